@@ -47,6 +47,125 @@ class Settings(BaseSettings):
         default="sk-46e78b90eb8e4d6ebef79f265891f238",
         description="API key for Qwen model"
     )
+    DASHSCOPE_BASE_URL: str = Field(
+        default="",
+        description="DashScope HTTP API base URL, e.g. a local app.utils.fake_dashscope server; empty for the SDK default"
+    )
+
+    # Query cache settings
+    QUERY_CACHE_ENABLED: bool = Field(default=True, description="Cache query embeddings and ranked results")
+    QUERY_CACHE_EMBEDDING_MAXSIZE: int = 4096
+    QUERY_CACHE_EMBEDDING_TTL: float = 86400.0
+    QUERY_CACHE_RESULT_MAXSIZE: int = 1024
+    QUERY_CACHE_RESULT_TTL: float = 300.0
+    QUERY_CACHE_REDIS_URL: str = Field(
+        default="",
+        description="Redis URL for the shared cache generation counter"
+    )
+    QUERY_CACHE_GENERATION_REFRESH: float = Field(
+        default=1.0,
+        description="Seconds queries reuse the generation read from Redis"
+    )
+
+    # Celery worker settings (see tasks/queues.py)
+    CELERY_CPU_CONCURRENCY: int = Field(default=0, description="cpu-parse worker processes (0 = one per CPU)")
+    CELERY_IO_POOL: str = Field(default="threads", description="llm-io worker pool: threads or gevent")
+    CELERY_IO_CONCURRENCY: int = Field(default=32, description="Concurrent llm-io tasks")
+    CELERY_INTERACTIVE_CONCURRENCY: int = Field(default=16, description="Concurrent interactive tasks")
+    CELERY_BATCH_CONCURRENCY: int = Field(default=2, description="Concurrent batch orchestration tasks")
+
+    # Bulk ingest settings (see tasks/ingest.py)
+    INGEST_WINDOW: int = Field(default=64, description="Maximum papers of an ingest job in flight")
+    INGEST_RATE: float = Field(default=0.0, description="Maximum admissions per minute (0 = no limit)")
+    INGEST_TICK_SECONDS: float = Field(default=5.0, description="Interval between scheduling ticks")
+    INGEST_MAX_QUEUE_DEPTH: int = Field(default=200, description="Stage queue depth that stops admissions")
+    INGEST_ITEM_TIMEOUT: float = Field(
+        default=3600.0,
+        description="Seconds a submitted paper's workflow may stay pending before it is marked failed"
+    )
+    INGEST_STALL_SECONDS: float = Field(
+        default=120.0,
+        description="Seconds without a tick after which a running job can be resumed"
+    )
+
+    # Metrics settings (see utils/metrics.py)
+    METRICS_PUSHGATEWAY_URL: str = Field(default="", description="Pushgateway workers push metrics to (empty = no push)")
+    METRICS_PUSH_INTERVAL: float = Field(default=15.0, description="Seconds between worker metric pushes")
+    METRICS_QUEUE_DEPTHS: bool = Field(default=True, description="Read broker queue depths on each /metrics scrape")
+
+    # Worker monitoring settings (see utils/monitoring.py)
+    MONITOR_ENABLED: bool = Field(default=True, description="Poll worker state in the background from the API")
+    MONITOR_INTERVAL: float = Field(default=5.0, description="Seconds between worker polls")
+    MONITOR_TIMEOUT: float = Field(default=1.0, description="Seconds to wait for worker replies per poll")
+    MONITOR_WINDOW: float = Field(default=300.0, description="Seconds of history for throughput and queue waits")
+    MONITOR_HISTORY: int = Field(default=120, description="Polls kept per worker")
+
+    # Tracing settings (see utils/tracing.py)
+    TRACING_EXPORTER: str = Field(default="", description="Span exporter: otlp, file or empty to disable tracing")
+    TRACING_OTLP_ENDPOINT: str = Field(default="localhost:4317", description="OTLP gRPC collector address")
+    TRACING_FILE: str = Field(default="/tmp/ananke2-traces.jsonl", description="JSON lines file of the file exporter")
+    TRACING_SAMPLE_RATIO: float = Field(default=1.0, description="Fraction of new traces recorded")
+
+    # Task profiling settings (see utils/profiling.py)
+    PROFILE_TASKS: str = Field(default="", description="Comma-separated task names profiled on every run ('*' for all)")
+    PROFILE_SAMPLE_RATE: float = Field(default=0.0, description="Fraction of other task runs profiled")
+    PROFILE_DIR: str = Field(default="/tmp/ananke2-profiles", description="Directory profiles are written to")
+    PROFILE_INTERVAL: float = Field(default=0.005, description="Seconds between stack samples")
+    PROFILE_MEMORY: bool = Field(default=True, description="Snapshot allocations with tracemalloc while profiling")
+    PROFILE_TOP_N: int = Field(default=25, description="Allocation sites listed per profile")
+    PROFILE_MAX_FILES: int = Field(default=200, description="Profile files kept")
+    PROFILE_MAX_AGE: float = Field(default=604800.0, description="Seconds profile files are kept")
+    PROFILE_REFRESH_SECONDS: float = Field(default=10.0, description="Seconds between reads of the profiling toggles")
+
+    # Progress reporting settings (see utils/progress.py)
+    PROGRESS_INTERVAL: float = Field(default=1.0, description="Minimum seconds between progress reports of a task")
+    PROGRESS_KEEPALIVE: float = Field(default=15.0, description="Seconds between keepalives on progress streams")
+
+    # Storage settings
+    DATA_DIR: str = Field(default="/tmp/ananke2-data", description="Root directory for downloaded documents")
+
+    # arXiv download settings
+    ARXIV_CACHE_DIR: str = Field(default="", description="arXiv metadata and PDF cache (default: DATA_DIR/arxiv)")
+    ARXIV_API_URL: str = "https://export.arxiv.org/api/query"
+    ARXIV_PDF_URL: str = "https://arxiv.org/pdf"
+    ARXIV_MAX_CONCURRENCY: int = Field(default=4, description="Concurrent requests to arXiv")
+    ARXIV_METADATA_TTL: float = Field(default=86400.0, description="Seconds before an unversioned id is resolved again")
+    ARXIV_TIMEOUT: float = 60.0
+
+    # Upload settings
+    UPLOAD_SPOOL_DIR: str = Field(
+        default="/tmp/ananke2-uploads",
+        description="Directory uploads are streamed to, addressed by SHA-256"
+    )
+    MAX_UPLOAD_BYTES: int = Field(default=100 * 1024 * 1024, description="Maximum upload size in bytes")
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    UPLOAD_CLAIM_TIMEOUT: float = Field(
+        default=3600.0,
+        description="Seconds an upload's task may stay pending before the upload is submitted again"
+    )
+
+    # Document dedup settings
+    DEDUP_ENABLED: bool = Field(default=True, description="Skip documents already in the fingerprint registry")
+    DEDUP_SIMHASH_DISTANCE: int = Field(
+        default=3,
+        description="Maximum SimHash Hamming distance for near duplicates (below 4)"
+    )
+
+    # Chunking settings
+    CHUNK_MIN_CHARS: int = Field(default=1000, description="Minimum chunk size before an anchor cut")
+    CHUNK_MAX_CHARS: int = Field(default=4000, description="Hard chunk size limit")
+    EMBEDDING_BATCH_SIZE: int = Field(default=10, description="Texts per DashScope embedding request")
+
+    # PDF partitioning settings
+    PARTITION_WORKERS: int = Field(default=0, description="Processes partitioning page batches (0 = one per CPU)")
+    PARTITION_PAGES_PER_BATCH: int = Field(default=8, description="Pages partitioned per worker task")
+    PARTITION_MIN_PAGES: int = Field(default=16, description="Smaller PDFs are partitioned in a single process")
+
+    # Streaming pipeline settings
+    STREAMING_INGEST: bool = Field(default=False, description="Ingest documents with the streaming pipeline")
+    PIPELINE_QUEUE_SIZE: int = Field(default=8, description="Capacity of the chunk and write queues")
+    PIPELINE_ELEMENT_QUEUE_SIZE: int = Field(default=256, description="Capacity of the element queue")
+    PIPELINE_WRITE_BATCH: int = Field(default=16, description="Results buffered before a bulk write")
 
     def get_neo4j_uri(self) -> str:
         """Get Neo4j URI based on environment."""
@@ -77,6 +196,14 @@ class Settings(BaseSettings):
             return f"redis://{self.get_redis_host()}:{self.REDIS_PORT}/{self.REDIS_DB}"
         return os.getenv("CELERY_RESULT_BACKEND", "sqlite:///celery-results.sqlite")
 
+    def get_query_cache_redis_url(self) -> str:
+        """Get Redis URL for the query cache generation counter."""
+        if self.QUERY_CACHE_REDIS_URL:
+            return self.QUERY_CACHE_REDIS_URL
+        if self.DOCKER_NETWORK:
+            return f"redis://{self.get_redis_host()}:{self.REDIS_PORT}/{self.REDIS_DB}"
+        return ""
+
     @computed_field
     @property
     def neo4j_uri(self) -> str:
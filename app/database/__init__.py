@@ -1,8 +1,16 @@
-"""Database interface implementations for Ananke2."""
+"""Database interface implementations for Ananke2.
+
+The interfaces are exported lazily so importing a submodule such as
+``app.database.cache`` doesn't load chromadb, neo4j and sqlalchemy.
+"""
 
 from .base import DatabaseInterface
-from .graph import Neo4jInterface
-from .vector import ChromaInterface
-from .relational import MySQLInterface
+from ..utils.lazy import lazy_exports
 
 __all__ = ['DatabaseInterface', 'Neo4jInterface', 'ChromaInterface', 'MySQLInterface']
+
+__getattr__ = lazy_exports(__name__, {
+    'Neo4jInterface': '.graph',
+    'ChromaInterface': '.vector',
+    'MySQLInterface': '.relational'
+})
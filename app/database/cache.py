@@ -0,0 +1,375 @@
+"""Query result caching for cross-database queries.
+
+This module provides the two-level cache used by CrossDatabaseQuery:
+- Embedding cache: query text and modality to Qwen embedding vector
+- Result cache: normalized query to ranked document ids
+
+Both levels use TTL expiry with LRU eviction. Result entries are tagged with
+a generation number; ingest tasks bump the generation whenever documents,
+entities or embeddings are written, which invalidates every cached result
+without having to know which queries they affect. Embeddings do not depend
+on the corpus and are not generation-tagged.
+
+The generation counter lives in Redis when one is configured so that the API
+process sees bumps made by Celery workers; otherwise a process-local counter
+is used. Queries read the Redis generation at most once per
+QUERY_CACHE_GENERATION_REFRESH seconds, from a worker thread, so a bump can
+take that long to reach other processes.
+
+Example:
+    >>> cache = QueryCache()
+    >>> embedding = await cache.get_embedding("quantum", "text", compute)
+    >>> cache.stats()["embeddings"]["hit_ratio"]
+    0.0
+    >>> bump_generation()  # called by ingest tasks after writes
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from ..config import settings
+from ..utils.metrics import record_cache
+
+_MISSING = object()
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one cache level.
+
+    Attributes:
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that had to be computed
+        evictions (int): Entries dropped by LRU eviction
+        saved_seconds (float): Sum of the original compute time of every hit
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return counters as a JSON-friendly dictionary."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hit_ratio,
+            "saved_seconds": self.saved_seconds
+        }
+
+class TTLLRUCache:
+    """Thread-safe mapping with per-entry TTL and LRU eviction.
+
+    Each entry remembers how long it took to compute so hits can be credited
+    with the latency they saved.
+
+    Args:
+        maxsize (int): Maximum number of entries kept
+        ttl (float): Seconds an entry stays valid, 0 disables expiry
+        name (Optional[str]): Name lookups are reported under in the
+            cache metrics, None to not report them
+    """
+
+    def __init__(self, maxsize: int, ttl: float, name: Optional[str] = None):
+        """Initialize an empty cache."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self.stats = CacheStats()
+        self._data: "OrderedDict[Hashable, Tuple[float, Optional[int], Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, generation: Optional[int] = None) -> Any:
+        """Look up a key, returning the module sentinel on a miss.
+
+        Entries that are expired or were stored under a different generation
+        count as misses and are dropped.
+
+        Args:
+            key (Hashable): Cache key
+            generation (Optional[int]): Current data generation
+
+        Returns:
+            Any: Cached value, or ``_MISSING`` if not present
+        """
+        now = time.monotonic()
+        hit, value = False, None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, entry_generation, value, cost = entry
+                if (self.ttl and expires_at < now) or entry_generation != generation:
+                    del self._data[key]
+                else:
+                    self._data.move_to_end(key)
+                    self.stats.hits += 1
+                    self.stats.saved_seconds += cost
+                    hit = True
+            if not hit:
+                self.stats.misses += 1
+        if self.name:
+            record_cache(self.name, hit)
+        return value if hit else _MISSING
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None,
+            cost: float = 0.0) -> None:
+        """Store a value, evicting least recently used entries if full.
+
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to store
+            generation (Optional[int]): Data generation the value belongs to
+            cost (float): Seconds it took to compute the value
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, generation, value, cost)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry, keeping statistics."""
+        with self._lock:
+            self._data.clear()
+
+class GenerationCounter:
+    """Process-local data generation counter."""
+
+    def __init__(self):
+        """Initialize the counter at generation 0."""
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> int:
+        """Return the current generation."""
+        return self._value
+
+    async def current(self) -> int:
+        """Return the current generation without blocking the event loop."""
+        return self.get()
+
+    def bump(self) -> int:
+        """Advance the generation, invalidating cached results.
+
+        Returns:
+            int: The new generation
+        """
+        with self._lock:
+            self._value += 1
+            return self._value
+
+class RedisGenerationCounter(GenerationCounter):
+    """Generation counter shared between processes through Redis.
+
+    Falls back to the local counter if Redis is unreachable so a cache outage
+    degrades to per-process invalidation instead of failing queries.
+
+    Args:
+        url (str): Redis connection URL
+        key (str, optional): Redis key holding the counter
+        refresh (Optional[float]): Seconds ``current`` reuses the last value
+            read from Redis. Defaults to QUERY_CACHE_GENERATION_REFRESH.
+    """
+
+    def __init__(self, url: str, key: str = "ananke2:query_cache:generation",
+                 refresh: Optional[float] = None):
+        """Initialize Redis client lazily on first use."""
+        super().__init__()
+        self.url = url
+        self.key = key
+        self.refresh = settings.QUERY_CACHE_GENERATION_REFRESH if refresh is None else refresh
+        self._client = None
+        self._shared: Optional[int] = None
+        self._read_at = 0.0
+
+    def _redis(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        return self._client
+
+    def get(self) -> int:
+        """Return the shared generation, or the local one if Redis fails."""
+        try:
+            return int(self._redis().get(self.key) or 0)
+        except Exception as e:
+            print(f"Error reading query cache generation: {str(e)}")
+            return super().get()
+
+    async def current(self) -> int:
+        """Return the shared generation, read from Redis in a worker thread.
+
+        The value is reused for ``refresh`` seconds so queries do not make a
+        Redis round trip each.
+        """
+        if self._shared is None or time.monotonic() - self._read_at >= self.refresh:
+            self._shared = await asyncio.to_thread(self.get)
+            self._read_at = time.monotonic()
+        return self._shared
+
+    def bump(self) -> int:
+        """Increment the shared generation, or the local one if Redis fails."""
+        try:
+            value = int(self._redis().incr(self.key))
+        except Exception as e:
+            print(f"Error bumping query cache generation: {str(e)}")
+            value = super().bump()
+        self._shared, self._read_at = value, time.monotonic()
+        return value
+
+_generation_counter: Optional[GenerationCounter] = None
+
+def get_generation_counter() -> GenerationCounter:
+    """Get the process-wide generation counter configured from settings.
+
+    Returns:
+        GenerationCounter: Redis-backed if QUERY_CACHE_REDIS_URL resolves,
+            process-local otherwise
+    """
+    global _generation_counter
+    if _generation_counter is None:
+        url = settings.get_query_cache_redis_url()
+        _generation_counter = RedisGenerationCounter(url) if url else GenerationCounter()
+    return _generation_counter
+
+def bump_generation() -> int:
+    """Invalidate cached query results after new data was ingested.
+
+    Returns:
+        int: The new generation
+    """
+    return get_generation_counter().bump()
+
+def normalize_query(**parts: Any) -> str:
+    """Build a canonical cache key from query parameters.
+
+    Whitespace in text is collapsed and dictionaries are serialized with
+    sorted keys so equivalent queries share an entry. Case is preserved
+    because embeddings are case-sensitive.
+
+    Args:
+        **parts: Query parameters
+
+    Returns:
+        str: Canonical key
+    """
+    normalized = {}
+    for name, value in parts.items():
+        if isinstance(value, str):
+            value = " ".join(value.split())
+        normalized[name] = value
+    return json.dumps(normalized, sort_keys=True, default=str)
+
+class QueryCache:
+    """Two-level cache for embeddings and ranked query results.
+
+    Args:
+        embedding_maxsize (int, optional): Max cached embeddings.
+            Defaults to settings.QUERY_CACHE_EMBEDDING_MAXSIZE.
+        embedding_ttl (float, optional): Embedding TTL in seconds.
+            Defaults to settings.QUERY_CACHE_EMBEDDING_TTL.
+        result_maxsize (int, optional): Max cached result lists.
+            Defaults to settings.QUERY_CACHE_RESULT_MAXSIZE.
+        result_ttl (float, optional): Result TTL in seconds.
+            Defaults to settings.QUERY_CACHE_RESULT_TTL.
+        generation (Optional[GenerationCounter]): Counter used to invalidate
+            results. Defaults to get_generation_counter().
+
+    Attributes:
+        embeddings (TTLLRUCache): Query text to embedding vector
+        results (TTLLRUCache): Normalized query to ranked document ids
+    """
+
+    def __init__(self, embedding_maxsize: Optional[int] = None,
+                 embedding_ttl: Optional[float] = None,
+                 result_maxsize: Optional[int] = None,
+                 result_ttl: Optional[float] = None,
+                 generation: Optional[GenerationCounter] = None):
+        """Initialize both cache levels."""
+        self.embeddings = TTLLRUCache(
+            embedding_maxsize or settings.QUERY_CACHE_EMBEDDING_MAXSIZE,
+            settings.QUERY_CACHE_EMBEDDING_TTL if embedding_ttl is None else embedding_ttl,
+            name="query_embeddings"
+        )
+        self.results = TTLLRUCache(
+            result_maxsize or settings.QUERY_CACHE_RESULT_MAXSIZE,
+            settings.QUERY_CACHE_RESULT_TTL if result_ttl is None else result_ttl,
+            name="query_results"
+        )
+        self.generation = generation or get_generation_counter()
+        self._generation = 0
+
+    async def get_embedding(self, text: str, modality: str,
+                            compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the embedding for text, computing it on a miss.
+
+        Args:
+            text (str): Query text
+            modality (str): Content modality
+            compute (Callable[[], Awaitable[Any]]): Coroutine factory that
+                generates the embedding
+
+        Returns:
+            Any: Embedding vector
+        """
+        key = (modality, " ".join(text.split()))
+        value = self.embeddings.get(key)
+        if value is not _MISSING:
+            return value
+        start = time.perf_counter()
+        value = await compute()
+        self.embeddings.set(key, value, cost=time.perf_counter() - start)
+        return value
+
+    async def get_results(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return cached results for a normalized query, computing on a miss.
+
+        Args:
+            key (str): Key from normalize_query
+            compute (Callable[[], Awaitable[Any]]): Coroutine factory that
+                runs the query and returns a cacheable value
+
+        Returns:
+            Any: Cached or freshly computed value
+        """
+        generation = self._generation = await self.generation.current()
+        value = self.results.get(key, generation)
+        if value is not _MISSING:
+            return value
+        start = time.perf_counter()
+        value = await compute()
+        self.results.set(key, value, generation, cost=time.perf_counter() - start)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """Report hit ratio and saved latency for both levels.
+
+        Returns:
+            Dict[str, Any]: Per-level statistics plus the generation of the
+                last result lookup
+        """
+        return {
+            "embeddings": self.embeddings.stats.to_dict(),
+            "results": self.results.stats.to_dict(),
+            "generation": self._generation
+        }
+
+    def clear(self) -> None:
+        """Drop all cached embeddings and results."""
+        self.embeddings.clear()
+        self.results.clear()
@@ -26,13 +26,14 @@ Note:
 """
 
 import asyncio
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
 from neo4j import AsyncGraphDatabase as Neo4jDriver
 from neo4j.exceptions import ServiceUnavailable
 
 from .base import DatabaseInterface
+from ..models.batches import EntityBatch, RelationBatch
 from ..models.entities import EntitySymbol
 from ..models.relations import RelationSymbol
 from ..models.triples import TripleSymbol
@@ -94,6 +95,12 @@ class Neo4jInterface(DatabaseInterface[EntitySymbol]):
             await self._driver.verify_connectivity()
             async with self._driver.session() as session:
                 await session.run("RETURN 1")
+                # Relationships resolve their endpoints by entity name
+                await session.run("CREATE INDEX entity_name IF NOT EXISTS FOR (e:Entity) ON (e.name)")
+                # Entities and relationships are merged on their ids
+                await session.run("CREATE INDEX entity_id IF NOT EXISTS FOR (e:Entity) ON (e.id)")
+                # Graph search ranks documents by the entities of a type
+                await session.run("CREATE INDEX entity_type IF NOT EXISTS FOR (e:Entity) ON (e.entity_type)")
         except Exception as e:
             print(f"Error connecting to Neo4j: {str(e)}")
             raise
@@ -149,6 +156,179 @@ class Neo4jInterface(DatabaseInterface[EntitySymbol]):
         finally:
             await session.close()
 
+    async def create_entities(self, batch: EntityBatch, chunk_size: int = 5000) -> int:
+        """Create all entities of a batch in a single transaction.
+
+        Each chunk is sent as one ``UNWIND`` statement over the batch's
+        parallel columns, so no per-entity models or round trips are needed.
+        Entities are merged on their id, so writing a batch with stable ids
+        (see ``stable_ids``) again updates the entities instead of
+        duplicating them.
+
+        Args:
+            batch (EntityBatch): Entities to create
+            chunk_size (int, optional): Rows per statement. Defaults to 5000.
+
+        Returns:
+            int: Number of entities created
+
+        Raises:
+            ConnectionError: If database connection fails
+            Exception: If entity creation fails
+        """
+        if self.test_mode or not len(batch):
+            return len(batch)
+
+        async with self._driver.session() as session:
+            tx = await session.begin_transaction()
+            try:
+                await self._create_entities(tx, batch, chunk_size)
+                await tx.commit()
+                return len(batch)
+            except Exception as e:
+                print(f"Error creating entity batch in Neo4j: {str(e)}")
+                await tx.rollback()
+                raise
+
+    async def create_relationships(self, batch: RelationBatch, chunk_size: int = 5000) -> int:
+        """Create all relationships of a batch in a single transaction.
+
+        Source and target are resolved by entity name, preferring entities
+        of the batch's document when a name is stored more than once.
+        Relationships whose source or target doesn't exist are skipped;
+        ones with an id already stored between the same entities are updated.
+
+        Args:
+            batch (RelationBatch): Relationships to create
+            chunk_size (int, optional): Rows per statement. Defaults to 5000.
+
+        Returns:
+            int: Number of relationships created
+
+        Raises:
+            ConnectionError: If database connection fails
+            Exception: If relationship creation fails
+        """
+        if self.test_mode or not len(batch):
+            return len(batch)
+
+        async with self._driver.session() as session:
+            tx = await session.begin_transaction()
+            try:
+                created = await self._create_relationships(tx, batch, chunk_size)
+                await tx.commit()
+                return created
+            except Exception as e:
+                print(f"Error creating relationship batch in Neo4j: {str(e)}")
+                await tx.rollback()
+                raise
+
+    async def store_graph(self, entities: EntityBatch, relationships: RelationBatch,
+                          chunk_size: int = 5000) -> Tuple[int, int]:
+        """Create a document's entities and the relationships between them in one transaction.
+
+        Relationships are created after the entities, so they resolve
+        against entities of the same batch as well as stored ones.
+
+        Args:
+            entities (EntityBatch): Entities to create
+            relationships (RelationBatch): Relationships to create
+            chunk_size (int, optional): Rows per statement. Defaults to 5000.
+
+        Returns:
+            Tuple[int, int]: Number of entities and relationships created
+
+        Raises:
+            ConnectionError: If database connection fails
+            Exception: If creation fails; nothing is stored
+        """
+        if self.test_mode or not (len(entities) or len(relationships)):
+            return len(entities), len(relationships)
+
+        async with self._driver.session() as session:
+            tx = await session.begin_transaction()
+            try:
+                await self._create_entities(tx, entities, chunk_size)
+                created = await self._create_relationships(tx, relationships, chunk_size)
+                await tx.commit()
+                return len(entities), created
+            except Exception as e:
+                print(f"Error storing graph in Neo4j: {str(e)}")
+                await tx.rollback()
+                raise
+
+    @staticmethod
+    async def _create_entities(tx: Any, batch: EntityBatch, chunk_size: int) -> None:
+        document_id = batch.document_id.bytes if batch.document_id else None
+        for chunk in batch.chunks(chunk_size):
+            await tx.run(
+                """
+                UNWIND range(0, size($ids) - 1) AS i
+                MERGE (e:Entity {id: $ids[i]})
+                SET e.name = $names[i],
+                    e.descriptions = [$descriptions[i]],
+                    e.entity_type = $entity_types[i],
+                    e.document_id = $document_id
+                """,
+                {**chunk.to_neo4j_params(), "document_id": document_id}
+            )
+
+    @staticmethod
+    async def _create_relationships(tx: Any, batch: RelationBatch, chunk_size: int) -> int:
+        document_id = batch.document_id.bytes if batch.document_id else None
+        created = 0
+        for chunk in batch.chunks(chunk_size):
+            result = await tx.run(
+                """
+                UNWIND range(0, size($ids) - 1) AS i
+                MATCH (s:Entity {name: $sources[i]})
+                WITH i, s ORDER BY coalesce(s.document_id = $document_id, false) DESC
+                WITH i, head(collect(s)) AS s
+                MATCH (t:Entity {name: $targets[i]})
+                WITH i, s, t ORDER BY coalesce(t.document_id = $document_id, false) DESC
+                WITH i, s, head(collect(t)) AS t
+                MERGE (s)-[r:RELATED_TO {id: $ids[i]}]->(t)
+                SET r.description = $relationships[i],
+                    r.strength = $strengths[i],
+                    r.document_id = $document_id
+                RETURN count(r) AS count
+                """,
+                {**chunk.to_neo4j_params(), "document_id": document_id}
+            )
+            record = await result.single()
+            created += record["count"] if record else 0
+        return created
+
+    async def delete_entities(self, ids: List[str]) -> int:
+        """Delete entities and their relationships by ID in one statement.
+
+        Args:
+            ids (List[str]): UUID strings of the entities, as created by
+                ``create_entities``
+
+        Returns:
+            int: Number of entities deleted
+
+        Raises:
+            ConnectionError: If database connection fails
+            Exception: If entity deletion fails
+        """
+        if self.test_mode or not ids:
+            return 0
+
+        async with self._driver.session() as session:
+            result = await session.run(
+                """
+                UNWIND $ids AS id
+                MATCH (e:Entity {id: id})
+                DETACH DELETE e
+                RETURN count(e) AS count
+                """,
+                ids=[UUID(id).bytes for id in ids]
+            )
+            record = await result.single()
+            return record["count"] if record else 0
+
     async def read(self, id: UUID) -> Optional[EntitySymbol]:
         """Read an entity from Neo4j by ID.
 
@@ -300,7 +480,11 @@ class Neo4jInterface(DatabaseInterface[EntitySymbol]):
         """Search for entities in Neo4j using a query dictionary.
 
         Constructs and executes a Cypher query based on the provided
-        search criteria. Supports exact match on entity properties.
+        search criteria. Supports exact match on entity properties, plus
+        these reserved keys:
+        - relationship, min_strength: the entity has a relationship of this
+          type and/or at least this strength
+        - skip, limit: page of results, ordered by name
 
         Args:
             query (Dict[str, Any]): Search criteria as property key-value pairs
@@ -312,20 +496,37 @@ class Neo4jInterface(DatabaseInterface[EntitySymbol]):
             ConnectionError: If database connection fails
             ValueError: If query format is invalid
         """
+        query = dict(query)
+        params = {"skip": query.pop("skip", 0), "limit": query.pop("limit", 10)}
         conditions = []
-        params = {}
+
+        related = []
+        for key in ("relationship", "min_strength"):
+            if query.get(key) is not None:
+                params[key] = query.pop(key)
+        if "relationship" in params:
+            related.append("r.description = $relationship")
+        if "min_strength" in params:
+            related.append("r.strength >= $min_strength")
+        if related:
+            conditions.append(f"EXISTS {{ MATCH (e)-[r:RELATED_TO]-() WHERE {' AND '.join(related)} }}")
 
         for key, value in query.items():
+            if not key.isidentifier():
+                raise ValueError(f"Invalid search property: {key!r}")
             conditions.append(f"e.{key} = ${key}")
             params[key] = value
 
         cypher_query = f"""
         MATCH (e:Entity)
-        WHERE {" AND ".join(conditions)}
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
         RETURN e
+        ORDER BY e.name
+        SKIP $skip
+        LIMIT $limit
         """
 
-        async with await self._driver.session() as session:
+        async with self._driver.session() as session:
             result = await session.run(cypher_query, params)
             records = await result.all()
             return [
@@ -333,7 +534,7 @@ class Neo4jInterface(DatabaseInterface[EntitySymbol]):
                     symbol_id=UUID(record["e"]["id"]),
                     name=record["e"]["name"],
                     descriptions=record["e"]["descriptions"],
-                    entity_type="ENTITY",
+                    entity_type=record["e"].get("entity_type", "ENTITY"),
                     semantics=[],
                     properties=[],
                     labels=[]
@@ -341,6 +542,42 @@ class Neo4jInterface(DatabaseInterface[EntitySymbol]):
                 for record in records
             ]
 
+    async def search_documents(self, entity_type: str, skip: int = 0, limit: int = 10) -> List[Dict[str, Any]]:
+        """Rank documents by the number of entities of a type they contain.
+
+        Args:
+            entity_type (str): Entity type to match
+            skip (int, optional): Documents to skip. Defaults to 0.
+            limit (int, optional): Maximum documents to return. Defaults to 10.
+
+        Returns:
+            List[Dict[str, Any]]: document_id (UUID) and score (number of
+                matching entities), highest score first
+
+        Raises:
+            ConnectionError: If database connection fails
+        """
+        async with self._driver.session() as session:
+            result = await session.run(
+                """
+                MATCH (e:Entity {entity_type: $entity_type})
+                WHERE e.document_id IS NOT NULL
+                WITH e.document_id AS document_id, count(e) AS mentions
+                RETURN document_id, mentions
+                ORDER BY mentions DESC, document_id
+                SKIP $skip
+                LIMIT $limit
+                """,
+                entity_type=entity_type,
+                skip=skip,
+                limit=limit
+            )
+            records = await result.all()
+            return [
+                {"document_id": UUID(bytes=bytes(record["document_id"])), "score": float(record["mentions"])}
+                for record in records
+            ]
+
     async def get_all_entities(self) -> List[EntitySymbol]:
         """Get all entities from the database with a reasonable limit.
 
@@ -387,3 +624,19 @@ class Neo4jInterface(DatabaseInterface[EntitySymbol]):
                 )
                 for record in records
             ]
+
+def get_graph_db() -> Neo4jInterface:
+    """Get a Neo4j interface configured from settings, not yet connected.
+
+    For async callers such as the Celery tasks, which await it directly
+    instead of going through the synchronous GraphDatabase wrapper.
+
+    Returns:
+        Neo4jInterface: Async graph database interface
+    """
+    from ..config import settings
+    return Neo4jInterface(
+        uri=settings.NEO4J_URI,
+        username=settings.NEO4J_USER,
+        password=settings.NEO4J_PASSWORD
+    )
@@ -6,16 +6,75 @@ It supports semantic similarity search, graph relationship queries, and
 structured data filtering with the ability to combine results.
 """
 
-from typing import List, Dict, Any, Optional
+import asyncio
+from collections import deque
+from dataclasses import replace
+from typing import List, Dict, Any, Optional, Mapping, Sequence, AsyncIterator, Union, TYPE_CHECKING
 from uuid import UUID
 
 from ..models.structured import Document
 from ..models.entities import EntitySymbol
-from ..utils.qwen import QwenClient
 from ..config import settings
-from .vector import ChromaInterface
-from .graph import Neo4jInterface
-from .relational import MySQLInterface
+from .ranking import ResultFusion, RankedResult, SourceHit, source_fetch_limit
+from .cache import QueryCache, normalize_query
+
+if TYPE_CHECKING:
+    from ..utils.qwen import QwenClient
+    from .vector import ChromaInterface
+    from .graph import Neo4jInterface
+    from .relational import MySQLInterface
+
+# Fields that can be produced without loading the document from MySQL.
+ID_ONLY_FIELDS = frozenset({"id", "score", "sources"})
+# Fields derived from the document or its ranking rather than model attributes.
+DERIVED_FIELDS = frozenset({"title"}) | ID_ONLY_FIELDS
+
+def validate_fields(fields: Optional[Sequence[str]]) -> None:
+    """Check that every projected field can be produced.
+
+    Args:
+        fields (Optional[Sequence[str]]): Requested field names, None for all
+
+    Raises:
+        ValueError: If a field is neither a Document attribute nor derived
+    """
+    if fields is None:
+        return
+    unknown = set(fields) - DERIVED_FIELDS - set(Document.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown projection fields: {sorted(unknown)}")
+
+def project_document(
+    document: Optional[Document],
+    fields: Sequence[str],
+    result: Optional[RankedResult] = None
+) -> Dict[str, Any]:
+    """Build a JSON-friendly projection of a search result.
+
+    Args:
+        document (Optional[Document]): Hydrated document, may be None when
+            only id-derived fields are requested
+        fields (Sequence[str]): Field names to include. Besides Document
+            attributes, supports "title" (from meta.data_value), "score" and
+            "sources" (from the fused ranking)
+        result (Optional[RankedResult]): Ranking entry for score fields
+
+    Returns:
+        Dict[str, Any]: Projected fields in request order
+    """
+    projected = {}
+    for field in fields:
+        if field == "id":
+            projected["id"] = str(document.id if document is not None else result.document_id)
+        elif field == "score":
+            projected["score"] = result.score if result else None
+        elif field == "sources":
+            projected["sources"] = result.explain()["sources"] if result else {}
+        elif field == "title":
+            projected["title"] = document.meta.data_value.get("title")
+        else:
+            projected[field] = document.model_dump(include={field}, mode="json")[field]
+    return projected
 
 class CrossDatabaseQuery:
     """Cross-database query interface supporting semantic, graph, and structured queries.
@@ -25,13 +84,15 @@ class CrossDatabaseQuery:
     - Semantic similarity search using vector embeddings
     - Knowledge graph traversal and relationship queries
     - Structured data filtering and retrieval
-    - Combined multi-database search with result deduplication
+    - Combined multi-database search ranked with Reciprocal Rank Fusion
 
     Attributes:
         vector_db (ChromaInterface): Vector database for semantic search
         graph_db (Neo4jInterface): Graph database for relationship queries
         mysql_db (MySQLInterface): Relational database for structured data
         qwen_client (QwenClient): Client for generating embeddings
+        fusion (ResultFusion): Ranking stage used by combined_search
+        cache (Optional[QueryCache]): Embedding and result cache, None if disabled
 
     Example:
         ```python
@@ -54,10 +115,12 @@ class CrossDatabaseQuery:
 
     def __init__(
         self,
-        vector_db: Optional[ChromaInterface] = None,
-        graph_db: Optional[Neo4jInterface] = None,
-        mysql_db: Optional[MySQLInterface] = None,
-        qwen_client: Optional[QwenClient] = None
+        vector_db: Optional["ChromaInterface"] = None,
+        graph_db: Optional["Neo4jInterface"] = None,
+        mysql_db: Optional["MySQLInterface"] = None,
+        qwen_client: Optional["QwenClient"] = None,
+        fusion: Optional[ResultFusion] = None,
+        cache: Optional[QueryCache] = None
     ):
         """Initialize database interfaces.
 
@@ -66,10 +129,20 @@ class CrossDatabaseQuery:
             graph_db (Optional[Neo4jInterface]): Graph database interface
             mysql_db (Optional[MySQLInterface]): Relational database interface
             qwen_client (Optional[QwenClient]): Embedding generation client
+            fusion (Optional[ResultFusion]): Ranking strategy for combined
+                search. Defaults to Reciprocal Rank Fusion.
+            cache (Optional[QueryCache]): Query cache. Defaults to a new
+                QueryCache when settings.QUERY_CACHE_ENABLED is set.
 
         If interfaces are not provided, they will be initialized with
-        default configuration from settings.
+        default configuration from settings. Backend modules are imported
+        here rather than at module level to keep API startup fast.
         """
+        from ..utils.qwen import QwenClient
+        from .vector import ChromaInterface
+        from .graph import Neo4jInterface
+        from .relational import MySQLInterface
+
         self.vector_db = vector_db or ChromaInterface()
         self.graph_db = graph_db or Neo4jInterface(
             uri=settings.NEO4J_URI,
@@ -84,6 +157,10 @@ class CrossDatabaseQuery:
             database=settings.MYSQL_DATABASE
         )
         self.qwen_client = qwen_client or QwenClient()
+        self.fusion = fusion or ResultFusion()
+        self.cache = cache
+        if self.cache is None and settings.QUERY_CACHE_ENABLED:
+            self.cache = QueryCache()
 
     async def search_by_embedding(
         self,
@@ -114,18 +191,12 @@ class CrossDatabaseQuery:
             )
             ```
         """
-        embedding = await self.qwen_client.generate_embeddings(query_text, modality)
-        results = await self.vector_db.search({
-            "vector": embedding,
-            "limit": limit
-        })
+        doc_ids = await self._embedding_ids(query_text, modality, limit)
         documents = []
-        for result in results:
-            doc_id = result.get('metadata', {}).get('document_id')
-            if doc_id:
-                doc = await self.mysql_db.get(UUID(doc_id))
-                if doc:
-                    documents.append(doc)
+        for doc_id in doc_ids:
+            doc = await self.mysql_db.get(doc_id)
+            if doc:
+                documents.append(doc)
         return documents
 
     async def search_by_graph(
@@ -134,7 +205,8 @@ class CrossDatabaseQuery:
         entity_name: Optional[str] = None,
         relationship_type: Optional[str] = None,
         min_strength: Optional[int] = None,
-        limit: int = 10
+        limit: int = 10,
+        skip: int = 0
     ) -> List[EntitySymbol]:
         """Search entities in knowledge graph.
 
@@ -147,6 +219,7 @@ class CrossDatabaseQuery:
             relationship_type (Optional[str]): Filter by relationship type
             min_strength (Optional[int]): Minimum relationship strength
             limit (int): Maximum number of results
+            skip (int): Matching entities to skip, for paging
 
         Returns:
             List[EntitySymbol]: List of matching entities
@@ -164,20 +237,22 @@ class CrossDatabaseQuery:
         """
         query = {}
         if entity_type:
-            query["type"] = entity_type
+            query["entity_type"] = entity_type
         if entity_name:
             query["name"] = entity_name
         if relationship_type:
             query["relationship"] = relationship_type
         if min_strength:
             query["min_strength"] = min_strength
+        query["skip"] = skip
         query["limit"] = limit
         return await self.graph_db.search(query)
 
     async def search_structured(
         self,
         filters: Dict[str, Any],
-        limit: int = 10
+        limit: int = 10,
+        skip: int = 0
     ) -> List[Document]:
         """Search structured data in MySQL.
 
@@ -187,6 +262,7 @@ class CrossDatabaseQuery:
         Args:
             filters (Dict[str, Any]): Dictionary of field-value pairs to filter on
             limit (int): Maximum number of results
+            skip (int): Matching documents to skip, for paging
 
         Returns:
             List[Document]: List of matching documents
@@ -202,6 +278,8 @@ class CrossDatabaseQuery:
             ```
         """
         filters["limit"] = limit
+        if skip:
+            filters["skip"] = skip
         return await self.mysql_db.search(filters)
 
     async def combined_search(
@@ -213,8 +291,10 @@ class CrossDatabaseQuery:
     ) -> List[Document]:
         """Search across all databases.
 
-        Performs parallel searches across semantic, graph, and structured
-        databases, combining and deduplicating results.
+        Runs the semantic, graph, and structured searches concurrently and
+        merges them with the configured fusion strategy (Reciprocal Rank
+        Fusion by default). Only the fused top ``limit`` documents are
+        loaded from MySQL.
 
         Args:
             query_text (str): Semantic search query
@@ -223,7 +303,7 @@ class CrossDatabaseQuery:
             limit (int): Maximum number of results
 
         Returns:
-            List[Document]: Combined and deduplicated list of matching documents
+            List[Document]: Deduplicated documents ordered by fused relevance
 
         Example:
             ```python
@@ -235,19 +315,360 @@ class CrossDatabaseQuery:
             )
             ```
         """
-        semantic_results = await self.search_by_embedding(query_text, limit=limit)
-        graph_results = await self.search_by_graph(entity_type=entity_type, limit=limit)
-        structured_results = await self.search_structured(filters or {}, limit=limit)
-        seen_ids = set()
-        combined = []
-        for doc in semantic_results + structured_results:
-            if doc.id not in seen_ids:
-                seen_ids.add(doc.id)
-                combined.append(doc)
-        for entity in graph_results:
-            if entity.document_id and entity.document_id not in seen_ids:
-                doc = await self.mysql_db.get(entity.document_id)
-                if doc:
-                    seen_ids.add(doc.id)
-                    combined.append(doc)
-        return combined[:limit]
+        ranked = await self.ranked_search(
+            query_text,
+            entity_type=entity_type,
+            filters=filters,
+            limit=limit
+        )
+        return [result.document for result in ranked]
+
+    async def ranked_search(
+        self,
+        query_text: str,
+        entity_type: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+        overfetch: float = 1.0,
+        weights: Optional[Mapping[str, float]] = None
+    ) -> List[RankedResult]:
+        """Search across all databases and return scored, explained results.
+
+        Each backend is asked only for the candidates the fused top-k can
+        use (see ``source_fetch_limit``). The graph source is skipped when no
+        ``entity_type`` is given and the structured source when ``filters``
+        is empty, so unconstrained sources don't flood the ranking.
+
+        Args:
+            query_text (str): Semantic search query
+            entity_type (Optional[str]): Knowledge graph entity type filter
+            filters (Optional[Dict[str, Any]]): Structured data filters
+            limit (int): Maximum number of results
+            overfetch (float): Per-source candidate multiplier. Defaults to 1.0.
+            weights (Optional[Mapping[str, float]]): Per-source weight override
+                for this call ("vector", "graph", "structured")
+
+        Returns:
+            List[RankedResult]: Hydrated results with per-source scores;
+                ``result.explain()`` gives a JSON-friendly breakdown
+
+        Example:
+            ```python
+            for result in await query.ranked_search("quantum computing", limit=5):
+                print(result.document.id, result.explain()["sources"])
+            ```
+        """
+        fused = await self._fused_candidates(
+            query_text, entity_type, filters, limit, overfetch, weights
+        )
+
+        # Walk the full fused order so documents that fail to hydrate are
+        # replaced by the next candidate instead of shrinking the page.
+        results = []
+        for result in fused:
+            if result.document is None:
+                result.document = await self.mysql_db.get(result.document_id)
+            if result.document is not None:
+                results.append(result)
+                if len(results) >= limit:
+                    break
+        return results
+
+    async def iter_by_embedding(
+        self,
+        query_text: str,
+        modality: str = "text",
+        limit: int = 10,
+        fields: Optional[Sequence[str]] = None,
+        prefetch: int = 4
+    ) -> AsyncIterator[Union[Document, Dict[str, Any]]]:
+        """Stream documents by semantic similarity as they are hydrated.
+
+        Streaming variant of search_by_embedding. Documents are loaded with a
+        small read-ahead window and yielded in similarity order, so the first
+        result is available after one MySQL round-trip and at most
+        ``prefetch`` documents are held in memory at once.
+
+        Args:
+            query_text (str): Text to search for
+            modality (str): Content modality (text, math, code)
+            limit (int): Maximum number of results
+            fields (Optional[Sequence[str]]): Projection; yields dicts with only
+                these fields. ``["id"]`` skips MySQL entirely. None yields
+                full Document objects.
+            prefetch (int): Number of documents loaded ahead of the consumer
+
+        Yields:
+            Union[Document, Dict[str, Any]]: Documents, or projections when
+                ``fields`` is given
+
+        Raises:
+            ValueError: If a projection field is unknown
+
+        Example:
+            ```python
+            async for doc in query.iter_by_embedding("quantum", limit=500, fields=["id", "title"]):
+                print(doc["title"])
+            ```
+        """
+        validate_fields(fields)
+        doc_ids = await self._embedding_ids(query_text, modality, limit)
+        candidates = [RankedResult(document_id=doc_id, score=0.0) for doc_id in doc_ids]
+        async for item in self._stream_results(candidates, fields, limit, prefetch):
+            yield item
+
+    async def iter_combined(
+        self,
+        query_text: str,
+        entity_type: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+        fields: Optional[Sequence[str]] = None,
+        prefetch: int = 4,
+        page_size: int = 100
+    ) -> AsyncIterator[Union[Document, Dict[str, Any]]]:
+        """Stream fused cross-database results as they are hydrated.
+
+        Streaming variant of combined_search with the same ranking. Results
+        are fused a page at a time: the first ``page_size`` are yielded after
+        one round of backend searches, and each further page searches the
+        backends for a deeper candidate window, yielding the documents not
+        seen yet. Documents that fail to load are skipped and replaced by the
+        next candidate.
+
+        Args:
+            query_text (str): Semantic search query
+            entity_type (Optional[str]): Knowledge graph entity type filter
+            filters (Optional[Dict[str, Any]]): Structured data filters
+            limit (int): Maximum number of results
+            fields (Optional[Sequence[str]]): Projection, see iter_by_embedding.
+                "score" and "sources" expose the fused ranking.
+            prefetch (int): Number of documents loaded ahead of the consumer
+            page_size (int): Results fused per round of backend searches
+
+        Yields:
+            Union[Document, Dict[str, Any]]: Documents, or projections when
+                ``fields`` is given
+
+        Raises:
+            ValueError: If a projection field is unknown
+        """
+        validate_fields(fields)
+        seen, yielded, window = set(), 0, 0
+        while yielded < limit and window < limit:
+            window = min(limit, window + max(1, page_size))
+            fused = await self._fused_candidates(query_text, entity_type, filters, window, 1.0, None)
+            # Until the last page only the top of the window is final; the
+            # last page also keeps the rest as replacements
+            candidates = fused if window == limit else fused[:window]
+            fresh = [result for result in candidates if result.document_id not in seen]
+            seen.update(result.document_id for result in fresh)
+            async for item in self._stream_results(fresh, fields, limit - yielded, prefetch):
+                yielded += 1
+                yield item
+            if len(fused) < window:
+                # The backends have no further candidates
+                return
+
+    async def iter_by_graph(self, page_size: int = 100, **kwargs: Any) -> AsyncIterator[EntitySymbol]:
+        """Stream graph search results a page at a time.
+
+        Args:
+            page_size (int): Entities read per graph query
+            **kwargs: Same arguments as search_by_graph
+
+        Yields:
+            EntitySymbol: Matching entities
+        """
+        limit = kwargs.pop("limit", 10)
+        skip = 0
+        while skip < limit:
+            size = min(page_size, limit - skip)
+            page = await self.search_by_graph(**kwargs, limit=size, skip=skip)
+            for entity in page:
+                yield entity
+            if len(page) < size:
+                return
+            skip += size
+
+    async def iter_structured(
+        self,
+        filters: Dict[str, Any],
+        limit: int = 10,
+        fields: Optional[Sequence[str]] = None,
+        page_size: int = 100
+    ) -> AsyncIterator[Union[Document, Dict[str, Any]]]:
+        """Stream structured search results a page at a time, with optional projection.
+
+        Args:
+            filters (Dict[str, Any]): Field-value pairs to filter on
+            limit (int): Maximum number of results
+            fields (Optional[Sequence[str]]): Projection, see iter_by_embedding
+            page_size (int): Documents read per MySQL query
+
+        Yields:
+            Union[Document, Dict[str, Any]]: Documents, or projections when
+                ``fields`` is given
+        """
+        validate_fields(fields)
+        skip = 0
+        while skip < limit:
+            size = min(page_size, limit - skip)
+            page = await self.search_structured(dict(filters), limit=size, skip=skip)
+            for doc in page:
+                yield doc if fields is None else project_document(doc, fields)
+            if len(page) < size:
+                return
+            skip += size
+
+    async def _stream_results(
+        self,
+        candidates: List[RankedResult],
+        fields: Optional[Sequence[str]],
+        limit: int,
+        prefetch: int
+    ) -> AsyncIterator[Union[Document, Dict[str, Any]]]:
+        """Hydrate candidates with a bounded read-ahead window and yield them in order."""
+        if fields is not None and set(fields) <= ID_ONLY_FIELDS:
+            for result in candidates[:limit]:
+                yield project_document(result.document, fields, result)
+            return
+
+        remaining = iter(candidates)
+        pending = deque()
+
+        def _schedule() -> None:
+            while len(pending) < max(1, prefetch):
+                result = next(remaining, None)
+                if result is None:
+                    return
+                if result.document is not None:
+                    future = asyncio.get_running_loop().create_future()
+                    future.set_result(result.document)
+                else:
+                    future = asyncio.ensure_future(self.mysql_db.get(result.document_id))
+                pending.append((result, future))
+
+        yielded = 0
+        try:
+            _schedule()
+            while pending and yielded < limit:
+                result, future = pending.popleft()
+                document = await future
+                _schedule()
+                if document is None:
+                    continue
+                yielded += 1
+                yield document if fields is None else project_document(document, fields, result)
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    async def _embedding_ids(self, query_text: str, modality: str, limit: int) -> List[UUID]:
+        """Return document ids ranked by vector similarity, using the cache."""
+        async def _search() -> List[UUID]:
+            hits = await self._semantic_hits(query_text, modality, limit)
+            return [hit.document_id for hit in hits]
+
+        if self.cache is None:
+            return await _search()
+        return await self.cache.get_results(
+            normalize_query(kind="embedding", text=query_text, modality=modality, limit=limit),
+            _search
+        )
+
+    async def _fused_candidates(
+        self,
+        query_text: str,
+        entity_type: Optional[str],
+        filters: Optional[Dict[str, Any]],
+        limit: int,
+        overfetch: float,
+        weights: Optional[Mapping[str, float]]
+    ) -> List[RankedResult]:
+        """Run all source searches and return the fused, not yet hydrated order.
+
+        Returned results are fresh copies, so callers may attach documents
+        without touching cached entries.
+        """
+        fusion = self.fusion
+        if weights is not None:
+            fusion = ResultFusion(method=fusion.method, weights=weights, k=fusion.k)
+
+        async def _fuse() -> List[RankedResult]:
+            fetch_limit = source_fetch_limit(limit, overfetch)
+            searches = {"vector": self._semantic_hits(query_text, "text", fetch_limit)}
+            if entity_type:
+                searches["graph"] = self._graph_hits(entity_type, fetch_limit)
+            if filters:
+                searches["structured"] = self._structured_hits(filters, fetch_limit)
+            hit_lists = await asyncio.gather(*searches.values())
+            return fusion.fuse(dict(zip(searches.keys(), hit_lists)))
+
+        if self.cache is None:
+            return await _fuse()
+
+        async def _fuse_ids() -> List[RankedResult]:
+            # Cache ids and scores only; documents are re-read on every hit.
+            return [replace(result, document=None) for result in await _fuse()]
+
+        key = normalize_query(
+            kind="ranked", text=query_text, entity_type=entity_type,
+            filters=filters or {}, limit=limit, overfetch=overfetch,
+            method=fusion.method, weights=dict(fusion.weights)
+        )
+        return [replace(result) for result in await self.cache.get_results(key, _fuse_ids)]
+
+    async def _semantic_hits(self, query_text: str, modality: str, limit: int) -> List[SourceHit]:
+        """Run a vector search and map results to ranked document hits.
+
+        Chroma distances are converted to similarities so that higher is
+        better; results without a distance fall back to their rank.
+        """
+        if self.cache is None:
+            embedding = await self.qwen_client.generate_embeddings(query_text, modality)
+        else:
+            embedding = await self.cache.get_embedding(
+                query_text,
+                modality,
+                lambda: self.qwen_client.generate_embeddings(query_text, modality)
+            )
+        results = await self.vector_db.search({
+            "vector": embedding,
+            "limit": limit
+        })
+        hits = []
+        for rank, result in enumerate(results, start=1):
+            doc_id = result.get('metadata', {}).get('document_id')
+            if not doc_id:
+                continue
+            if result.get('distance') is not None:
+                score = 1.0 / (1.0 + float(result['distance']))
+            else:
+                score = float(result.get('score', 1.0 / rank))
+            hits.append(SourceHit(document_id=UUID(str(doc_id)), score=score))
+        return hits
+
+    async def _graph_hits(self, entity_type: str, limit: int) -> List[SourceHit]:
+        """Rank documents by how many entities of ``entity_type`` they contain."""
+        results = await self.graph_db.search_documents(entity_type, limit=limit)
+        return [SourceHit(document_id=result["document_id"], score=result["score"]) for result in results]
+
+    async def _structured_hits(self, filters: Dict[str, Any], limit: int) -> List[SourceHit]:
+        """Run a structured search; matched documents are already hydrated."""
+        documents = await self.search_structured(dict(filters), limit=limit)
+        return [
+            SourceHit(document_id=doc.id, score=1.0 / rank, payload=doc)
+            for rank, doc in enumerate(documents, start=1)
+        ]
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Report query cache hit ratios and saved latency.
+
+        Returns:
+            Dict[str, Any]: Statistics from QueryCache.stats, or
+                ``{"enabled": False}`` when caching is disabled
+        """
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
@@ -0,0 +1,186 @@
+"""Result fusion and ranking for cross-database queries.
+
+This module implements the ranking stage used by CrossDatabaseQuery to merge
+candidates coming from the vector, graph and relational stores into a single
+ordered list. It supports:
+- Reciprocal Rank Fusion (RRF) over per-source rankings
+- Weighted score fusion over normalized per-source scores
+- Top-k selection so only the fused winners need to be hydrated
+- Per-source rank and score breakdowns for debugging
+
+Example:
+    >>> fusion = ResultFusion(method="rrf")
+    >>> ranked = fusion.fuse({
+    ...     "vector": [SourceHit(doc_id, score=0.92)],
+    ...     "graph": [SourceHit(doc_id, score=8.0)]
+    ... }, limit=10)
+    >>> ranked[0].sources["vector"].rank
+    1
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from uuid import UUID
+
+RRF_K = 60
+
+@dataclass
+class SourceHit:
+    """A single candidate returned by one backend.
+
+    Attributes:
+        document_id (UUID): Identifier of the candidate document
+        score (float): Backend-native relevance score, higher is better
+        payload (Any): Optional backend object (e.g. an already hydrated Document)
+    """
+    document_id: UUID
+    score: float = 1.0
+    payload: Any = None
+
+@dataclass
+class SourceScore:
+    """Contribution of one source to a fused result.
+
+    Attributes:
+        rank (int): 1-based rank of the document within the source
+        score (float): Raw backend score
+        contribution (float): Amount added to the fused score by this source
+    """
+    rank: int
+    score: float
+    contribution: float
+
+@dataclass
+class RankedResult:
+    """A fused result with per-source explanation.
+
+    Attributes:
+        document_id (UUID): Identifier of the ranked document
+        score (float): Final fused score used for ordering
+        sources (Dict[str, SourceScore]): Per-source rank/score breakdown
+        document (Any): Hydrated document, filled in by the caller
+    """
+    document_id: UUID
+    score: float
+    sources: Dict[str, SourceScore] = field(default_factory=dict)
+    document: Any = None
+
+    def explain(self) -> Dict[str, Any]:
+        """Return a JSON-friendly breakdown of how the score was computed.
+
+        Returns:
+            Dict[str, Any]: Fused score and per-source rank/score/contribution
+        """
+        return {
+            "document_id": str(self.document_id),
+            "score": self.score,
+            "sources": {
+                name: {
+                    "rank": source.rank,
+                    "score": source.score,
+                    "contribution": source.contribution
+                }
+                for name, source in self.sources.items()
+            }
+        }
+
+class ResultFusion:
+    """Fuse per-source candidate lists into a single top-k ranking.
+
+    Two methods are supported:
+    - ``rrf``: Reciprocal Rank Fusion, ``sum(weight / (k + rank))``. Only the
+      rank within each source matters, so incomparable scores (cosine
+      distance, relationship strength, exact filter matches) can be mixed.
+    - ``weighted``: min-max normalizes each source's scores to [0, 1] and sums
+      them with per-source weights.
+
+    Args:
+        method (str, optional): "rrf" or "weighted". Defaults to "rrf".
+        weights (Optional[Mapping[str, float]]): Per-source weights, missing
+            sources default to 1.0
+        k (int, optional): RRF damping constant. Defaults to 60.
+
+    Raises:
+        ValueError: If method is not supported
+    """
+
+    METHODS = ("rrf", "weighted")
+
+    def __init__(self, method: str = "rrf",
+                 weights: Optional[Mapping[str, float]] = None,
+                 k: int = RRF_K):
+        """Initialize fusion strategy."""
+        if method not in self.METHODS:
+            raise ValueError(f"Unsupported fusion method: {method}")
+        self.method = method
+        self.weights = dict(weights or {})
+        self.k = k
+
+    def fuse(self, sources: Mapping[str, Sequence[SourceHit]],
+             limit: Optional[int] = None) -> List[RankedResult]:
+        """Fuse candidate lists and return the top results.
+
+        Duplicate document ids within a single source keep their best rank.
+
+        Args:
+            sources (Mapping[str, Sequence[SourceHit]]): Candidates per source,
+                each already ordered best-first
+            limit (Optional[int]): Maximum results to return, None for all
+
+        Returns:
+            List[RankedResult]: Results ordered by fused score, ties broken by
+                the best rank achieved in any source
+        """
+        fused: Dict[UUID, RankedResult] = {}
+        for name, hits in sources.items():
+            weight = self.weights.get(name, 1.0)
+            contributions = self._contributions(hits, weight)
+            seen = set()
+            for rank, (hit, contribution) in enumerate(zip(hits, contributions), start=1):
+                if hit.document_id in seen:
+                    continue
+                seen.add(hit.document_id)
+                result = fused.get(hit.document_id)
+                if result is None:
+                    result = fused[hit.document_id] = RankedResult(document_id=hit.document_id, score=0.0)
+                result.score += contribution
+                result.sources[name] = SourceScore(rank=rank, score=hit.score, contribution=contribution)
+                if result.document is None and hit.payload is not None:
+                    result.document = hit.payload
+
+        ranked = sorted(
+            fused.values(),
+            key=lambda r: (-r.score, min(s.rank for s in r.sources.values()))
+        )
+        return ranked if limit is None else ranked[:limit]
+
+    def _contributions(self, hits: Sequence[SourceHit], weight: float) -> List[float]:
+        """Compute the fused-score contribution of every hit in one source."""
+        if self.method == "rrf":
+            return [weight / (self.k + rank) for rank in range(1, len(hits) + 1)]
+
+        scores = [hit.score for hit in hits]
+        if not scores:
+            return []
+        low, high = min(scores), max(scores)
+        if high == low:
+            return [weight for _ in scores]
+        return [weight * (score - low) / (high - low) for score in scores]
+
+def source_fetch_limit(limit: int, overfetch: float = 1.0) -> int:
+    """Number of candidates each backend must return for a fused top-k.
+
+    Only documents ranked inside a source's top ``limit`` can take a fused
+    top-k slot on the strength of that source alone, so backends are asked
+    for ``limit`` candidates rather than everything they match. ``overfetch``
+    trades extra backend work for better recall of documents that only make
+    the cut by appearing in several sources.
+
+    Args:
+        limit (int): Number of fused results requested
+        overfetch (float, optional): Multiplier applied to limit. Defaults to 1.0.
+
+    Returns:
+        int: Per-source candidate limit, at least 1
+    """
+    return max(1, int(round(limit * overfetch)))
@@ -4,6 +4,10 @@ This module provides MySQL implementations for structured data storage using SQL
 - MySQLInterface: Implements DatabaseInterface for structured data
 - AsyncRelationalDatabase: Specialized interface for documents and entities
 - SQLAlchemy models for data mapping
+- Document fingerprint registry for duplicate detection
+- Per-document chunk manifests for incremental re-processing
+- Bulk ingest jobs and their per-paper progress
+- Per-document workflow stage checkpoints
 
 Features:
 - Async/await support using aiomysql
@@ -30,13 +34,15 @@ from uuid import UUID
 import aiomysql
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy import Column, String, JSON, select
-from sqlalchemy.dialects.mysql import BINARY
+from sqlalchemy import Column, Float, Index, Integer, String, JSON, delete, func, insert, or_, select, update
+from sqlalchemy.dialects.mysql import BIGINT, BINARY
 import asyncio
 
 from .base import DatabaseInterface
+from ..models.batches import EntityBatch
 from ..models.structured import StructuredData
 from ..models.entities import Entity
+from ..utils.fingerprint import DocumentFingerprint, hamming_distance, simhash_bands
 
 Base = declarative_base()
 
@@ -80,6 +86,151 @@ class EntityTable(Base):
     document_id = Column(BINARY(16))
     properties = Column(JSON)
 
+class DocumentFingerprintTable(Base):
+    """SQLAlchemy model for the document fingerprint registry.
+
+    Maps file hashes to the document they were ingested as. The SimHash is
+    also stored split into indexed bands so near-duplicate candidates can be
+    found without scanning the table.
+
+    Attributes:
+        sha256 (str): Hex SHA-256 of the file bytes, primary key
+        document_id (BINARY): UUID of the document stored as 16 bytes
+        simhash (BIGINT): 64-bit SimHash of the normalized text
+        band0-band3 (int): 16-bit SimHash bands
+        size (int): Length of the normalized text
+    """
+    __tablename__ = "document_fingerprints"
+
+    sha256 = Column(String(64), primary_key=True)
+    document_id = Column(BINARY(16), nullable=False, index=True)
+    simhash = Column(BIGINT(unsigned=True), nullable=False)
+    band0 = Column(Integer, nullable=False, index=True)
+    band1 = Column(Integer, nullable=False, index=True)
+    band2 = Column(Integer, nullable=False, index=True)
+    band3 = Column(Integer, nullable=False, index=True)
+    size = Column(Integer)
+
+class DocumentChunkTable(Base):
+    """SQLAlchemy model for per-document chunk manifests.
+
+    One row per distinct chunk of a document, keyed by the chunk's content
+    hash, with the IDs of the results extracted from it so they can be
+    reused when the chunk is unchanged and retracted when it disappears.
+
+    Attributes:
+        document_id (BINARY): UUID of the document stored as 16 bytes
+        content_hash (str): Hex SHA-256 of the normalized chunk text
+        chunk_index (int): Position of the chunk in the latest version
+        entity_ids (JSON): UUID strings of graph entities extracted from
+            the chunk, NULL until extraction finished
+        embedding_id (str): Vector store ID of the chunk embedding, NULL
+            until embedding finished
+    """
+    __tablename__ = "document_chunks"
+
+    document_id = Column(BINARY(16), primary_key=True)
+    content_hash = Column(String(64), primary_key=True)
+    chunk_index = Column(Integer, nullable=False)
+    entity_ids = Column(JSON)
+    embedding_id = Column(String(255))
+
+class IngestJobTable(Base):
+    """SQLAlchemy model for bulk ingest jobs.
+
+    Holds the scheduler's controls (status, window, rate) and its adaptive
+    state, so a job survives worker restarts and can be paused, resumed and
+    throttled while it runs.
+
+    Attributes:
+        job_id (str): UUID string of the job
+        status (str): "running", "paused", "cancelled" or "completed"
+        generation (int): Incremented on resume; ticks of older generations
+            stop, so only one scheduling loop runs per job
+        window (int): Maximum papers in flight
+        rate (float): Maximum admissions per minute, 0 for no limit
+        effective_window (float): Window adapted to downstream queue depth
+        tokens (float): Admission token bucket for the rate limit
+        throughput (float): Smoothed completions per second
+        total (int): Number of papers in the job
+        updated_at (float): Unix time of the last scheduling tick
+    """
+    __tablename__ = "ingest_jobs"
+
+    job_id = Column(String(36), primary_key=True)
+    status = Column(String(16), nullable=False)
+    generation = Column(Integer, nullable=False, default=0)
+    window = Column(Integer, nullable=False)
+    rate = Column(Float, nullable=False, default=0.0)
+    effective_window = Column(Float, nullable=False)
+    tokens = Column(Float, nullable=False, default=0.0)
+    throughput = Column(Float, nullable=False, default=0.0)
+    total = Column(Integer, nullable=False)
+    updated_at = Column(Float, nullable=False)
+
+class IngestItemTable(Base):
+    """SQLAlchemy model for the papers of a bulk ingest job.
+
+    Attributes:
+        job_id (str): UUID string of the job
+        position (int): Order of the paper in the job
+        arxiv_id (str): arXiv identifier
+        state (str): "pending", "submitted", "completed" or "failed"
+        task_id (str): Celery task processing the paper, once submitted
+        submitted_at (float): Unix time the task was submitted
+        error (str): Error message of failed papers
+    """
+    __tablename__ = "ingest_items"
+    __table_args__ = (Index("ix_ingest_items_job_state", "job_id", "state", "position"),)
+
+    job_id = Column(String(36), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    arxiv_id = Column(String(64), nullable=False)
+    state = Column(String(16), nullable=False)
+    task_id = Column(String(36))
+    submitted_at = Column(Float)
+    error = Column(String(1024))
+
+class DocumentStageTable(Base):
+    """SQLAlchemy model for document workflow checkpoints.
+
+    One row per document and workflow stage, so a failed workflow resumes
+    after the last completed stage instead of starting over.
+
+    Attributes:
+        document_key (str): Workflow input the stages belong to (arXiv id)
+        stage (str): Stage name, e.g. "downloaded" or "extracted"
+        status (str): "completed" or "failed"
+        result (JSON): What later stages need from this one, e.g. doc_id
+        attempts (int): Number of times the stage ran
+        error (str): Error message of the last failed attempt
+        updated_at (float): Unix time of the last attempt
+    """
+    __tablename__ = "document_stages"
+
+    document_key = Column(String(255), primary_key=True)
+    stage = Column(String(16), primary_key=True)
+    status = Column(String(16), nullable=False)
+    result = Column(JSON)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(String(1024))
+    updated_at = Column(Float, nullable=False)
+
+# Rows inserted per statement when creating an ingest job
+INGEST_INSERT_BATCH = 1000
+
+_INGEST_JOB_COLUMNS = ("status", "generation", "window", "rate", "effective_window",
+                       "tokens", "throughput", "total", "updated_at")
+
+def _fingerprint_dict(row: DocumentFingerprintTable) -> Dict[str, Any]:
+    """Convert a fingerprint row to the registry's dictionary format."""
+    return {
+        "sha256": row.sha256,
+        "document_id": str(UUID(bytes=row.document_id)),
+        "simhash": row.simhash,
+        "size": row.size
+    }
+
 class MySQLInterface(DatabaseInterface[StructuredData]):
     """MySQL implementation of DatabaseInterface for structured data storage.
 
@@ -328,7 +479,9 @@ class MySQLInterface(DatabaseInterface[StructuredData]):
         """Search structured data using property matching.
 
         Args:
-            query (Dict[str, Any]): Search criteria as property key-value pairs
+            query (Dict[str, Any]): Search criteria as property key-value
+                pairs; "skip" and "limit" select a page of the results,
+                ordered by ID
 
         Returns:
             List[StructuredData]: List of matching records
@@ -358,6 +511,10 @@ class MySQLInterface(DatabaseInterface[StructuredData]):
                 stmt = select(StructuredDataTable)
                 for condition in conditions:
                     stmt = stmt.where(condition)
+                if "skip" in query or "limit" in query:
+                    stmt = stmt.order_by(StructuredDataTable.id).offset(query.get("skip", 0))
+                    if "limit" in query:
+                        stmt = stmt.limit(query["limit"])
 
                 result = await session.execute(stmt)
                 rows = result.scalars().all()
@@ -550,3 +707,412 @@ class AsyncRelationalDatabase:
                 session.add(db_entity)
                 await session.commit()
                 return {"id": str(entity.id)}
+
+    async def create_entities(self, batch: EntityBatch) -> int:
+        """Insert all entities of a batch with one multi-row INSERT.
+
+        Args:
+            batch (EntityBatch): Entities to insert
+
+        Returns:
+            int: Number of entities inserted
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        if not len(batch):
+            return 0
+        async with self._session_factory() as session:
+            async with session.begin():
+                await session.execute(insert(EntityTable), batch.to_mysql_rows())
+                return len(batch)
+
+    async def get_fingerprint(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """Look up a file hash in the fingerprint registry.
+
+        Args:
+            sha256 (str): Hex SHA-256 of the file bytes
+
+        Returns:
+            Optional[Dict[str, Any]]: sha256, document_id, simhash and size,
+                or None if the file hasn't been ingested
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        async with self._session_factory() as session:
+            async with session.begin():
+                row = await session.get(DocumentFingerprintTable, sha256)
+                return _fingerprint_dict(row) if row else None
+
+    async def find_similar_fingerprints(self, simhash: int, max_distance: int) -> List[Dict[str, Any]]:
+        """Find registered documents whose SimHash is within a Hamming distance.
+
+        Candidates are selected by exact band matches, which finds every
+        fingerprint within ``max_distance`` bits as long as it is smaller
+        than the number of bands.
+
+        Args:
+            simhash (int): 64-bit SimHash to compare against
+            max_distance (int): Maximum number of differing bits
+
+        Returns:
+            List[Dict[str, Any]]: Matching registry entries with a "distance"
+                key, closest first
+
+        Raises:
+            ValueError: If max_distance is too large for band lookup
+            SQLAlchemyError: If database operation fails
+        """
+        bands = simhash_bands(simhash)
+        if max_distance >= len(bands):
+            raise ValueError(f"max_distance must be below {len(bands)} for band lookup")
+        columns = [getattr(DocumentFingerprintTable, f"band{i}") for i in range(len(bands))]
+        async with self._session_factory() as session:
+            async with session.begin():
+                stmt = select(DocumentFingerprintTable).where(
+                    or_(*(column == band for column, band in zip(columns, bands)))
+                )
+                rows = (await session.execute(stmt)).scalars().all()
+        matches = []
+        for row in rows:
+            distance = hamming_distance(simhash, row.simhash)
+            if distance <= max_distance:
+                matches.append({**_fingerprint_dict(row), "distance": distance})
+        return sorted(matches, key=lambda match: match["distance"])
+
+    async def store_fingerprint(self, fingerprint: DocumentFingerprint, document_id: str) -> None:
+        """Register a file fingerprint for a document.
+
+        Re-registering a known file hash points it at the given document.
+
+        Args:
+            fingerprint (DocumentFingerprint): File hash and text SimHash
+            document_id (str): UUID string of the document
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        bands = fingerprint.bands
+        async with self._session_factory() as session:
+            async with session.begin():
+                await session.merge(DocumentFingerprintTable(
+                    sha256=fingerprint.sha256,
+                    document_id=UUID(str(document_id)).bytes,
+                    simhash=fingerprint.simhash,
+                    band0=bands[0],
+                    band1=bands[1],
+                    band2=bands[2],
+                    band3=bands[3],
+                    size=fingerprint.size
+                ))
+
+    async def get_chunk_manifest(self, doc_id: str) -> Dict[str, Dict[str, Any]]:
+        """Load the chunk manifest of a document.
+
+        Args:
+            doc_id (str): UUID string of the document
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Rows keyed by content hash, each with
+                content_hash, chunk_index, entity_ids and embedding_id
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        async with self._session_factory() as session:
+            async with session.begin():
+                stmt = select(DocumentChunkTable).where(DocumentChunkTable.document_id == UUID(doc_id).bytes)
+                rows = (await session.execute(stmt)).scalars().all()
+                return {
+                    row.content_hash: {
+                        "content_hash": row.content_hash,
+                        "chunk_index": row.chunk_index,
+                        "entity_ids": row.entity_ids,
+                        "embedding_id": row.embedding_id
+                    }
+                    for row in rows
+                }
+
+    async def store_chunks(self, doc_id: str, chunks: List[Dict[str, Any]]) -> None:
+        """Insert or update manifest rows for a document's chunks.
+
+        Stored result columns are kept unless a chunk dict carries a
+        non-None value for them.
+
+        Args:
+            doc_id (str): UUID string of the document
+            chunks (List[Dict[str, Any]]): Chunks with content_hash and index,
+                optionally entity_ids and embedding_id
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        if not chunks:
+            return
+        document_id = UUID(doc_id).bytes
+        async with self._session_factory() as session:
+            async with session.begin():
+                for chunk in chunks:
+                    row = await session.get(DocumentChunkTable, (document_id, chunk["content_hash"]))
+                    if row is None:
+                        row = DocumentChunkTable(document_id=document_id, content_hash=chunk["content_hash"])
+                        session.add(row)
+                    row.chunk_index = chunk["index"]
+                    for column in ("entity_ids", "embedding_id"):
+                        if chunk.get(column) is not None:
+                            setattr(row, column, chunk[column])
+
+    async def update_chunk_results(self, doc_id: str, column: str, results: Dict[str, Any]) -> None:
+        """Record one kind of result for several chunks.
+
+        Args:
+            doc_id (str): UUID string of the document
+            column (str): "entity_ids" or "embedding_id"
+            results (Dict[str, Any]): Result value per content hash
+
+        Raises:
+            ValueError: If the column is not a result column
+            SQLAlchemyError: If database operation fails
+        """
+        if column not in ("entity_ids", "embedding_id"):
+            raise ValueError(f"Unknown chunk result column '{column}'")
+        document_id = UUID(doc_id).bytes
+        async with self._session_factory() as session:
+            async with session.begin():
+                for content_hash, value in results.items():
+                    await session.execute(
+                        update(DocumentChunkTable)
+                        .where(DocumentChunkTable.document_id == document_id,
+                               DocumentChunkTable.content_hash == content_hash)
+                        .values({column: value})
+                    )
+
+    async def delete_chunks(self, doc_id: str, content_hashes: List[str]) -> int:
+        """Remove manifest rows of chunks that no longer exist.
+
+        Args:
+            doc_id (str): UUID string of the document
+            content_hashes (List[str]): Content hashes to remove
+
+        Returns:
+            int: Number of rows removed
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        if not content_hashes:
+            return 0
+        async with self._session_factory() as session:
+            async with session.begin():
+                result = await session.execute(
+                    delete(DocumentChunkTable).where(
+                        DocumentChunkTable.document_id == UUID(doc_id).bytes,
+                        DocumentChunkTable.content_hash.in_(content_hashes)
+                    )
+                )
+                return result.rowcount
+
+    async def create_ingest_job(self, job_id: str, arxiv_ids: List[str], window: int,
+                                rate: float, now: float) -> None:
+        """Create a running ingest job with all its papers pending.
+
+        Args:
+            job_id (str): UUID string of the job
+            arxiv_ids (List[str]): Papers in admission order
+            window (int): Maximum papers in flight
+            rate (float): Maximum admissions per minute, 0 for no limit
+            now (float): Unix time of creation
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        async with self._session_factory() as session:
+            async with session.begin():
+                session.add(IngestJobTable(
+                    job_id=job_id, status="running", generation=0, window=window, rate=rate,
+                    effective_window=float(window), tokens=0.0, throughput=0.0,
+                    total=len(arxiv_ids), updated_at=now
+                ))
+                await session.flush()
+                for start in range(0, len(arxiv_ids), INGEST_INSERT_BATCH):
+                    await session.execute(insert(IngestItemTable), [
+                        {"job_id": job_id, "position": start + i, "arxiv_id": arxiv_id, "state": "pending"}
+                        for i, arxiv_id in enumerate(arxiv_ids[start:start + INGEST_INSERT_BATCH])
+                    ])
+
+    async def get_ingest_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Load an ingest job with the number of papers in each state.
+
+        Args:
+            job_id (str): UUID string of the job
+
+        Returns:
+            Optional[Dict[str, Any]]: Job columns plus "counts" by state, or
+                None if the job doesn't exist
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        async with self._session_factory() as session:
+            async with session.begin():
+                job = await session.get(IngestJobTable, job_id)
+                if job is None:
+                    return None
+                stmt = (select(IngestItemTable.state, func.count())
+                        .where(IngestItemTable.job_id == job_id)
+                        .group_by(IngestItemTable.state))
+                counts = {state: count for state, count in (await session.execute(stmt)).all()}
+                return {
+                    "job_id": job.job_id,
+                    **{column: getattr(job, column) for column in _INGEST_JOB_COLUMNS},
+                    "counts": counts
+                }
+
+    async def update_ingest_job(self, job_id: str, values: Dict[str, Any]) -> bool:
+        """Update the controls or scheduler state of an ingest job.
+
+        Args:
+            job_id (str): UUID string of the job
+            values (Dict[str, Any]): New column values
+
+        Returns:
+            bool: True if the job exists
+
+        Raises:
+            ValueError: If a key is not a job column
+            SQLAlchemyError: If database operation fails
+        """
+        unknown = set(values) - set(_INGEST_JOB_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown ingest job columns: {sorted(unknown)}")
+        async with self._session_factory() as session:
+            async with session.begin():
+                result = await session.execute(
+                    update(IngestJobTable).where(IngestJobTable.job_id == job_id).values(values)
+                )
+                return result.rowcount > 0
+
+    async def list_ingest_items(self, job_id: str, state: str, limit: int) -> List[Dict[str, Any]]:
+        """List papers of a job in one state, in admission order.
+
+        Args:
+            job_id (str): UUID string of the job
+            state (str): Item state to select
+            limit (int): Maximum number of items
+
+        Returns:
+            List[Dict[str, Any]]: Items with position, arxiv_id, state,
+                task_id, submitted_at and error
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        async with self._session_factory() as session:
+            async with session.begin():
+                stmt = (select(IngestItemTable)
+                        .where(IngestItemTable.job_id == job_id, IngestItemTable.state == state)
+                        .order_by(IngestItemTable.position)
+                        .limit(limit))
+                return [
+                    {"position": row.position, "arxiv_id": row.arxiv_id, "state": row.state,
+                     "task_id": row.task_id, "submitted_at": row.submitted_at, "error": row.error}
+                    for row in (await session.execute(stmt)).scalars().all()
+                ]
+
+    async def update_ingest_items(self, job_id: str, updates: Dict[int, Dict[str, Any]]) -> None:
+        """Record state changes of several papers of a job.
+
+        Args:
+            job_id (str): UUID string of the job
+            updates (Dict[int, Dict[str, Any]]): New state, task_id,
+                submitted_at and/or error per item position
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        async with self._session_factory() as session:
+            async with session.begin():
+                for position, values in updates.items():
+                    await session.execute(
+                        update(IngestItemTable)
+                        .where(IngestItemTable.job_id == job_id, IngestItemTable.position == position)
+                        .values(values)
+                    )
+
+    async def get_stages(self, document_key: str) -> Dict[str, Dict[str, Any]]:
+        """Load the workflow checkpoints of a document.
+
+        Args:
+            document_key (str): Workflow input the stages belong to
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Rows keyed by stage, each with status,
+                result, attempts, error and updated_at
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        async with self._session_factory() as session:
+            async with session.begin():
+                stmt = select(DocumentStageTable).where(DocumentStageTable.document_key == document_key)
+                return {
+                    row.stage: {
+                        "status": row.status,
+                        "result": row.result,
+                        "attempts": row.attempts,
+                        "error": row.error,
+                        "updated_at": row.updated_at
+                    }
+                    for row in (await session.execute(stmt)).scalars().all()
+                }
+
+    async def record_stage(self, document_key: str, stage: str, status: str, now: float,
+                           result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> int:
+        """Record an attempt of a workflow stage.
+
+        Args:
+            document_key (str): Workflow input the stage belongs to
+            stage (str): Stage name
+            status (str): "completed" or "failed"
+            now (float): Unix time of the attempt
+            result (Optional[Dict[str, Any]]): JSON-serializable stage output
+            error (Optional[str]): Error message of a failed attempt
+
+        Returns:
+            int: Number of attempts of the stage so far
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        async with self._session_factory() as session:
+            async with session.begin():
+                row = await session.get(DocumentStageTable, (document_key, stage))
+                if row is None:
+                    row = DocumentStageTable(document_key=document_key, stage=stage, attempts=0)
+                    session.add(row)
+                row.status = status
+                row.result = result
+                row.error = error[:1024] if error else None
+                row.attempts += 1
+                row.updated_at = now
+                return row.attempts
+
+    async def reset_stages(self, document_key: str) -> int:
+        """Forget the workflow checkpoints of a document.
+
+        Args:
+            document_key (str): Workflow input the stages belong to
+
+        Returns:
+            int: Number of rows removed
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        async with self._session_factory() as session:
+            async with session.begin():
+                result = await session.execute(
+                    delete(DocumentStageTable).where(DocumentStageTable.document_key == document_key)
+                )
+                return result.rowcount
@@ -23,8 +23,13 @@ Example:
 """
 
 import asyncio
+import time
 from typing import List, Optional, Dict, Any
+from ..models.batches import EntityBatch, RelationBatch
 from ..models.entities import Entity, Relationship
+from ..utils.fingerprint import DocumentFingerprint
+from ..utils.metrics import observe_db
+from ..utils.tracing import end_span, start_db_span
 
 def run_async(coro):
     """Run an async coroutine in a synchronous context safely.
@@ -44,6 +49,10 @@ def run_async(coro):
         RuntimeError: If event loop creation fails
         Exception: Any exception from coroutine execution
     """
+    qualname = getattr(coro, "__qualname__", "")
+    current = start_db_span(qualname)
+    error = None
+    start = time.perf_counter()
     try:
         # Get current event loop
         try:
@@ -78,7 +87,39 @@ def run_async(coro):
             return loop.run_until_complete(coro)
     except Exception as e:
         print(f"Error in run_async: {str(e)}")
+        error = e
         raise
+    finally:
+        # Database interface coroutines are counted and traced as round-trips
+        observe_db(qualname, time.perf_counter() - start)
+        end_span(current, error)
+
+async def await_db(coro):
+    """Await a database interface coroutine, counted and traced like run_async.
+
+    For async callers, which don't need run_async's event loop handling.
+
+    Args:
+        coro: Async coroutine to await
+
+    Returns:
+        Any: Result of the coroutine
+
+    Raises:
+        Exception: Any exception from the coroutine
+    """
+    qualname = getattr(coro, "__qualname__", "")
+    current = start_db_span(qualname)
+    error = None
+    start = time.perf_counter()
+    try:
+        return await coro
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        observe_db(qualname, time.perf_counter() - start)
+        end_span(current, error)
 
 class GraphDatabase:
     """Synchronous wrapper for Neo4j graph database interface.
@@ -121,17 +162,43 @@ class GraphDatabase:
         )
         run_async(self._async_db.create(entity_symbol))
 
+    def store_entities(self, batch: EntityBatch) -> int:
+        """Store a columnar batch of entities in one transaction.
+
+        Args:
+            batch (EntityBatch): Entities to store
+
+        Returns:
+            int: Number of entities stored
+        """
+        return run_async(self._async_db.create_entities(batch))
+
+    def delete_entities(self, ids: List[str]) -> int:
+        """Delete entities and their relationships by ID.
+
+        Args:
+            ids (List[str]): UUID strings of the entities
+
+        Returns:
+            int: Number of entities deleted
+        """
+        return run_async(self._async_db.delete_entities(ids))
+
     def store_relationship(self, rel: Relationship) -> None:
-        """Store a relationship in the graph database."""
-        from ..models.relations import RelationSymbol
-        rel_symbol = RelationSymbol(
-            source=rel.source,
-            target=rel.target,
-            relation_type="RELATED_TO",
-            descriptions=[rel.relationship],
-            strength=rel.relationship_strength
-        )
-        run_async(self._async_db.create(rel_symbol))
+        """Store a relationship between two stored entities, by name."""
+        self.store_relationships(RelationBatch.from_records([rel]))
+
+    def store_relationships(self, batch: RelationBatch) -> int:
+        """Store a columnar batch of relationships in one transaction.
+
+        Args:
+            batch (RelationBatch): Relationships between stored entities
+
+        Returns:
+            int: Number of relationships stored; ones whose source or target
+            doesn't exist are skipped
+        """
+        return run_async(self._async_db.create_relationships(batch))
 
     def get_entity(self, name: str) -> Optional[Entity]:
         """Get an entity by name."""
@@ -222,9 +289,7 @@ class VectorDatabase:
         run_async(self._async_db.connect())
 
     def store_embedding(self, id: str, embedding: List[float], metadata: Dict[str, Any]) -> None:
-        """Store a vector embedding with metadata.
-
-        Creates an EntitySemantic instance and stores it in the ChromaDB collection.
+        """Store a vector embedding with metadata, replacing one with the same ID.
 
         Args:
             id (str): Unique identifier for the embedding
@@ -236,12 +301,29 @@ class VectorDatabase:
             ValueError: If embedding format is invalid
             Exception: If embedding storage fails
         """
-        from ..models.entities import EntitySemantic
-        semantic = EntitySemantic(
-            name=id,
-            vector_representation=embedding
-        )
-        run_async(self._async_db.create(semantic))
+        run_async(self._async_db.store_embedding(id, embedding, metadata))
+
+    def add_embeddings(self, ids: List[str], embeddings: List[List[float]],
+                       metadatas: List[Dict[str, Any]]) -> int:
+        """Store several embeddings under explicit IDs.
+
+        Args:
+            ids (List[str]): Embedding IDs
+            embeddings (List[List[float]]): Vectors, one per ID
+            metadatas (List[Dict[str, Any]]): Metadata, one per ID
+
+        Returns:
+            int: Number of embeddings stored
+        """
+        return run_async(self._async_db.add_embeddings(ids, embeddings, metadatas))
+
+    def delete_embeddings(self, ids: List[str]) -> None:
+        """Delete embeddings by ID.
+
+        Args:
+            ids (List[str]): Embedding IDs
+        """
+        run_async(self._async_db.delete_embeddings(ids))
 
     def get_embedding(self, id: str) -> Optional[Dict[str, Any]]:
         """Retrieve an embedding by ID.
@@ -400,6 +482,177 @@ class RelationalDatabase:
             doc.data_value.update(data)
             run_async(self._async_db.update(doc_id, doc))
 
+    def get_fingerprint(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """Look up a file hash in the fingerprint registry.
+
+        Args:
+            sha256 (str): Hex SHA-256 of the file bytes
+
+        Returns:
+            Optional[Dict[str, Any]]: Registry entry with document_id, or None
+        """
+        return run_async(self._async_db.get_fingerprint(sha256))
+
+    def find_similar_fingerprints(self, simhash: int, max_distance: int) -> List[Dict[str, Any]]:
+        """Find registered documents with a SimHash within max_distance bits.
+
+        Args:
+            simhash (int): 64-bit SimHash of the normalized text
+            max_distance (int): Maximum Hamming distance
+
+        Returns:
+            List[Dict[str, Any]]: Registry entries with distances, closest first
+        """
+        return run_async(self._async_db.find_similar_fingerprints(simhash, max_distance))
+
+    def store_fingerprint(self, fingerprint: DocumentFingerprint, document_id: str) -> None:
+        """Register a document fingerprint.
+
+        Args:
+            fingerprint (DocumentFingerprint): File hash and text SimHash
+            document_id (str): UUID string of the document
+        """
+        run_async(self._async_db.store_fingerprint(fingerprint, document_id))
+
+    def get_chunk_manifest(self, doc_id: str) -> Dict[str, Dict[str, Any]]:
+        """Load a document's chunk manifest keyed by content hash.
+
+        Args:
+            doc_id (str): Document UUID string
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Manifest rows, empty for new documents
+        """
+        return run_async(self._async_db.get_chunk_manifest(doc_id))
+
+    def store_chunks(self, doc_id: str, chunks: List[Dict[str, Any]]) -> None:
+        """Insert or update a document's manifest rows.
+
+        Args:
+            doc_id (str): Document UUID string
+            chunks (List[Dict[str, Any]]): Chunks with content_hash and index
+        """
+        run_async(self._async_db.store_chunks(doc_id, chunks))
+
+    def update_chunk_results(self, doc_id: str, column: str, results: Dict[str, Any]) -> None:
+        """Record entity_ids or embedding_id results per chunk.
+
+        Args:
+            doc_id (str): Document UUID string
+            column (str): "entity_ids" or "embedding_id"
+            results (Dict[str, Any]): Result value per content hash
+        """
+        run_async(self._async_db.update_chunk_results(doc_id, column, results))
+
+    def delete_chunks(self, doc_id: str, content_hashes: List[str]) -> int:
+        """Remove manifest rows of chunks that no longer exist.
+
+        Args:
+            doc_id (str): Document UUID string
+            content_hashes (List[str]): Content hashes to remove
+
+        Returns:
+            int: Number of rows removed
+        """
+        return run_async(self._async_db.delete_chunks(doc_id, content_hashes))
+
+    def create_ingest_job(self, job_id: str, arxiv_ids: List[str], window: int,
+                          rate: float, now: float) -> None:
+        """Create a running ingest job with all its papers pending.
+
+        Args:
+            job_id (str): UUID string of the job
+            arxiv_ids (List[str]): Papers in admission order
+            window (int): Maximum papers in flight
+            rate (float): Maximum admissions per minute, 0 for no limit
+            now (float): Unix time of creation
+        """
+        run_async(self._async_db.create_ingest_job(job_id, arxiv_ids, window, rate, now))
+
+    def get_ingest_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Load an ingest job with the number of papers in each state.
+
+        Args:
+            job_id (str): UUID string of the job
+
+        Returns:
+            Optional[Dict[str, Any]]: Job with "counts", or None
+        """
+        return run_async(self._async_db.get_ingest_job(job_id))
+
+    def update_ingest_job(self, job_id: str, values: Dict[str, Any]) -> bool:
+        """Update the controls or scheduler state of an ingest job.
+
+        Args:
+            job_id (str): UUID string of the job
+            values (Dict[str, Any]): New column values
+
+        Returns:
+            bool: True if the job exists
+        """
+        return run_async(self._async_db.update_ingest_job(job_id, values))
+
+    def list_ingest_items(self, job_id: str, state: str, limit: int) -> List[Dict[str, Any]]:
+        """List papers of a job in one state, in admission order.
+
+        Args:
+            job_id (str): UUID string of the job
+            state (str): Item state to select
+            limit (int): Maximum number of items
+
+        Returns:
+            List[Dict[str, Any]]: Items with position, arxiv_id and task_id
+        """
+        return run_async(self._async_db.list_ingest_items(job_id, state, limit))
+
+    def update_ingest_items(self, job_id: str, updates: Dict[int, Dict[str, Any]]) -> None:
+        """Record state changes of several papers of a job.
+
+        Args:
+            job_id (str): UUID string of the job
+            updates (Dict[int, Dict[str, Any]]): New values per item position
+        """
+        run_async(self._async_db.update_ingest_items(job_id, updates))
+
+    def get_stages(self, document_key: str) -> Dict[str, Dict[str, Any]]:
+        """Load the workflow checkpoints of a document.
+
+        Args:
+            document_key (str): Workflow input the stages belong to
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Checkpoint rows keyed by stage
+        """
+        return run_async(self._async_db.get_stages(document_key))
+
+    def record_stage(self, document_key: str, stage: str, status: str, now: float,
+                     result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> int:
+        """Record an attempt of a workflow stage.
+
+        Args:
+            document_key (str): Workflow input the stage belongs to
+            stage (str): Stage name
+            status (str): "completed" or "failed"
+            now (float): Unix time of the attempt
+            result (Optional[Dict[str, Any]]): JSON-serializable stage output
+            error (Optional[str]): Error message of a failed attempt
+
+        Returns:
+            int: Number of attempts of the stage so far
+        """
+        return run_async(self._async_db.record_stage(document_key, stage, status, now, result, error))
+
+    def reset_stages(self, document_key: str) -> int:
+        """Forget the workflow checkpoints of a document.
+
+        Args:
+            document_key (str): Workflow input the stages belong to
+
+        Returns:
+            int: Number of rows removed
+        """
+        return run_async(self._async_db.reset_stages(document_key))
+
     def list_documents(self) -> List[Dict[str, Any]]:
         """List all documents in the database.
 
@@ -32,6 +32,7 @@ from chromadb.config import Settings
 import numpy as np
 
 from .base import DatabaseInterface
+from ..models.batches import EntityBatch
 from ..models.entities import EntitySemantic
 from ..models.structured import StructuredData
 
@@ -175,7 +176,7 @@ class ChromaInterface(DatabaseInterface[EntitySemantic]):
         """
         async def _update():
             try:
-                vector = np.array(item.vector_representation).tolist()
+                vector = item.vector_representation.tolist()
                 self._collection.update(
                     ids=[str(id)],
                     embeddings=[vector],
@@ -232,7 +233,7 @@ class ChromaInterface(DatabaseInterface[EntitySemantic]):
                 EntitySemantic(
                     semantic_id=UUID(id),
                     name=metadata["name"],
-                    vector_representation=np.array(embedding)
+                    vector_representation=embedding
                 )
                 for id, metadata, embedding in zip(
                     result["ids"],
@@ -242,8 +243,8 @@ class ChromaInterface(DatabaseInterface[EntitySemantic]):
             ]
         return await asyncio.to_thread(_list)
 
-    async def search(self, query: Dict[str, Any]) -> List[EntitySemantic]:
-        """Search semantic entities by vector similarity.
+    async def search(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Search stored embeddings by vector similarity.
 
         Args:
             query (Dict[str, Any]): Search parameters including:
@@ -251,38 +252,35 @@ class ChromaInterface(DatabaseInterface[EntitySemantic]):
                 - limit: Maximum number of results (default: 10)
 
         Returns:
-            List[EntitySemantic]: List of similar entities by vector distance
+            List[Dict[str, Any]]: Closest embeddings first, each with id,
+                metadata and distance
 
         Raises:
             ConnectionError: If not connected to ChromaDB
             ValueError: If query vector is invalid
             Exception: For other search errors
         """
-        async def _search():
-            if "vector" not in query:
-                return []
-            vector = np.array(query["vector"]).tolist()
-            result = self._collection.query(
-                query_embeddings=[vector],
-                n_results=query.get("limit", 10),
-                include=["embeddings", "metadatas"]
+        if "vector" not in query:
+            return []
+        if not self._collection:
+            await self.connect()
+        result = await asyncio.to_thread(
+            self._collection.query,
+            query_embeddings=[np.asarray(query["vector"], dtype=np.float64).tolist()],
+            n_results=query.get("limit", 10),
+            include=["metadatas", "distances"]
+        )
+        return [
+            {"id": id, "metadata": metadata or {}, "distance": distance}
+            for id, metadata, distance in zip(
+                result["ids"][0],
+                result["metadatas"][0],
+                result["distances"][0]
             )
-            return [
-                EntitySemantic(
-                    semantic_id=UUID(id),
-                    name=metadata["name"],
-                    vector_representation=np.array(embedding)
-                )
-                for id, metadata, embedding in zip(
-                    result["ids"],
-                    result["metadatas"],
-                    result["embeddings"]
-                )
-            ]
-        return await asyncio.to_thread(_search)
+        ]
 
     async def store_embedding(self, id: str, embedding: List[float], metadata: Dict[str, Any]) -> None:
-        """Store vector embedding with metadata.
+        """Store vector embedding with metadata, replacing one with the same ID.
 
         Args:
             id (str): Unique identifier for embedding
@@ -294,15 +292,82 @@ class ChromaInterface(DatabaseInterface[EntitySemantic]):
             ValueError: If embedding format is invalid
             Exception: For other storage errors
         """
-        async def _store():
-            if not self._collection:
-                await self.connect()
-            self._collection.add(
-                ids=[id],
-                embeddings=[embedding],
-                metadatas=[metadata]
-            )
-        await asyncio.to_thread(_store)
+        if not self._collection:
+            await self.connect()
+        # Upsert so a retried task overwrites instead of duplicating
+        await asyncio.to_thread(
+            self._collection.upsert,
+            ids=[id],
+            embeddings=[embedding],
+            metadatas=[metadata]
+        )
+
+    async def store_embeddings(self, batch: EntityBatch, embeddings: Any) -> int:
+        """Store one embedding per entity of a batch in a single add call.
+
+        Args:
+            batch (EntityBatch): Entities the embeddings belong to
+            embeddings (Any): ``(n, dim)`` array or list of vectors
+
+        Returns:
+            int: Number of embeddings stored
+
+        Raises:
+            ConnectionError: If not connected to ChromaDB
+            ValueError: If embeddings don't match the batch
+        """
+        if not len(batch):
+            return 0
+        params = batch.to_chroma_add(embeddings)
+        if not self._collection:
+            await self.connect()
+        await asyncio.to_thread(self._collection.add, **params)
+        return len(batch)
+
+    async def add_embeddings(self, ids: List[str], embeddings: Any,
+                             metadatas: List[Dict[str, Any]]) -> int:
+        """Store several embeddings under explicit IDs in a single upsert call.
+
+        Args:
+            ids (List[str]): Embedding IDs
+            embeddings (Any): ``(n, dim)`` array or list of vectors
+            metadatas (List[Dict[str, Any]]): Metadata per embedding
+
+        Returns:
+            int: Number of embeddings stored
+
+        Raises:
+            ConnectionError: If not connected to ChromaDB
+            ValueError: If the argument lengths differ
+        """
+        if not ids:
+            return 0
+        if not len(ids) == len(embeddings) == len(metadatas):
+            raise ValueError("ids, embeddings and metadatas must have the same length")
+        if not self._collection:
+            await self.connect()
+        await asyncio.to_thread(
+            self._collection.upsert,
+            ids=list(ids),
+            embeddings=[[float(x) for x in embedding] for embedding in embeddings],
+            metadatas=list(metadatas)
+        )
+        return len(ids)
+
+    async def delete_embeddings(self, ids: List[str]) -> None:
+        """Delete embeddings by ID in a single call.
+
+        Args:
+            ids (List[str]): Embedding IDs
+
+        Raises:
+            ConnectionError: If not connected to ChromaDB
+        """
+        if not ids:
+            return
+        if not self._collection:
+            await self.connect()
+        await asyncio.to_thread(self._collection.delete, ids=list(ids))
 
     async def search_similar(self, embedding: List[float], limit: int = 10) -> List[Dict[str, Any]]:
         """Search for similar embeddings by vector distance.
@@ -1,9 +1,23 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-import psycopg
-from .routers import tasks
+from .config import settings
+from .routers import tasks, search, monitoring
+from .utils import metrics
+from .utils.tracing import setup_tracing
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Poll worker state in the background while the API is up."""
+    from .utils.monitoring import get_monitor
+    if settings.MONITOR_ENABLED:
+        get_monitor().start()
+    yield
+    get_monitor().stop()
+
+app = FastAPI(lifespan=lifespan)
+setup_tracing("ananke2-api", app)
 
 # Disable CORS. Do not remove this for full-stack development.
 app.add_middleware(
@@ -16,7 +30,27 @@ app.add_middleware(
 
 # Include task management router
 app.include_router(tasks.router, prefix="/api/v1")
+app.include_router(search.router, prefix="/api/v1/search")
+app.include_router(monitoring.router, prefix="/api/v1/monitoring")
 
 @app.get("/healthz")
 async def healthz():
     return {"status": "ok"}
+
+def _scrape() -> bytes:
+    if settings.METRICS_QUEUE_DEPTHS:
+        from .tasks.ingest import queue_depths
+        from .tasks.queues import TASK_QUEUES
+        metrics.update_queue_depths(queue_depths([queue.name for queue in TASK_QUEUES]))
+    body, _ = metrics.render()
+    return body
+
+@app.get("/metrics")
+async def prometheus_metrics() -> Response:
+    """Expose metrics in the Prometheus text format.
+
+    Broker queue depths are read at scrape time; worker metrics arrive
+    through the Pushgateway (see utils.metrics).
+    """
+    body = await asyncio.to_thread(_scrape)
+    return Response(content=body, media_type=metrics.CONTENT_TYPE_LATEST)
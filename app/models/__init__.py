@@ -1,4 +1,7 @@
 from .base import BaseObject
+from .vector import Vector
+from .serialization import ColumnBuffer, dumps
+from .batches import EntityBatch, RelationBatch, TripleBatch
 from .types import SemanticBase, SymbolBase, StructuredDataBase
 from .expressions import LogicExpression, MathExpression
 from .entities import EntitySemantic, EntitySymbol
@@ -13,6 +16,12 @@ from .structured import (
 
 __all__ = [
     'BaseObject',
+    'Vector',
+    'ColumnBuffer',
+    'dumps',
+    'EntityBatch',
+    'RelationBatch',
+    'TripleBatch',
     'SemanticBase',
     'SymbolBase',
     'EntitySemantic',
@@ -28,25 +37,3 @@ __all__ = [
     'StructuredChunk',
     'Document'
 ]
-
-# Rebuild base models first
-BaseObject.model_rebuild()
-SemanticBase.model_rebuild()
-SymbolBase.model_rebuild()
-StructuredDataBase.model_rebuild()
-
-# Then rebuild semantic models
-EntitySemantic.model_rebuild()
-RelationSemantic.model_rebuild()
-TripleSemantic.model_rebuild()
-
-# Then rebuild symbol models
-EntitySymbol.model_rebuild()
-RelationSymbol.model_rebuild()
-TripleSymbol.model_rebuild()
-
-# Finally rebuild structured models
-StructuredData.model_rebuild()
-StructuredSentence.model_rebuild()
-StructuredChunk.model_rebuild()
-Document.model_rebuild()
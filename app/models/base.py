@@ -1,6 +1,7 @@
 from uuid import UUID
-from pydantic import BaseModel
-from typing import Dict, Any
+from pydantic import BaseModel, ConfigDict
+from typing import Dict, Any, Optional
+from .serialization import ColumnBuffer, dumps, emit, get_field_plan, orjson
 
 class BaseObject(BaseModel):
     """Base class for all objects in the knowledge graph.
@@ -11,7 +12,9 @@ class BaseObject(BaseModel):
 
     The class handles:
     - UUID field serialization to strings
-    - Conversion to database-specific formats (Neo4j, MySQL, ChromaDB)
+    - Conversion to database-specific formats (Neo4j, MySQL, ChromaDB),
+      optionally appended to a ColumnBuffer for bulk writes
+    - Byte output (JSON or msgpack) for transport and caching
     - Common data validation through Pydantic
 
     Example:
@@ -26,13 +29,21 @@ class BaseObject(BaseModel):
         mysql_data = entity.to_mysql()
         chroma_data = entity.to_chroma()
         ```
+
+    Validators and serializers are built on first use (``defer_build``)
+    rather than at import, so processes that import the models but never
+    instantiate some of them don't pay for their schemas.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     def model_dump(self, **kwargs) -> Dict[str, Any]:
         """Convert model to dictionary with UUID string conversion.
 
         Extends Pydantic's model_dump to ensure UUID fields are properly
-        serialized as strings for database compatibility.
+        serialized as strings for database compatibility. Only the fields
+        that can hold a UUID (from the class's cached field plan) are
+        checked, and JSON-mode dumps are returned as-is.
 
         Args:
             **kwargs: Additional arguments passed to Pydantic's model_dump
@@ -47,53 +58,90 @@ class BaseObject(BaseModel):
             assert isinstance(data["id"], str)  # UUID converted to string
             ```
         """
-        data = super().model_dump(**kwargs)
-        for key, value in data.items():
+        if kwargs:
+            data = super().model_dump(**kwargs)
+        else:
+            data = self.__pydantic_serializer__.to_python(self)
+        if kwargs.get("mode") == "json":
+            return data
+        for key in get_field_plan(type(self)).uuid_fields:
+            value = data.get(key)
             if isinstance(value, UUID):
                 data[key] = str(value)
         return data
 
-    def to_neo4j(self) -> Dict[str, Any]:
+    def model_dump_bytes(self, format: str = "json") -> bytes:
+        """Serialize the model to bytes.
+
+        JSON output goes through orjson when it is installed, which encodes
+        vectors as numpy arrays several times faster than Pydantic, and
+        through Pydantic's compiled serializer otherwise. msgpack output
+        requires the optional msgpack package.
+
+        Args:
+            format (str, optional): "json" or "msgpack". Defaults to "json".
+
+        Returns:
+            bytes: Encoded model
+
+        Raises:
+            ValueError: If the format is unknown
+            ImportError: If msgpack is requested but not installed
+        """
+        if format == "json" and orjson is None:
+            return self.__pydantic_serializer__.to_json(self)
+        return dumps(self.__pydantic_serializer__.to_python(self), format)
+
+    def to_neo4j(self, buffer: Optional[ColumnBuffer] = None) -> Dict[str, Any]:
         """Convert the object to a Neo4j compatible format.
 
         Serializes the object for Neo4j graph database storage.
         Currently uses the base model_dump implementation, but can be
         overridden by subclasses for custom Neo4j formatting.
 
+        Args:
+            buffer (Optional[ColumnBuffer]): Batch buffer to append the row to
+
         Returns:
             Dict[str, Any]: Neo4j-compatible dictionary representation
 
         Raises:
             ValueError: If object contains data types incompatible with Neo4j
         """
-        return self.model_dump()
+        return emit(self.model_dump(), buffer)
 
-    def to_mysql(self) -> Dict[str, Any]:
+    def to_mysql(self, buffer: Optional[ColumnBuffer] = None) -> Dict[str, Any]:
         """Convert the object to a MySQL compatible format.
 
         Serializes the object for MySQL relational database storage.
         Currently uses the base model_dump implementation, but can be
         overridden by subclasses for custom MySQL formatting.
 
+        Args:
+            buffer (Optional[ColumnBuffer]): Batch buffer to append the row to
+
         Returns:
             Dict[str, Any]: MySQL-compatible dictionary representation
 
         Raises:
             ValueError: If object contains data types incompatible with MySQL
         """
-        return self.model_dump()
+        return emit(self.model_dump(), buffer)
 
-    def to_chroma(self) -> Dict[str, Any]:
+    def to_chroma(self, buffer: Optional[ColumnBuffer] = None) -> Dict[str, Any]:
         """Convert the object to a ChromaDB compatible format.
 
         Serializes the object for ChromaDB vector database storage.
         Currently uses the base model_dump implementation, but can be
         overridden by subclasses for custom ChromaDB formatting.
 
+        Args:
+            buffer (Optional[ColumnBuffer]): Batch buffer to append the row to
+
         Returns:
             Dict[str, Any]: ChromaDB-compatible dictionary representation
 
         Raises:
             ValueError: If object contains data types incompatible with ChromaDB
         """
-        return self.model_dump()
+        return emit(self.model_dump(), buffer)
@@ -0,0 +1,487 @@
+"""Columnar batch containers for bulk knowledge graph ingestion.
+
+Extraction produces thousands of entities and relationships per document.
+Building one Pydantic model per row and dumping it again for every database
+dominates ingest CPU time, so bulk paths use struct-of-arrays batches instead:
+- Each attribute is one column (a list of strings or a numpy array)
+- UUIDs are generated and stored as a single ``(n, 16)`` uint8 array
+- Validation runs once per column instead of once per row
+- Conversion targets are shaped for bulk writes: parallel lists for Neo4j
+  ``UNWIND``, row dicts for a MySQL multi-row ``INSERT`` and keyword
+  arguments for ``Collection.add`` in Chroma
+
+Batches are Arrow-compatible: ``to_arrow()`` returns a ``pyarrow.Table`` when
+pyarrow is installed.
+
+Example:
+    ```python
+    entities = await client.extract_entities(text)
+    batch = EntityBatch.from_records(entities)
+    await graph_db.create_entities(batch)
+    await vector_db.store_embeddings(batch, embeddings)
+    ```
+"""
+
+import os
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+from uuid import UUID, uuid5
+
+import numpy as np
+
+ID_WIDTH = 16
+MAX_LABEL_LENGTH = 255
+
+def new_ids(count: int) -> np.ndarray:
+    """Generate random version 4 UUIDs as a ``(count, 16)`` uint8 array.
+
+    Args:
+        count (int): Number of ids to generate
+
+    Returns:
+        np.ndarray: One UUID per row, in the same byte order as ``UUID.bytes``
+    """
+    ids = np.frombuffer(os.urandom(ID_WIDTH * count), dtype=np.uint8).reshape(count, ID_WIDTH).copy()
+    ids[:, 6] = (ids[:, 6] & 0x0F) | 0x40
+    ids[:, 8] = (ids[:, 8] & 0x3F) | 0x80
+    return ids
+
+def stable_ids(document_id: UUID, key: str, count: int) -> List[UUID]:
+    """Generate ids that are the same every time a document part is processed.
+
+    Version 5 UUIDs of ``key`` and each row's ordinal in the document's
+    namespace. Rows written under them are merged on retry instead of being
+    duplicated.
+
+    Args:
+        document_id (UUID): Document the rows belong to
+        key (str): Part of the document, e.g. a chunk's content hash
+        count (int): Number of ids
+
+    Returns:
+        List[UUID]: One id per ordinal
+    """
+    return [uuid5(document_id, f"{key}:{i}") for i in range(count)]
+
+def _id_array(values: Optional[Any], count: int, column: str) -> np.ndarray:
+    """Coerce ids (UUIDs, strings, bytes or an array) to a ``(count, 16)`` array."""
+    if values is None:
+        return new_ids(count)
+    if isinstance(values, np.ndarray):
+        ids = np.ascontiguousarray(values, dtype=np.uint8)
+    else:
+        try:
+            raw = b"".join(
+                v if isinstance(v, bytes) else (v if isinstance(v, UUID) else UUID(str(v))).bytes
+                for v in values
+            )
+        except ValueError as e:
+            raise ValueError(f"Invalid UUID in column '{column}': {str(e)}")
+        ids = np.frombuffer(raw, dtype=np.uint8)
+    if ids.size != count * ID_WIDTH:
+        raise ValueError(f"Column '{column}' must contain {count} 16-byte ids")
+    return ids.reshape(count, ID_WIDTH)
+
+def _id_bytes(ids: np.ndarray) -> List[bytes]:
+    """Split an id array into per-row ``bytes`` (as stored by Neo4j and MySQL)."""
+    raw = ids.tobytes()
+    return [raw[i:i + ID_WIDTH] for i in range(0, len(raw), ID_WIDTH)]
+
+def _id_strings(ids: np.ndarray) -> List[str]:
+    """Format an id array as canonical UUID strings."""
+    raw = ids.tobytes().hex()
+    return [
+        f"{raw[i:i + 8]}-{raw[i + 8:i + 12]}-{raw[i + 12:i + 16]}-{raw[i + 16:i + 20]}-{raw[i + 20:i + 32]}"
+        for i in range(0, len(raw), 2 * ID_WIDTH)
+    ]
+
+def _invalid_rows(mask: np.ndarray, limit: int = 5) -> str:
+    rows = np.flatnonzero(mask)
+    shown = ", ".join(str(i) for i in rows[:limit])
+    return f"{shown}, ... ({len(rows)} rows)" if len(rows) > limit else shown
+
+def _string_column(values: Iterable[Any], count: int, column: str,
+                   allow_empty: bool = False, max_length: Optional[int] = None) -> List[str]:
+    """Validate a column of strings in bulk.
+
+    Type, emptiness and length checks are done with one C-level pass each
+    rather than one Python-level check per row.
+
+    Raises:
+        ValueError: If the column has the wrong length or invalid rows
+    """
+    column_values = values if isinstance(values, list) else list(values)
+    if len(column_values) != count:
+        raise ValueError(f"Column '{column}' has {len(column_values)} rows, expected {count}")
+    if not set(map(type, column_values)) <= {str}:
+        mask = np.fromiter((not isinstance(v, str) for v in column_values), dtype=bool, count=count)
+        raise ValueError(f"Column '{column}' must contain strings (rows {_invalid_rows(mask)})")
+    lengths = np.fromiter(map(len, column_values), dtype=np.int64, count=count)
+    if not allow_empty and count and not lengths.all():
+        raise ValueError(f"Column '{column}' must not be empty (rows {_invalid_rows(lengths == 0)})")
+    if max_length is not None and count and lengths.max() > max_length:
+        raise ValueError(
+            f"Column '{column}' exceeds {max_length} characters "
+            f"(rows {_invalid_rows(lengths > max_length)})"
+        )
+    return column_values
+
+def _records_column(records: Sequence[Any], field: str, default: Any = None) -> List[Any]:
+    """Pull one field out of every record (mappings or attribute objects)."""
+    if records and isinstance(records[0], Mapping):
+        if default is None:
+            try:
+                return list(map(itemgetter(field), records))
+            except KeyError:
+                raise ValueError(f"Records are missing required field '{field}'")
+        return [record.get(field, default) for record in records]
+    if default is None:
+        try:
+            return [getattr(record, field) for record in records]
+        except AttributeError:
+            raise ValueError(f"Records are missing required field '{field}'")
+    return [getattr(record, field, default) for record in records]
+
+class _ColumnarBatch:
+    """Shared behaviour of the columnar batches.
+
+    Subclasses list their columns in ``_columns``; every column is either a
+    list or a numpy array with one entry per row.
+    """
+
+    _columns: Sequence[str] = ()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: slice) -> "_ColumnarBatch":
+        """Return the rows in ``index`` as a new batch sharing numpy buffers."""
+        if not isinstance(index, slice):
+            raise TypeError(f"{type(self).__name__} only supports slicing")
+        batch = object.__new__(type(self))
+        for name in self._columns:
+            setattr(batch, name, getattr(self, name)[index])
+        batch.document_id = self.document_id
+        return batch
+
+    def chunks(self, size: int) -> Iterator["_ColumnarBatch"]:
+        """Split the batch into consecutive slices of at most ``size`` rows.
+
+        Args:
+            size (int): Maximum rows per chunk
+
+        Yields:
+            Batches of the same type sharing this batch's buffers
+        """
+        for start in range(0, len(self), size):
+            yield self[start:start + size]
+
+    def id_strings(self) -> List[str]:
+        """Return row ids as canonical UUID strings."""
+        return _id_strings(self.ids)
+
+    def to_arrow(self):
+        """Convert the batch to a ``pyarrow.Table``.
+
+        UUID columns become ``fixed_size_binary(16)``; other columns keep
+        their element types.
+
+        Returns:
+            pyarrow.Table: One column per batch column
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is required for to_arrow(); install it with 'pip install pyarrow'")
+        columns = {}
+        for name in self._columns:
+            values = getattr(self, name)
+            if isinstance(values, np.ndarray) and values.ndim == 2:
+                columns[name] = pa.array(_id_bytes(values), type=pa.binary(ID_WIDTH))
+            else:
+                columns[name] = pa.array(values)
+        return pa.table(columns)
+
+class EntityBatch(_ColumnarBatch):
+    """Struct-of-arrays container for knowledge graph entities.
+
+    Args:
+        names (Sequence[str]): Entity names
+        types (Sequence[str]): Entity types
+        descriptions (Optional[Sequence[str]]): Entity descriptions.
+            Defaults to empty strings.
+        ids (Optional[Any]): UUIDs, UUID strings, 16-byte values or a
+            ``(n, 16)`` uint8 array. New UUIDs are generated if omitted.
+        document_id (Optional[UUID]): Source document of every entity
+
+    Attributes:
+        ids (np.ndarray): ``(n, 16)`` uint8 UUID bytes
+        names (List[str]): Entity names
+        types (List[str]): Entity types
+        descriptions (List[str]): Entity descriptions
+        document_id (Optional[UUID]): Source document
+
+    Raises:
+        ValueError: If any column is invalid; the message lists the rows
+
+    Example:
+        ```python
+        batch = EntityBatch.from_records([
+            {"name": "Neural Network", "type": "CONCEPT", "description": "..."}
+        ])
+        params = batch.to_neo4j_params()
+        ```
+    """
+
+    _columns = ("ids", "names", "types", "descriptions")
+
+    def __init__(self, names: Sequence[str], types: Sequence[str],
+                 descriptions: Optional[Sequence[str]] = None,
+                 ids: Optional[Any] = None, document_id: Optional[UUID] = None):
+        """Validate columns and build the batch."""
+        self.names = _string_column(names, len(names), "names", max_length=MAX_LABEL_LENGTH)
+        count = len(self.names)
+        self.types = _string_column(types, count, "types", max_length=MAX_LABEL_LENGTH)
+        self.descriptions = _string_column(
+            descriptions if descriptions is not None else [""] * count,
+            count, "descriptions", allow_empty=True
+        )
+        self.ids = _id_array(ids, count, "ids")
+        self.document_id = document_id
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any], document_id: Optional[UUID] = None,
+                     ids: Optional[Any] = None) -> "EntityBatch":
+        """Build a batch from extraction output.
+
+        Args:
+            records (Iterable[Any]): Dicts with ``name``, ``type`` and
+                ``description`` keys (as returned by QwenClient), or
+                ``Entity`` instances
+            document_id (Optional[UUID]): Source document of every entity
+            ids (Optional[Any]): Entity UUIDs, generated if omitted
+
+        Returns:
+            EntityBatch: Validated batch
+        """
+        records = list(records)
+        return cls(
+            names=_records_column(records, "name"),
+            types=_records_column(records, "type"),
+            descriptions=_records_column(records, "description", ""),
+            ids=ids,
+            document_id=document_id
+        )
+
+    def to_neo4j_params(self) -> Dict[str, Any]:
+        """Build parallel-list parameters for an ``UNWIND`` create.
+
+        Returns:
+            Dict[str, Any]: ``ids``, ``names``, ``entity_types`` and
+                ``descriptions`` lists, indexed together by ``UNWIND range``
+        """
+        return {
+            "ids": _id_bytes(self.ids),
+            "names": self.names,
+            "entity_types": self.types,
+            "descriptions": self.descriptions
+        }
+
+    def to_mysql_rows(self) -> List[Dict[str, Any]]:
+        """Build rows for a multi-row insert into the ``entities`` table.
+
+        Returns:
+            List[Dict[str, Any]]: One dict per row, keyed by EntityTable column
+        """
+        document_id = self.document_id.bytes if self.document_id else None
+        return [
+            {
+                "id": id,
+                "name": name,
+                "type": type,
+                "description": description,
+                "document_id": document_id,
+                "properties": {}
+            }
+            for id, name, type, description in zip(
+                _id_bytes(self.ids), self.names, self.types, self.descriptions
+            )
+        ]
+
+    def to_chroma_add(self, embeddings: Any) -> Dict[str, Any]:
+        """Build keyword arguments for ``Collection.add``.
+
+        Args:
+            embeddings (Any): ``(n, dim)`` array or list of vectors, one per row
+
+        Returns:
+            Dict[str, Any]: ``ids``, ``embeddings``, ``metadatas`` and
+                ``documents`` for Chroma
+
+        Raises:
+            ValueError: If embeddings don't have one vector per row
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[0] != len(self):
+            raise ValueError(f"Expected {len(self)} embeddings, got array of shape {vectors.shape}")
+        document_id = str(self.document_id) if self.document_id else ""
+        return {
+            "ids": self.id_strings(),
+            "embeddings": vectors.tolist(),
+            "metadatas": [
+                {"name": name, "type": type, "document_id": document_id}
+                for name, type in zip(self.names, self.types)
+            ],
+            "documents": self.descriptions
+        }
+
+class RelationBatch(_ColumnarBatch):
+    """Struct-of-arrays container for relationships between named entities.
+
+    Args:
+        sources (Sequence[str]): Source entity names
+        targets (Sequence[str]): Target entity names
+        relationships (Sequence[str]): Relationship descriptions
+        strengths (Sequence[int]): Relationship strengths
+        ids (Optional[Any]): Relationship UUIDs, generated if omitted
+        document_id (Optional[UUID]): Source document of every relationship
+
+    Attributes:
+        ids (np.ndarray): ``(n, 16)`` uint8 UUID bytes
+        sources (List[str]): Source entity names
+        targets (List[str]): Target entity names
+        relationships (List[str]): Relationship descriptions
+        strengths (np.ndarray): int64 relationship strengths
+        document_id (Optional[UUID]): Source document
+
+    Raises:
+        ValueError: If any column is invalid; the message lists the rows
+    """
+
+    _columns = ("ids", "sources", "targets", "relationships", "strengths")
+
+    def __init__(self, sources: Sequence[str], targets: Sequence[str],
+                 relationships: Sequence[str], strengths: Sequence[int],
+                 ids: Optional[Any] = None, document_id: Optional[UUID] = None):
+        """Validate columns and build the batch."""
+        self.sources = _string_column(sources, len(sources), "sources")
+        count = len(self.sources)
+        self.targets = _string_column(targets, count, "targets")
+        self.relationships = _string_column(relationships, count, "relationships", allow_empty=True)
+        try:
+            self.strengths = np.asarray(strengths).astype(np.int64, casting="unsafe")
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Column 'strengths' must contain integers: {str(e)}")
+        if self.strengths.shape != (count,):
+            raise ValueError(f"Column 'strengths' has shape {self.strengths.shape}, expected ({count},)")
+        self.ids = _id_array(ids, count, "ids")
+        self.document_id = document_id
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any], document_id: Optional[UUID] = None,
+                     ids: Optional[Any] = None) -> "RelationBatch":
+        """Build a batch from extraction output.
+
+        Args:
+            records (Iterable[Any]): Dicts with ``source``, ``target``,
+                ``relationship`` and ``relationship_strength`` keys (as
+                returned by QwenClient), or ``Relationship`` instances
+            document_id (Optional[UUID]): Source document of every relationship
+            ids (Optional[Any]): Relationship UUIDs, generated if omitted
+
+        Returns:
+            RelationBatch: Validated batch
+        """
+        records = list(records)
+        return cls(
+            sources=_records_column(records, "source"),
+            targets=_records_column(records, "target"),
+            relationships=_records_column(records, "relationship", ""),
+            strengths=_records_column(records, "relationship_strength"),
+            ids=ids,
+            document_id=document_id
+        )
+
+    def to_neo4j_params(self) -> Dict[str, Any]:
+        """Build parallel-list parameters for an ``UNWIND`` merge.
+
+        Returns:
+            Dict[str, Any]: ``ids``, ``sources``, ``targets``,
+                ``relationships`` and ``strengths`` lists
+        """
+        return {
+            "ids": _id_bytes(self.ids),
+            "sources": self.sources,
+            "targets": self.targets,
+            "relationships": self.relationships,
+            "strengths": self.strengths.tolist()
+        }
+
+class TripleBatch(_ColumnarBatch):
+    """Struct-of-arrays container for subject-predicate-object triples.
+
+    Args:
+        subject_ids (Any): Subject entity UUIDs
+        predicate_ids (Any): Predicate relation UUIDs
+        object_ids (Any): Object entity UUIDs
+        ids (Optional[Any]): Triple UUIDs, generated if omitted
+        document_id (Optional[UUID]): Source document of every triple
+
+    Attributes:
+        ids, subject_ids, predicate_ids, object_ids (np.ndarray): ``(n, 16)``
+            uint8 UUID bytes
+        document_id (Optional[UUID]): Source document
+
+    Raises:
+        ValueError: If any id column is invalid
+    """
+
+    _columns = ("ids", "subject_ids", "predicate_ids", "object_ids")
+
+    def __init__(self, subject_ids: Any, predicate_ids: Any, object_ids: Any,
+                 ids: Optional[Any] = None, document_id: Optional[UUID] = None):
+        """Validate id columns and build the batch."""
+        count = len(subject_ids)
+        self.subject_ids = _id_array(subject_ids, count, "subject_ids")
+        self.predicate_ids = _id_array(predicate_ids, count, "predicate_ids")
+        self.object_ids = _id_array(object_ids, count, "object_ids")
+        self.ids = _id_array(ids, count, "ids")
+        self.document_id = document_id
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any],
+                     document_id: Optional[UUID] = None) -> "TripleBatch":
+        """Build a batch from TripleSymbol instances or equivalent dicts.
+
+        Args:
+            records (Iterable[Any]): Records with ``subject_id``,
+                ``predicate_id`` and ``object_id``
+            document_id (Optional[UUID]): Source document of every triple
+
+        Returns:
+            TripleBatch: Validated batch
+        """
+        records = list(records)
+        return cls(
+            subject_ids=_records_column(records, "subject_id"),
+            predicate_ids=_records_column(records, "predicate_id"),
+            object_ids=_records_column(records, "object_id"),
+            document_id=document_id
+        )
+
+    def to_neo4j_params(self) -> Dict[str, Any]:
+        """Build parallel-list parameters for an ``UNWIND`` create.
+
+        Returns:
+            Dict[str, Any]: ``ids``, ``subject_ids``, ``predicate_ids`` and
+                ``object_ids`` as lists of UUID strings
+        """
+        return {
+            "ids": _id_strings(self.ids),
+            "subject_ids": _id_strings(self.subject_ids),
+            "predicate_ids": _id_strings(self.predicate_ids),
+            "object_ids": _id_strings(self.object_ids)
+        }
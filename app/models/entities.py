@@ -2,6 +2,8 @@ from uuid import UUID
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field, ConfigDict
 from .types import SemanticBase, SymbolBase, StructuredDataBase
+from .vector import Vector
+from .serialization import ColumnBuffer, emit
 
 class Entity(BaseModel):
     """Base entity model for knowledge graph nodes.
@@ -91,7 +93,7 @@ class EntitySemantic(SemanticBase):
 
     Attributes:
         name (str): Entity name for semantic context
-        vector_representation (List[float]): Vector embedding of the entity
+        vector_representation (Vector): float32 vector embedding of the entity
         semantic_type (str): Type of semantic representation (default: "DEFINITION")
         semantic_value (str): Actual semantic content or value
 
@@ -108,7 +110,7 @@ class EntitySemantic(SemanticBase):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     name: str = ""
-    vector_representation: List[float] = Field(default_factory=list)
+    vector_representation: Vector = Field(default_factory=Vector)
     semantic_type: str = Field(default="DEFINITION")
     semantic_value: str = Field(default="")
 
@@ -124,7 +126,7 @@ class EntitySemantic(SemanticBase):
             "name": self.name,
             "semantic_type": self.semantic_type,
             "semantic_value": self.semantic_value,
-            "vector_representation": self.vector_representation
+            "vector_representation": self.vector_representation.tolist()
         }
 
 class EntitySymbol(SymbolBase):
@@ -158,11 +160,15 @@ class EntitySymbol(SymbolBase):
     properties: List[StructuredDataBase] = Field(default_factory=list)
     labels: List[StructuredDataBase] = Field(default_factory=list)
 
-    def to_neo4j(self) -> Dict[str, Any]:
+    def to_neo4j(self, buffer: Optional[ColumnBuffer] = None) -> Dict[str, Any]:
         """Convert entity symbol to Neo4j compatible format.
 
         Serializes the entity symbol and its associated data for
-        storage in Neo4j graph database.
+        storage in Neo4j graph database. Properties and labels are dumped
+        together in one JSON-mode pass of the compiled serializer.
+
+        Args:
+            buffer (Optional[ColumnBuffer]): Batch buffer to append the row to
 
         Returns:
             Dict[str, Any]: Neo4j-compatible dictionary containing all
@@ -171,12 +177,15 @@ class EntitySymbol(SymbolBase):
         Raises:
             ValueError: If required attributes are missing or invalid
         """
-        return {
+        nested = self.__pydantic_serializer__.to_python(
+            self, include={'properties', 'labels'}, mode='json'
+        )
+        return emit({
             'symbol_id': str(self.symbol_id),
             'name': self.name,
             'entity_type': self.entity_type,
             'descriptions': self.descriptions,
-            'properties': [p.model_dump() for p in self.properties],
-            'labels': [l.model_dump() for l in self.labels],
+            'properties': nested['properties'],
+            'labels': nested['labels'],
             'document_id': str(self.document_id) if self.document_id else None
-        }
+        }, buffer)
@@ -1,7 +1,7 @@
 from uuid import UUID
-from typing import Dict, Any
-import sympy as sp
+from typing import Dict, Any, Optional
 from .base import BaseObject
+from .serialization import ColumnBuffer, emit
 
 class LogicExpression(BaseObject):
     """Represents a logical expression in the knowledge graph.
@@ -34,12 +34,15 @@ class LogicExpression(BaseObject):
     expression_lean4: str  # Using string representation for Lean4 expressions
     expression_sympy: str  # Using string representation for sympy expressions
 
-    def to_mysql(self) -> Dict[str, Any]:
+    def to_mysql(self, buffer: Optional[ColumnBuffer] = None) -> Dict[str, Any]:
         """Convert logical expression to MySQL compatible format.
 
         Serializes the logical expression for storage in MySQL database,
         ensuring proper string representation of UUIDs.
 
+        Args:
+            buffer (Optional[ColumnBuffer]): Batch buffer to append the row to
+
         Returns:
             Dict[str, Any]: MySQL-compatible dictionary containing
                 expression ID and both format representations
@@ -54,11 +57,11 @@ class LogicExpression(BaseObject):
             # }
             ```
         """
-        return {
+        return emit({
             'expression_id': str(self.expression_id),
             'expression_lean4': self.expression_lean4,
             'expression_sympy': self.expression_sympy
-        }
+        }, buffer)
 
 class MathExpression(BaseObject):
     """Represents a mathematical expression in the knowledge graph.
@@ -94,12 +97,15 @@ class MathExpression(BaseObject):
     expression_sympy: str  # Using string representation for sympy expressions
     expression_wolfram: str
 
-    def to_mysql(self) -> Dict[str, Any]:
+    def to_mysql(self, buffer: Optional[ColumnBuffer] = None) -> Dict[str, Any]:
         """Convert mathematical expression to MySQL compatible format.
 
         Serializes the mathematical expression for storage in MySQL database,
         ensuring proper string representation of UUIDs.
 
+        Args:
+            buffer (Optional[ColumnBuffer]): Batch buffer to append the row to
+
         Returns:
             Dict[str, Any]: MySQL-compatible dictionary containing
                 expression ID and all format representations
@@ -115,9 +121,9 @@ class MathExpression(BaseObject):
             # }
             ```
         """
-        return {
+        return emit({
             'expression_id': str(self.expression_id),
             'expression_latex': self.expression_latex,
             'expression_sympy': self.expression_sympy,
             'expression_wolfram': self.expression_wolfram
-        }
+        }, buffer)
@@ -1,7 +1,8 @@
 from uuid import UUID
-from typing import List, Dict, Any
-import numpy as np
+from typing import Dict, Any, Optional
 from .base import BaseObject
+from .vector import Vector
+from .serialization import ColumnBuffer, emit
 
 class RelationSemantic(BaseObject):
     """Represents a semantic relation in the knowledge graph.
@@ -13,8 +14,7 @@ class RelationSemantic(BaseObject):
     Attributes:
         relation_id (UUID): Unique identifier for the relation
         name (str): Name of the relationship
-        semantic (List[float]): Vector embedding representation of the relation.
-            Stored as List[float] instead of np.ndarray for serialization.
+        semantic (Vector): float32 vector embedding of the relation
         hit_count (int): Number of times this relation has been observed
 
     Example:
@@ -29,20 +29,23 @@ class RelationSemantic(BaseObject):
         ```
 
     Note:
-        The semantic vector is stored as List[float] rather than np.ndarray
-        to ensure proper serialization when storing in databases.
+        The semantic vector is a float32 Vector; it dumps to a plain list of
+        floats in JSON mode and via to_chroma.
     """
     relation_id: UUID
     name: str
-    semantic: List[float]  # Using List[float] instead of np.ndarray for serialization
+    semantic: Vector
     hit_count: int
 
-    def to_chroma(self) -> Dict[str, Any]:
+    def to_chroma(self, buffer: Optional[ColumnBuffer] = None) -> Dict[str, Any]:
         """Convert semantic relation to Chroma vector database format.
 
         Prepares the relation data for storage in Chroma by including
         the semantic vector as the embedding vector.
 
+        Args:
+            buffer (Optional[ColumnBuffer]): Batch buffer to append the row to
+
         Returns:
             Dict[str, Any]: Chroma-compatible dictionary containing
                 relation metadata and vector embedding
@@ -58,9 +61,9 @@ class RelationSemantic(BaseObject):
             # }
             ```
         """
-        data = self.model_dump()
-        data['vector'] = self.semantic
-        return data
+        data = self.model_dump(exclude={'semantic'})
+        data['semantic'] = data['vector'] = self.semantic.tolist()
+        return emit(data, buffer)
 
 class RelationSymbol(BaseObject):
     """Represents a symbolic relation in the knowledge graph.
@@ -101,12 +104,15 @@ class RelationSymbol(BaseObject):
     hit_count: int
     relationship_strength: int
 
-    def to_neo4j(self) -> Dict[str, Any]:
+    def to_neo4j(self, buffer: Optional[ColumnBuffer] = None) -> Dict[str, Any]:
         """Convert symbolic relation to Neo4j graph database format.
 
         Prepares the relation data for storage in Neo4j, including
         metadata but excluding the semantic vector representation.
 
+        Args:
+            buffer (Optional[ColumnBuffer]): Batch buffer to append the row to
+
         Returns:
             Dict[str, Any]: Neo4j-compatible dictionary containing
                 relation metadata without vector embedding
@@ -122,9 +128,9 @@ class RelationSymbol(BaseObject):
             # }
             ```
         """
-        return {
+        return emit({
             'relation_id': str(self.relation_id),
             'name': self.name,
             'description': self.description,
             'hit_count': self.hit_count
-        }
+        }, buffer)
@@ -0,0 +1,176 @@
+"""Serialization helpers shared by the knowledge graph models.
+
+Bulk graph exports dump the same handful of model classes hundreds of
+thousands of times, so the per-call work is kept small:
+- FieldPlan: per-class facts computed once (which fields can hold a UUID)
+  so ``BaseObject.model_dump`` only post-processes those fields
+- ColumnBuffer: column-oriented accumulator that the ``to_*`` adapters
+  append to, producing Neo4j ``UNWIND`` / MySQL ``executemany`` parameters
+  without building an intermediate list of row dicts
+- dumps: byte output for dumped data, using orjson when installed (it ships
+  with chromadb) and pydantic-core's JSON encoder otherwise, or msgpack
+
+Example:
+    ```python
+    buffer = ColumnBuffer()
+    for entity in entities:
+        entity.to_neo4j(buffer=buffer)
+    await session.run(UNWIND_QUERY, buffer.columns)
+
+    payload = dumps(document.to_chroma())
+    ```
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Union, get_args, get_origin
+from uuid import UUID
+
+import pydantic_core
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FORMATS = ("json", "msgpack")
+
+@dataclass(frozen=True)
+class FieldPlan:
+    """Per-class serialization facts.
+
+    Attributes:
+        uuid_fields (FrozenSet[str]): Top-level fields whose annotation can
+            hold a UUID (``UUID``, ``Optional[UUID]`` or ``Any``)
+    """
+    uuid_fields: FrozenSet[str]
+
+def _may_hold_uuid(annotation: Any) -> bool:
+    if annotation is UUID or annotation is Any:
+        return True
+    if get_origin(annotation) is Union:
+        return any(_may_hold_uuid(arg) for arg in get_args(annotation))
+    return False
+
+_plans: Dict[type, FieldPlan] = {}
+
+def get_field_plan(cls: type) -> FieldPlan:
+    """Return the cached field plan for a model class.
+
+    Plans are computed on first use, after forward references have been
+    resolved by ``model_rebuild``.
+
+    Args:
+        cls (type): Pydantic model class
+
+    Returns:
+        FieldPlan: Serialization facts for the class
+    """
+    plan = _plans.get(cls)
+    if plan is None:
+        plan = FieldPlan(uuid_fields=frozenset(
+            name for name, field in cls.model_fields.items()
+            if _may_hold_uuid(field.annotation)
+        ))
+        _plans[cls] = plan
+    return plan
+
+class ColumnBuffer:
+    """Column-oriented accumulator for adapter output.
+
+    Each appended row is split into per-key lists. Rows must share the same
+    keys; the first row fixes the column set.
+
+    Attributes:
+        columns (Dict[str, List[Any]]): Values per column, in append order
+    """
+
+    def __init__(self):
+        """Initialize an empty buffer."""
+        self.columns: Dict[str, List[Any]] = {}
+        self._rows = 0
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        """Append one row.
+
+        Args:
+            row (Mapping[str, Any]): Adapter output for one object
+
+        Raises:
+            ValueError: If the row's keys differ from the buffer's columns
+        """
+        if not self.columns:
+            self.columns = {key: [] for key in row}
+        elif len(row) != len(self.columns):
+            raise ValueError(f"Row keys {sorted(row)} don't match columns {sorted(self.columns)}")
+        try:
+            for key, value in row.items():
+                self.columns[key].append(value)
+        except KeyError as e:
+            raise ValueError(f"Unexpected column {str(e)} for buffer with columns {sorted(self.columns)}")
+        self._rows += 1
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Return the buffered data as row dicts (e.g. for ``executemany``)."""
+        keys = list(self.columns)
+        return [dict(zip(keys, values)) for values in zip(*self.columns.values())]
+
+def _default(value: Any) -> Any:
+    """Encode types pydantic-core and msgpack don't know natively."""
+    if isinstance(value, UUID):
+        return str(value)
+    if hasattr(value, "tolist"):  # Vector, numpy arrays and numpy scalars
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+def _orjson_default(value: Any) -> Any:
+    """Hand vectors to orjson as numpy arrays, which it encodes natively."""
+    array = getattr(value, "array", None)
+    if array is not None:
+        return array
+    return _default(value)
+
+def dumps(data: Any, format: str = "json") -> bytes:
+    """Serialize dumped model data to bytes.
+
+    Python-mode dumps can be passed directly: UUIDs, numpy arrays and
+    Vectors are encoded by the backend.
+
+    Args:
+        data (Any): Output of ``model_dump`` or a ``to_*`` adapter
+        format (str, optional): "json" or "msgpack". Defaults to "json".
+
+    Returns:
+        bytes: Encoded data
+
+    Raises:
+        ValueError: If the format is unknown
+        ImportError: If msgpack output is requested but msgpack is missing
+    """
+    if format == "json":
+        if orjson is not None:
+            return orjson.dumps(data, default=_orjson_default, option=orjson.OPT_SERIALIZE_NUMPY)
+        return pydantic_core.to_json(data, fallback=_default)
+    if format == "msgpack":
+        try:
+            import msgpack
+        except ImportError:
+            raise ImportError("msgpack is required for msgpack output; install it with 'pip install msgpack'")
+        return msgpack.packb(pydantic_core.to_jsonable_python(data, fallback=_default))
+    raise ValueError(f"Unknown serialization format '{format}', expected one of {FORMATS}")
+
+def emit(row: Dict[str, Any], buffer: Optional[ColumnBuffer]) -> Dict[str, Any]:
+    """Return an adapter row, appending it to a buffer if one is given.
+
+    Args:
+        row (Dict[str, Any]): Adapter output
+        buffer (Optional[ColumnBuffer]): Batch buffer to write into
+
+    Returns:
+        Dict[str, Any]: The row, unchanged
+    """
+    if buffer is not None:
+        buffer.append(row)
+    return row
@@ -5,11 +5,14 @@ in the knowledge graph system, including documents, chunks, and sentences.
 The models support various data formats and database-specific serialization.
 """
 from uuid import UUID
-from typing import List, Dict, Any, TYPE_CHECKING
-from pydantic import Field, ConfigDict
+from typing import List, Dict, Any, TYPE_CHECKING, Optional
+from pydantic import Field, ConfigDict, model_validator
 from .base import BaseObject
 from .expressions import LogicExpression, MathExpression
 from .types import StructuredDataBase
+from .vector import Vector
+from .serialization import ColumnBuffer, emit
+from ..utils.chunking import chunk_hash
 
 if TYPE_CHECKING:
     from .entities import EntitySymbol
@@ -43,7 +46,7 @@ class StructuredSentence(BaseObject):
         entity_relations (List[TripleSymbol]): Entity relationship triples
         logic_expressions (List[LogicExpression]): Logical expressions
         math_expressions (List[MathExpression]): Mathematical expressions
-        sentence_vectorization (List[float]): Vector representation
+        sentence_vectorization (Vector): float32 vector representation
         parent_chunk_id (UUID): ID of the containing chunk
         document_id (UUID): ID of the parent document
 
@@ -65,16 +68,19 @@ class StructuredSentence(BaseObject):
     entity_relations: List[TripleSymbol] = Field(default_factory=list)
     logic_expressions: List[LogicExpression] = Field(default_factory=list)
     math_expressions: List[MathExpression] = Field(default_factory=list)
-    sentence_vectorization: List[float] = Field(default_factory=list)
+    sentence_vectorization: Vector = Field(default_factory=Vector)
     parent_chunk_id: UUID
     document_id: UUID
 
-    def to_chroma(self) -> Dict[str, Any]:
+    def to_chroma(self, buffer: Optional[ColumnBuffer] = None) -> Dict[str, Any]:
         """Convert sentence to Chroma vector database format.
 
         Prepares the sentence data for storage in Chroma, including
         vector representation and document/chunk identifiers.
 
+        Args:
+            buffer (Optional[ColumnBuffer]): Batch buffer to append the row to
+
         Returns:
             Dict[str, Any]: Chroma-compatible dictionary containing
                 vector embedding and metadata
@@ -91,13 +97,13 @@ class StructuredSentence(BaseObject):
             # }
             ```
         """
-        return {
-            'vector': self.sentence_vectorization,
+        return emit({
+            'vector': self.sentence_vectorization.tolist(),
             'metadata': {
                 'document_id': str(self.document_id),
                 'chunk_id': str(self.parent_chunk_id)
             }
-        }
+        }, buffer)
 
 class StructuredChunk(BaseObject):
     """Represents a structured chunk within a document.
@@ -110,6 +116,8 @@ class StructuredChunk(BaseObject):
         chunk_id (UUID): Unique identifier for the chunk
         chunk_raw_content (str): Original unprocessed content
         chunk_summary_content (str): Summarized content
+        content_hash (str): SHA-256 of the normalized raw content, computed
+            when not given; identifies the chunk across re-ingests
         modality_identifier (str): Type/format of the chunk content
         document_id (UUID): ID of the parent document
         extraction_entity_results (List[EntitySymbol]): Extracted entities
@@ -137,6 +145,7 @@ class StructuredChunk(BaseObject):
     chunk_id: UUID
     chunk_raw_content: str
     chunk_summary_content: str
+    content_hash: str = ""
     modality_identifier: str
     document_id: UUID
     extraction_entity_results: List[EntitySymbol] = Field(default_factory=list)
@@ -145,6 +154,12 @@ class StructuredChunk(BaseObject):
     logic_expression_extraction_results: List[LogicExpression] = Field(default_factory=list)
     math_expression_extraction_results: List[MathExpression] = Field(default_factory=list)
 
+    @model_validator(mode="after")
+    def _fill_content_hash(self) -> "StructuredChunk":
+        if not self.content_hash:
+            self.content_hash = chunk_hash(self.chunk_raw_content)
+        return self
+
 class Document(BaseObject):
     """Represents a complete document or file in the knowledge graph.
 
@@ -155,7 +170,7 @@ class Document(BaseObject):
     Attributes:
         id (UUID): Unique identifier for the document
         meta (StructuredData): Document metadata
-        meta_embedding (List[float]): Vector embedding of metadata
+        meta_embedding (Vector): float32 vector embedding of metadata
         raw_content (str): Original document content
         structured_chunks (List[StructuredChunk]): Processed document chunks
 
@@ -175,16 +190,19 @@ class Document(BaseObject):
 
     id: UUID
     meta: StructuredData
-    meta_embedding: List[float] = Field(default_factory=list)
+    meta_embedding: Vector = Field(default_factory=Vector)
     raw_content: str
     structured_chunks: List[StructuredChunk] = Field(default_factory=list)
 
-    def to_chroma(self) -> Dict[str, Any]:
+    def to_chroma(self, buffer: Optional[ColumnBuffer] = None) -> Dict[str, Any]:
         """Convert document to Chroma vector database format.
 
         Prepares the document data for storage in Chroma, including
         metadata embedding and document information.
 
+        Args:
+            buffer (Optional[ColumnBuffer]): Batch buffer to append the row to
+
         Returns:
             Dict[str, Any]: Chroma-compatible dictionary containing
                 vector embedding and metadata
@@ -201,15 +219,10 @@ class Document(BaseObject):
             # }
             ```
         """
-        return {
-            'vector': self.meta_embedding,
+        return emit({
+            'vector': self.meta_embedding.tolist(),
             'metadata': {
                 'document_id': str(self.id),
                 'meta': self.meta.model_dump()
             }
-        }
-
-# Update forward references after all models are defined
-Document.model_rebuild()
-StructuredChunk.model_rebuild()
-StructuredSentence.model_rebuild()
+        }, buffer)
@@ -6,10 +6,11 @@ blocks of the knowledge graph, representing subject-predicate-object
 relationships.
 """
 from uuid import UUID
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pydantic import Field
 
 from .types import SemanticBase, SymbolBase
+from .serialization import ColumnBuffer, emit
 
 class TripleSymbol(SymbolBase):
     """Represents a symbolic triple in the knowledge graph.
@@ -42,12 +43,15 @@ class TripleSymbol(SymbolBase):
     predicate_id: UUID
     object_id: UUID
 
-    def to_neo4j(self) -> Dict[str, Any]:
+    def to_neo4j(self, buffer: Optional[ColumnBuffer] = None) -> Dict[str, Any]:
         """Convert triple to Neo4j graph database format.
 
         Prepares the triple data for storage in Neo4j, including
         entity references and inherited properties.
 
+        Args:
+            buffer (Optional[ColumnBuffer]): Batch buffer to append the row to
+
         Returns:
             Dict[str, Any]: Neo4j-compatible dictionary containing
                 triple data and metadata
@@ -65,14 +69,14 @@ class TripleSymbol(SymbolBase):
             # }
             ```
         """
-        return {
+        return emit({
             'triple_id': str(self.symbol_id),
             'subject_id': str(self.subject_id),
             'predicate_id': str(self.predicate_id),
             'object_id': str(self.object_id),
             'properties': self.properties,
             'labels': self.labels
-        }
+        }, buffer)
 
 class TripleSemantic(SemanticBase):
     """Represents a semantic triple in the knowledge graph.
@@ -107,12 +111,15 @@ class TripleSemantic(SemanticBase):
     predicate_id: UUID
     object_id: UUID
 
-    def to_chroma(self) -> Dict[str, Any]:
+    def to_chroma(self, buffer: Optional[ColumnBuffer] = None) -> Dict[str, Any]:
         """Convert triple to Chroma vector database format.
 
         Prepares the triple data for storage in Chroma, including
         entity references and semantic properties.
 
+        Args:
+            buffer (Optional[ColumnBuffer]): Batch buffer to append the row to
+
         Returns:
             Dict[str, Any]: Chroma-compatible dictionary containing
                 triple data and semantic information
@@ -131,7 +138,7 @@ class TripleSemantic(SemanticBase):
             # }
             ```
         """
-        return {
+        return emit({
             'triple_id': str(self.semantic_id),
             'subject_id': str(self.subject_id),
             'predicate_id': str(self.predicate_id),
@@ -139,4 +146,4 @@ class TripleSemantic(SemanticBase):
             'semantic_type': self.semantic_type,
             'semantic_value': self.semantic_value,
             'confidence': self.confidence
-        }
+        }, buffer)
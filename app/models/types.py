@@ -97,31 +97,3 @@ class SymbolBase(BaseObject):
     properties: Dict[str, Any] = Field(default_factory=dict)
     labels: List[str] = Field(default_factory=list)
     document_id: Optional[UUID] = None
-
-    def model_dump(self, **kwargs) -> Dict[str, Any]:
-        """Convert symbol to dictionary format with string UUIDs.
-
-        Extends the base model_dump method to ensure UUIDs are
-        properly serialized as strings.
-
-        Args:
-            **kwargs: Additional arguments passed to model_dump
-
-        Returns:
-            Dict[str, Any]: Dictionary representation with string UUIDs
-
-        Example:
-            ```python
-            data = symbol.model_dump()
-            # Returns: {
-            #     'symbol_id': 'uuid-string',
-            #     'name': 'Example Entity',
-            #     'document_id': 'uuid-string'  # if present
-            # }
-            ```
-        """
-        data = super().model_dump(**kwargs)
-        data['symbol_id'] = str(data['symbol_id'])
-        if data.get('document_id'):
-            data['document_id'] = str(data['document_id'])
-        return data
@@ -0,0 +1,142 @@
+"""Compact vector field type for embedding models.
+
+Embeddings were previously declared as ``List[float]``, which stores every
+component as a boxed Python float (~32 bytes each) and makes Pydantic
+validate each element on construction. ``Vector`` keeps the components in a
+contiguous float32 numpy array instead:
+- Validation is a single ``np.asarray`` call for lists, a no-copy view for
+  float32 arrays and ``np.frombuffer`` for raw bytes
+- Python-mode ``model_dump`` returns the Vector itself (no copy)
+- JSON-mode dumps (``model_dump(mode="json")``, ``model_dump_json``) emit a
+  plain list of floats, so the wire format is unchanged
+- ``tolist()``/``tobytes()`` produce what Chroma and binary stores expect
+
+Example:
+    ```python
+    class Embedded(BaseObject):
+        vector: Vector = Field(default_factory=Vector)
+
+    item = Embedded(vector=[0.1, 0.2, 0.3])
+    item.vector.array.dtype      # float32
+    item.model_dump_json()       # '{"vector":[0.1,0.2,0.3]}' (float32-rounded)
+    Vector.frombytes(item.vector.tobytes()) == item.vector  # True
+    ```
+"""
+
+from typing import Any, Iterator, List, Union
+
+import numpy as np
+from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
+
+DTYPE = np.float32
+
+class Vector:
+    """Immutable-by-convention float32 vector backed by a numpy array.
+
+    Behaves like a read-only sequence of floats (``len``, iteration,
+    indexing, ``==`` against lists or arrays) and exposes the underlying
+    array through ``array`` and the numpy ``__array__`` protocol.
+
+    Args:
+        values: Sequence of numbers, numpy array, Vector, or a float32 byte
+            buffer. Defaults to an empty vector.
+
+    Raises:
+        ValueError: If values are not one-dimensional or not numeric
+    """
+
+    __slots__ = ("_array",)
+
+    def __init__(self, values: Any = ()):
+        """Convert values to a contiguous one-dimensional float32 array."""
+        if isinstance(values, Vector):
+            array = values._array
+        elif isinstance(values, (bytes, bytearray, memoryview)):
+            array = np.frombuffer(values, dtype=DTYPE)
+        else:
+            try:
+                array = np.asarray(values, dtype=DTYPE)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Vector values must be numeric: {str(e)}")
+        if array.ndim != 1:
+            raise ValueError(f"Vector must be one-dimensional, got shape {array.shape}")
+        self._array = np.ascontiguousarray(array)
+
+    @classmethod
+    def frombytes(cls, buffer: Union[bytes, bytearray, memoryview]) -> "Vector":
+        """Create a vector viewing a float32 byte buffer without copying.
+
+        Args:
+            buffer: Raw little-endian float32 data, e.g. from ``tobytes()``
+
+        Returns:
+            Vector: Vector sharing memory with the buffer
+        """
+        return cls(buffer)
+
+    @property
+    def array(self) -> np.ndarray:
+        """The underlying float32 numpy array."""
+        return self._array
+
+    def tolist(self) -> List[float]:
+        """Return the components as Python floats (for Chroma and JSON)."""
+        return self._array.tolist()
+
+    def tobytes(self) -> bytes:
+        """Return the raw float32 buffer."""
+        return self._array.tobytes()
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if dtype is None or np.dtype(dtype) == self._array.dtype:
+            return self._array
+        return self._array.astype(dtype)
+
+    def __len__(self) -> int:
+        return self._array.shape[0]
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self._array.tolist())
+
+    def __getitem__(self, index):
+        value = self._array[index]
+        return Vector(value) if isinstance(index, slice) else float(value)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Vector):
+            other = other._array
+        elif isinstance(other, (list, tuple, np.ndarray)):
+            other = np.asarray(other, dtype=DTYPE)
+        else:
+            return NotImplemented
+        return self._array.shape == other.shape and bool(np.array_equal(self._array, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Vector(dim={len(self)})"
+
+    @classmethod
+    def _validate(cls, value: Any) -> "Vector":
+        return value if isinstance(value, Vector) else cls(value)
+
+    @staticmethod
+    def _serialize(value: "Vector", info: core_schema.SerializationInfo) -> Any:
+        return value.tolist() if info.mode_is_json() else value
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls._serialize,
+                info_arg=True
+            )
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema: core_schema.CoreSchema,
+                                     handler: GetJsonSchemaHandler) -> JsonSchemaValue:
+        return {"type": "array", "items": {"type": "number"}}
@@ -21,6 +21,8 @@ import json
 from pathlib import Path
 import os
 from unstructured.partition.auto import partition
+from .partition import partition_pdf
+from ..utils.qwen import configure_dashscope
 import dashscope
 from dashscope import Generation
 
@@ -62,7 +64,7 @@ class DocumentProcessor:
         """
         self.supported_types = ['.pdf', '.txt', '.docx']
         self.qwen_api_key = os.getenv('QWEN_API_KEY', 'sk-46e78b90eb8e4d6ebef79f265891f238')
-        dashscope.api_key = self.qwen_api_key
+        configure_dashscope(self.qwen_api_key)
 
     def process_document(self, file_path: str) -> List[str]:
         """Process document and extract text elements.
@@ -84,7 +86,10 @@ class DocumentProcessor:
             Exception: If document processing fails (e.g., corrupt file)
         """
         try:
-            elements = partition(filename=file_path)
+            if Path(file_path).suffix.lower() == '.pdf':
+                elements = partition_pdf(filename=file_path)
+            else:
+                elements = partition(filename=file_path)
             return [str(el) for el in elements]
         except Exception as e:
             raise Exception(f"Error processing document: {str(e)}")
@@ -0,0 +1,221 @@
+"""Page-parallel PDF partitioning for Ananke2.
+
+``unstructured``'s ``partition_pdf`` processes a file page by page in a
+single thread, which makes it the slowest stage for long papers. This module
+splits a PDF into page ranges, partitions the ranges in a process pool and
+reassembles the elements in document order:
+- page_ranges: split a page count into fixed-size batches
+- partition_pdf: drop-in replacement for ``partition_pdf`` that uses the
+  pool for files with at least PARTITION_MIN_PAGES pages
+- iter_partition_pdf: the same, yielding page batches as they complete in
+  order, for streaming consumers
+- shutdown_pool: stop the shared worker processes
+
+Each batch is written to a temporary PDF with pypdf and partitioned with
+``starting_page_number`` set, so element page numbers refer to the original
+document. Small files, a worker count of 1, daemonic processes (Celery
+prefork workers) and any failure to start the pool or its worker processes
+fall back to partitioning in the calling process.
+
+Example:
+    ```python
+    elements = partition_pdf(filename="paper.pdf", strategy="fast")
+    pages = [element.metadata.page_number for element in elements]
+    ```
+"""
+
+import importlib
+import multiprocessing
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from ..config import settings
+
+PARTITIONER = "unstructured.partition.pdf:partition_pdf"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+def _resolve(partitioner: str):
+    module, name = partitioner.split(":")
+    return getattr(importlib.import_module(module), name)
+
+def page_count(filename: str) -> int:
+    """Return the number of pages in a PDF."""
+    from pypdf import PdfReader
+    return len(PdfReader(filename).pages)
+
+def page_ranges(pages: int, pages_per_batch: int) -> List[Tuple[int, int]]:
+    """Split a page count into half-open, zero-based page ranges.
+
+    Args:
+        pages (int): Number of pages
+        pages_per_batch (int): Pages per range
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) ranges covering all pages in order
+    """
+    return [(start, min(start + pages_per_batch, pages)) for start in range(0, pages, pages_per_batch)]
+
+def _partition_range(filename: str, start: int, end: int, partitioner: str,
+                     kwargs: Dict[str, Any]) -> List[Any]:
+    """Partition pages ``start``..``end`` of a PDF (runs in a worker process)."""
+    from pypdf import PdfReader, PdfWriter
+
+    reader = PdfReader(filename)
+    writer = PdfWriter()
+    for index in range(start, end):
+        writer.add_page(reader.pages[index])
+
+    fd, path = tempfile.mkstemp(suffix=".pdf", prefix="ananke-pages-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            writer.write(f)
+        elements = _resolve(partitioner)(filename=path, starting_page_number=start + 1, **kwargs)
+    finally:
+        os.unlink(path)
+
+    # Point element metadata back at the original file
+    for element in elements:
+        metadata = getattr(element, "metadata", None)
+        if metadata is not None and hasattr(metadata, "filename"):
+            metadata.filename = os.path.basename(filename)
+            metadata.file_directory = os.path.dirname(filename) or None
+    return elements
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the shared process pool, recreating it if the size changed.
+
+    The pool is kept between calls so each worker pays the ``unstructured``
+    import only once.
+    """
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        shutdown_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+def shutdown_pool() -> None:
+    """Shut down the shared partitioning pool, if one was started."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool, _pool_workers = None, 0
+
+def iter_partition_pdf(filename: str, workers: Optional[int] = None,
+                       pages_per_batch: Optional[int] = None, min_pages: Optional[int] = None,
+                       partitioner: str = PARTITIONER, **kwargs) -> Iterator[List[Any]]:
+    """Partition a PDF, yielding the elements of each page batch in order.
+
+    At most two batches per worker are in flight, so a slow consumer holds
+    back the pool instead of letting parsed pages pile up in memory.
+
+    Args:
+        filename (str): Path to the PDF
+        workers (Optional[int]): Worker processes. Defaults to
+            settings.PARTITION_WORKERS, where 0 means one per CPU.
+        pages_per_batch (Optional[int]): Pages per task. Defaults to
+            settings.PARTITION_PAGES_PER_BATCH.
+        min_pages (Optional[int]): Files with fewer pages are partitioned in
+            the calling process. Defaults to settings.PARTITION_MIN_PAGES.
+        partitioner (str, optional): "module:function" of the partition
+            function, called with ``filename`` and ``starting_page_number``.
+            Defaults to unstructured's ``partition_pdf``.
+        **kwargs: Passed to the partition function (e.g. ``strategy``)
+
+    Yields:
+        List[Any]: Elements of one page batch (of the whole file when it is
+            partitioned in process)
+
+    Raises:
+        Exception: Any error raised by the partition function
+    """
+    workers = workers if workers is not None else settings.PARTITION_WORKERS
+    workers = workers or os.cpu_count() or 1
+    pages_per_batch = pages_per_batch or settings.PARTITION_PAGES_PER_BATCH
+    min_pages = min_pages if min_pages is not None else settings.PARTITION_MIN_PAGES
+
+    ranges = []
+    if workers > 1:
+        try:
+            pages = page_count(filename)
+        except Exception as e:
+            print(f"Could not read page count of {filename}, partitioning in process: {str(e)}")
+            pages = 0
+        if pages >= max(min_pages, 2):
+            ranges = page_ranges(pages, pages_per_batch)
+    if len(ranges) < 2:
+        yield _resolve(partitioner)(filename=filename, **kwargs)
+        return
+
+    if multiprocessing.current_process().daemon:
+        # e.g. Celery prefork workers, which can't start child processes
+        print("Daemonic process can't start a partitioning pool, partitioning in process")
+        yield _resolve(partitioner)(filename=filename, **kwargs)
+        return
+    try:
+        pool = _get_pool(min(workers, len(ranges)))
+    except (OSError, RuntimeError, AssertionError) as e:
+        print(f"Process pool unavailable, partitioning in process: {str(e)}")
+        yield _resolve(partitioner)(filename=filename, **kwargs)
+        return
+
+    pending, in_flight = deque(ranges), deque()
+    while pending or in_flight:
+        failure = None
+        try:
+            # Worker processes are started by submit, not by the constructor
+            while pending and len(in_flight) < 2 * _pool_workers:
+                start, end = pending[0]
+                future = pool.submit(_partition_range, filename, start, end, partitioner, kwargs)
+                in_flight.append((pending.popleft(), future))
+        except (BrokenProcessPool, OSError, RuntimeError, AssertionError) as e:
+            failure = e
+        if failure is None:
+            try:
+                elements = in_flight[0][1].result()
+            except BrokenProcessPool as e:
+                failure = e
+        if failure is not None:
+            # Partition the batches not yet yielded in this process
+            shutdown_pool()
+            print(f"Partitioning pool failed, partitioning in process: {str(failure)}")
+            for start, end in [page_range for page_range, _ in in_flight] + list(pending):
+                yield _partition_range(filename, start, end, partitioner, kwargs)
+            return
+        in_flight.popleft()
+        yield elements
+
+def partition_pdf(filename: str, workers: Optional[int] = None,
+                  pages_per_batch: Optional[int] = None, min_pages: Optional[int] = None,
+                  partitioner: str = PARTITIONER, **kwargs) -> List[Any]:
+    """Partition a PDF, spreading page batches over worker processes.
+
+    Args:
+        filename (str): Path to the PDF
+        workers (Optional[int]): Worker processes. Defaults to
+            settings.PARTITION_WORKERS, where 0 means one per CPU.
+        pages_per_batch (Optional[int]): Pages per task. Defaults to
+            settings.PARTITION_PAGES_PER_BATCH.
+        min_pages (Optional[int]): Files with fewer pages are partitioned in
+            the calling process. Defaults to settings.PARTITION_MIN_PAGES.
+        partitioner (str, optional): "module:function" of the partition
+            function, called with ``filename`` and ``starting_page_number``.
+            Defaults to unstructured's ``partition_pdf``.
+        **kwargs: Passed to the partition function (e.g. ``strategy``)
+
+    Returns:
+        List[Any]: Elements of all pages in document order
+
+    Raises:
+        Exception: Any error raised by the partition function
+    """
+    return [
+        element
+        for batch in iter_partition_pdf(filename, workers, pages_per_batch, min_pages, partitioner, **kwargs)
+        for element in batch
+    ]
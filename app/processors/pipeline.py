@@ -0,0 +1,285 @@
+"""Streaming ingest pipeline for Ananke2.
+
+The staged tasks (process_document → extract_knowledge_graph →
+extract_content) each wait for the previous stage to finish and pass the
+whole document text along. This module instead streams a document through
+asyncio stages connected by bounded queues:
+
+    page batches → elements → chunks → embed ‖ extract → bulk writes
+
+- parse: pulls page batches from ``iter_partition_pdf`` in a thread
+- chunk: packs elements into content-defined chunks (ChunkBuilder) and
+  fingerprints the text on the fly (SimHasher)
+- embed / extract: run side by side on every chunk
+- write: buffers results and stores them in bulk every PIPELINE_WRITE_BATCH
+  items (vectors, entities, then the chunk manifest); relationships are
+  stored in one batch at the end, once every entity they may refer to is
+
+A full queue blocks the stage feeding it, so parsing slows down to the pace
+of the slowest consumer and peak memory is bounded by the queue sizes rather
+than the document size. The first chunks are stored while later pages are
+still being partitioned.
+
+Example:
+    ```python
+    pipeline = StreamingPipeline(doc_id, rel_db, graph_db, vector_db, client, embed_texts)
+    result = await pipeline.run(iter_partition_pdf("paper.pdf"))
+    print(f"Stored {result.chunks} chunks, {result.entities} entities")
+    ```
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from uuid import UUID
+
+import numpy as np
+
+from ..config import settings
+from ..models.batches import EntityBatch, RelationBatch, stable_ids
+from ..utils.chunking import ChunkBuilder
+from ..utils.fingerprint import SimHasher
+from ..utils.tracing import traced_stage
+
+@dataclass
+class PipelineResult:
+    """Counts and fingerprint of a streamed document.
+
+    Attributes:
+        chunks (int): Chunks produced
+        entities (int): Entities stored
+        relationships (int): Relationships stored
+        flushes (int): Bulk write rounds
+        simhash (int): SimHash of the document text
+        size (int): Length of the normalized document text
+        document_embedding (Optional[List[float]]): Normalized mean of the
+            chunk embeddings, None for documents without text
+        peak_queue_sizes (Dict[str, int]): Largest size each queue reached
+    """
+    chunks: int = 0
+    entities: int = 0
+    relationships: int = 0
+    flushes: int = 0
+    simhash: int = 0
+    size: int = 0
+    document_embedding: Optional[List[float]] = None
+    peak_queue_sizes: Dict[str, int] = field(default_factory=dict)
+
+class StreamingPipeline:
+    """Stream one document from partitioned pages to the databases.
+
+    Args:
+        doc_id (str): UUID string of the (already stored) document
+        rel_db: Synchronous relational database
+        graph_db: Synchronous graph database
+        vector_db: Synchronous vector database
+        client: QwenClient used for entity and relationship extraction
+        embed (Callable[[List[str]], List[List[float]]]): Embeds a batch of texts
+        queue_size (Optional[int]): Capacity of the chunk and write queues.
+            Defaults to settings.PIPELINE_QUEUE_SIZE.
+        element_queue_size (Optional[int]): Capacity of the element queue.
+            Defaults to settings.PIPELINE_ELEMENT_QUEUE_SIZE.
+        write_batch (Optional[int]): Results buffered before a bulk write.
+            Defaults to settings.PIPELINE_WRITE_BATCH.
+    """
+
+    def __init__(self, doc_id: str, rel_db: Any, graph_db: Any, vector_db: Any, client: Any,
+                 embed: Callable[[List[str]], List[List[float]]], queue_size: Optional[int] = None,
+                 element_queue_size: Optional[int] = None, write_batch: Optional[int] = None):
+        self.doc_id = doc_id
+        self.rel_db = rel_db
+        self.graph_db = graph_db
+        self.vector_db = vector_db
+        self.client = client
+        self.embed = embed
+        queue_size = queue_size or settings.PIPELINE_QUEUE_SIZE
+        self.write_batch = write_batch or settings.PIPELINE_WRITE_BATCH
+        self._queues = {
+            "elements": asyncio.Queue(element_queue_size or settings.PIPELINE_ELEMENT_QUEUE_SIZE),
+            "embed": asyncio.Queue(queue_size),
+            "extract": asyncio.Queue(queue_size),
+            "write": asyncio.Queue(queue_size)
+        }
+        self._hasher = SimHasher()
+        self._embedding_sum = None
+        self._result = PipelineResult(peak_queue_sizes={name: 0 for name in self._queues})
+        self._relationships: List[tuple] = []
+        self._reset_buffers()
+
+    def _reset_buffers(self) -> None:
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._vectors: List[tuple] = []
+        self._entities: List[tuple] = []
+        self._buffered = 0
+
+    async def _put(self, name: str, item: Any) -> None:
+        queue = self._queues[name]
+        await queue.put(item)
+        peaks = self._result.peak_queue_sizes
+        peaks[name] = max(peaks[name], queue.qsize())
+
+    async def _parse(self, batches: Iterator[List[Any]]) -> None:
+        while True:
+            # Partitioning blocks, so each batch is pulled in a thread
+            with traced_stage("pipeline_parse"):
+                batch = await asyncio.to_thread(next, batches, None)
+            if batch is None:
+                break
+            for element in batch:
+                await self._put("elements", str(element))
+        await self._put("elements", None)
+
+    async def _emit(self, chunk) -> None:
+        row = chunk.to_dict()
+        self._result.chunks += 1
+        await self._put("embed", row)
+        await self._put("extract", row)
+
+    async def _chunk(self) -> None:
+        builder = ChunkBuilder(settings.CHUNK_MIN_CHARS, settings.CHUNK_MAX_CHARS)
+        queue = self._queues["elements"]
+        while (text := await queue.get()) is not None:
+            self._hasher.update(text)
+            for chunk in builder.add(text):
+                await self._emit(chunk)
+        for chunk in builder.finish():
+            await self._emit(chunk)
+        await self._put("embed", None)
+        await self._put("extract", None)
+
+    async def _embed(self) -> None:
+        queue, done = self._queues["embed"], False
+        while not done:
+            chunk = await queue.get()
+            if chunk is None:
+                break
+            # Batch whatever is already waiting, without holding back for more
+            batch = [chunk]
+            while len(batch) < settings.EMBEDDING_BATCH_SIZE and not queue.empty():
+                chunk = queue.get_nowait()
+                if chunk is None:
+                    done = True
+                    break
+                batch.append(chunk)
+            with traced_stage("pipeline_embed"):
+                embeddings = await asyncio.to_thread(self.embed, [chunk["text"] for chunk in batch])
+            for chunk, embedding in zip(batch, embeddings):
+                await self._put("write", ("embedding", chunk, embedding))
+        await self._put("write", None)
+
+    async def _extract(self) -> None:
+        queue = self._queues["extract"]
+        while (chunk := await queue.get()) is not None:
+            with traced_stage("pipeline_extract"):
+                entities = await self.client.extract_entities(chunk["text"])
+                relationships = await self.client.extract_relationships(chunk["text"])
+            await self._put("write", ("entities", chunk, entities, relationships))
+        await self._put("write", None)
+
+    def _row(self, chunk: Dict[str, Any]) -> Dict[str, Any]:
+        return self._rows.setdefault(chunk["content_hash"], {
+            "index": chunk["index"], "content_hash": chunk["content_hash"],
+            "entity_ids": None, "embedding_id": None
+        })
+
+    def _flush(self) -> None:
+        """Store buffered results, then record them in the chunk manifest."""
+        if not self._buffered:
+            return
+        with traced_stage("pipeline_write"):
+            if self._vectors:
+                ids = [f"chunk_{self.doc_id}_{chunk['content_hash'][:16]}" for chunk, _ in self._vectors]
+                self.vector_db.add_embeddings(ids, [embedding for _, embedding in self._vectors], [
+                    {"type": "chunk", "document_id": self.doc_id, "chunk_index": chunk["index"],
+                     "content_hash": chunk["content_hash"]}
+                    for chunk, _ in self._vectors
+                ])
+                for (chunk, _), id in zip(self._vectors, ids):
+                    self._row(chunk)["embedding_id"] = id
+            if self._entities:
+                records = [record for _, entities in self._entities for record in entities]
+                # Stable ids: a rerun after a failed manifest write merges these entities
+                document_id = UUID(self.doc_id)
+                batch = EntityBatch.from_records(records, document_id=document_id, ids=[
+                    id for chunk, entities in self._entities
+                    for id in stable_ids(document_id, chunk["content_hash"], len(entities))
+                ])
+                self.graph_db.store_entities(batch)
+                ids, start = batch.id_strings(), 0
+                for chunk, entities in self._entities:
+                    self._row(chunk)["entity_ids"] = ids[start:start + len(entities)]
+                    start += len(entities)
+                self._result.entities += len(records)
+            self.rel_db.store_chunks(self.doc_id, list(self._rows.values()))
+            self._result.flushes += 1
+            self._reset_buffers()
+
+    def _store_relationships(self) -> None:
+        """Store the document's relationships in one batch."""
+        if not any(relationships for _, relationships in self._relationships):
+            return
+        with traced_stage("pipeline_write"):
+            document_id = UUID(self.doc_id)
+            batch = RelationBatch.from_records(
+                [record for _, relationships in self._relationships for record in relationships],
+                document_id=document_id,
+                ids=[id for chunk, relationships in self._relationships
+                     for id in stable_ids(document_id, f"{chunk['content_hash']}:relationships", len(relationships))]
+            )
+            self._result.relationships = self.graph_db.store_relationships(batch)
+
+    async def _write(self) -> None:
+        queue, producers = self._queues["write"], 2
+        while producers:
+            item = await queue.get()
+            if item is None:
+                producers -= 1
+                continue
+            if item[0] == "embedding":
+                _, chunk, embedding = item
+                self._vectors.append((chunk, embedding))
+                vector = np.asarray(embedding, dtype=np.float64)
+                self._embedding_sum = vector if self._embedding_sum is None else self._embedding_sum + vector
+            else:
+                _, chunk, entities, relationships = item
+                self._row(chunk)
+                self._entities.append((chunk, entities))
+                self._relationships.append((chunk, relationships))
+            self._buffered += 1
+            if self._buffered >= self.write_batch:
+                await asyncio.to_thread(self._flush)
+        await asyncio.to_thread(self._flush)
+        await asyncio.to_thread(self._store_relationships)
+
+    async def run(self, batches: Iterator[List[Any]]) -> PipelineResult:
+        """Stream page batches through all stages.
+
+        Args:
+            batches (Iterator[List[Any]]): Element batches in document order,
+                e.g. from ``iter_partition_pdf``
+
+        Returns:
+            PipelineResult: Counts, fingerprint and document embedding
+
+        Raises:
+            Exception: The first error raised by any stage; the other stages
+                are cancelled and results not yet flushed are dropped
+        """
+        tasks = [
+            asyncio.create_task(stage)
+            for stage in (self._parse(batches), self._chunk(), self._embed(), self._extract(), self._write())
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        result = self._result
+        result.simhash, result.size = self._hasher.digest(), self._hasher.size
+        if self._embedding_sum is not None:
+            norm = np.linalg.norm(self._embedding_sum)
+            result.document_embedding = (self._embedding_sum / (norm or 1.0)).tolist()
+        return result
@@ -0,0 +1,36 @@
+"""Worker monitoring router for Ananke2.
+
+Endpoints serve the worker monitor's in-memory snapshot (see
+utils/monitoring.py) and return immediately once it has polled.
+"""
+
+import asyncio
+from typing import Any, Dict
+from fastapi import APIRouter
+from ..utils.monitoring import get_monitor
+
+router = APIRouter()
+
+@router.get("/workers")
+async def workers() -> Dict[str, Any]:
+    """Get the last snapshot of every worker's tasks, throughput and queue waits."""
+    return await asyncio.to_thread(get_monitor().snapshot)
+
+@router.get("/throughput")
+async def throughput() -> Dict[str, Any]:
+    """Get per-worker throughput and processed totals over time, and queue waits."""
+    monitor = get_monitor()
+    snapshot = await asyncio.to_thread(monitor.snapshot)
+    return {
+        "workers": {
+            worker: {
+                "throughput": data["throughput"],
+                "total_processed": data["total_processed"],
+                "queue_wait": data.get("queue_wait", {})
+            }
+            for worker, data in snapshot["workers"].items()
+        },
+        "history": monitor.history(),
+        "updated_at": snapshot["updated_at"],
+        "age": snapshot["age"]
+    }
@@ -0,0 +1,92 @@
+"""Search router for Ananke2."""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+from ..database.query import CrossDatabaseQuery, validate_fields
+
+router = APIRouter()
+
+_query: Optional[CrossDatabaseQuery] = None
+_query_lock = asyncio.Lock()
+
+async def get_query() -> CrossDatabaseQuery:
+    """Get the shared, connected cross-database query interface.
+
+    Returns:
+        CrossDatabaseQuery: Query interface with all backends connected
+    """
+    global _query
+    async with _query_lock:
+        if _query is None:
+            query = CrossDatabaseQuery()
+            await asyncio.gather(
+                query.vector_db.connect(),
+                query.graph_db.connect(),
+                query.mysql_db.connect()
+            )
+            _query = query
+    return _query
+
+async def _ndjson(items: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """Encode each streamed item as one JSON line."""
+    async for item in items:
+        yield json.dumps(jsonable_encoder(item)).encode() + b"\n"
+
+def _parse_filters(filters: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Decode the filters parameter; 422 unless it is a JSON object."""
+    if not filters:
+        return None
+    try:
+        parsed = json.loads(filters)
+    except ValueError:
+        parsed = None
+    if not isinstance(parsed, dict):
+        raise HTTPException(status_code=422, detail="filters must be a JSON object")
+    return parsed
+
+@router.get("/stream")
+async def stream_search(
+    q: str,
+    entity_type: Optional[str] = None,
+    filters: Optional[str] = Query(None, description="JSON object of structured filters"),
+    limit: int = Query(10, ge=1, le=10000),
+    fields: Optional[str] = Query(None, description="Comma-separated projection, e.g. id,title"),
+    query: CrossDatabaseQuery = Depends(get_query)
+) -> StreamingResponse:
+    """Stream combined search results as newline-delimited JSON.
+
+    Args:
+        q: Semantic search query
+        entity_type: Knowledge graph entity type filter
+        filters: Structured data filters as a JSON object
+        limit: Maximum number of results
+        fields: Fields to include per result; all document fields if omitted
+
+    Returns:
+        StreamingResponse emitting one JSON document per line in rank order
+
+    Raises:
+        HTTPException: 422 if filters isn't a JSON object, 400 for unknown
+            projection fields
+    """
+    parsed_filters = _parse_filters(filters)
+    try:
+        projection = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+        validate_fields(projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    results = query.iter_combined(
+        q,
+        entity_type=entity_type,
+        filters=parsed_filters,
+        limit=limit,
+        fields=projection
+    )
+    return StreamingResponse(_ndjson(results), media_type="application/x-ndjson")
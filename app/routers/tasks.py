@@ -1,9 +1,19 @@
 """Task management router for Ananke2."""
 
+import asyncio
+import json
+import time
 from fastapi import APIRouter, HTTPException, File, UploadFile
-from typing import Dict, Any
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, AsyncIterator, List, Optional
 from pydantic import BaseModel
-from ..tasks import workflow, celery_app
+from celery import states
+from ..tasks import ingest, workflow, celery_app
+from ..tasks.queues import PRIORITY_INTERACTIVE
+from ..config import settings
+from ..utils.progress import get_hub
+from ..utils.uploads import UploadTooLargeError, claim_upload, release_upload, replace_claim, spool_upload
 import uuid
 
 router = APIRouter()  # Remove prefix since it's set in main.py
@@ -16,6 +26,17 @@ class TaskResponse(BaseModel):
     task_id: str
     status: str
 
+class IngestRequest(BaseModel):
+    """Request model for bulk ingestion."""
+    arxiv_ids: List[str]
+    window: Optional[int] = None
+    rate: Optional[float] = None
+
+class ThrottleRequest(BaseModel):
+    """Request model for changing an ingest job's limits."""
+    window: Optional[int] = None
+    rate: Optional[float] = None
+
 @router.post("/process-document", response_model=TaskResponse)
 async def start_document_processing(request: DocumentRequest) -> Dict[str, Any]:
     """Start document processing workflow.
@@ -28,8 +49,9 @@ async def start_document_processing(request: DocumentRequest) -> Dict[str, Any]:
     """
     try:
         # Start document processing task
-        task = workflow.process_document_workflow.delay(
-            document_path=request.document_path
+        task = workflow.process_document_workflow.apply_async(
+            kwargs={"document_path": request.document_path},
+            priority=PRIORITY_INTERACTIVE
         )
 
         return {
@@ -42,34 +64,166 @@ async def start_document_processing(request: DocumentRequest) -> Dict[str, Any]:
             detail=f"Failed to start document processing: {str(e)}"
         )
 
+def _claim_failed(record: Dict[str, Any]) -> bool:
+    """Whether the task holding an upload claim failed, was revoked or was lost.
+
+    Tasks report STARTED once a worker picks them up, so a task still
+    PENDING after UPLOAD_CLAIM_TIMEOUT was lost with its message (or its
+    result expired) and won't process the upload.
+    """
+    task_id = record["task_id"]
+    try:
+        state = celery_app.AsyncResult(task_id).state
+    except Exception as e:
+        print(f"Could not get state of task {task_id}: {str(e)}")
+        return False
+    if state == states.PENDING:
+        return time.time() - record.get("claimed_at", 0) > settings.UPLOAD_CLAIM_TIMEOUT
+    return state in (states.FAILURE, states.REVOKED)
+
 @router.post("/upload-document")
-async def upload_document(file: UploadFile = File(...)) -> Dict[str, str]:
+async def upload_document(file: UploadFile = File(...)) -> Dict[str, Any]:
     """Upload and process a document.
 
+    The upload is streamed to the spool directory in chunks and stored under
+    its SHA-256 and ingested by ``document.stream_document``. If the same
+    content was uploaded before, the existing task is returned instead of
+    running the pipeline again, unless that task failed, was revoked or is
+    still pending after UPLOAD_CLAIM_TIMEOUT.
+
     Args:
         file: The uploaded file
 
     Returns:
-        Dict containing the task ID
+        Dict containing the task ID, the content hash and whether the
+        upload duplicated earlier content
+
+    Raises:
+        HTTPException: 413 if the upload exceeds MAX_UPLOAD_BYTES
     """
     try:
-        # Save uploaded file
-        file_path = f"/tmp/{file.filename}"
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-
-        # Start processing task
-        task = workflow.process_document_workflow.delay(
-            document_path=file_path
+        upload = await spool_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to store uploaded document: {str(e)}"
+        )
+
+    task_id = str(uuid.uuid4())
+    record = claim_upload(upload, task_id)
+    if record["task_id"] != task_id and _claim_failed(record):
+        record = replace_claim(upload, record["task_id"], task_id)
+    if record["task_id"] != task_id:
+        return {"task_id": record["task_id"], "sha256": upload.sha256, "duplicate": True}
+
+    try:
+        # Start processing task; sent by name so it goes through celery_app
+        # rather than the shared_task proxy's current app
+        celery_app.send_task(
+            "document.stream_document",
+            args=[str(upload.path)],
+            task_id=task_id,
+            priority=PRIORITY_INTERACTIVE
         )
-        return {"task_id": task.id}
+        return {"task_id": task_id, "sha256": upload.sha256, "duplicate": False}
     except Exception as e:
+        release_upload(upload)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to process uploaded document: {str(e)}"
         )
 
+@router.post("/ingest")
+async def start_ingest(request: IngestRequest) -> Dict[str, Any]:
+    """Start a backpressure-aware bulk ingest of arXiv papers.
+
+    Args:
+        request: Papers to ingest, with optional window and rate limit
+
+    Returns:
+        Dict containing the job ID
+
+    Raises:
+        HTTPException: 400 if the window or rate is invalid
+    """
+    try:
+        job_id = ingest.start_ingest(request.arxiv_ids, window=request.window, rate=request.rate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to start ingest: {str(e)}"
+        )
+    return {"job_id": job_id, "status": "running"}
+
+@router.get("/ingest/{job_id}")
+async def get_ingest_status(job_id: str) -> Dict[str, Any]:
+    """Get an ingest job's progress, throughput and ETA.
+
+    Args:
+        job_id: The ID of the ingest job
+
+    Returns:
+        Dict containing the job state
+
+    Raises:
+        HTTPException: 404 if the job doesn't exist
+    """
+    job = ingest.ingest_status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ingest job not found")
+    return job
+
+@router.patch("/ingest/{job_id}")
+async def throttle_ingest(job_id: str, request: ThrottleRequest) -> Dict[str, Any]:
+    """Change an ingest job's window and/or rate limit.
+
+    Args:
+        job_id: The ID of the ingest job
+        request: New limits
+
+    Returns:
+        Dict containing the job state
+
+    Raises:
+        HTTPException: 400 if a limit is invalid, 404 if the job doesn't exist
+    """
+    try:
+        found = ingest.throttle_ingest(job_id, window=request.window, rate=request.rate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not found:
+        raise HTTPException(status_code=404, detail="Ingest job not found")
+    return ingest.ingest_status(job_id)
+
+@router.post("/ingest/{job_id}/{action}")
+async def control_ingest(job_id: str, action: str) -> Dict[str, Any]:
+    """Pause, resume or cancel an ingest job.
+
+    Args:
+        job_id: The ID of the ingest job
+        action: "pause", "resume" or "cancel"
+
+    Returns:
+        Dict containing the job state
+
+    Raises:
+        HTTPException: 404 for an unknown action or job, 409 if the job's
+            status doesn't allow the action
+    """
+    controls = {"pause": ingest.pause_ingest, "resume": ingest.resume_ingest, "cancel": ingest.cancel_ingest}
+    if action not in controls:
+        raise HTTPException(status_code=404, detail=f"Unknown ingest action: {action}")
+    if not controls[action](job_id):
+        job = ingest.ingest_status(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Ingest job not found")
+        raise HTTPException(status_code=409, detail=f"Cannot {action} a {job['status']} ingest job")
+    return ingest.ingest_status(job_id)
+
 @router.get("/{task_id}")
 async def get_task_status(task_id: str) -> Dict[str, Any]:
     """Get task status.
@@ -134,3 +288,63 @@ async def get_task_progress(task_id: str) -> Dict[str, Any]:
             status_code=500,
             detail=f"Failed to get task progress: {str(e)}"
         )
+
+def _task_state(task_id: str) -> Dict[str, Any]:
+    result = celery_app.AsyncResult(task_id)
+    event = {"task_id": task_id, "state": result.status}
+    if result.ready():
+        if result.successful():
+            event["result"] = result.result
+        else:
+            event["error"] = str(result.result)
+    elif isinstance(result.info, dict):
+        event.update(result.info)
+    return event
+
+def _sse(name: str, data: Dict[str, Any]) -> bytes:
+    return f"event: {name}\ndata: {json.dumps(jsonable_encoder(data))}\n\n".encode()
+
+async def _progress_events(task_id: str) -> AsyncIterator[bytes]:
+    """Stream a task's state, its progress events and its final state."""
+    async with get_hub().follow(task_id) as events:
+        # follow() returns once the hub is subscribed, so events published after
+        # the state is read are received; the keepalive re-check covers the rest
+        state = await asyncio.to_thread(_task_state, task_id)
+        yield _sse("state", state)
+        while state["state"] not in states.READY_STATES:
+            try:
+                event = await asyncio.wait_for(events.get(), timeout=settings.PROGRESS_KEEPALIVE)
+            except asyncio.TimeoutError:
+                # Check the backend in case the final event was missed
+                state = await asyncio.to_thread(_task_state, task_id)
+                if state["state"] in states.READY_STATES:
+                    yield _sse("state", state)
+                else:
+                    yield b": keepalive\n\n"
+                continue
+            if event.get("state") in states.READY_STATES:
+                state = await asyncio.to_thread(_task_state, task_id)
+                yield _sse("state", state)
+            else:
+                yield _sse("progress", dict(event, task_id=task_id))
+
+@router.get("/{task_id}/events")
+async def stream_task_progress(task_id: str) -> StreamingResponse:
+    """Stream task progress as Server-Sent Events.
+
+    The first ``state`` event carries the task's current state. While it
+    runs, ``progress`` events carry its stage, done/total units, tokens
+    used and ETA, at most one per PROGRESS_INTERVAL seconds. A final
+    ``state`` event carries the result or error, and the stream ends.
+
+    Args:
+        task_id: The ID of the task to follow
+
+    Returns:
+        StreamingResponse: ``text/event-stream`` of the task's events
+    """
+    return StreamingResponse(
+        _progress_events(task_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -2,6 +2,9 @@
 
 from celery import Celery
 from ..config import Settings
+from .queues import INTERACTIVE, MAX_PRIORITY, PRIORITY_DEFAULT, TASK_QUEUES, TASK_ROUTES
+from ..utils.metrics import instrument_celery
+from ..utils.tracing import trace_celery
 
 settings = Settings()
 
@@ -10,7 +13,7 @@ celery_app = Celery(
     'ananke2',
     broker=f'redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}',
     backend=f'redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}',
-    include=['app.tasks.document', 'app.tasks.workflow']
+    include=['app.tasks.document', 'app.tasks.workflow', 'app.tasks.ingest']
 )
 
 # Configure Celery settings
@@ -24,6 +27,18 @@ celery_app.conf.update(
     task_ignore_result=False,
     task_store_errors_even_if_ignored=True,
     worker_prefetch_multiplier=1,
+    # Routing and priorities (see queues.py)
+    task_queues=TASK_QUEUES,
+    task_routes=TASK_ROUTES,
+    task_default_queue=INTERACTIVE,
+    task_default_priority=PRIORITY_DEFAULT,
+    task_queue_max_priority=MAX_PRIORITY,
+    task_inherit_parent_priority=True,
+    broker_transport_options={
+        "priority_steps": list(range(MAX_PRIORITY + 1)),
+        "sep": ":",
+        "queue_order_strategy": "priority"
+    },
     # Database configurations
     neo4j_uri=settings.NEO4J_URI,
     neo4j_user=settings.NEO4J_USER,
@@ -38,6 +53,15 @@ celery_app.conf.update(
     mysql_database=settings.MYSQL_DATABASE
 )
 
+# Task durations and worker metric pushes (see utils/metrics.py)
+instrument_celery()
+# Trace context propagation and task spans (see utils/tracing.py)
+trace_celery()
+
 # Import tasks after celery app is configured
 from . import document  # noqa
 from . import workflow  # noqa
+from . import ingest  # noqa
+
+# Worker snapshot command and queue wait tracking (see utils/monitoring.py)
+from ..utils import monitoring  # noqa
@@ -11,33 +11,54 @@ The tasks form a processing pipeline that can be chained together:
 1. download_arxiv -> process_document
 2. process_document -> extract_knowledge_graph
 3. process_document -> extract_content
+
+process_document checks the document fingerprint registry first, so
+byte-identical files resolve to the existing document and the extraction
+tasks only process the chunks an earlier run left unfinished. Text is split into content-hashed chunks tracked in a
+per-document manifest: when a near-identical document (e.g. a new arXiv
+version) is ingested, only new or changed chunks are passed on for
+extraction and the results of removed chunks are retracted.
 """
 
+import asyncio
 import os
-from typing import Dict, Any, Optional
-from unstructured.partition.pdf import partition_pdf
-import dashscope
+from typing import Dict, Any, List, Optional
 from http import HTTPStatus
 from celery import shared_task
-import arxiv
-import json
-from uuid import uuid4
-from ..utils.qwen import QwenClient
-from ..database.sync_wrappers import get_sync_relational_db, get_sync_vector_db, get_sync_graph_db
-from ..database.relational import AsyncRelationalDatabase
-from ..database.graph import Neo4jInterface
-from ..database.vector import ChromaInterface
-from ..models.entities import Entity, Relationship
+from uuid import UUID, uuid4
+from ..utils.lazy import LazyModule, lazy_exports
+from ..utils.qwen import QwenClient, call_dashscope, configure_dashscope
+from ..database.sync_wrappers import (
+    await_db, get_sync_relational_db, get_sync_vector_db, get_sync_graph_db, run_async
+)
+from ..database.cache import bump_generation
+from ..models.batches import EntityBatch, RelationBatch, stable_ids
+from ..utils.chunking import ChunkDiff, diff_chunks, split_text
+from ..utils.fingerprint import DocumentFingerprint, file_sha256
+from ..processors.partition import iter_partition_pdf, partition_pdf
+from ..processors.pipeline import StreamingPipeline
+from ..utils.metrics import record_bytes
+from ..utils.profiling import profiled
+from ..utils.progress import ProgressReporter
+from ..utils.tracing import span
 from ..config import settings
 
-# Initialize Qwen client
-qwen_client = QwenClient(api_key=settings.QWEN_API_KEY)
+# Heavy dependencies are imported on first use so workers that never parse
+# PDFs or call DashScope don't pay for them at startup.
+dashscope = LazyModule("dashscope")
+
+__getattr__ = lazy_exports(__name__, {
+    "AsyncRelationalDatabase": "..database.relational",
+    "Neo4jInterface": "..database.graph",
+    "ChromaInterface": "..database.vector"
+}, package=__package__)
 
 async def process_pdf(pdf_path: str) -> str:
     """Process PDF file and extract text content.
 
     Uses unstructured.io's partition_pdf function to extract text
-    content from PDF files while preserving document structure.
+    content from PDF files while preserving document structure. Long
+    PDFs are partitioned page-parallel (see processors.partition).
 
     Args:
         pdf_path (str): Path to the PDF file
@@ -60,7 +81,8 @@ async def process_pdf(pdf_path: str) -> str:
 
     try:
         # Process PDF using unstructured library
-        elements = partition_pdf(filename=pdf_path)
+        with span("partition_pdf", {"pdf.path": pdf_path}):
+            elements = partition_pdf(filename=pdf_path)
         text = "\n".join([str(element) for element in elements])
         return text
     except Exception as e:
@@ -68,16 +90,114 @@ async def process_pdf(pdf_path: str) -> str:
         raise
 
 
+def sync_chunk_manifest(rel_db: Any, doc_id: str, text: str) -> ChunkDiff:
+    """Diff a document's text against its chunk manifest and retract removed chunks.
+
+    Entities (with their relationships) and embeddings of chunks that no
+    longer exist are deleted, their manifest rows dropped, and rows for new
+    chunks inserted as pending.
+
+    Args:
+        rel_db: Synchronous relational database
+        doc_id (str): Document UUID string
+        text (str): New document text
+
+    Returns:
+        ChunkDiff: Chunks that still need extraction or embedding
+    """
+    chunks = split_text(text, settings.CHUNK_MIN_CHARS, settings.CHUNK_MAX_CHARS)
+    diff = diff_chunks(rel_db.get_chunk_manifest(doc_id), chunks)
+
+    if diff.removed:
+        entity_ids = [id for row in diff.removed for id in row.get("entity_ids") or []]
+        embedding_ids = [row["embedding_id"] for row in diff.removed if row.get("embedding_id")]
+        if entity_ids:
+            get_sync_graph_db().delete_entities(entity_ids)
+        if embedding_ids:
+            get_sync_vector_db().delete_embeddings(embedding_ids)
+        rel_db.delete_chunks(doc_id, [row["content_hash"] for row in diff.removed])
+    rel_db.store_chunks(doc_id, [chunk.to_dict() for chunk in chunks])
+
+    print(f"Chunks for {doc_id}: {len(diff.added)} to process, "
+          f"{diff.unchanged} unchanged, {len(diff.removed)} removed")
+    return diff
+
+def stage_input(rel_db: Any, doc_id: str) -> Dict[str, Any]:
+    """Rebuild the extraction input of a stored document.
+
+    Used for exact duplicates and when resuming after process_document,
+    whose result is not kept: the text is read back from the document and
+    only chunks whose entities or embedding are missing from the manifest
+    are returned.
+
+    Args:
+        rel_db: Synchronous relational database
+        doc_id (str): Document UUID string
+
+    Returns:
+        Dict[str, Any]: doc_id, text and chunks, as returned by process_document
+
+    Raises:
+        ValueError: If the document doesn't exist
+    """
+    doc = rel_db.get_document(doc_id)
+    if not doc:
+        raise ValueError(f"Document not found: {doc_id}")
+    text = doc["value"].get("content", "")
+    chunks = split_text(text, settings.CHUNK_MIN_CHARS, settings.CHUNK_MAX_CHARS)
+    pending = diff_chunks(rel_db.get_chunk_manifest(doc_id), chunks).added
+    return {"doc_id": doc_id, "text": text, "chunks": pending}
+
+def embed_texts(texts: List[str], reporter: Optional[ProgressReporter] = None) -> List[List[float]]:
+    """Embed texts with text-embedding-v3 in batches of EMBEDDING_BATCH_SIZE.
+
+    Args:
+        texts (List[str]): Texts to embed
+        reporter (Optional[ProgressReporter]): Advanced by each embedded batch
+
+    Returns:
+        List[List[float]]: One 1024-dimensional embedding per text
+
+    Raises:
+        Exception: If a batch request fails
+    """
+    configure_dashscope(settings.QWEN_API_KEY)
+    embeddings = []
+    batch_size = settings.EMBEDDING_BATCH_SIZE
+    for start in range(0, len(texts), batch_size):
+        resp = call_dashscope(
+            "embedding",
+            dashscope.TextEmbedding.call,
+            model=dashscope.TextEmbedding.Models.text_embedding_v3,
+            input=texts[start:start + batch_size],
+            dimension=1024,
+            output_type="dense"
+        )
+        if resp.status_code != HTTPStatus.OK:
+            raise Exception("Failed to generate embeddings")
+        batch = sorted(enumerate(resp.output["embeddings"]), key=lambda item: item[1].get("text_index", item[0]))
+        embeddings.extend(item["embedding"] for _, item in batch)
+        if reporter is not None:
+            reporter.advance(len(batch))
+    return embeddings
+
+async def _download_papers(arxiv_ids: List[str]) -> Dict[str, Any]:
+    from ..utils.arxiv_cache import ArxivDownloader
+    async with ArxivDownloader() as downloader:
+        return await downloader.download_many(arxiv_ids)
+
 @shared_task(name='document.download_arxiv')
 def download_arxiv(arxiv_id: str) -> dict:
     """Download arXiv paper and store metadata.
 
-    Downloads a paper from arXiv using its ID, stores the PDF locally,
-    and saves metadata to the relational database. This task is typically
-    the first step in processing arXiv papers.
+    Downloads a paper from arXiv using its ID through the local paper cache
+    (see utils.arxiv_cache), so papers fetched before are not downloaded
+    again, and saves metadata to the relational database. This task is
+    typically the first step in processing arXiv papers.
 
     Args:
-        arxiv_id (str): arXiv paper identifier (e.g., "2101.00123")
+        arxiv_id (str): arXiv paper identifier (e.g., "2101.00123"), with or
+            without version
 
     Returns:
         dict: Contains:
@@ -103,28 +223,23 @@ def download_arxiv(arxiv_id: str) -> dict:
     print(f"Downloading arXiv paper {arxiv_id}")
 
     try:
-        # Create downloads directory
-        download_dir = os.path.join(settings.DATA_DIR, 'arxiv')
-        os.makedirs(download_dir, exist_ok=True)
-
-        # Download paper using arxiv API
-        search = arxiv.Search(id_list=[arxiv_id])
-        paper = next(search.results())
-
-        # Download PDF
-        pdf_path = os.path.join(download_dir, f"{arxiv_id}.pdf")
-        paper.download_pdf(filename=pdf_path)
-        print(f"Downloaded PDF to {pdf_path}")
+        paper = run_async(_download_papers([arxiv_id]))[arxiv_id]
+        if isinstance(paper, Exception):
+            raise paper
+        pdf_path = paper.pdf_path
+        print(f"{'Found cached' if paper.cached else 'Downloaded'} PDF at {pdf_path}")
 
         # Store metadata
         rel_db = get_sync_relational_db()
         metadata = {
             "arxiv_id": arxiv_id,
-            "title": paper.title,
-            "authors": [str(author) for author in paper.authors],
-            "abstract": paper.summary,
-            "categories": paper.categories,
+            "version": paper.metadata["version"],
+            "title": paper.metadata["title"],
+            "authors": paper.metadata["authors"],
+            "abstract": paper.metadata["abstract"],
+            "categories": paper.metadata["categories"],
             "pdf_path": pdf_path,
+            "sha256": paper.sha256,
             "status": "downloaded"
         }
         doc_id = rel_db.store_document({
@@ -132,6 +247,7 @@ def download_arxiv(arxiv_id: str) -> dict:
             "data_type": "arxiv_paper",
             "data_value": metadata
         })
+        bump_generation()
 
         return {"doc_id": doc_id, "pdf_path": pdf_path}
 
@@ -139,7 +255,38 @@ def download_arxiv(arxiv_id: str) -> dict:
         print(f"Error downloading arXiv paper: {str(e)}")
         raise
 
+@shared_task(name='document.prefetch_arxiv')
+def prefetch_arxiv(arxiv_ids: List[str]) -> List[dict]:
+    """Download several arXiv papers into the local cache concurrently.
+
+    Fetches metadata in batched API requests and PDFs with bounded
+    concurrency, so the download_arxiv tasks that follow find their papers
+    cached. Nothing is stored in the databases.
+
+    Args:
+        arxiv_ids (List[str]): arXiv paper identifiers
+
+    Returns:
+        List[dict]: One entry per id with arxiv_id and either pdf_path and
+            cached, or error
+
+    Example:
+        ```python
+        prefetch_arxiv.delay(["2101.00123", "1706.03762"]).get()
+        ```
+    """
+    print(f"Prefetching {len(arxiv_ids)} arXiv papers")
+    results = []
+    for arxiv_id, paper in run_async(_download_papers(arxiv_ids)).items():
+        if isinstance(paper, Exception):
+            print(f"Error prefetching arXiv paper {arxiv_id}: {str(paper)}")
+            results.append({"arxiv_id": arxiv_id, "error": str(paper)})
+        else:
+            results.append({"arxiv_id": arxiv_id, "pdf_path": paper.pdf_path, "cached": paper.cached})
+    return results
+
 @shared_task(name='document.process_document')
+@profiled
 async def process_document(document_path: str) -> dict:
     """Process PDF document and extract text content.
 
@@ -153,7 +300,14 @@ async def process_document(document_path: str) -> dict:
     Returns:
         dict: Contains:
             - doc_id (str): UUID of processed document
-            - text (str): Extracted text content
+            - text (str): Extracted text content, the stored text for exact
+              duplicates
+            - duplicate (str, optional): "exact" if the file was ingested
+              before, "near" if its text matches an ingested document; doc_id
+              is then the existing document's ID
+            - chunks (List[dict]): Chunks still to extract and embed (all
+              chunks for new documents, changed ones for near duplicates,
+              ones an earlier run left unfinished for exact duplicates)
 
     Raises:
         FileNotFoundError: If document does not exist
@@ -176,14 +330,44 @@ async def process_document(document_path: str) -> dict:
         raise FileNotFoundError(f"PDF file not found: {document_path}")
 
     try:
+        rel_db = get_sync_relational_db()
+
+        # Exact duplicates are detected before partitioning
+        sha256 = file_sha256(document_path)
+        if settings.DEDUP_ENABLED:
+            known = rel_db.get_fingerprint(sha256)
+            if known:
+                # An earlier run may have stopped before every chunk was
+                # extracted and embedded; pass those chunks on
+                print(f"Document already ingested as {known['document_id']}, resuming unfinished chunks")
+                return {**stage_input(rel_db, known["document_id"]), "duplicate": "exact"}
+
         print("Processing PDF document...")
         # Process PDF using process_pdf function
         text = await process_pdf(document_path)
+        record_bytes("pdf_parsed", os.path.getsize(document_path))
         print(f"Extracted {len(text)} characters of text")
 
+        fingerprint = DocumentFingerprint.from_text(sha256, text)
+        if settings.DEDUP_ENABLED:
+            similar = rel_db.find_similar_fingerprints(fingerprint.simhash, settings.DEDUP_SIMHASH_DISTANCE)
+            if similar:
+                existing_id = similar[0]["document_id"]
+                print(f"Document is a near duplicate of {existing_id} "
+                      f"(distance {similar[0]['distance']}), updating changed chunks")
+                rel_db.store_fingerprint(fingerprint, existing_id)
+                rel_db.update_document(existing_id, {"path": document_path, "content": text, "sha256": sha256})
+                diff = sync_chunk_manifest(rel_db, existing_id, text)
+                bump_generation()
+                return {
+                    "doc_id": existing_id,
+                    "text": text,
+                    "duplicate": "near",
+                    "chunks": diff.added
+                }
+
         # Store document metadata
         print("Storing document in relational database...")
-        rel_db = get_sync_relational_db()
         doc_id = uuid4()
         doc_data = {
             "data_id": doc_id,
@@ -191,19 +375,141 @@ async def process_document(document_path: str) -> dict:
             "data_value": {
                 "path": document_path,
                 "content": text,
+                "sha256": sha256,
                 "status": "processed",
                 "type": "document"
             }
         }
         rel_db.store_document(doc_data)
+        rel_db.store_fingerprint(fingerprint, str(doc_id))
+        diff = sync_chunk_manifest(rel_db, str(doc_id), text)
+        bump_generation()
         print(f"Document stored with ID: {doc_id}")
 
-        return {"doc_id": str(doc_id), "text": text}
+        return {"doc_id": str(doc_id), "text": text, "chunks": diff.added}
     except Exception as e:
         print(f"Error in process_document: {str(e)}")
         raise
 
+@shared_task(name='document.stream_document')
+def stream_document(document_path: str) -> dict:
+    """Ingest a PDF document with the streaming pipeline.
+
+    Synchronous entry point running ``_stream_document`` on a fresh event
+    loop, so the worker executes the pipeline rather than returning an
+    unawaited coroutine.
+
+    Args:
+        document_path (str): Path to the PDF document
+
+    Returns:
+        dict: Result of ``_stream_document``
+
+    Example:
+        ```python
+        result = stream_document.delay("/path/to/paper.pdf").get()
+        print(f"{result['chunks']} chunks, {result['entities']} entities")
+        ```
+    """
+    return asyncio.run(_stream_document(document_path))
+
+async def _stream_document(document_path: str) -> dict:
+    """Ingest a PDF document with the streaming pipeline.
+
+    Runs partitioning, chunking, embedding, extraction and storage as one
+    pipeline of bounded stages (see processors.pipeline), so chunks are
+    stored while later pages are still being parsed and the document text
+    is never held in memory as a whole. The document row therefore keeps
+    no ``content``; its text lives in the chunk embeddings. The document
+    embedding is the mean of its chunk embeddings.
+
+    Exact duplicates are skipped; their fingerprint is only registered once
+    the whole pipeline succeeded, so a failed run is repeated. Near duplicates
+    can only be recognized once the whole text was seen; they are ingested
+    as new documents and their fingerprint registered.
+
+    Args:
+        document_path (str): Path to the PDF document
+
+    Returns:
+        dict: Contains:
+            - status (str): "completed"
+            - doc_id (str): UUID of the document, or of the existing
+              document for exact duplicates
+            - duplicate (str, optional): "exact" for known files
+            - chunks (int): Chunks stored
+            - entities (int): Entities stored
+            - relationships (int): Relationships stored
+
+    Raises:
+        FileNotFoundError: If document does not exist
+        Exception: If any pipeline stage fails
+
+    Example:
+        ```python
+        result = await _stream_document("/path/to/paper.pdf")
+        print(f"{result['chunks']} chunks, {result['entities']} entities")
+        ```
+    """
+    print(f"Starting streaming ingest for {document_path}")
+    if not os.path.exists(document_path):
+        raise FileNotFoundError(f"PDF file not found: {document_path}")
+
+    try:
+        rel_db = get_sync_relational_db()
+        sha256 = file_sha256(document_path)
+        if settings.DEDUP_ENABLED:
+            known = rel_db.get_fingerprint(sha256)
+            if known:
+                print(f"Document already ingested as {known['document_id']}, skipping")
+                return {"status": "completed", "doc_id": known["document_id"], "duplicate": "exact",
+                        "chunks": 0, "entities": 0, "relationships": 0}
+
+        doc_id = uuid4()
+        rel_db.store_document({
+            "data_id": doc_id,
+            "data_type": "document",
+            "data_value": {
+                "path": document_path,
+                "sha256": sha256,
+                "status": "processing",
+                "type": "document"
+            }
+        })
+
+        vector_db = get_sync_vector_db()
+        pipeline = StreamingPipeline(
+            str(doc_id), rel_db, get_sync_graph_db(), vector_db,
+            QwenClient(api_key=settings.QWEN_API_KEY), embed_texts
+        )
+        result = await pipeline.run(iter_partition_pdf(document_path))
+        record_bytes("pdf_parsed", os.path.getsize(document_path))
+        print(f"Streamed {result.chunks} chunks in {result.flushes} writes "
+              f"(peak queue sizes {result.peak_queue_sizes})")
+
+        rel_db.store_fingerprint(DocumentFingerprint(sha256, result.simhash, result.size), str(doc_id))
+        if result.document_embedding is not None:
+            vector_db.store_embedding(
+                f"doc_{doc_id}",
+                result.document_embedding,
+                {"type": "document", "path": document_path}
+            )
+        rel_db.update_document(str(doc_id), {"status": "content_extracted", "chunks": result.chunks})
+        bump_generation()
+
+        return {
+            "status": "completed",
+            "doc_id": str(doc_id),
+            "chunks": result.chunks,
+            "entities": result.entities,
+            "relationships": result.relationships
+        }
+    except Exception as e:
+        print(f"Error in stream_document: {str(e)}")
+        raise
+
 @shared_task(name='document.extract_knowledge_graph')
+@profiled
 async def extract_knowledge_graph(result_dict: dict) -> dict:
     """Extract knowledge graph from document text.
 
@@ -211,14 +517,19 @@ async def extract_knowledge_graph(result_dict: dict) -> dict:
     and stores them in the Neo4j graph database. This task is typically
     chained after process_document.
 
+    When ``result_dict`` carries the ``chunks`` produced by process_document,
+    only chunks without stored entities are extracted and the IDs of the new
+    entities are recorded in the chunk manifest.
+
     Args:
         result_dict (dict): Contains:
             - doc_id (str): Document UUID
             - text (str): Document text content
+            - chunks (List[dict], optional): Chunks to extract
 
     Returns:
         dict: Contains:
-            - status (str): "completed" or "failed"
+            - status (str): "completed", "failed" or "skipped" for duplicates
             - doc_id (str): Document UUID
             - entities (List[dict]): Extracted entities
             - relationships (List[dict]): Extracted relationships
@@ -239,22 +550,67 @@ async def extract_knowledge_graph(result_dict: dict) -> dict:
     """
     doc_id = result_dict.get("doc_id")
     text = result_dict.get("text")
+    chunks = result_dict.get("chunks")
+    if result_dict.get("duplicate") == "exact" and not chunks:
+        print(f"Skipping knowledge graph extraction for duplicate document {doc_id}")
+        return {"status": "skipped", "doc_id": doc_id, "duplicate": result_dict["duplicate"]}
 
     print(f"Starting knowledge graph extraction for document {doc_id}")
     try:
         # Initialize QwenClient
         client = QwenClient(api_key=settings.QWEN_API_KEY)
 
-        # Extract entities and relationships using async calls
-        entities = await client.extract_entities(text)
-        relationships = await client.extract_relationships(text)
-
-        # Store in graph database
-        graph_db = get_sync_graph_db()
-        for entity in entities:
-            graph_db.store_entity(Entity(**entity))
-        for rel in relationships:
-            graph_db.store_relationship(Relationship(**rel))
+        # Extract entities and relationships using async calls, reporting
+        # chunk progress under the workflow task
+        from .workflow import STAGES
+        pending = None
+        with ProgressReporter.for_task(extract_knowledge_graph, parent=True, stages=STAGES) as reporter:
+            if chunks is None:
+                reporter.stage("extracted", total=1)
+                entities = await client.extract_entities(text)
+                relationships = await client.extract_relationships(text)
+                reporter.advance()
+            else:
+                pending = [chunk for chunk in chunks if chunk.get("entity_ids") is None]
+                reporter.stage("extracted", total=len(pending))
+                entities, relationships, counts, relation_counts = [], [], [], []
+                for chunk in pending:
+                    chunk_entities = await client.extract_entities(chunk["text"])
+                    chunk_relationships = await client.extract_relationships(chunk["text"])
+                    entities.extend(chunk_entities)
+                    relationships.extend(chunk_relationships)
+                    counts.append(len(chunk_entities))
+                    relation_counts.append(len(chunk_relationships))
+                    reporter.advance()
+
+        # Store entities and the relationships between them in one transaction
+        document_id = entity_ids = relation_ids = None
+        if pending is not None:
+            # Ids derived from the chunks stay the same across attempts, so a
+            # retry after a failed manifest update merges what was stored
+            document_id = UUID(doc_id)
+            entity_ids = [id for chunk, count in zip(pending, counts)
+                          for id in stable_ids(document_id, chunk["content_hash"], count)]
+            relation_ids = [id for chunk, count in zip(pending, relation_counts)
+                            for id in stable_ids(document_id, f"{chunk['content_hash']}:relationships", count)]
+        batch = EntityBatch.from_records(entities, document_id=document_id, ids=entity_ids)
+        relations = RelationBatch.from_records(relationships, document_id=document_id, ids=relation_ids)
+        from ..database.graph import get_graph_db
+        graph_db = get_graph_db()
+        await graph_db.connect()
+        try:
+            await await_db(graph_db.store_graph(batch, relations))
+        finally:
+            await graph_db.disconnect()
+
+        if pending:
+            # Remember which entities came from which chunk for later retraction
+            ids, start, results = batch.id_strings(), 0, {}
+            for chunk, count in zip(pending, counts):
+                results[chunk["content_hash"]] = ids[start:start + count]
+                start += count
+            get_sync_relational_db().update_chunk_results(doc_id, "entity_ids", results)
+        bump_generation()
 
         return {
             "status": "completed",
@@ -272,6 +628,7 @@ async def extract_knowledge_graph(result_dict: dict) -> dict:
         }
 
 @shared_task(name='document.extract_content')
+@profiled
 def extract_content(result_dict: dict) -> dict:
     """Extract and store content in vector and relational databases.
 
@@ -279,14 +636,19 @@ def extract_content(result_dict: dict) -> dict:
     model and stores them in the Chroma vector database. Updates document status
     in MySQL database. This task is typically chained after process_document.
 
+    When ``result_dict`` carries the ``chunks`` produced by process_document,
+    chunks without a stored embedding are also embedded (in batches) and
+    stored as ``chunk_{doc_id}_{hash}`` vectors recorded in the manifest.
+
     Args:
         result_dict (dict): Contains:
             - doc_id (str): Document UUID
             - text (str): Document text content
+            - chunks (List[dict], optional): Chunks to embed
 
     Returns:
         dict: Contains:
-            - status (str): "success"
+            - status (str): "success", or "skipped" for duplicates
             - doc_id (str): Document UUID
             - embedding_id (str): ID of stored embedding
 
@@ -311,6 +673,10 @@ def extract_content(result_dict: dict) -> dict:
     """
     doc_id = result_dict.get("doc_id")
     text = result_dict.get("text")
+    chunks = result_dict.get("chunks")
+    if result_dict.get("duplicate") == "exact" and not chunks:
+        print(f"Skipping content extraction for duplicate document {doc_id}")
+        return {"status": "skipped", "doc_id": doc_id, "embedding_id": f"doc_{doc_id}"}
 
     print(f"Starting content extraction for document {doc_id}")
     try:
@@ -322,28 +688,51 @@ def extract_content(result_dict: dict) -> dict:
             raise ValueError(f"Document not found: {doc_id}")
         print(f"Retrieved document with {len(doc['content'])} characters")
 
-        # Generate embeddings using dashscope
-        print("Generating embeddings for document content...")
-        resp = dashscope.TextEmbedding.call(
-            model=dashscope.TextEmbedding.Models.text_embedding_v3,
-            input=text,
-            dimension=1024,
-            output_type="dense"
-        )
-        if resp.status_code != HTTPStatus.OK:
-            raise Exception("Failed to generate embeddings")
-        content_embedding = resp.output["embeddings"][0]["embedding"]
-        print("Generated document embedding")
-
-        # Store in vector database
-        print("Storing document embedding in vector database...")
-        vector_db = get_sync_vector_db()
-        vector_db.store_embedding(
-            f"doc_{doc_id}",
-            content_embedding,
-            {"type": "document", "path": doc["path"]}
-        )
-        print("Document embedding stored successfully")
+        # Report embedded chunks under the workflow task
+        from .workflow import STAGES
+        pending = [chunk for chunk in chunks or [] if chunk.get("embedding_id") is None]
+        with ProgressReporter.for_task(extract_content, parent=True, stages=STAGES) as reporter:
+            reporter.stage("embedded", total=1 + len(pending))
+            # Generate embeddings using dashscope
+            print("Generating embeddings for document content...")
+            resp = call_dashscope(
+                "embedding",
+                dashscope.TextEmbedding.call,
+                model=dashscope.TextEmbedding.Models.text_embedding_v3,
+                input=text,
+                dimension=1024,
+                output_type="dense"
+            )
+            if resp.status_code != HTTPStatus.OK:
+                raise Exception("Failed to generate embeddings")
+            content_embedding = resp.output["embeddings"][0]["embedding"]
+            reporter.advance()
+            print("Generated document embedding")
+
+            # Store in vector database
+            print("Storing document embedding in vector database...")
+            vector_db = get_sync_vector_db()
+            vector_db.store_embedding(
+                f"doc_{doc_id}",
+                content_embedding,
+                {"type": "document", "path": doc["path"]}
+            )
+            print("Document embedding stored successfully")
+
+            if pending:
+                print(f"Generating embeddings for {len(pending)} chunks...")
+                embeddings = embed_texts([chunk["text"] for chunk in pending], reporter)
+                ids = [f"chunk_{doc_id}_{chunk['content_hash'][:16]}" for chunk in pending]
+                vector_db.add_embeddings(ids, embeddings, [
+                    {"type": "chunk", "document_id": doc_id, "chunk_index": chunk["index"],
+                     "content_hash": chunk["content_hash"]}
+                    for chunk in pending
+                ])
+                rel_db.update_chunk_results(doc_id, "embedding_id", {
+                    chunk["content_hash"]: id for chunk, id in zip(pending, ids)
+                })
+
+        bump_generation()
 
         # Update document status
         print("Updating document status...")
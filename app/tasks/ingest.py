@@ -0,0 +1,341 @@
+"""Backpressure-aware bulk ingestion for Ananke2.
+
+Large backfills (e.g. 100k arXiv ids) are run as ingest jobs instead of
+submitting every paper at once. A job's papers and progress are stored in
+the relational database, and a self-rescheduling ``ingest.tick`` task
+admits papers in small steps:
+- reap: papers whose workflow finished are marked completed or failed, as
+  are papers whose workflow is still unknown to the result backend after
+  INGEST_ITEM_TIMEOUT (its message was lost or its result expired)
+- adapt: the effective window halves while any stage queue (cpu-parse,
+  llm-io) is at INGEST_MAX_QUEUE_DEPTH and grows by one paper per
+  tick while all are below half of it (AIMD), so admissions follow what
+  Qwen, Neo4j and Chroma actually absorb
+- admit: at most ``effective window - in flight`` papers, limited by the
+  queue headroom and by a token bucket when a rate is set, are submitted
+  at backfill priority
+
+Jobs can be paused, resumed and throttled (window, rate) while running;
+since all state is persisted, a job also survives worker restarts. A tick
+that fails still schedules the next one; if the loop stops anyway (e.g. the
+broker was down), resuming the job restarts it.
+
+Example:
+    ```python
+    job_id = start_ingest(arxiv_ids, window=32, rate=120)
+    pause_ingest(job_id)
+    throttle_ingest(job_id, rate=30)
+    resume_ingest(job_id)
+    print(ingest_status(job_id)["counts"])
+    ```
+"""
+
+import math
+import time
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+from celery import states
+from . import celery_app, workflow
+from .queues import CPU_PARSE, LLM_IO, MAX_PRIORITY, PRIORITY_BACKFILL
+from ..database.sync_wrappers import get_sync_relational_db
+from ..utils.metrics import update_queue_depths
+from ..config import settings
+
+# Queues whose depth gates admissions
+STAGE_QUEUES = (CPU_PARSE, LLM_IO)
+
+# Smoothing factor of the throughput estimate
+THROUGHPUT_ALPHA = 0.3
+
+def queue_depths(queues=STAGE_QUEUES) -> Dict[str, int]:
+    """Count messages waiting in each queue on the Redis broker.
+
+    The Redis transport keeps one list per priority step, all of which are
+    summed.
+
+    Args:
+        queues: Queue names
+
+    Returns:
+        Dict[str, int]: Waiting messages per queue, empty if the broker
+            can't be reached (admissions are then only window-limited)
+    """
+    sep = celery_app.conf.broker_transport_options.get("sep", ":")
+    try:
+        with celery_app.connection_or_acquire() as conn:
+            client = conn.default_channel.client
+            return {
+                queue: sum(client.llen(f"{queue}{sep}{priority}" if priority else queue)
+                           for priority in range(MAX_PRIORITY + 1))
+                for queue in queues
+            }
+    except Exception as e:
+        print(f"Could not read queue depths: {str(e)}")
+        return {}
+
+def adapt_window(effective: float, window: int, depths: Dict[str, int], max_depth: int) -> float:
+    """Adapt the effective in-flight window to downstream congestion.
+
+    Args:
+        effective (float): Current effective window
+        window (int): Configured maximum window
+        depths (Dict[str, int]): Waiting messages per stage queue
+        max_depth (int): Queue depth considered congested
+
+    Returns:
+        float: New effective window between 1 and ``window``
+    """
+    fullest = max(depths.values(), default=0)
+    if fullest >= max_depth:
+        effective = effective / 2
+    elif fullest < max_depth / 2:
+        effective = effective + 1
+    return max(1.0, min(float(window), effective))
+
+def admission_budget(effective: float, in_flight: int, depths: Dict[str, int],
+                     max_depth: int, tokens: Optional[float]) -> int:
+    """Number of papers that may be admitted now.
+
+    Args:
+        effective (float): Effective in-flight window
+        in_flight (int): Papers submitted and not finished
+        depths (Dict[str, int]): Waiting messages per stage queue
+        max_depth (int): Queue depth considered congested
+        tokens (Optional[float]): Rate-limit tokens, None without a limit
+
+    Returns:
+        int: Papers to admit, never negative
+    """
+    budget = int(effective) - in_flight
+    if depths:
+        budget = min(budget, max_depth - max(depths.values()))
+    if tokens is not None:
+        budget = min(budget, math.floor(tokens))
+    return max(0, budget)
+
+def _schedule(job_id: str, generation: int, countdown: float = 0) -> None:
+    ingest_tick.apply_async((job_id, generation), countdown=countdown)
+
+def start_ingest(arxiv_ids: List[str], window: Optional[int] = None, rate: Optional[float] = None) -> str:
+    """Create an ingest job and start scheduling it.
+
+    Args:
+        arxiv_ids (List[str]): Papers in admission order; duplicates are dropped
+        window (Optional[int]): Maximum papers in flight. Defaults to
+            settings.INGEST_WINDOW.
+        rate (Optional[float]): Maximum admissions per minute, 0 for no
+            limit. Defaults to settings.INGEST_RATE.
+
+    Returns:
+        str: Job ID
+
+    Raises:
+        ValueError: If the window is smaller than 1 or the rate negative
+    """
+    window = window if window is not None else settings.INGEST_WINDOW
+    rate = rate if rate is not None else settings.INGEST_RATE
+    if window < 1 or rate < 0:
+        raise ValueError("Ingest window must be at least 1 and rate not negative")
+    job_id = str(uuid4())
+    get_sync_relational_db().create_ingest_job(job_id, list(dict.fromkeys(arxiv_ids)), window, rate, time.time())
+    _schedule(job_id, 0)
+    return job_id
+
+def ingest_status(job_id: str) -> Optional[Dict[str, Any]]:
+    """Return a job's controls, progress counts, throughput and ETA.
+
+    Args:
+        job_id (str): Job ID
+
+    Returns:
+        Optional[Dict[str, Any]]: Job state with "counts" by paper state and
+            "eta_seconds" (None while no throughput was measured), or None
+    """
+    job = get_sync_relational_db().get_ingest_job(job_id)
+    if job is None:
+        return None
+    counts = job["counts"]
+    remaining = counts.get("pending", 0) + counts.get("submitted", 0)
+    job["eta_seconds"] = remaining / job["throughput"] if job["throughput"] > 0 else None
+    return job
+
+def pause_ingest(job_id: str) -> bool:
+    """Stop admitting papers; papers in flight still finish.
+
+    Args:
+        job_id (str): Job ID
+
+    Returns:
+        bool: True if a running job was paused
+    """
+    rel_db = get_sync_relational_db()
+    job = rel_db.get_ingest_job(job_id)
+    if job is None or job["status"] != "running":
+        return False
+    return rel_db.update_ingest_job(job_id, {"status": "paused"})
+
+def resume_ingest(job_id: str) -> bool:
+    """Resume a paused job, or restart the loop of a stalled one.
+
+    A running job is stalled when it wasn't ticked for INGEST_STALL_SECONDS.
+
+    Args:
+        job_id (str): Job ID
+
+    Returns:
+        bool: True if a paused or stalled job was resumed
+    """
+    rel_db = get_sync_relational_db()
+    job = rel_db.get_ingest_job(job_id)
+    if job is None:
+        return False
+    stalled = job["status"] == "running" and time.time() - job["updated_at"] > settings.INGEST_STALL_SECONDS
+    if job["status"] != "paused" and not stalled:
+        return False
+    generation = job["generation"] + 1
+    rel_db.update_ingest_job(job_id, {"status": "running", "generation": generation, "updated_at": time.time()})
+    _schedule(job_id, generation)
+    return True
+
+def cancel_ingest(job_id: str) -> bool:
+    """Stop a job for good; papers in flight still finish.
+
+    Args:
+        job_id (str): Job ID
+
+    Returns:
+        bool: True if the job was running or paused
+    """
+    rel_db = get_sync_relational_db()
+    job = rel_db.get_ingest_job(job_id)
+    if job is None or job["status"] not in ("running", "paused"):
+        return False
+    return rel_db.update_ingest_job(job_id, {"status": "cancelled"})
+
+def throttle_ingest(job_id: str, window: Optional[int] = None, rate: Optional[float] = None) -> bool:
+    """Change a job's window and/or rate limit; takes effect on the next tick.
+
+    Args:
+        job_id (str): Job ID
+        window (Optional[int]): New maximum papers in flight
+        rate (Optional[float]): New maximum admissions per minute, 0 for no limit
+
+    Returns:
+        bool: True if the job exists
+
+    Raises:
+        ValueError: If the window is smaller than 1 or the rate negative
+    """
+    values = {}
+    if window is not None:
+        if window < 1:
+            raise ValueError("Ingest window must be at least 1")
+        values["window"] = window
+    if rate is not None:
+        if rate < 0:
+            raise ValueError("Ingest rate must not be negative")
+        values["rate"] = rate
+    rel_db = get_sync_relational_db()
+    if not values:
+        return rel_db.get_ingest_job(job_id) is not None
+    return rel_db.update_ingest_job(job_id, values)
+
+def _reap(rel_db: Any, job_id: str, limit: int, now: float) -> int:
+    """Mark finished or lost papers; returns the number that finished."""
+    updates = {}
+    for item in rel_db.list_ingest_items(job_id, "submitted", limit):
+        result = celery_app.AsyncResult(item["task_id"])
+        if not result.ready():
+            # Workflows report STARTED, so PENDING this long means unknown
+            submitted_at = item.get("submitted_at")
+            if (result.state == states.PENDING and submitted_at is not None
+                    and now - submitted_at > settings.INGEST_ITEM_TIMEOUT):
+                updates[item["position"]] = {"state": "failed",
+                                             "error": "Workflow task was lost or its result expired"}
+            continue
+        value = result.result if result.successful() else {"status": "failed", "error": str(result.result)}
+        if isinstance(value, dict) and value.get("status") == "failed":
+            updates[item["position"]] = {"state": "failed", "error": str(value.get("error", ""))[:1024]}
+        else:
+            updates[item["position"]] = {"state": "completed"}
+    if updates:
+        rel_db.update_ingest_items(job_id, updates)
+    return len(updates)
+
+@celery_app.task(name='ingest.tick')
+def ingest_tick(job_id: str, generation: int) -> Dict[str, Any]:
+    """Run one scheduling step of an ingest job and schedule the next.
+
+    The next tick is scheduled even if this one fails, unless the job
+    finished, stopped or the tick is stale.
+
+    Args:
+        job_id (str): Job ID
+        generation (int): Scheduling loop the tick belongs to; ticks of an
+            older generation (from before a pause/resume) stop
+
+    Returns:
+        Dict[str, Any]: Contains:
+            - status (str): Job status after the tick, or "stale"
+            - admitted (int): Papers submitted by this tick
+            - in_flight (int): Papers submitted and not finished
+    """
+    status = "running"
+    try:
+        rel_db = get_sync_relational_db()
+        job = rel_db.get_ingest_job(job_id)
+        if job is None or job["generation"] != generation:
+            status = "stale"
+            return {"status": status, "admitted": 0, "in_flight": 0}
+        status = job["status"]
+        if status != "running":
+            return {"status": status, "admitted": 0, "in_flight": job["counts"].get("submitted", 0)}
+
+        now = time.time()
+        elapsed = max(now - job["updated_at"], 1e-3)
+        in_flight = job["counts"].get("submitted", 0)
+        finished = _reap(rel_db, job_id, max(in_flight, 1), now)
+        in_flight -= finished
+        throughput = (1 - THROUGHPUT_ALPHA) * job["throughput"] + THROUGHPUT_ALPHA * finished / elapsed
+
+        max_depth = settings.INGEST_MAX_QUEUE_DEPTH
+        depths = queue_depths()
+        update_queue_depths(depths)
+        effective = adapt_window(job["effective_window"], job["window"], depths, max_depth)
+        tokens = None
+        if job["rate"] > 0:
+            # Allow a burst of one tick's worth of admissions at most
+            burst = max(1.0, job["rate"] / 60 * settings.INGEST_TICK_SECONDS)
+            tokens = min(burst, job["tokens"] + job["rate"] / 60 * elapsed)
+        budget = admission_budget(effective, in_flight, depths, max_depth, tokens)
+
+        admitted = {}
+        for item in rel_db.list_ingest_items(job_id, "pending", budget) if budget else []:
+            result = workflow.process_document_workflow.apply_async((item["arxiv_id"],), priority=PRIORITY_BACKFILL)
+            admitted[item["position"]] = {"state": "submitted", "task_id": result.id, "submitted_at": now}
+        if admitted:
+            rel_db.update_ingest_items(job_id, admitted)
+        in_flight += len(admitted)
+
+        pending = job["counts"].get("pending", 0) - len(admitted)
+        values = {
+            "effective_window": effective,
+            "tokens": (tokens - len(admitted)) if tokens is not None else 0.0,
+            "throughput": throughput,
+            "updated_at": now
+        }
+        if pending <= 0 and in_flight <= 0:
+            values["status"] = "completed"
+        # Status is otherwise left alone so a pause during the tick isn't overwritten
+        rel_db.update_ingest_job(job_id, values)
+        status = values.get("status", "running")
+        print(f"Ingest {job_id}: admitted {len(admitted)}, {in_flight} in flight, {pending} pending, "
+              f"window {effective:.1f}, depths {depths}")
+        return {"status": status, "admitted": len(admitted), "in_flight": in_flight}
+    except Exception as e:
+        print(f"Ingest tick of {job_id} failed: {str(e)}")
+        raise
+    finally:
+        # Also after a failed tick, so an error doesn't end the job's loop
+        if status == "running":
+            _schedule(job_id, generation, countdown=settings.INGEST_TICK_SECONDS)
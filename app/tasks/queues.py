@@ -0,0 +1,103 @@
+"""Celery queues, task routing and priorities for Ananke2.
+
+Tasks are routed by workload to dedicated queues, each consumed by workers
+with a matching pool:
+- cpu-parse: PDF partitioning, prefork pool with one process per CPU
+- llm-io: DashScope/Qwen calls and arXiv downloads, thread pool (or
+  gevent) with many slots since tasks mostly wait on the network
+- interactive: workflow orchestration started by API requests and ingest
+  scheduling ticks, thread pool
+- batch: batch orchestration, small thread pool. A batch blocks on the
+  workflows it starts, so it must not occupy the slots they run in.
+
+Database writes run inside the stage tasks, batched per document, rather
+than as tasks of their own.
+
+Messages carry a priority (0 is served first by the Redis transport).
+Uploads and API requests are sent with PRIORITY_INTERACTIVE and batch
+backfills with PRIORITY_BACKFILL; subtasks inherit their parent's priority,
+so a user's upload overtakes queued backfill work at every stage.
+
+Example:
+    ```bash
+    # One worker per queue, with the pool and concurrency of its profile
+    celery -A app.tasks $(python -m app.tasks.queues cpu-parse)
+    ```
+"""
+
+import os
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+from kombu import Queue
+from ..config import settings
+
+CPU_PARSE = "cpu-parse"
+LLM_IO = "llm-io"
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+# Lower numbers are served first by the Redis transport
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 5
+PRIORITY_BACKFILL = 9
+MAX_PRIORITY = 9
+
+TASK_QUEUES = [
+    Queue(name, routing_key=name, queue_arguments={"x-max-priority": MAX_PRIORITY})
+    for name in (CPU_PARSE, LLM_IO, INTERACTIVE, BATCH)
+]
+
+TASK_ROUTES = {
+    "document.process_document": {"queue": CPU_PARSE},
+    "document.stream_document": {"queue": CPU_PARSE},
+    "document.download_arxiv": {"queue": LLM_IO},
+    "document.prefetch_arxiv": {"queue": LLM_IO},
+    "document.extract_knowledge_graph": {"queue": LLM_IO},
+    "document.extract_content": {"queue": LLM_IO},
+    "workflow.process_documents_batch": {"queue": BATCH},
+    "workflow.*": {"queue": INTERACTIVE},
+    "ingest.*": {"queue": INTERACTIVE}
+}
+
+def worker_profiles() -> Dict[str, Dict[str, Any]]:
+    """Pool type and concurrency of the worker consuming each queue.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Queue name to {"pool", "concurrency"}
+    """
+    return {
+        CPU_PARSE: {"pool": "prefork", "concurrency": settings.CELERY_CPU_CONCURRENCY or os.cpu_count() or 1},
+        LLM_IO: {"pool": settings.CELERY_IO_POOL, "concurrency": settings.CELERY_IO_CONCURRENCY},
+        INTERACTIVE: {"pool": "threads", "concurrency": settings.CELERY_INTERACTIVE_CONCURRENCY},
+        BATCH: {"pool": "threads", "concurrency": settings.CELERY_BATCH_CONCURRENCY}
+    }
+
+def worker_args(queue: str) -> List[str]:
+    """Build ``celery worker`` arguments for a queue's worker.
+
+    Args:
+        queue (str): Queue name
+
+    Returns:
+        List[str]: Arguments following ``celery -A app.tasks``
+
+    Raises:
+        KeyError: If the queue is unknown
+    """
+    profile = worker_profiles()[queue]
+    return [
+        "worker", "--queues", queue, "--pool", profile["pool"],
+        "--concurrency", str(profile["concurrency"]), "--hostname", f"{queue}@%h"
+    ]
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Print the worker arguments of a queue."""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1 or argv[0] not in worker_profiles():
+        print(f"usage: python -m app.tasks.queues {{{','.join(worker_profiles())}}}", file=sys.stderr)
+        return 2
+    print(" ".join(worker_args(argv[0])))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
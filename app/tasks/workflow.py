@@ -6,34 +6,143 @@ in the Ananke2 knowledge framework. It orchestrates:
 - Batch document processing
 - Task chaining and error handling
 - Result aggregation and status tracking
+
+Each paper's progress through the workflow stages (STAGES) is checkpointed
+in the relational database. Running the workflow again for a paper resumes
+after its last completed stage, so a retry after a transient failure only
+repeats the stage that failed. The stages themselves are idempotent: chunk
+results are tracked in the chunk manifest and vectors are upserted under
+deterministic IDs.
 """
 
-from typing import Dict, Any, List
+import os
+import time
+from typing import Dict, Any, List, Optional
 from celery import shared_task
 from . import celery_app, document
+from .document import stage_input
+from .queues import PRIORITY_BACKFILL
+from ..database.cache import bump_generation
+from ..database.sync_wrappers import get_sync_relational_db
+from ..utils.metrics import STAGE_DURATION
+from ..utils.progress import ProgressReporter
+from ..utils.tracing import close_span, open_span, set_attributes
+from ..config import settings
+
+# Workflow stages in order. process_document partitions and chunks in one
+# task, so "partitioned" and "chunked" complete together.
+STAGES = ("downloaded", "partitioned", "chunked", "extracted", "embedded", "indexed")
+
+class StageCheckpoints:
+    """Completed workflow stages of one paper, persisted as they finish.
+
+    The time since the previous checkpoint is reported as the duration of
+    each completed stage. A stage started with ``begin`` is also reported
+    to the progress reporter and traced as a span until it completes or
+    fails.
+
+    Args:
+        rel_db: Synchronous relational database
+        document_key (str): Workflow input the stages belong to (arXiv id)
+        restart (bool): Forget earlier checkpoints and run every stage
+        reporter (Optional[ProgressReporter]): Progress of the workflow task
+    """
+
+    def __init__(self, rel_db: Any, document_key: str, restart: bool = False,
+                 reporter: Optional[ProgressReporter] = None):
+        self.rel_db = rel_db
+        self.document_key = document_key
+        self.reporter = reporter
+        if restart:
+            rel_db.reset_stages(document_key)
+        self.stages = {} if restart else rel_db.get_stages(document_key)
+        self._started = time.perf_counter()
+        self._span = None
+
+    def result(self, stage: str) -> Optional[Dict[str, Any]]:
+        """Return a stage's recorded result, or None unless it completed."""
+        row = self.stages.get(stage)
+        if row is None or row["status"] != "completed":
+            return None
+        return row["result"] or {}
+
+    def resume_stage(self) -> Optional[str]:
+        """Return the first stage that hasn't completed, None when all did."""
+        return next((stage for stage in STAGES if self.result(stage) is None), None)
+
+    def begin(self, stage: str) -> None:
+        """Report a stage as started and open its span."""
+        self._end_span()
+        if self.reporter is not None:
+            self.reporter.stage(stage)
+        # Subtasks sent during the stage become children of its span
+        self._span = (stage, open_span(f"stage.{stage}", {"ananke.stage": stage}))
+
+    def _end_span(self, stage: Optional[str] = None, error: Optional[str] = None) -> None:
+        if self._span is not None and stage in (None, self._span[0]):
+            close_span(self._span[1], Exception(error) if error else None)
+            self._span = None
+
+    def complete(self, stage: str, result: Optional[Dict[str, Any]] = None) -> None:
+        """Record a completed stage."""
+        self.rel_db.record_stage(self.document_key, stage, "completed", time.time(), result=result)
+        self.stages[stage] = {"status": "completed", "result": result}
+        now = time.perf_counter()
+        STAGE_DURATION.labels(stage=stage).observe(now - self._started)
+        self._started = now
+        self._end_span(stage)
+
+    def fail(self, stage: str, error: str) -> None:
+        """Record a failed stage attempt; never raises."""
+        self._end_span(error=error)
+        try:
+            self.rel_db.record_stage(self.document_key, stage, "failed", time.time(), error=error)
+            self.stages[stage] = {"status": "failed", "result": None}
+        except Exception as e:
+            print(f"Error recording failed stage {stage} of {self.document_key}: {str(e)}")
 
 @celery_app.task(name='workflow.process_document_workflow')
-def process_document_workflow(document_id: str) -> Dict[str, Any]:
+def process_document_workflow(document_id: str, restart: bool = False) -> Dict[str, Any]:
     """Execute complete document processing workflow for a single arXiv paper.
 
     Orchestrates the full document processing pipeline by chaining multiple tasks:
-    1. Download arXiv paper and store metadata
-    2. Process PDF and extract text content
-    3. Extract knowledge graph (entities and relationships)
-    4. Generate and store content embeddings
+    1. Download arXiv paper and store metadata (downloaded)
+    2. Process PDF and extract text content (partitioned, chunked)
+    3. Extract knowledge graph (entities and relationships) (extracted)
+    4. Generate and store content embeddings (embedded)
+    5. Mark the document searchable and invalidate cached queries (indexed)
+
+    Each stage is checkpointed; a repeated call resumes after the last
+    completed stage. Progress is reported as the stage starts, and the
+    extraction and embedding tasks report their chunks under this task's ID
+    (see utils/progress.py).
 
     Args:
         document_id (str): arXiv paper identifier (e.g., "2101.00123")
+        restart (bool): Ignore checkpoints and run every stage again
 
     Returns:
         Dict[str, Any]: Contains:
             - status (str): "completed" or "failed"
             - task_id (str): Celery task ID
             - document_id (str): Input document ID
+            - doc_id (str): UUID of the stored document, once known
             - entities (List[dict]): Extracted entities if successful
             - relationships (List[dict]): Extracted relationships if successful
+            - resumed_from (str, optional): First stage run by this call if
+              earlier stages were already completed, None if all were
+            - duplicate (str, optional): "exact" or "near" if the paper was
+              already ingested; doc_id then names the existing document. Exact
+              duplicates skip extraction unless the existing document has
+              unfinished chunks, near duplicates only extract their changed
+              chunks
+            - stage (str, optional): Stage that failed
             - error (str, optional): Error message if failed
 
+        With settings.STREAMING_INGEST the paper is ingested by
+        document.stream_document instead, and entities, relationships and
+        chunks are counts.
+
     Example:
         ```python
         # Process single arXiv paper
@@ -42,29 +151,119 @@ def process_document_workflow(document_id: str) -> Dict[str, Any]:
         if result['status'] == 'completed':
             print(f"Extracted {len(result['entities'])} entities")
         else:
-            print(f"Processing failed: {result.get('error')}")
+            print(f"Processing failed at {result.get('stage')}: {result.get('error')}")
+            # Retrying only runs the failed stage and the ones after it
+            result = process_document_workflow.delay("2101.00123").get()
         ```
     """
+    stage = STAGES[0]
+    try:
+        rel_db = get_sync_relational_db()
+        reporter = ProgressReporter.for_task(process_document_workflow, stages=STAGES)
+        checkpoints = StageCheckpoints(rel_db, document_id, restart=restart, reporter=reporter)
+    except Exception as e:
+        return {'status': 'failed', 'stage': stage, 'error': str(e), 'document_id': document_id}
+
+    response = {
+        'status': 'completed',
+        'task_id': process_document_workflow.request.id,
+        'document_id': document_id
+    }
+    set_attributes({"ananke.document_id": document_id})
+    resumed_from = checkpoints.resume_stage()
+    if resumed_from != STAGES[0]:
+        response['resumed_from'] = resumed_from
+        print(f"Resuming workflow for {document_id} at stage {resumed_from}")
     try:
-        # Chain arXiv processing tasks
-        result = document.download_arxiv.delay(arxiv_id=document_id)
-        download_result = result.get()
+        download_result = checkpoints.result(stage)
+        if download_result is None or not os.path.exists(download_result["pdf_path"]):
+            checkpoints.begin(stage)
+            download_result = document.download_arxiv.delay(arxiv_id=document_id).get()
+            checkpoints.complete(stage, {"doc_id": download_result["doc_id"],
+                                         "pdf_path": download_result["pdf_path"]})
+
+        if settings.STREAMING_INGEST:
+            # Parse, extract and embed in one pipeline; results hold counts only
+            stage = "partitioned"
+            stream_result = checkpoints.result("embedded")
+            if stream_result is None:
+                checkpoints.begin(stage)
+                stream_result = document.stream_document.delay(download_result["pdf_path"]).get()
+                stream_result = {key: value for key, value in stream_result.items() if key != "status"}
+                for completed in STAGES[1:5]:
+                    checkpoints.complete(completed, stream_result)
+            doc_id = stream_result["doc_id"]
+            set_attributes({"ananke.doc_id": doc_id})
+
+            stage = "indexed"
+            if checkpoints.result(stage) is None:
+                checkpoints.begin(stage)
+                rel_db.update_document(doc_id, {"status": "indexed"})
+                bump_generation()
+                checkpoints.complete(stage, {"doc_id": doc_id})
+            return {**response, **stream_result}
 
-        process_result = document.process_document.delay(download_result["pdf_path"]).get()
-        kg_result = document.extract_knowledge_graph.delay(process_result).get()
-        content_result = document.extract_content.delay(process_result).get()
+        stage = "partitioned"
+        payload = None
+        chunked = checkpoints.result("chunked")
+        if chunked is None:
+            checkpoints.begin(stage)
+            payload = document.process_document.delay(download_result["pdf_path"]).get()
+            chunked = {"doc_id": payload["doc_id"], "duplicate": payload.get("duplicate")}
+            checkpoints.complete("partitioned", chunked)
+            checkpoints.complete("chunked", chunked)
+        doc_id = chunked["doc_id"]
+        response['doc_id'] = doc_id
+        set_attributes({"ananke.doc_id": doc_id})
+        if chunked.get("duplicate"):
+            response['duplicate'] = chunked["duplicate"]
+
+        if chunked.get("duplicate") == "exact" and checkpoints.result("extracted") is None:
+            # Already ingested: only finish chunks an earlier run left incomplete
+            payload = payload or stage_input(rel_db, doc_id)
+            if not payload["chunks"]:
+                for completed in STAGES[3:]:
+                    checkpoints.complete(completed, {"entities": [], "relationships": []})
+                return {**response, 'entities': [], 'relationships': []}
+
+        stage = "extracted"
+        kg_result = checkpoints.result(stage)
+        if kg_result is None:
+            checkpoints.begin(stage)
+            payload = payload or stage_input(rel_db, doc_id)
+            kg_result = document.extract_knowledge_graph.delay(payload).get()
+            if kg_result.get("status") == "failed":
+                raise Exception(kg_result.get("error", "Knowledge graph extraction failed"))
+            kg_result = {"entities": kg_result.get("entities", []),
+                         "relationships": kg_result.get("relationships", [])}
+            checkpoints.complete(stage, kg_result)
+
+        stage = "embedded"
+        if checkpoints.result(stage) is None:
+            checkpoints.begin(stage)
+            payload = payload or stage_input(rel_db, doc_id)
+            content_result = document.extract_content.delay(payload).get()
+            checkpoints.complete(stage, {"embedding_id": content_result.get("embedding_id")})
+
+        stage = "indexed"
+        if checkpoints.result(stage) is None:
+            checkpoints.begin(stage)
+            rel_db.update_document(doc_id, {"status": "indexed"})
+            bump_generation()
+            checkpoints.complete(stage, {"doc_id": doc_id})
 
         return {
-            'status': 'completed',
-            'task_id': result.id,
-            'document_id': document_id,
+            **response,
             'entities': kg_result.get('entities', []),
             'relationships': kg_result.get('relationships', [])
         }
 
     except Exception as e:
+        print(f"Workflow for {document_id} failed at stage {stage}: {str(e)}")
+        checkpoints.fail(stage, str(e))
         return {
             'status': 'failed',
+            'stage': stage,
             'error': str(e),
             'document_id': document_id
         }
@@ -75,7 +274,13 @@ def process_documents_batch(document_ids: List[str]) -> List[Dict[str, Any]]:
 
     Executes the complete document processing workflow for multiple papers
     in parallel using Celery's task distribution. Each paper is processed
-    independently, and failures in one document don't affect others.
+    independently, and failures in one document don't affect others. PDFs
+    of all papers are first downloaded concurrently into the local cache.
+    Papers run at backfill priority, behind interactive uploads. The batch
+    itself runs on the batch queue, so waiting for the papers' workflows
+    doesn't take the interactive slots they run in. For large
+    backfills use an ingest job (tasks.ingest.start_ingest), which admits
+    papers at the pace downstream stages can absorb.
 
     Args:
         document_ids (List[str]): List of arXiv paper identifiers
@@ -99,10 +304,16 @@ def process_documents_batch(document_ids: List[str]) -> List[Dict[str, Any]]:
         print(f"Successfully processed {success_count}/{len(papers)} papers")
         ```
     """
+    try:
+        # Download all papers concurrently up front; each workflow then hits the cache
+        document.prefetch_arxiv.apply_async((document_ids,), priority=PRIORITY_BACKFILL).get()
+    except Exception as e:
+        print(f"Error prefetching arXiv papers: {str(e)}")
+
     results = []
     for doc_id in document_ids:
         try:
-            result = process_document_workflow.delay(doc_id).get()
+            result = process_document_workflow.apply_async((doc_id,), priority=PRIORITY_BACKFILL).get()
             results.append(result)
         except Exception as e:
             results.append({
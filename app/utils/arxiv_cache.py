@@ -0,0 +1,379 @@
+"""Concurrent arXiv downloads with an on-disk cache.
+
+``ArxivDownloader`` fetches papers from the arXiv API and PDF endpoints with
+httpx, at most ARXIV_MAX_CONCURRENCY requests at a time, and caches both
+metadata and PDFs under ARXIV_CACHE_DIR:
+- metadata of a versioned id (``2101.00123v2``) never changes and is kept
+  forever; an unversioned id points at its latest version and is looked up
+  again after ARXIV_METADATA_TTL seconds
+- PDFs are stored under their SHA-256, so identical files are kept once, and
+  the versioned metadata records which file belongs to the paper
+- downloads are written to a ``.part`` file first; an interrupted download
+  resumes with an HTTP Range request instead of starting over
+
+Layout:
+    ```
+    {ARXIV_CACHE_DIR}/meta/2101.00123v2.json  # metadata, "sha256" once downloaded
+    {ARXIV_CACHE_DIR}/meta/2101.00123.json    # {"latest": "2101.00123v2"}
+    {ARXIV_CACHE_DIR}/pdf/ab/abcdef....pdf    # content-addressed PDFs
+    {ARXIV_CACHE_DIR}/partial/2101.00123v2.pdf.part
+    ```
+
+Example:
+    ```python
+    async with ArxivDownloader() as downloader:
+        papers = await downloader.download_many(["2101.00123", "1706.03762v5"])
+    for arxiv_id, paper in papers.items():
+        if not isinstance(paper, Exception):
+            print(arxiv_id, paper.pdf_path, paper.cached)
+    ```
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import re
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+from ..config import settings
+from .fingerprint import file_sha256
+from .metrics import record_bytes, record_cache
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+# Ids requested per API query
+METADATA_BATCH_SIZE = 50
+
+_ARXIV_ID = re.compile(r"^(?P<base>\d{4}\.\d{4,5}|[a-z][a-z\-]*(\.[A-Z]{2})?/\d{7})(v(?P<version>\d+))?$")
+
+def split_version(arxiv_id: str) -> Tuple[str, Optional[int]]:
+    """Split an arXiv id into its base id and version.
+
+    Args:
+        arxiv_id (str): New-style ("2101.00123v2") or old-style
+            ("hep-th/9901001") id, with or without version
+
+    Returns:
+        Tuple[str, Optional[int]]: Base id and version, None if unversioned
+
+    Raises:
+        ValueError: If the id is not a valid arXiv id
+    """
+    match = _ARXIV_ID.match(arxiv_id.strip())
+    if not match:
+        raise ValueError(f"Invalid arXiv id: {arxiv_id}")
+    version = match.group("version")
+    return match.group("base"), int(version) if version else None
+
+def parse_feed(feed: str) -> List[Dict[str, Any]]:
+    """Parse an arXiv API Atom feed into metadata dicts.
+
+    Args:
+        feed (str): Atom XML returned by the API
+
+    Returns:
+        List[Dict[str, Any]]: One dict per entry with arxiv_id (versioned),
+            base_id, version, title, authors, abstract, categories,
+            published and updated
+    """
+    papers = []
+    for entry in ET.fromstring(feed).iter(f"{ATOM}entry"):
+        entry_id = (entry.findtext(f"{ATOM}id") or "").rsplit("/abs/", 1)[-1]
+        try:
+            base_id, version = split_version(entry_id)
+        except ValueError:
+            continue  # error entries for unknown ids
+        if version is None:
+            continue
+        papers.append({
+            "arxiv_id": entry_id,
+            "base_id": base_id,
+            "version": version,
+            "title": " ".join((entry.findtext(f"{ATOM}title") or "").split()),
+            "authors": [author.findtext(f"{ATOM}name") for author in entry.findall(f"{ATOM}author")],
+            "abstract": (entry.findtext(f"{ATOM}summary") or "").strip(),
+            "categories": [category.get("term") for category in entry.findall(f"{ATOM}category")],
+            "published": entry.findtext(f"{ATOM}published"),
+            "updated": entry.findtext(f"{ATOM}updated")
+        })
+    return papers
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    """Write JSON atomically so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+@dataclass(frozen=True)
+class ArxivPaper:
+    """A downloaded arXiv paper.
+
+    Attributes:
+        arxiv_id (str): Versioned arXiv id
+        pdf_path (str): Cached PDF
+        sha256 (str): Hex digest of the PDF
+        metadata (Dict[str, Any]): Metadata from the arXiv API
+        cached (bool): Whether the PDF was already in the cache
+    """
+    arxiv_id: str
+    pdf_path: str
+    sha256: str
+    metadata: Dict[str, Any]
+    cached: bool
+
+class ArxivDownloader:
+    """Download arXiv papers concurrently through a local cache.
+
+    Use as an async context manager, or pass an ``httpx.AsyncClient`` that
+    the caller closes.
+
+    Args:
+        cache_dir (Optional[str]): Cache root. Defaults to settings.ARXIV_CACHE_DIR,
+            or DATA_DIR/arxiv if that is empty.
+        api_url (Optional[str]): API query endpoint. Defaults to settings.ARXIV_API_URL.
+        pdf_url (Optional[str]): PDF base URL. Defaults to settings.ARXIV_PDF_URL.
+        max_concurrency (Optional[int]): Concurrent requests. Defaults to
+            settings.ARXIV_MAX_CONCURRENCY.
+        metadata_ttl (Optional[float]): Seconds an unversioned id stays
+            resolved. Defaults to settings.ARXIV_METADATA_TTL.
+        client (Optional[httpx.AsyncClient]): HTTP client to use
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, api_url: Optional[str] = None,
+                 pdf_url: Optional[str] = None, max_concurrency: Optional[int] = None,
+                 metadata_ttl: Optional[float] = None, client: Optional[httpx.AsyncClient] = None):
+        self.cache_dir = Path(cache_dir or settings.ARXIV_CACHE_DIR or os.path.join(settings.DATA_DIR, "arxiv"))
+        self.api_url = api_url or settings.ARXIV_API_URL
+        self.pdf_url = (pdf_url or settings.ARXIV_PDF_URL).rstrip("/")
+        self.metadata_ttl = metadata_ttl if metadata_ttl is not None else settings.ARXIV_METADATA_TTL
+        self._semaphore = asyncio.Semaphore(max_concurrency or settings.ARXIV_MAX_CONCURRENCY)
+        self._client = client
+        self._owns_client = client is None
+        self._downloads: Dict[str, asyncio.Future] = {}
+
+    async def __aenter__(self) -> "ArxivDownloader":
+        if self._client is None:
+            self._client = httpx.AsyncClient(follow_redirects=True, timeout=settings.ARXIV_TIMEOUT)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _meta_path(self, arxiv_id: str) -> Path:
+        return self.cache_dir / "meta" / f"{arxiv_id.replace('/', '_')}.json"
+
+    def _pdf_path(self, sha256: str) -> Path:
+        return self.cache_dir / "pdf" / sha256[:2] / f"{sha256}.pdf"
+
+    def _part_path(self, arxiv_id: str) -> Path:
+        return self.cache_dir / "partial" / f"{arxiv_id.replace('/', '_')}.pdf.part"
+
+    def cached_metadata(self, arxiv_id: str) -> Optional[Dict[str, Any]]:
+        """Return cached metadata of a paper without network access.
+
+        Args:
+            arxiv_id (str): arXiv id, with or without version
+
+        Returns:
+            Optional[Dict[str, Any]]: Metadata of the (latest known) version,
+                None if not cached or the unversioned lookup expired
+        """
+        base_id, version = split_version(arxiv_id)
+        if version is None:
+            path = self._meta_path(base_id)
+            pointer = _read_json(path)
+            if not pointer or time.time() - path.stat().st_mtime > self.metadata_ttl:
+                return None
+            arxiv_id = pointer["latest"]
+        return _read_json(self._meta_path(arxiv_id))
+
+    async def fetch_metadata(self, arxiv_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up metadata, querying the API only for ids not in the cache.
+
+        Missing ids are queried in batches of METADATA_BATCH_SIZE per request.
+
+        Args:
+            arxiv_ids (Sequence[str]): arXiv ids, with or without version
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Metadata per requested id; ids the API
+                doesn't know are left out
+
+        Raises:
+            ValueError: If an id is not a valid arXiv id
+            httpx.HTTPError: If an API request fails
+        """
+        results, missing = {}, []
+        for arxiv_id in dict.fromkeys(arxiv_ids):
+            cached = self.cached_metadata(arxiv_id)
+            if cached:
+                results[arxiv_id] = cached
+            else:
+                missing.append(arxiv_id)
+
+        async def query(batch: List[str]) -> None:
+            async with self._semaphore:
+                resp = await self._client.get(self.api_url, params={
+                    "id_list": ",".join(batch), "max_results": len(batch)
+                })
+            resp.raise_for_status()
+            by_id = {}
+            for paper in parse_feed(resp.text):
+                stored = _read_json(self._meta_path(paper["arxiv_id"])) or {}
+                paper = {**paper, **{key: stored[key] for key in ("sha256", "size") if key in stored}}
+                _write_json(self._meta_path(paper["arxiv_id"]), paper)
+                by_id[paper["arxiv_id"]] = paper
+                by_id.setdefault(paper["base_id"], paper)
+            for arxiv_id in batch:
+                base_id, version = split_version(arxiv_id)
+                paper = by_id.get(arxiv_id if version else base_id)
+                if paper is not None:
+                    if version is None:
+                        _write_json(self._meta_path(base_id), {"latest": paper["arxiv_id"]})
+                    results[arxiv_id] = paper
+
+        await asyncio.gather(*(
+            query(missing[start:start + METADATA_BATCH_SIZE])
+            for start in range(0, len(missing), METADATA_BATCH_SIZE)
+        ))
+        return results
+
+    async def download(self, arxiv_id: str) -> ArxivPaper:
+        """Download a paper's PDF unless it is already cached.
+
+        Concurrent calls for the same id share one download.
+
+        Args:
+            arxiv_id (str): arXiv id, with or without version
+
+        Returns:
+            ArxivPaper: The cached paper
+
+        Raises:
+            LookupError: If arXiv doesn't know the id
+            ValueError: If the id is invalid or the response isn't a PDF
+            httpx.HTTPError: If a request fails; a partial download is kept
+                and resumed by the next attempt
+        """
+        future = self._downloads.get(arxiv_id)
+        if future is None:
+            future = asyncio.ensure_future(self._download(arxiv_id))
+            self._downloads[arxiv_id] = future
+            future.add_done_callback(lambda _: self._downloads.pop(arxiv_id, None))
+        return await asyncio.shield(future)
+
+    async def download_many(self, arxiv_ids: Sequence[str]) -> Dict[str, Union[ArxivPaper, Exception]]:
+        """Download several papers concurrently.
+
+        Metadata of all ids is fetched first in batched API requests; PDFs
+        are then downloaded at most ``max_concurrency`` at a time.
+
+        Args:
+            arxiv_ids (Sequence[str]): arXiv ids, with or without version
+
+        Returns:
+            Dict[str, Union[ArxivPaper, Exception]]: Paper or the error that
+                prevented its download, per id
+        """
+        valid = []
+        results: Dict[str, Union[ArxivPaper, Exception]] = {}
+        for arxiv_id in dict.fromkeys(arxiv_ids):
+            try:
+                split_version(arxiv_id)
+                valid.append(arxiv_id)
+            except ValueError as e:
+                results[arxiv_id] = e
+        try:
+            known = await self.fetch_metadata(valid)
+            for arxiv_id in valid:
+                if arxiv_id not in known:
+                    results[arxiv_id] = LookupError(f"arXiv paper not found: {arxiv_id}")
+            valid = [arxiv_id for arxiv_id in valid if arxiv_id in known]
+        except httpx.HTTPError as e:
+            print(f"Batched arXiv metadata lookup failed, looking up papers one by one: {str(e)}")
+        papers = await asyncio.gather(*(self.download(arxiv_id) for arxiv_id in valid), return_exceptions=True)
+        results.update(zip(valid, papers))
+        return results
+
+    async def _download(self, arxiv_id: str) -> ArxivPaper:
+        metadata = (await self.fetch_metadata([arxiv_id])).get(arxiv_id)
+        if metadata is None:
+            raise LookupError(f"arXiv paper not found: {arxiv_id}")
+        versioned_id = metadata["arxiv_id"]
+
+        sha256 = metadata.get("sha256")
+        if sha256 and self._pdf_path(sha256).exists():
+            record_cache("arxiv_pdf", hit=True)
+            return ArxivPaper(versioned_id, str(self._pdf_path(sha256)), sha256, metadata, cached=True)
+
+        record_cache("arxiv_pdf", hit=False)
+        async with self._semaphore:
+            metadata = await self._fetch_pdf(metadata)
+        return ArxivPaper(versioned_id, str(self._pdf_path(metadata["sha256"])), metadata["sha256"],
+                          metadata, cached=False)
+
+    async def _fetch_pdf(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Download a PDF into the cache, resuming a partial download.
+
+        Returns the metadata with the PDF's sha256 and size recorded.
+        """
+        versioned_id = metadata["arxiv_id"]
+        part = self._part_path(versioned_id)
+        part.parent.mkdir(parents=True, exist_ok=True)
+        with open(part, "ab") as f:
+            # Another worker may be downloading the same paper
+            await asyncio.to_thread(fcntl.flock, f, fcntl.LOCK_EX)
+            if not part.exists() or os.stat(part).st_ino != os.fstat(f.fileno()).st_ino:
+                # ... and finished while we waited
+                stored = _read_json(self._meta_path(versioned_id)) or {}
+                if stored.get("sha256") and self._pdf_path(stored["sha256"]).exists():
+                    return stored
+                return await self._fetch_pdf(metadata)
+
+            offset = f.tell()
+            # Byte ranges only line up with the file if the body isn't re-encoded
+            headers = {"Accept-Encoding": "identity"}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+            async with self._client.stream("GET", f"{self.pdf_url}/{versioned_id}", headers=headers) as resp:
+                if resp.status_code != 416:  # 416: the partial file is already complete
+                    resp.raise_for_status()
+                    if resp.status_code != 206:
+                        # Range not honoured, start over
+                        f.truncate(0)
+                        f.seek(0)
+                    async for chunk in resp.aiter_raw():
+                        f.write(chunk)
+                        record_bytes("arxiv_download", len(chunk))
+            f.flush()
+
+            with open(part, "rb") as check:
+                if check.read(5) != b"%PDF-":
+                    os.unlink(part)
+                    raise ValueError(f"Download of {versioned_id} is not a PDF")
+            sha256 = await asyncio.to_thread(file_sha256, str(part))
+            metadata = {**metadata, "sha256": sha256, "size": os.path.getsize(part)}
+            target = self._pdf_path(sha256)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _write_json(self._meta_path(versioned_id), metadata)
+            os.replace(part, target)
+        return metadata
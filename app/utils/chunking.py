@@ -0,0 +1,202 @@
+"""Content-defined text chunking and chunk manifest diffs.
+
+Documents are split into chunks whose boundaries depend on the content
+around them rather than on absolute offsets, so an edit only changes the
+chunks it touches; the rest keep their content hash and their extraction
+and embedding results can be reused:
+- split_text: pack text elements (lines, as produced by joining PDF
+  elements) into chunks, cutting after "anchor" elements (selected by
+  hash) once a chunk reaches a minimum size
+- ChunkBuilder: the same chunking fed one element at a time, for streaming
+- chunk_hash: SHA-256 of a chunk's normalized text
+- diff_chunks: compare a document's stored chunk manifest with new chunks
+
+Example:
+    ```python
+    chunks = split_text(text)
+    diff = diff_chunks(rel_db.get_chunk_manifest(doc_id), chunks)
+    for chunk in diff.added:
+        ...  # extract and embed
+    for row in diff.removed:
+        ...  # retract entities and vectors
+    ```
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from .fingerprint import normalize_text
+
+# An element is an anchor with probability 1 / ANCHOR_MODULUS
+ANCHOR_MODULUS = 4
+
+@dataclass(frozen=True)
+class TextChunk:
+    """One chunk of a document.
+
+    Attributes:
+        index (int): Position of the chunk in the document
+        content_hash (str): Hex SHA-256 of the normalized chunk text
+        text (str): Chunk text
+    """
+    index: int
+    content_hash: str
+    text: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the JSON-serializable form passed between tasks."""
+        return {"index": self.index, "content_hash": self.content_hash, "text": self.text}
+
+def chunk_hash(text: str) -> str:
+    """Hash chunk text, ignoring case, whitespace and punctuation changes.
+
+    Args:
+        text (str): Chunk text
+
+    Returns:
+        str: Hex SHA-256 of the normalized text
+    """
+    return hashlib.sha256(normalize_text(text).encode()).hexdigest()
+
+def _is_anchor(element: str) -> bool:
+    digest = hashlib.blake2b(element.encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "little") % ANCHOR_MODULUS == 0
+
+def _split_long(element: str, max_chars: int) -> List[str]:
+    """Split an oversized element at sentence or word boundaries."""
+    pieces = []
+    while len(element) > max_chars:
+        cut = element.rfind(". ", 0, max_chars)
+        if cut <= 0:
+            cut = element.rfind(" ", 0, max_chars)
+        cut = cut + 1 if cut > 0 else max_chars
+        pieces.append(element[:cut].strip())
+        element = element[cut:].strip()
+    if element:
+        pieces.append(element)
+    return pieces
+
+class ChunkBuilder:
+    """Incrementally pack text elements into content-defined chunks.
+
+    Feeding a document's lines one at a time yields the same chunks as
+    ``split_text`` on the whole text, while holding at most one chunk of
+    text, so chunks can be handed to later stages while the rest of the
+    document is still being parsed.
+
+    Example:
+        ```python
+        builder = ChunkBuilder()
+        for element in elements:
+            for chunk in builder.add(str(element)):
+                ...  # process chunk
+        for chunk in builder.finish():
+            ...
+        ```
+    """
+
+    def __init__(self, min_chars: int = 1000, max_chars: int = 4000):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._current: List[str] = []
+        self._size = 0
+        self._seen = set()
+        self._count = 0
+
+    def _close(self) -> List[TextChunk]:
+        chunk_text = "\n".join(self._current)
+        self._current, self._size = [], 0
+        content_hash = chunk_hash(chunk_text)
+        if content_hash in self._seen:
+            return []
+        self._seen.add(content_hash)
+        self._count += 1
+        return [TextChunk(index=self._count - 1, content_hash=content_hash, text=chunk_text)]
+
+    def add(self, text: str) -> List[TextChunk]:
+        """Add text (one or more lines) and return the chunks it completes."""
+        chunks = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            for element in _split_long(line, self.max_chars):
+                if self._current and self._size + len(element) > self.max_chars:
+                    chunks.extend(self._close())
+                self._current.append(element)
+                self._size += len(element) + 1
+                if self._size >= self.min_chars and _is_anchor(element):
+                    chunks.extend(self._close())
+        return chunks
+
+    def finish(self) -> List[TextChunk]:
+        """Return the last, partial chunk."""
+        return self._close() if self._current else []
+
+def split_text(text: str, min_chars: int = 1000, max_chars: int = 4000) -> List[TextChunk]:
+    """Split text into content-defined chunks of whole lines.
+
+    Each non-empty line is an element (``process_pdf`` joins PDF elements
+    with newlines). A chunk is closed after an anchor element once it holds
+    at least ``min_chars`` characters, or when adding the next element would
+    exceed ``max_chars``. Because anchors depend only on element content,
+    chunk boundaries before and after an edit resynchronize at the next
+    anchor. Chunks with identical content are only returned once.
+
+    Args:
+        text (str): Document text
+        min_chars (int, optional): Minimum chunk size before cutting at an
+            anchor. Defaults to 1000.
+        max_chars (int, optional): Hard chunk size limit. Defaults to 4000.
+
+    Returns:
+        List[TextChunk]: Chunks in document order
+    """
+    builder = ChunkBuilder(min_chars, max_chars)
+    return builder.add(text) + builder.finish()
+
+@dataclass
+class ChunkDiff:
+    """Difference between a stored chunk manifest and a new chunk set.
+
+    Attributes:
+        added (List[Dict[str, Any]]): New chunks or chunks whose results are
+            incomplete, as dicts with index, content_hash, text and the
+            stored entity_ids / embedding_id (None where missing)
+        removed (List[Dict[str, Any]]): Manifest rows of chunks no longer
+            present, holding the results to retract
+        unchanged (int): Number of chunks whose results are reused
+    """
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+    unchanged: int = 0
+
+def diff_chunks(manifest: Optional[Dict[str, Dict[str, Any]]], chunks: List[TextChunk]) -> ChunkDiff:
+    """Compare a document's chunk manifest with its new chunks.
+
+    Args:
+        manifest (Optional[Dict[str, Dict[str, Any]]]): Stored rows keyed by
+            content hash, each with entity_ids and embedding_id (None while
+            pending); None or empty for new documents
+        chunks (List[TextChunk]): Chunks of the new document text
+
+    Returns:
+        ChunkDiff: Chunks to process, manifest rows to retract and the
+            number of reused chunks
+    """
+    manifest = manifest or {}
+    diff = ChunkDiff()
+    new_hashes = set()
+    for chunk in chunks:
+        new_hashes.add(chunk.content_hash)
+        row = manifest.get(chunk.content_hash) or {}
+        if row.get("entity_ids") is not None and row.get("embedding_id") is not None:
+            diff.unchanged += 1
+            continue
+        diff.added.append({
+            **chunk.to_dict(),
+            "entity_ids": row.get("entity_ids"),
+            "embedding_id": row.get("embedding_id")
+        })
+    diff.removed = [row for content_hash, row in manifest.items() if content_hash not in new_hashes]
+    return diff
@@ -0,0 +1,267 @@
+"""Local stand-in for the DashScope HTTP API.
+
+Serves the two endpoints Ananke2 calls, on a loopback port:
+- ``/api/v1/services/aigc/text-generation/generation``: answers the
+  extraction prompts of QwenClient and DocumentProcessor with templated
+  JSON built from the capitalized words of the prompt text, in the
+  "message" or "text" result format
+- ``/api/v1/services/embeddings/text-embedding/text-embedding``: returns
+  embeddings derived from a hash of each text
+
+Every response is delayed by ``latency`` (plus up to ``jitter``) seconds. An
+``error_rate`` share of requests is answered with HTTP 500, a ``rate_limit``
+share with HTTP 429, and requests beyond ``requests_per_second`` are
+answered with HTTP 429 as well, so retries and back-pressure are exercised
+as against the real service. Responses only depend on the request (and the
+seed for delays and errors), so runs are repeatable.
+
+Point the clients at a running server with the DASHSCOPE_BASE_URL setting,
+or call ``install`` to do so in-process.
+
+Example:
+    ```python
+    with FakeDashScope(latency=0.05, rate_limit=0.02) as server:
+        server.install()  # point QwenClient, DocumentProcessor and embed_texts at the server
+        ...
+    print(server.stats)
+    ```
+
+Usage:
+    python -m app.utils.fake_dashscope --port 8089 --latency 0.05 --error-rate 0.01
+    DASHSCOPE_BASE_URL=http://127.0.0.1:8089/api/v1 celery -A app.celery_app worker
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+GENERATION_PATH = "/api/v1/services/aigc/text-generation/generation"
+EMBEDDING_PATH = "/api/v1/services/embeddings/text-embedding/text-embedding"
+
+_TEXT = re.compile(r"Text:\s*(.*?)\s*(?:Just return|Return a list)", re.S)
+_WORD = re.compile(r"\b[A-Z][A-Za-z]{3,}\b")
+
+def hash_embedding(text: str, dimension: int) -> List[float]:
+    """Unit vector derived from a hash of the text."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dimension)
+    return (vector / np.linalg.norm(vector)).round(6).tolist()
+
+def extraction(prompt: str, max_entities: int = 5) -> List[Dict[str, Any]]:
+    """Entities and/or relationships for an extraction prompt.
+
+    Args:
+        prompt (str): Prompt built by QwenClient._get_prompt or
+            DocumentProcessor.extract_knowledge_graph
+        max_entities (int): Distinct capitalized words used as entities
+
+    Returns:
+        List[Dict[str, Any]]: Entities for entity prompts, relationships
+        between consecutive entities for relationship prompts, and both
+        for combined prompts
+    """
+    match = _TEXT.search(prompt)
+    names = list(dict.fromkeys(word.upper() for word in _WORD.findall(match.group(1) if match else "")))
+    names = names[:max_entities]
+    entities = [{"name": name, "type": "CONCEPT", "description": f"{name.title()} as used in the text"}
+                for name in names]
+    relationships = [{"source": source, "target": target, "relationship": "RELATED_TO",
+                      "relationship_strength": 1 + len(source + target) % 10}
+                     for source, target in zip(names, names[1:])]
+    if prompt.startswith("Given a text document that is potentially relevant"):
+        return entities
+    if prompt.startswith("Given a text document, identify all relationships"):
+        return relationships
+    return entities + relationships
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "FakeDashScope"
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _reply(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        server = self.server
+        delay = server.delay()
+        if delay:
+            time.sleep(delay)
+        request_id = server.count(self.path)
+        failure = server.failure()
+        if failure == HTTPStatus.TOO_MANY_REQUESTS:
+            self._reply(failure, {"request_id": request_id, "code": "Throttling.RateQuota",
+                                  "message": "Requests rate limit exceeded, please try again later."})
+        elif failure == HTTPStatus.INTERNAL_SERVER_ERROR:
+            self._reply(failure, {"request_id": request_id, "code": "InternalError",
+                                  "message": "An internal error has occured, please try again later."})
+        elif self.path == GENERATION_PATH:
+            prompt = request.get("input", {}).get("prompt", "")
+            content = json.dumps(extraction(prompt))
+            if request.get("parameters", {}).get("result_format") == "message":
+                output = {"choices": [{"finish_reason": "stop", "message": {"role": "assistant", "content": content}}]}
+            else:
+                output = {"text": content, "finish_reason": "stop"}
+            self._reply(HTTPStatus.OK, {
+                "request_id": request_id,
+                "output": output,
+                "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(content) // 4}
+            })
+        elif self.path == EMBEDDING_PATH:
+            texts = request.get("input", {}).get("texts", [])
+            texts = [texts] if isinstance(texts, str) else texts
+            dimension = request.get("parameters", {}).get("dimension", 1024)
+            self._reply(HTTPStatus.OK, {
+                "request_id": request_id,
+                "output": {"embeddings": [{"text_index": i, "embedding": hash_embedding(text, dimension)}
+                                          for i, text in enumerate(texts)]},
+                "usage": {"total_tokens": sum(len(text) for text in texts) // 4}
+            })
+        else:
+            self._reply(HTTPStatus.NOT_FOUND, {"request_id": request_id, "code": "NotFound",
+                                               "message": f"Unknown path {self.path}"})
+
+class FakeDashScope(ThreadingHTTPServer):
+    """DashScope stand-in served from a background thread.
+
+    Args:
+        latency (float): Seconds every response is delayed
+        rate_limit (float): Share of requests answered with HTTP 429
+        seed (int): Seed deciding jitter and which requests fail
+        port (int): Port to listen on, 0 for any free port
+        error_rate (float): Share of requests answered with HTTP 500
+        requests_per_second (float): Sustained request rate, with bursts of
+            as many requests, beyond which requests are answered with HTTP 429;
+            0 for no limit
+        jitter (float): Up to this many seconds are added to ``latency``
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0, rate_limit: float = 0.0, seed: int = 0, port: int = 0,
+                 error_rate: float = 0.0, requests_per_second: float = 0.0, jitter: float = 0.0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.requests_per_second = requests_per_second
+        self.stats: Dict[str, int] = {"generation": 0, "embedding": 0, "rate_limited": 0, "errors": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = max(requests_per_second, 1.0)
+        self._refilled = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self._previous: Optional[tuple] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as DASHSCOPE_BASE_URL."""
+        return f"http://127.0.0.1:{self.server_address[1]}/api/v1"
+
+    def delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.jitter)
+
+    def count(self, path: str) -> str:
+        with self._lock:
+            kind = "generation" if path == GENERATION_PATH else "embedding"
+            self.stats[kind] += 1
+            return f"fake-{self.stats['generation'] + self.stats['embedding']}"
+
+    def _over_rate(self) -> bool:
+        # Token bucket holding up to one second of requests
+        now = time.monotonic()
+        capacity = max(self.requests_per_second, 1.0)
+        self._tokens = min(capacity, self._tokens + (now - self._refilled) * self.requests_per_second)
+        self._refilled = now
+        if self._tokens < 1:
+            return True
+        self._tokens -= 1
+        return False
+
+    def failure(self) -> Optional[HTTPStatus]:
+        """Status to fail the current request with, if any."""
+        with self._lock:
+            if (self.requests_per_second and self._over_rate()) or (
+                    self.rate_limit and self._random.random() < self.rate_limit):
+                self.stats["rate_limited"] += 1
+                return HTTPStatus.TOO_MANY_REQUESTS
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return HTTPStatus.INTERNAL_SERVER_ERROR
+            return None
+
+    def install(self) -> None:
+        """Point the DashScope clients of this process at the server until ``stop``."""
+        import dashscope
+        from ..config import settings
+        from .qwen import configure_dashscope
+        self._previous = (settings.DASHSCOPE_BASE_URL, dashscope.base_http_api_url)
+        settings.DASHSCOPE_BASE_URL = self.url
+        configure_dashscope()
+
+    def start(self) -> "FakeDashScope":
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-dashscope", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._previous is not None:
+            import dashscope
+            from ..config import settings
+            settings.DASHSCOPE_BASE_URL, dashscope.base_http_api_url = self._previous
+            self._previous = None
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "FakeDashScope":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Serve the fake DashScope API until interrupted."""
+    parser = argparse.ArgumentParser(prog="python -m app.utils.fake_dashscope", description=main.__doc__)
+    parser.add_argument("--port", type=int, default=8089, help="port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds every response is delayed")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many seconds added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered 500")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="share of requests answered 429")
+    parser.add_argument("--rps", type=float, default=0.0, help="requests per second before answering 429")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the jitter and failures")
+    args = parser.parse_args(argv)
+
+    server = FakeDashScope(args.latency, args.rate_limit, args.seed, args.port, args.error_rate, args.rps,
+                           args.jitter)
+    print(f"Fake DashScope listening, set DASHSCOPE_BASE_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Document fingerprints for duplicate detection.
+
+A fingerprint combines two hashes:
+- sha256: digest of the file bytes, identifying exact duplicates before any
+  parsing happens
+- simhash: 64-bit SimHash of the normalized extracted text, where documents
+  that differ by a few words are a few bits apart (Hamming distance)
+
+``SimHasher`` computes the same SimHash incrementally for streamed text.
+
+Near-duplicate lookup splits the SimHash into equal bands. Two hashes within
+``bands - 1`` bits of each other agree exactly on at least one band, so a
+store only has to compare candidates sharing a band value.
+
+Example:
+    ```python
+    sha256 = file_sha256("paper.pdf")
+    fingerprint = DocumentFingerprint.from_text(sha256, text)
+    if hamming_distance(fingerprint.simhash, other.simhash) <= 3:
+        ...  # near duplicate
+    ```
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+SHINGLE_SIZE = 3
+
+_TOKEN = re.compile(r"\w+")
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Hash a file in chunks.
+
+    Args:
+        path (str): File to hash
+        chunk_size (int, optional): Read size in bytes. Defaults to 1 MiB.
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def normalize_text(text: str) -> str:
+    """Lowercase text and collapse it to word tokens separated by spaces.
+
+    Whitespace, punctuation and layout differences between two extractions
+    of the same content don't change the result.
+
+    Args:
+        text (str): Extracted document text
+
+    Returns:
+        str: Normalized text
+    """
+    return " ".join(_TOKEN.findall(text.lower()))
+
+class SimHasher:
+    """Incremental SimHash over text fed in pieces.
+
+    Shingles spanning two ``update`` calls are kept, so feeding a document
+    line by line gives the same hash as ``simhash`` on the whole text while
+    holding only 64 bit votes and the last few words.
+
+    Example:
+        ```python
+        hasher = SimHasher()
+        for line in lines:
+            hasher.update(line)
+        fingerprint = DocumentFingerprint(sha256, hasher.digest(), hasher.size)
+        ```
+    """
+
+    def __init__(self, shingle_size: int = SHINGLE_SIZE):
+        self.shingle_size = shingle_size
+        self._votes = np.zeros(SIMHASH_BITS, dtype=np.int64)
+        self._tail: List[str] = []
+        self._tokens = 0
+        self._chars = 0
+
+    def _vote(self, features: List[str]) -> None:
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+             for feature in features),
+            dtype=np.uint64, count=len(features)
+        )
+        bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+        self._votes += (2 * bits.astype(np.int64) - 1).sum(axis=0)
+
+    def update(self, text: str) -> None:
+        """Add the words of a piece of text."""
+        new = normalize_text(text).split()
+        if not new:
+            return
+        self._chars += sum(len(token) for token in new) + len(new)
+        self._tokens += len(new)
+        tokens = self._tail + new
+        k = self.shingle_size
+        if len(tokens) >= k:
+            self._vote([" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)])
+        self._tail = tokens[-(k - 1):] if k > 1 else []
+
+    @property
+    def size(self) -> int:
+        """Length of the normalized text seen so far."""
+        return max(self._chars - 1, 0)
+
+    def digest(self) -> int:
+        """Return the SimHash of the text seen so far."""
+        if not self._tokens:
+            return 0
+        votes = self._votes
+        if self._tokens < self.shingle_size:
+            # Shorter than one shingle: the whole text is the only feature
+            hasher = SimHasher(self._tokens)
+            hasher.update(" ".join(self._tail))
+            votes = hasher._votes
+        return int.from_bytes(np.packbits(votes > 0, bitorder="little").tobytes(), "little")
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> int:
+    """Compute the 64-bit SimHash of a text.
+
+    Features are word shingles of the normalized text, counted once per
+    occurrence. Each feature is hashed with BLAKE2b and the per-bit votes
+    are summed with numpy in one pass.
+
+    Args:
+        text (str): Document text
+        shingle_size (int, optional): Words per shingle. Defaults to 3.
+
+    Returns:
+        int: Unsigned 64-bit SimHash, 0 for text without words
+    """
+    hasher = SimHasher(shingle_size)
+    hasher.update(text)
+    return hasher.digest()
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two SimHashes."""
+    return bin(a ^ b).count("1")
+
+def simhash_bands(value: int, bands: int = SIMHASH_BANDS) -> List[int]:
+    """Split a SimHash into equal-width bands for candidate lookup.
+
+    Args:
+        value (int): 64-bit SimHash
+        bands (int, optional): Number of bands. Defaults to 4.
+
+    Returns:
+        List[int]: Band values, lowest bits first
+    """
+    width = SIMHASH_BITS // bands
+    mask = (1 << width) - 1
+    return [(value >> (i * width)) & mask for i in range(bands)]
+
+@dataclass(frozen=True)
+class DocumentFingerprint:
+    """Exact and near-duplicate fingerprint of a document.
+
+    Attributes:
+        sha256 (str): Hex digest of the file bytes
+        simhash (int): 64-bit SimHash of the extracted text
+        size (int): Length of the normalized text in characters
+    """
+    sha256: str
+    simhash: int
+    size: int = 0
+
+    @classmethod
+    def from_text(cls, sha256: str, text: str) -> "DocumentFingerprint":
+        """Build a fingerprint from a file digest and its extracted text."""
+        return cls(sha256=sha256, simhash=simhash(text), size=len(normalize_text(text)))
+
+    @property
+    def bands(self) -> List[int]:
+        """SimHash bands used to index the fingerprint."""
+        return simhash_bands(self.simhash)
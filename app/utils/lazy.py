@@ -0,0 +1,94 @@
+"""Deferred imports for heavy optional dependencies.
+
+Importing ``unstructured``, ``dashscope``, ``arxiv``, ``chromadb``, ``neo4j``
+or ``sqlalchemy`` costs between 0.1 and several seconds each. The API and
+most Celery workers only touch a few of them, so modules refer to them
+through the helpers below and pay the import cost on first use:
+- LazyModule: module proxy that imports on first attribute access
+- lazy_callable: function proxy for ``from pkg import func`` imports
+- lazy_exports: PEP 562 ``__getattr__`` for re-exported names
+
+All proxies resolve attributes on every access rather than caching them,
+so ``unittest.mock.patch`` on the real module keeps working.
+
+Example:
+    ```python
+    dashscope = LazyModule("dashscope")
+    partition_pdf = lazy_callable("unstructured.partition.pdf", "partition_pdf")
+    __getattr__ = lazy_exports(__name__, {"Neo4jInterface": ".graph"})  # in a package __init__
+    ```
+"""
+
+import importlib
+import types
+from typing import Any, Callable, Dict, Optional
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first use.
+
+    Args:
+        name (str): Absolute module name
+    """
+
+    def __init__(self, name: str):
+        """Record the module name without importing it."""
+        super().__init__(name)
+        object.__setattr__(self, "_module", None)
+
+    def _load(self) -> types.ModuleType:
+        module = object.__getattribute__(self, "_module")
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            object.__setattr__(self, "_module", module)
+        return module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._load(), name, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if object.__getattribute__(self, "_module") else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+def lazy_callable(module: str, name: str) -> Callable[..., Any]:
+    """Create a function that imports ``module.name`` when first called.
+
+    Args:
+        module (str): Absolute module name
+        name (str): Function name within the module
+
+    Returns:
+        Callable[..., Any]: Proxy forwarding all arguments to the real function
+    """
+    def proxy(*args, **kwargs):
+        return getattr(importlib.import_module(module), name)(*args, **kwargs)
+
+    proxy.__name__ = proxy.__qualname__ = name
+    proxy.__doc__ = f"Lazily imported {module}.{name}."
+    return proxy
+
+def lazy_exports(module: str, exports: Dict[str, str],
+                 package: Optional[str] = None) -> Callable[[str], Any]:
+    """Build a module ``__getattr__`` that imports exported names on demand.
+
+    Args:
+        module (str): ``__name__`` of the module defining the exports
+        exports (Dict[str, str]): Exported name to the (possibly relative)
+            module it lives in
+        package (Optional[str]): ``__package__`` used to resolve relative
+            paths. Defaults to ``module``, which is right for ``__init__``.
+
+    Returns:
+        Callable[[str], Any]: Function to assign to the module's ``__getattr__``
+    """
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module '{module}' has no attribute '{name}'")
+        return getattr(importlib.import_module(exports[name], package or module), name)
+
+    return __getattr__
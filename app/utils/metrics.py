@@ -0,0 +1,291 @@
+"""Prometheus metrics for Ananke2.
+
+This module defines the counters, gauges and histograms used to find
+bottlenecks in production:
+- Celery task run time by task and final state
+- Time spent in workflow and streaming pipeline stages
+- Qwen/DashScope request latency and token usage
+- Database round-trips (count and latency) per backend and operation
+- Cache lookups by cache and outcome, for hit ratios
+- Broker queue depths, time spent waiting in them, and bytes downloaded, uploaded and parsed
+
+The API process exposes the registry on ``/metrics`` for Prometheus to
+scrape. Celery workers don't serve HTTP; each worker process pushes its
+metrics to a Pushgateway every METRICS_PUSH_INTERVAL seconds when
+METRICS_PUSHGATEWAY_URL is set, grouped by host and pid so prefork
+children don't overwrite each other. A process deletes its group when it
+shuts down, so replaced children don't leave stale groups behind; query
+worker counters with ``rate`` or ``increase``, which tolerate the resets.
+Processes that are killed outright still leave their last group behind.
+
+Example:
+    ```python
+    from app.utils.metrics import STAGE_DURATION, record_cache
+
+    with STAGE_DURATION.labels(stage="partitioned").time():
+        elements = partition_pdf(path)
+    record_cache("arxiv_pdf", hit=paper.cached)
+    ```
+"""
+
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    GCCollector,
+    Histogram,
+    ProcessCollector,
+    delete_from_gateway,
+    generate_latest,
+    push_to_gateway
+)
+from ..config import settings
+
+REGISTRY = CollectorRegistry()
+ProcessCollector(registry=REGISTRY)
+GCCollector(registry=REGISTRY)
+
+# From fast database round-trips to multi-minute PDF parses
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+TASK_DURATION = Histogram(
+    "ananke_task_duration_seconds", "Run time of Celery tasks",
+    ["task", "state"], buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+STAGE_DURATION = Histogram(
+    "ananke_stage_duration_seconds", "Time spent in a workflow or pipeline stage",
+    ["stage"], buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+QWEN_DURATION = Histogram(
+    "ananke_qwen_request_duration_seconds", "Latency of DashScope requests, per attempt",
+    ["operation", "status"], buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+QWEN_TOKENS = Counter(
+    "ananke_qwen_tokens", "Tokens used by DashScope requests",
+    ["operation", "kind"], registry=REGISTRY
+)
+DB_DURATION = Histogram(
+    "ananke_db_request_duration_seconds", "Latency of database round-trips",
+    ["backend", "operation"], buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+CACHE_LOOKUPS = Counter(
+    "ananke_cache_lookups", "Cache lookups by outcome",
+    ["cache", "result"], registry=REGISTRY
+)
+QUEUE_DEPTH = Gauge(
+    "ananke_queue_depth", "Messages waiting in a broker queue",
+    ["queue"], registry=REGISTRY
+)
+QUEUE_WAIT = Histogram(
+    "ananke_queue_wait_seconds", "Time tasks waited in a broker queue before starting",
+    ["queue"], buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+BYTES = Counter(
+    "ananke_bytes", "Bytes moved, e.g. arxiv_download, upload or pdf_parsed",
+    ["source"], registry=REGISTRY
+)
+
+# Database interface classes and the backend they are reported as
+DB_BACKENDS = {
+    "AsyncRelationalDatabase": "relational",
+    "MySQLInterface": "relational",
+    "Neo4jInterface": "graph",
+    "ChromaInterface": "vector"
+}
+
+def observe_db(qualname: str, seconds: float) -> None:
+    """Record a database round-trip by the coroutine that performed it.
+
+    Args:
+        qualname (str): Qualified name of the interface method, e.g.
+            "Neo4jInterface.store_entities"; other coroutines are ignored
+        seconds (float): Round-trip time
+    """
+    owner, _, operation = qualname.rpartition(".")
+    backend = DB_BACKENDS.get(owner)
+    if backend:
+        DB_DURATION.labels(backend=backend, operation=operation).observe(seconds)
+
+def _usage_value(usage: Any, key: str) -> Optional[float]:
+    value = usage.get(key) if isinstance(usage, dict) else getattr(usage, key, None)
+    return value if isinstance(value, (int, float)) else None
+
+def usage_tokens(usage: Any) -> Dict[str, float]:
+    """Read token counts from a DashScope response ``usage``.
+
+    Args:
+        usage (Any): Usage with input_tokens/output_tokens or total_tokens
+
+    Returns:
+        Dict[str, float]: Non-zero counts keyed "input" and "output", or
+            "total" for embedding responses
+    """
+    if usage is None:
+        return {}
+    counts = {kind: _usage_value(usage, f"{kind}_tokens") for kind in ("input", "output")}
+    if all(value is None for value in counts.values()):
+        # Embedding responses only report a total
+        counts = {"total": _usage_value(usage, "total_tokens")}
+    return {kind: value for kind, value in counts.items() if value}
+
+def record_qwen(operation: str, seconds: float, status: str, usage: Any = None) -> None:
+    """Record one DashScope request attempt.
+
+    Args:
+        operation (str): "entities", "relationships" or "embedding"
+        seconds (float): Request latency
+        status (str): "ok", "rate_limited" or "error"
+        usage (Any): Response ``usage`` with input_tokens/output_tokens
+            or total_tokens, if any
+    """
+    QWEN_DURATION.labels(operation=operation, status=status).observe(seconds)
+    for kind, value in usage_tokens(usage).items():
+        QWEN_TOKENS.labels(operation=operation, kind=kind).inc(value)
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup.
+
+    Args:
+        cache (str): Cache name, e.g. "query_results" or "arxiv_pdf"
+        hit (bool): Whether the lookup was answered from the cache
+    """
+    CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+def record_bytes(source: str, count: int) -> None:
+    """Count bytes moved.
+
+    Args:
+        source (str): What moved them, e.g. "arxiv_download"
+        count (int): Number of bytes
+    """
+    if count > 0:
+        BYTES.labels(source=source).inc(count)
+
+def update_queue_depths(depths: Dict[str, int]) -> None:
+    """Set the queue depth gauges.
+
+    Args:
+        depths (Dict[str, int]): Waiting messages per queue
+    """
+    for queue, depth in depths.items():
+        QUEUE_DEPTH.labels(queue=queue).set(depth)
+
+def render() -> Tuple[bytes, str]:
+    """Serialize the registry in the Prometheus text format.
+
+    Returns:
+        Tuple[bytes, str]: Body and content type of a scrape response
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+def _grouping_key() -> Dict[str, str]:
+    return {"instance": f"{socket.gethostname()}:{os.getpid()}"}
+
+def push_metrics(gateway: Optional[str] = None, job: str = "ananke2-worker") -> bool:
+    """Push this process's metrics to the Pushgateway.
+
+    Args:
+        gateway (Optional[str]): Pushgateway address. Defaults to
+            settings.METRICS_PUSHGATEWAY_URL.
+        job (str): Job label
+
+    Returns:
+        bool: True if pushed, False if no gateway is configured or the push failed
+    """
+    gateway = gateway or settings.METRICS_PUSHGATEWAY_URL
+    if not gateway:
+        return False
+    try:
+        push_to_gateway(gateway, job=job, registry=REGISTRY, grouping_key=_grouping_key())
+        return True
+    except Exception as e:
+        print(f"Error pushing metrics to {gateway}: {str(e)}")
+        return False
+
+def delete_metrics(gateway: Optional[str] = None, job: str = "ananke2-worker") -> bool:
+    """Delete this process's group from the Pushgateway.
+
+    Args:
+        gateway (Optional[str]): Pushgateway address. Defaults to
+            settings.METRICS_PUSHGATEWAY_URL.
+        job (str): Job label
+
+    Returns:
+        bool: True if deleted, False if no gateway is configured or the delete failed
+    """
+    gateway = gateway or settings.METRICS_PUSHGATEWAY_URL
+    if not gateway:
+        return False
+    try:
+        delete_from_gateway(gateway, job=job, grouping_key=_grouping_key())
+        return True
+    except Exception as e:
+        print(f"Error deleting metrics from {gateway}: {str(e)}")
+        return False
+
+class MetricsPusher(threading.Thread):
+    """Daemon thread pushing metrics at a fixed interval.
+
+    Args:
+        interval (float): Seconds between pushes
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(name="metrics-pusher", daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            push_metrics()
+
+    def stop(self) -> None:
+        """Stop pushing and delete this process's group from the Pushgateway."""
+        self.stopped.set()
+        delete_metrics()
+
+_pusher: Optional[MetricsPusher] = None
+_pusher_pid: Optional[int] = None
+_task_starts: Dict[str, float] = {}
+_task_starts_lock = threading.Lock()
+
+def start_pusher(**kwargs: Any) -> None:
+    """Start pushing from this process, once per process."""
+    global _pusher, _pusher_pid
+    if not settings.METRICS_PUSHGATEWAY_URL or _pusher_pid == os.getpid():
+        return
+    _pusher, _pusher_pid = MetricsPusher(settings.METRICS_PUSH_INTERVAL), os.getpid()
+    _pusher.start()
+
+def stop_pusher(**kwargs: Any) -> None:
+    """Stop this process's pusher and delete its Pushgateway group."""
+    if _pusher is not None and _pusher_pid == os.getpid():
+        _pusher.stop()
+
+def _task_started(task_id: Optional[str] = None, **kwargs: Any) -> None:
+    with _task_starts_lock:
+        _task_starts[task_id] = time.perf_counter()
+
+def _task_finished(task_id: Optional[str] = None, task: Any = None, state: Optional[str] = None,
+                   **kwargs: Any) -> None:
+    with _task_starts_lock:
+        start = _task_starts.pop(task_id, None)
+    if start is not None and task is not None:
+        TASK_DURATION.labels(task=task.name, state=(state or "unknown").lower()).observe(time.perf_counter() - start)
+
+def instrument_celery() -> None:
+    """Time every task and push worker metrics, via Celery signals."""
+    from celery import signals
+    signals.task_prerun.connect(_task_started, weak=False)
+    signals.task_postrun.connect(_task_finished, weak=False)
+    # Prefork children are initialized separately from the main process
+    signals.worker_process_init.connect(start_pusher, weak=False)
+    signals.worker_ready.connect(start_pusher, weak=False)
+    signals.worker_process_shutdown.connect(stop_pusher, weak=False)
+    signals.worker_shutdown.connect(stop_pusher, weak=False)
@@ -5,23 +5,282 @@ Ananke2 knowledge framework. It enables:
 - Real-time task progress tracking
 - Worker status monitoring
 - Task state inspection
-- Error tracking and reporting
+- Per-worker throughput and per-queue latency over time
 
-The monitoring utilities are essential for:
-- Debugging task execution issues
-- Load balancing across workers
-- Identifying bottlenecks in document processing
-- Tracking long-running knowledge extraction tasks
+Worker state is gathered by a background collector instead of by the request
+handlers. Each worker answers a single ``ananke_snapshot`` inspect command
+with its active, scheduled, reserved, revoked and registered tasks, its
+processed task counts and how long its tasks waited in each queue, so a poll
+costs one broadcast timeout instead of five. The collector polls every
+MONITOR_INTERVAL seconds and keeps the last replies in memory, which status
+endpoints serve without waiting on the broker.
+
+Queue latency is measured on the worker from a ``sent_at`` header stamped
+on every message when it is published. Inspect commands are answered by the
+worker's main process, while prefork pools run tasks in child processes, so
+the waits in the snapshot are taken when the main process receives a
+message: they cover the time spent in the broker but not the time a
+prefetched message waits in the worker for a free pool slot. The full wait
+until the task starts is measured in the process running the task and only
+exported as the ``ananke_queue_wait_seconds`` histogram, which prefork
+children push to the Pushgateway.
+
+Example:
+    ```python
+    from app.utils.monitoring import get_monitor
+
+    monitor = get_monitor()
+    monitor.start()
+    for worker, stats in monitor.snapshot()["workers"].items():
+        print(worker, stats["throughput"], stats["queue_wait"])
+    ```
 """
 
-from typing import Dict, Any, Optional
+import copy
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from celery import signals
+from celery.worker import state as worker_state
+from celery.worker.control import Panel, inspect_command
+from ..config import settings
 from ..tasks import celery_app
+from .metrics import QUEUE_WAIT
+
+INSPECTIONS = ("active", "scheduled", "reserved", "revoked", "registered")
+
+# Queue waits of recent tasks per queue, kept by each worker's main process
+_queue_waits: Dict[str, Deque[Tuple[float, float]]] = {}
+_queue_waits_lock = threading.Lock()
+
+def _stamp_sent_at(headers: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+    if headers is not None:
+        headers.setdefault("sent_at", time.time())
+
+def _queue(request: Any) -> str:
+    return (getattr(request, "delivery_info", None) or {}).get("routing_key") or "unknown"
+
+def _record_queue_wait(task: Any = None, **kwargs: Any) -> None:
+    # task_prerun: runs in the process executing the task (a prefork child)
+    request = getattr(task, "request", None)
+    sent_at = getattr(request, "sent_at", None)
+    if isinstance(sent_at, (int, float)):
+        QUEUE_WAIT.labels(queue=_queue(request)).observe(max(time.time() - sent_at, 0.0))
+
+def _record_received(request: Any = None, **kwargs: Any) -> None:
+    # task_received: runs in the worker's main process, which answers ananke_snapshot
+    sent_at = (getattr(request, "request_dict", None) or {}).get("sent_at")
+    if isinstance(sent_at, (int, float)):
+        now = time.time()
+        record_queue_wait(_queue(request), max(now - sent_at, 0.0), now)
+
+def record_queue_wait(queue: str, seconds: float, now: Optional[float] = None) -> None:
+    """Record how long a message waited in a queue before the worker received it.
+
+    Args:
+        queue (str): Queue the task was consumed from
+        seconds (float): Time between publishing and receiving the message
+        now (Optional[float]): Receive time, defaults to now
+    """
+    with _queue_waits_lock:
+        _queue_waits.setdefault(queue, deque(maxlen=1000)).append((now or time.time(), seconds))
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+def queue_wait_stats(window: Optional[float] = None, now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+    """Summarize recent queue waits recorded by this worker's main process.
+
+    Args:
+        window (Optional[float]): Seconds of history to include. Defaults to
+            settings.MONITOR_WINDOW.
+        now (Optional[float]): Current time, defaults to now
+
+    Returns:
+        Dict[str, Dict[str, float]]: Queue name to count, mean, p95 and max
+            wait in seconds
+    """
+    window = settings.MONITOR_WINDOW if window is None else window
+    since = (now or time.time()) - window
+    with _queue_waits_lock:
+        recent = {queue: [wait for at, wait in waits if at >= since] for queue, waits in _queue_waits.items()}
+    return {
+        queue: {
+            "count": len(waits),
+            "mean": sum(waits) / len(waits),
+            "p95": _percentile(waits, 0.95),
+            "max": max(waits)
+        }
+        for queue, waits in recent.items() if waits
+    }
+
+@inspect_command()
+def ananke_snapshot(state: Any) -> Dict[str, Any]:
+    """Tasks, processed counts and queue waits of this worker, in one reply.
+
+    Runs in the worker's main process; ``queue_wait`` therefore excludes the
+    time messages spend prefetched in the worker (see the module docstring).
+    """
+    reply: Dict[str, Any] = {}
+    for name in INSPECTIONS:
+        try:
+            reply[name] = Panel.data[name](state)
+        except Exception as e:
+            print(f"Error inspecting {name}: {str(e)}")
+            reply[name] = []
+    reply["processed"] = dict(worker_state.total_count)
+    reply["queue_wait"] = queue_wait_stats()
+    reply["time"] = time.time()
+    return reply
+
+signals.before_task_publish.connect(_stamp_sent_at, weak=False)
+signals.task_received.connect(_record_received, weak=False)
+signals.task_prerun.connect(_record_queue_wait, weak=False)
+
+class WorkerMonitor:
+    """Background collector keeping a snapshot of worker state.
+
+    Args:
+        app (Any): Celery application to inspect
+        interval (float): Seconds between polls
+        timeout (float): Seconds to wait for worker replies per poll
+        window (float): Seconds of history used for throughput
+        history (int): Polls kept per worker
+    """
+
+    def __init__(self, app: Any = celery_app, interval: Optional[float] = None, timeout: Optional[float] = None,
+                 window: Optional[float] = None, history: Optional[int] = None):
+        self.app = app
+        self.interval = settings.MONITOR_INTERVAL if interval is None else interval
+        self.timeout = settings.MONITOR_TIMEOUT if timeout is None else timeout
+        self.window = settings.MONITOR_WINDOW if window is None else window
+        self.history_size = settings.MONITOR_HISTORY if history is None else history
+        self._history: Dict[str, Deque[Tuple[float, int]]] = {}
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _throughput(self, worker: str, now: float, processed: int) -> float:
+        history = self._history.setdefault(worker, deque(maxlen=self.history_size))
+        if history and processed < history[-1][1]:
+            # The worker restarted and its counters were reset
+            history.clear()
+        history.append((now, processed))
+        since = now - self.window
+        start = next((point for point in history if point[0] >= since), history[-1])
+        elapsed = now - start[0]
+        return (processed - start[1]) / elapsed if elapsed > 0 else 0.0
+
+    def poll(self) -> Dict[str, Any]:
+        """Inspect all workers once and replace the snapshot.
+
+        Returns:
+            Dict[str, Any]: The new snapshot (see ``snapshot``)
+        """
+        try:
+            replies = self.app.control.broadcast("ananke_snapshot", reply=True, timeout=self.timeout) or []
+        except Exception as e:
+            print(f"Error polling workers: {str(e)}")
+            replies = []
+
+        now = time.time()
+        workers: Dict[str, Any] = {}
+        with self._lock:
+            for reply in replies:
+                for worker, data in reply.items():
+                    if not isinstance(data, dict) or "processed" not in data:
+                        continue
+                    processed = sum(data["processed"].values())
+                    workers[worker] = dict(
+                        data, total_processed=processed,
+                        throughput=self._throughput(worker, now, processed)
+                    )
+            for worker in set(self._history) - set(workers):
+                # Keep history across a missed reply, drop it once stale
+                if now - self._history[worker][-1][0] > self.window:
+                    del self._history[worker]
+            self._snapshot = {"workers": workers, "updated_at": now}
+            return self._copy(now)
+
+    def _copy(self, now: float) -> Dict[str, Any]:
+        snapshot = copy.deepcopy(self._snapshot)
+        snapshot["age"] = now - snapshot["updated_at"]
+        return snapshot
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the last snapshot, polling once if there is none yet.
+
+        Returns:
+            Dict[str, Any]: Snapshot containing:
+                - workers (Dict): Worker hostname to its active, scheduled,
+                  reserved, revoked and registered tasks, ``processed``
+                  counts per task, ``total_processed``, ``throughput`` in
+                  tasks per second over the window and ``queue_wait`` stats
+                - updated_at (float): Time of the poll
+                - age (float): Seconds since the poll
+        """
+        with self._lock:
+            if self._snapshot is not None:
+                return self._copy(time.time())
+        return self.poll()
+
+    def history(self) -> Dict[str, List[Dict[str, float]]]:
+        """Get processed totals per worker over time.
+
+        Returns:
+            Dict[str, List[Dict[str, float]]]: Worker hostname to
+                {"time", "processed"} points, oldest first
+        """
+        with self._lock:
+            return {
+                worker: [{"time": at, "processed": processed} for at, processed in points]
+                for worker, points in self._history.items()
+            }
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self.poll()
+            self._stopped.wait(self.interval)
+
+    def start(self) -> None:
+        """Start polling in a daemon thread, if not already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="worker-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout + 1)
+            self._thread = None
+
+_monitor: Optional[WorkerMonitor] = None
+_monitor_lock = threading.Lock()
+
+def get_monitor() -> WorkerMonitor:
+    """Get the process-wide worker monitor.
+
+    Returns:
+        WorkerMonitor: Shared collector, not started
+    """
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = WorkerMonitor()
+    return _monitor
 
 def get_active_tasks() -> Dict[str, Any]:
     """Get currently active tasks from all Celery workers.
 
-    Retrieves a snapshot of all tasks currently being executed across
-    all registered Celery workers. This is useful for monitoring system
+    Served from the worker monitor's snapshot, so the result may be up to
+    MONITOR_INTERVAL seconds old. This is useful for monitoring system
     load and identifying potential bottlenecks.
 
     Returns:
@@ -31,7 +290,7 @@ def get_active_tasks() -> Dict[str, Any]:
             - name (str): Task name
             - args (List): Task arguments
             - kwargs (Dict): Task keyword arguments
-            - started (float): Timestamp when task started
+            - time_start (float): Timestamp when task started
 
     Example:
         ```python
@@ -45,8 +304,8 @@ def get_active_tasks() -> Dict[str, Any]:
         Returns empty dict if no workers are available or if inspector
         fails to communicate with workers.
     """
-    inspector = celery_app.control.inspect()
-    return inspector.active() or {}
+    workers = get_monitor().snapshot()["workers"]
+    return {worker: data.get("active", []) for worker, data in workers.items()}
 
 def get_task_progress(task_id: str) -> Dict[str, Any]:
     """Get detailed progress information for a specific task.
@@ -85,7 +344,7 @@ def get_task_progress(task_id: str) -> Dict[str, Any]:
     return {
         'status': result.status,
         'info': info,
-        'progress': getattr(info, 'progress', 0) if info else 0,
+        'progress': info.get('progress', 0) if isinstance(info, dict) else 0,
         'current_operation': info.get('current_operation', None) if isinstance(info, dict) else None,
         'errors': info.get('errors', []) if isinstance(info, dict) else []
     }
@@ -93,9 +352,9 @@ def get_task_progress(task_id: str) -> Dict[str, Any]:
 def get_worker_stats() -> Dict[str, Any]:
     """Get comprehensive statistics about all Celery workers.
 
-    Collects detailed statistics about registered Celery workers, including
-    their active, scheduled, and reserved tasks. This information is crucial
-    for monitoring system health and load distribution.
+    Served from the worker monitor's snapshot instead of five inspect
+    broadcasts, so calling it from a request handler doesn't block. The
+    snapshot is taken synchronously only if the monitor hasn't polled yet.
 
     Returns:
         Dict[str, Any]: Worker statistics containing:
@@ -104,6 +363,9 @@ def get_worker_stats() -> Dict[str, Any]:
             - reserved (Dict): Tasks reserved by workers but not yet started
             - revoked (Dict): Tasks that were revoked
             - registered (Dict): All task types registered with each worker
+            - throughput (Dict): Tasks per second per worker
+            - queue_wait (Dict): Queue wait stats per worker and queue
+            - updated_at (float): Time of the snapshot
 
     Example:
         ```python
@@ -123,11 +385,13 @@ def get_worker_stats() -> Dict[str, Any]:
         All dictionary values default to empty dict if the corresponding
         information cannot be retrieved from workers.
     """
-    inspector = celery_app.control.inspect()
-    return {
-        'active': inspector.active() or {},
-        'scheduled': inspector.scheduled() or {},
-        'reserved': inspector.reserved() or {},
-        'revoked': inspector.revoked() or {},
-        'registered': inspector.registered() or {}
+    snapshot = get_monitor().snapshot()
+    workers = snapshot["workers"]
+    stats: Dict[str, Any] = {
+        name: {worker: data.get(name, []) for worker, data in workers.items()}
+        for name in INSPECTIONS
     }
+    stats['throughput'] = {worker: data["throughput"] for worker, data in workers.items()}
+    stats['queue_wait'] = {worker: data.get("queue_wait", {}) for worker, data in workers.items()}
+    stats['updated_at'] = snapshot["updated_at"]
+    return stats
@@ -0,0 +1,339 @@
+"""Structured task progress for Ananke2.
+
+Tasks report progress through a ProgressReporter: the current workflow
+stage, units done out of a total (chunks, batches), DashScope tokens used
+and an ETA for the stage. Reports are rate limited to one per
+PROGRESS_INTERVAL seconds, except stage changes, and each report is:
+- stored as the task's PROGRESS state in the result backend, so
+  ``AsyncResult.info`` and the ``/{task_id}/progress`` endpoint see it
+- published on the Redis channel ``ananke2:progress:{task_id}``
+
+Subtasks report under their parent's task ID, so a client following a
+workflow sees the chunk progress of its extraction and embedding tasks.
+When a reported task finishes, a final event with its state is published.
+
+The API holds one pattern subscription (ProgressHub) and fans events out to
+its Server-Sent Events clients, so followers don't poll the result backend.
+
+Example:
+    ```python
+    from app.utils.progress import ProgressReporter
+
+    with ProgressReporter.for_task(extract_knowledge_graph, parent=True) as reporter:
+        reporter.stage("extracted", total=len(chunks))
+        for chunk in chunks:
+            extract(chunk)  # DashScope tokens are added to the report
+            reporter.advance()
+    ```
+"""
+
+import asyncio
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Sequence, Set
+from celery import signals, states
+from ..config import settings
+from .metrics import usage_tokens
+
+PROGRESS_STATE = "PROGRESS"
+CHANNEL_PREFIX = "ananke2:progress:"
+
+_current: ContextVar[Optional["ProgressReporter"]] = ContextVar("progress_reporter", default=None)
+# IDs of tasks in this process whose completion is published
+_reported: Set[str] = set()
+_redis: Any = None
+_redis_lock = threading.Lock()
+
+def channel(task_id: str) -> str:
+    """Redis channel a task's progress is published on."""
+    return f"{CHANNEL_PREFIX}{task_id}"
+
+def _client() -> Any:
+    global _redis
+    with _redis_lock:
+        if _redis is None:
+            import redis
+            _redis = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB,
+                                 socket_timeout=1.0, socket_connect_timeout=1.0)
+        return _redis
+
+def publish_progress(task_id: str, event: Dict[str, Any]) -> None:
+    """Publish a progress event; errors are logged, never raised.
+
+    Args:
+        task_id (str): Task the event belongs to
+        event (Dict[str, Any]): JSON-serializable event
+    """
+    try:
+        _client().publish(channel(task_id), json.dumps(event))
+    except Exception as e:
+        print(f"Error publishing progress of {task_id}: {str(e)}")
+
+def store_progress(task_id: str, event: Dict[str, Any]) -> None:
+    """Store an event as the task's PROGRESS state; errors are logged, never raised.
+
+    Args:
+        task_id (str): Task the event belongs to
+        event (Dict[str, Any]): Event stored as the task's info
+    """
+    from ..tasks import celery_app
+    try:
+        celery_app.backend.store_result(task_id, event, PROGRESS_STATE)
+    except Exception as e:
+        print(f"Error storing progress of {task_id}: {str(e)}")
+
+def report_tokens(usage: Any) -> None:
+    """Add a DashScope response's token usage to the current report, if any."""
+    reporter = _current.get()
+    if reporter is not None:
+        reporter.add_tokens(usage)
+
+class ProgressReporter:
+    """Rate-limited structured progress of one task.
+
+    A reporter without a task ID (tasks called directly or eagerly) keeps
+    count but emits nothing.
+
+    Args:
+        task_id (Optional[str]): Task reported on
+        stages (Sequence[str]): Ordered stages, used for the overall percentage
+        interval (Optional[float]): Minimum seconds between reports.
+            Defaults to settings.PROGRESS_INTERVAL.
+        publish (Callable): Publishes an event, publish_progress by default
+        store (Callable): Stores an event, store_progress by default
+        clock (Callable): Monotonic clock
+    """
+
+    def __init__(self, task_id: Optional[str], stages: Sequence[str] = (), interval: Optional[float] = None,
+                 publish: Callable[[str, Dict[str, Any]], None] = publish_progress,
+                 store: Callable[[str, Dict[str, Any]], None] = store_progress,
+                 clock: Callable[[], float] = time.monotonic):
+        self.task_id = task_id
+        self.stages = tuple(stages)
+        self.interval = settings.PROGRESS_INTERVAL if interval is None else interval
+        self.publish = publish
+        self.store = store
+        self.clock = clock
+        self.current_stage: Optional[str] = None
+        self.done = 0
+        self.total: Optional[int] = None
+        self.tokens: Dict[str, float] = {}
+        self._started = self._stage_started = clock()
+        self._last_emit: Optional[float] = None
+        self._pending = False
+        self._token = None
+
+    @classmethod
+    def for_task(cls, task: Any, parent: bool = False, stages: Sequence[str] = (), **kwargs: Any) -> "ProgressReporter":
+        """Create a reporter for the running task.
+
+        Args:
+            task (Any): Celery task whose ``request`` is current
+            parent (bool): Report under the parent task's ID, if there is one
+            stages (Sequence[str]): Ordered stages
+            **kwargs: Other ProgressReporter arguments
+
+        Returns:
+            ProgressReporter: Reporter, inactive outside a worker
+        """
+        request = task.request
+        task_id = getattr(request, "id", None)
+        if task_id is None or getattr(request, "is_eager", False):
+            return cls(None, stages, **kwargs)
+        target = (parent and getattr(request, "parent_id", None)) or task_id
+        if target == task_id:
+            _reported.add(task_id)
+        return cls(target, stages, **kwargs)
+
+    def __enter__(self) -> "ProgressReporter":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _current.reset(self._token)
+        if self._pending:
+            self.emit(force=True)
+
+    def stage(self, name: str, total: Optional[int] = None) -> None:
+        """Start a stage and report it immediately.
+
+        Args:
+            name (str): Stage name
+            total (Optional[int]): Units of work in the stage, if known
+        """
+        self.current_stage, self.done, self.total = name, 0, total
+        self._stage_started = self.clock()
+        self.emit(force=True)
+
+    def advance(self, count: int = 1) -> None:
+        """Mark units of the current stage done."""
+        self.done += count
+        self.emit()
+
+    def add_tokens(self, usage: Any) -> None:
+        """Add token usage of a DashScope response."""
+        for kind, value in usage_tokens(usage).items():
+            self.tokens[kind] = self.tokens.get(kind, 0) + value
+        self.emit()
+
+    def event(self) -> Dict[str, Any]:
+        """Build the current progress event.
+
+        Returns:
+            Dict[str, Any]: Contains:
+                - state (str): "PROGRESS"
+                - stage (str): Current stage
+                - done (int), total (int): Units of the stage, total may be None
+                - tokens (Dict[str, float]): DashScope tokens used by kind
+                - progress (float): Overall percentage over the stages
+                - current_operation (str): Readable summary
+                - eta (float): Estimated seconds left in the stage, or None
+                - elapsed (float): Seconds since the reporter started
+                - updated_at (float): Unix time of the event
+        """
+        now = self.clock()
+        fraction = min(self.done / self.total, 1.0) if self.total else 0.0
+        eta = None
+        if self.total and self.done:
+            eta = (now - self._stage_started) / self.done * max(self.total - self.done, 0)
+        progress = 0.0
+        if self.current_stage in self.stages:
+            progress = (self.stages.index(self.current_stage) + fraction) / len(self.stages) * 100
+        operation = self.current_stage or ""
+        if self.total:
+            operation = f"{operation} {self.done}/{self.total}"
+        return {
+            "state": PROGRESS_STATE,
+            "stage": self.current_stage,
+            "done": self.done,
+            "total": self.total,
+            "tokens": dict(self.tokens),
+            "progress": round(progress, 1),
+            "current_operation": operation,
+            "eta": eta,
+            "elapsed": now - self._started,
+            "updated_at": time.time()
+        }
+
+    def emit(self, force: bool = False) -> None:
+        """Report progress unless the last report is under ``interval`` old.
+
+        Args:
+            force (bool): Report regardless of the rate limit
+        """
+        if self.task_id is None:
+            return
+        now = self.clock()
+        if not force and self._last_emit is not None and now - self._last_emit < self.interval:
+            self._pending = True
+            return
+        event = self.event()
+        self.store(self.task_id, event)
+        self.publish(self.task_id, event)
+        self._last_emit, self._pending = now, False
+
+def _publish_final(task_id: Optional[str] = None, state: Optional[str] = None, **kwargs: Any) -> None:
+    if task_id in _reported:
+        _reported.discard(task_id)
+        publish_progress(task_id, {"state": state or states.SUCCESS, "updated_at": time.time()})
+
+signals.task_postrun.connect(_publish_final, weak=False)
+
+class ProgressHub:
+    """Shared Redis subscription fanning progress events out to local queues.
+
+    One pattern subscription serves every follower in the process. The
+    listener starts with the first follower and reconnects after errors.
+
+    Args:
+        maxsize (int): Events buffered per follower; the oldest are dropped
+        subscribe_timeout (float): Seconds a follower waits for the
+            subscription before following anyway
+    """
+
+    def __init__(self, maxsize: int = 100, subscribe_timeout: float = 5.0):
+        self.maxsize = maxsize
+        self.subscribe_timeout = subscribe_timeout
+        self._followers: Dict[str, Set[asyncio.Queue]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    def dispatch(self, task_id: str, event: Dict[str, Any]) -> None:
+        """Deliver an event to the task's followers."""
+        for queue in self._followers.get(task_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def _listen(self) -> None:
+        import redis.asyncio as aioredis
+        while self._followers:
+            client = aioredis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                    self._subscribed.set()
+                    async for message in pubsub.listen():
+                        if message["type"] == "pmessage":
+                            task_id = message["channel"].decode()[len(CHANNEL_PREFIX):]
+                            self.dispatch(task_id, json.loads(message["data"]))
+            except Exception as e:
+                print(f"Error listening for progress events: {str(e)}")
+                await asyncio.sleep(1.0)
+            finally:
+                self._subscribed.clear()
+                await client.aclose()
+
+    async def _wait_subscribed(self) -> None:
+        # Returns early if the listener stops, e.g. after a Redis error
+        waiter = asyncio.ensure_future(self._subscribed.wait())
+        try:
+            await asyncio.wait({waiter, self._listener}, timeout=self.subscribe_timeout,
+                               return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+        if not self._subscribed.is_set():
+            print("Following task progress before the progress subscription is ready")
+
+    @asynccontextmanager
+    async def follow(self, task_id: str) -> AsyncIterator[asyncio.Queue]:
+        """Receive a task's events while the context is open.
+
+        Waits until the hub's subscription is active, so every event
+        published after the context is entered is received.
+
+        Args:
+            task_id (str): Task to follow
+
+        Yields:
+            asyncio.Queue: Queue the task's events are put on
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.maxsize)
+        self._followers.setdefault(task_id, set()).add(queue)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        try:
+            if not self._subscribed.is_set():
+                await self._wait_subscribed()
+            yield queue
+        finally:
+            followers = self._followers.get(task_id, set())
+            followers.discard(queue)
+            if not followers:
+                self._followers.pop(task_id, None)
+            if not self._followers and self._listener is not None:
+                self._listener.cancel()
+                self._listener = None
+                self._subscribed.clear()
+
+_hub: Optional[ProgressHub] = None
+
+def get_hub() -> ProgressHub:
+    """Get the API process's progress hub."""
+    global _hub
+    if _hub is None:
+        _hub = ProgressHub()
+    return _hub
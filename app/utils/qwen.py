@@ -16,9 +16,62 @@ The client supports both synchronous and asynchronous operations with:
 from typing import Dict, List, Any, Optional
 import json
 import asyncio
-import dashscope
+import time
 from http import HTTPStatus
 from ..config import settings
+from .lazy import LazyModule
+from .metrics import record_qwen, usage_tokens
+from .progress import report_tokens
+from .tracing import span
+
+dashscope = LazyModule("dashscope")
+
+def configure_dashscope(api_key: Optional[str] = None) -> None:
+    """Set the DashScope SDK's API key and base URL.
+
+    The base URL is only changed when DASHSCOPE_BASE_URL is set, e.g. to
+    point every client at a local fake server (see app.utils.fake_dashscope).
+
+    Args:
+        api_key (Optional[str]): API key to use, if given
+    """
+    if api_key:
+        dashscope.api_key = api_key
+    if settings.DASHSCOPE_BASE_URL:
+        dashscope.base_http_api_url = settings.DASHSCOPE_BASE_URL
+
+def call_dashscope(operation: str, call: Any, **kwargs: Any) -> Any:
+    """Call a DashScope API and record its latency, status and token usage.
+
+    Each call is traced as a span. Token usage is also added to the running
+    task's progress report.
+
+    Args:
+        operation (str): Metrics label, e.g. "entities" or "embedding"
+        call (Any): DashScope function, e.g. dashscope.Generation.call
+        **kwargs: Arguments of the call
+
+    Returns:
+        Any: The DashScope response
+
+    Raises:
+        Exception: Whatever the call raises
+    """
+    with span(f"dashscope.{operation}", {"dashscope.operation": operation}) as current:
+        start = time.perf_counter()
+        try:
+            resp = call(**kwargs)
+        except Exception:
+            record_qwen(operation, time.perf_counter() - start, "error")
+            raise
+        status = {HTTPStatus.OK: "ok", HTTPStatus.TOO_MANY_REQUESTS: "rate_limited"}.get(resp.status_code, "error")
+        usage = getattr(resp, "usage", None)
+        record_qwen(operation, time.perf_counter() - start, status, usage)
+        report_tokens(usage)
+        current.set_attribute("dashscope.status", status)
+        for kind, value in usage_tokens(usage).items():
+            current.set_attribute(f"dashscope.tokens.{kind}", value)
+        return resp
 
 class QwenClient:
     """Client for interacting with Qwen API for knowledge extraction and embeddings.
@@ -65,7 +118,7 @@ class QwenClient:
         self.base_url = "https://dashscope.aliyuncs.com/compatible-mode/v1"
         self.max_retries = 3
         self.retry_delay = 1
-        dashscope.api_key = self.api_key
+        configure_dashscope(self.api_key)
 
     async def extract_entities(self, text: str) -> List[Dict[str, Any]]:
         """Extract entities from text using Qwen API.
@@ -127,7 +180,9 @@ class QwenClient:
         last_error = None
         for attempt in range(self.max_retries):
             try:
-                resp = dashscope.Generation.call(
+                resp = call_dashscope(
+                    request_type,
+                    dashscope.Generation.call,
                     model="qwen-max",
                     prompt=prompt,
                     result_format='message'
@@ -289,7 +344,9 @@ Just return output as a list of JSON relationships, nothing else."""
         last_error = None
         for attempt in range(self.max_retries):
             try:
-                response = dashscope.TextEmbedding.call(
+                response = call_dashscope(
+                    "embedding",
+                    dashscope.TextEmbedding.call,
                     model=dashscope.TextEmbedding.Models.text_embedding_v3,
                     input=text,
                     dimension=1024,
@@ -298,7 +355,8 @@ Just return output as a list of JSON relationships, nothing else."""
 
                 if response.status_code == HTTPStatus.OK:
                     try:
-                        return response.output["embeddings"][0]["dense"]
+                        item = response.output["embeddings"][0]
+                        return item["embedding"] if "embedding" in item else item["dense"]
                     except (KeyError, IndexError):
                         raise Exception("Invalid embedding response format")
 
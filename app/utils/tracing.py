@@ -0,0 +1,428 @@
+"""Distributed tracing for Ananke2.
+
+Spans follow a document from the API request through its Celery tasks:
+- FastAPI requests, via opentelemetry-instrumentation-fastapi
+- Celery tasks; the trace context travels in the message headers, so a
+  task's span is a child of the request or task that sent it
+- Workflow and streaming pipeline stages
+- DashScope calls (one span per attempt, so retries are visible)
+- Database round-trips through ``run_async``
+- PDF partitioning
+
+Workflow spans carry ``ananke.document_id`` (the arXiv id) and
+``ananke.doc_id`` attributes. Spans are exported when TRACING_EXPORTER is
+"otlp" (to a collector at TRACING_OTLP_ENDPOINT) or "file" (JSON lines in
+TRACING_FILE). OpenTelemetry is optional: without it, or with no exporter
+configured, every helper here is a no-op.
+
+The critical path of a document's workflow runs can be printed from a
+trace file:
+
+Example:
+    ```bash
+    TRACING_EXPORTER=file TRACING_FILE=/tmp/traces.jsonl celery -A app.tasks worker
+    python -m app.utils.tracing 2101.00123 --file /tmp/traces.jsonl
+    ```
+"""
+
+import argparse
+import json
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from ..config import settings
+from .metrics import DB_BACKENDS, STAGE_DURATION
+
+try:
+    from opentelemetry import context as otel_context, propagate, trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:
+    trace = None
+
+TRACER_NAME = "ananke2"
+# Message headers carrying the trace context
+CONTEXT_HEADERS = ("traceparent", "tracestate")
+
+class _NoopSpan:
+    """Stands in for a span when OpenTelemetry isn't installed."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def set_status(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def end(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+_configured = False
+_configure_lock = threading.Lock()
+_task_spans: Dict[str, Tuple[Any, Any]] = {}
+
+def _tracer() -> Any:
+    return trace.get_tracer(TRACER_NAME)
+
+@contextmanager
+def span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """Run a block in a new span, made current for nested spans.
+
+    Exceptions are recorded on the span and re-raised.
+
+    Args:
+        name (str): Span name
+        attributes (Optional[Dict[str, Any]]): Span attributes
+
+    Yields:
+        Any: The span
+    """
+    if trace is None:
+        yield _NOOP_SPAN
+        return
+    with _tracer().start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+    """Start a span without making it current; end it with ``end_span``.
+
+    Args:
+        name (str): Span name
+        attributes (Optional[Dict[str, Any]]): Span attributes
+
+    Returns:
+        Any: The span
+    """
+    if trace is None:
+        return _NOOP_SPAN
+    return _tracer().start_span(name, attributes=attributes)
+
+def end_span(current: Any, error: Optional[BaseException] = None) -> None:
+    """End a span, marking it failed if an error is given."""
+    if error is not None:
+        current.record_exception(error)
+        if trace is not None:
+            current.set_status(Status(StatusCode.ERROR, str(error)))
+    current.end()
+
+def open_span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Tuple[Any, Any]:
+    """Start a span and make it current until ``close_span``.
+
+    For spans that don't fit a ``with`` block; must be closed on the same
+    thread.
+
+    Args:
+        name (str): Span name
+        attributes (Optional[Dict[str, Any]]): Span attributes
+
+    Returns:
+        Tuple[Any, Any]: Handle to pass to ``close_span``
+    """
+    current = start_span(name, attributes)
+    token = otel_context.attach(trace.set_span_in_context(current)) if trace is not None else None
+    return current, token
+
+def close_span(handle: Tuple[Any, Any], error: Optional[BaseException] = None) -> None:
+    """End a span opened with ``open_span`` and restore the previous one."""
+    current, token = handle
+    if token is not None:
+        otel_context.detach(token)
+    end_span(current, error)
+
+def set_attributes(attributes: Dict[str, Any]) -> None:
+    """Set attributes on the current span, e.g. ``{"ananke.doc_id": doc_id}``."""
+    if trace is not None:
+        trace.get_current_span().set_attributes(
+            {key: value for key, value in attributes.items() if value is not None}
+        )
+
+@contextmanager
+def traced_stage(stage: str) -> Iterator[Any]:
+    """Time a stage in the stage histogram and in a span.
+
+    Args:
+        stage (str): Stage name, e.g. "pipeline_embed"
+
+    Yields:
+        Any: The span
+    """
+    with STAGE_DURATION.labels(stage=stage).time(), span(stage, {"ananke.stage": stage}) as current:
+        yield current
+
+def start_db_span(qualname: str) -> Any:
+    """Start a span for a database interface coroutine.
+
+    Args:
+        qualname (str): Qualified name, e.g. "Neo4jInterface.store_entities";
+            other coroutines get a no-op span
+
+    Returns:
+        Any: The span, to be ended with ``end_span``
+    """
+    owner, _, operation = qualname.rpartition(".")
+    backend = DB_BACKENDS.get(owner)
+    if backend is None:
+        return _NOOP_SPAN
+    return start_span(f"db.{backend}.{operation}", {"db.system": backend, "db.operation": operation})
+
+def _inject_context(headers: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+    if trace is not None and headers is not None:
+        propagate.inject(headers)
+
+def _start_task_span(task_id: Optional[str] = None, task: Any = None, **kwargs: Any) -> None:
+    if trace is None or task_id is None or task is None:
+        return
+    request = task.request
+    carrier = {key: getattr(request, key) for key in CONTEXT_HEADERS if getattr(request, key, None)}
+    queue = (getattr(request, "delivery_info", None) or {}).get("routing_key")
+    current = _tracer().start_span(
+        f"celery.run {task.name}", context=propagate.extract(carrier), kind=SpanKind.CONSUMER,
+        attributes={"celery.task_id": task_id, "celery.task_name": task.name, "celery.queue": queue or ""}
+    )
+    token = otel_context.attach(trace.set_span_in_context(current))
+    _task_spans[task_id] = (current, token)
+
+def _end_task_span(task_id: Optional[str] = None, state: Optional[str] = None, **kwargs: Any) -> None:
+    current, token = _task_spans.pop(task_id, (None, None))
+    if current is None:
+        return
+    current.set_attribute("celery.state", state or "")
+    if state == "FAILURE":
+        current.set_status(Status(StatusCode.ERROR))
+    otel_context.detach(token)
+    current.end()
+
+class JsonLinesExporter:
+    """Span exporter appending one JSON object per span to a file.
+
+    Args:
+        path (str): File to append to
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Any]) -> Any:
+        from opentelemetry.sdk.trace.export import SpanExportResult
+        lines = [json.dumps(span_record(finished), default=str) for finished in spans]
+        try:
+            with self._lock, open(self.path, "a") as f:
+                f.write("".join(line + "\n" for line in lines))
+        except OSError as e:
+            print(f"Error writing spans to {self.path}: {str(e)}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+def span_record(finished: Any) -> Dict[str, Any]:
+    """Convert a finished SDK span to the trace file format.
+
+    Args:
+        finished (Any): ``opentelemetry.sdk.trace.ReadableSpan``
+
+    Returns:
+        Dict[str, Any]: trace_id, span_id, parent_id, name, service, start,
+            end (Unix seconds), attributes and status
+    """
+    context = finished.get_span_context()
+    return {
+        "trace_id": format(context.trace_id, "032x"),
+        "span_id": format(context.span_id, "016x"),
+        "parent_id": format(finished.parent.span_id, "016x") if finished.parent else None,
+        "name": finished.name,
+        "service": finished.resource.attributes.get("service.name"),
+        "start": finished.start_time / 1e9,
+        "end": finished.end_time / 1e9,
+        "attributes": dict(finished.attributes or {}),
+        "status": finished.status.status_code.name
+    }
+
+def setup_tracing(service_name: str, app: Any = None) -> bool:
+    """Install the tracer provider and exporter for this process, once.
+
+    Args:
+        service_name (str): ``service.name`` of the spans, e.g. "ananke2-api"
+        app (Any): FastAPI application to instrument, if any
+
+    Returns:
+        bool: True if spans are exported, False if tracing is disabled or
+            OpenTelemetry is not installed
+    """
+    global _configured
+    exporter_name = settings.TRACING_EXPORTER
+    if not exporter_name or trace is None:
+        return False
+    with _configure_lock:
+        if not _configured:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+            if exporter_name == "otlp":
+                from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+                exporter = OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT, insecure=True)
+            elif exporter_name == "file":
+                exporter = JsonLinesExporter(settings.TRACING_FILE)
+            else:
+                raise ValueError(f"Unknown tracing exporter '{exporter_name}', expected 'otlp' or 'file'")
+            provider = TracerProvider(
+                resource=Resource.create({"service.name": service_name}),
+                sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO))
+            )
+            # The batch processor restarts its thread in forked pool processes
+            provider.add_span_processor(BatchSpanProcessor(exporter))
+            trace.set_tracer_provider(provider)
+            _configured = True
+    if app is not None:
+        try:
+            from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+            FastAPIInstrumentor.instrument_app(app)
+        except ImportError:
+            print("opentelemetry-instrumentation-fastapi is not installed, API requests are not traced")
+    return True
+
+def _setup_worker(**kwargs: Any) -> None:
+    setup_tracing("ananke2-worker")
+
+def trace_celery() -> None:
+    """Propagate trace context through task messages and trace every task."""
+    from celery import signals
+    signals.before_task_publish.connect(_inject_context, weak=False)
+    signals.task_prerun.connect(_start_task_span, weak=False)
+    signals.task_postrun.connect(_end_task_span, weak=False)
+    signals.worker_init.connect(_setup_worker, weak=False)
+    signals.worker_process_init.connect(_setup_worker, weak=False)
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    """Read spans from a trace file written by the "file" exporter.
+
+    Args:
+        path (str): Trace file
+
+    Returns:
+        List[Dict[str, Any]]: Span records (see ``span_record``)
+    """
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def document_roots(spans: List[Dict[str, Any]], document_id: str) -> List[Dict[str, Any]]:
+    """Find the outermost spans of a document's workflow runs.
+
+    Args:
+        spans (List[Dict[str, Any]]): Span records
+        document_id (str): arXiv id or document UUID
+
+    Returns:
+        List[Dict[str, Any]]: Spans tagged with the document whose parent
+            isn't, oldest first
+    """
+    def matches(record: Optional[Dict[str, Any]]) -> bool:
+        attributes = (record or {}).get("attributes", {})
+        return document_id in (attributes.get("ananke.document_id"), attributes.get("ananke.doc_id"))
+
+    by_id = {record["span_id"]: record for record in spans}
+    roots = [record for record in spans if matches(record) and not matches(by_id.get(record["parent_id"]))]
+    return sorted(roots, key=lambda record: record["start"])
+
+def critical_path(spans: List[Dict[str, Any]], root: Dict[str, Any]) -> List[Tuple[Dict[str, Any], float]]:
+    """Split a span's duration along its critical path.
+
+    Walking back from the end of a span, the child that finished last
+    before the cursor is on the critical path; time not covered by such a
+    child is the span's own. Concurrent children that finished earlier
+    don't delay the parent and are left out.
+
+    Args:
+        spans (List[Dict[str, Any]]): Span records of the trace
+        root (Dict[str, Any]): Span to analyze
+
+    Returns:
+        List[Tuple[Dict[str, Any], float]]: (span, seconds) segments on the
+            critical path; the seconds add up to the root's duration
+    """
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    for record in spans:
+        if record["parent_id"]:
+            children.setdefault(record["parent_id"], []).append(record)
+
+    def walk(record: Dict[str, Any], end: float) -> List[Tuple[Dict[str, Any], float]]:
+        segments: List[Tuple[Dict[str, Any], float]] = []
+        cursor = min(record["end"], end)
+        for child in sorted(children.get(record["span_id"], []), key=lambda c: c["end"], reverse=True):
+            if cursor <= record["start"]:
+                break
+            if child["start"] >= cursor:
+                continue
+            child_end = min(child["end"], cursor)
+            if child_end < cursor:
+                segments.append((record, cursor - child_end))
+            child_start = max(child["start"], record["start"])
+            segments.extend(walk(dict(child, start=child_start), child_end))
+            cursor = child_start
+        if cursor > record["start"]:
+            segments.append((record, cursor - record["start"]))
+        return segments
+
+    return walk(root, root["end"])
+
+def summarize(segments: List[Tuple[Dict[str, Any], float]]) -> List[Dict[str, Any]]:
+    """Total critical-path time by span name.
+
+    Args:
+        segments (List[Tuple[Dict[str, Any], float]]): From ``critical_path``
+
+    Returns:
+        List[Dict[str, Any]]: name, seconds, share (0-1) and spans count,
+            longest first
+    """
+    totals: Dict[str, Dict[str, Any]] = {}
+    for record, seconds in segments:
+        entry = totals.setdefault(record["name"], {"name": record["name"], "seconds": 0.0, "spans": set()})
+        entry["seconds"] += seconds
+        entry["spans"].add(record["span_id"])
+    overall = sum(entry["seconds"] for entry in totals.values()) or 1.0
+    return sorted(
+        ({"name": entry["name"], "seconds": entry["seconds"], "share": entry["seconds"] / overall,
+          "spans": len(entry["spans"])} for entry in totals.values()),
+        key=lambda entry: entry["seconds"], reverse=True
+    )
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Print the critical path of a document's workflow runs."""
+    parser = argparse.ArgumentParser(prog="python -m app.utils.tracing", description=main.__doc__)
+    parser.add_argument("document_id", help="arXiv id or document UUID")
+    parser.add_argument("--file", default=settings.TRACING_FILE, help="trace file of the 'file' exporter")
+    parser.add_argument("--top", type=int, default=15, help="span names to show per run")
+    args = parser.parse_args(argv)
+
+    spans = load_spans(args.file)
+    roots = document_roots(spans, args.document_id)
+    if not roots:
+        print(f"No spans for document {args.document_id} in {args.file}", file=sys.stderr)
+        return 1
+    for root in roots:
+        trace_spans = [record for record in spans if record["trace_id"] == root["trace_id"]]
+        started = datetime.fromtimestamp(root["start"], timezone.utc).isoformat(timespec="seconds")
+        print(f"{root['name']} ({root['status']}) trace {root['trace_id']} "
+              f"started {started}, {root['end'] - root['start']:.3f}s")
+        print(f"  {'seconds':>10}  {'share':>6}  {'spans':>5}  name")
+        for entry in summarize(critical_path(trace_spans, root))[:args.top]:
+            print(f"  {entry['seconds']:10.3f}  {entry['share']:6.1%}  {entry['spans']:5d}  {entry['name']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
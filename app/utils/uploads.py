@@ -0,0 +1,253 @@
+"""Content-addressed upload spooling for Ananke2.
+
+Uploaded documents are streamed to a spool directory in fixed-size chunks
+while their SHA-256 is computed, so the API never holds a whole file in
+memory. Files are stored under their hash, which makes identical uploads
+share one path regardless of filename. A JSON sidecar next to each file
+records the task that processes it:
+- spool_upload: stream an upload to disk, enforcing a size limit
+- claim_upload: atomically register the processing task for a hash, or
+  return the task registered by an earlier upload of the same content
+- replace_claim: take over a claim whose task failed, was revoked or never
+  started
+- release_upload: drop a claim whose task could not be started
+
+Layout:
+    ```
+    {UPLOAD_SPOOL_DIR}/ab/abcdef....pdf    # uploaded content
+    {UPLOAD_SPOOL_DIR}/ab/abcdef....claim.json   # {"task_id": ..., "claimed_at": ..., ...}
+    ```
+
+Example:
+    ```python
+    upload = await spool_upload(file)
+    record = claim_upload(upload, task_id=str(uuid4()))
+    if record["task_id"] != task_id:
+        ...  # duplicate, already being processed
+    ```
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+from ..config import settings
+from .metrics import record_bytes, record_cache
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+    def __init__(self, limit: int):
+        super().__init__(f"Upload exceeds the maximum size of {limit} bytes")
+        self.limit = limit
+
+@dataclass(frozen=True)
+class SpooledUpload:
+    """An upload stored in the spool directory.
+
+    Attributes:
+        sha256 (str): Hex digest of the content
+        path (Path): Content-addressed location of the file
+        size (int): Size in bytes
+        filename (str): Client-supplied filename, informational only
+    """
+    sha256: str
+    path: Path
+    size: int
+    filename: str
+
+    @property
+    def sidecar(self) -> Path:
+        """Path of the JSON record for this content.
+
+        Content extensions are a single suffix, so no upload can share it.
+        """
+        return self.path.with_name(f"{self.sha256}.claim.json")
+
+_SUFFIX = re.compile(r"^\.[A-Za-z0-9]{1,10}$")
+
+def content_path(sha256: str, filename: str = "", spool_dir: Optional[str] = None) -> Path:
+    """Return the content-addressed path for a digest.
+
+    Only a short alphanumeric extension is taken from the filename, so
+    client-supplied names can't escape the spool directory.
+
+    Args:
+        sha256 (str): Hex digest of the content
+        filename (str, optional): Original filename to take the extension from
+        spool_dir (Optional[str]): Spool root. Defaults to settings.UPLOAD_SPOOL_DIR.
+
+    Returns:
+        Path: ``{spool_dir}/{sha256[:2]}/{sha256}{ext}``
+    """
+    suffix = os.path.splitext(filename or "")[1].lower()
+    if not _SUFFIX.match(suffix):
+        suffix = ".bin"
+    return Path(spool_dir or settings.UPLOAD_SPOOL_DIR) / sha256[:2] / f"{sha256}{suffix}"
+
+async def spool_upload(file: Any, spool_dir: Optional[str] = None,
+                       max_bytes: Optional[int] = None,
+                       chunk_size: Optional[int] = None) -> SpooledUpload:
+    """Stream an upload to the spool directory while hashing it.
+
+    Chunks are written to a temporary file in the spool directory, which is
+    renamed to its content-addressed path once the hash is known. If the
+    content is already spooled the temporary file is discarded.
+
+    Args:
+        file (Any): FastAPI ``UploadFile`` (anything with ``filename`` and an
+            async ``read(size)``)
+        spool_dir (Optional[str]): Spool root. Defaults to settings.UPLOAD_SPOOL_DIR.
+        max_bytes (Optional[int]): Size limit. Defaults to settings.MAX_UPLOAD_BYTES.
+        chunk_size (Optional[int]): Read size. Defaults to settings.UPLOAD_CHUNK_SIZE.
+
+    Returns:
+        SpooledUpload: Hash, path and size of the stored content
+
+    Raises:
+        UploadTooLargeError: If the upload exceeds ``max_bytes``; nothing is kept
+    """
+    spool_dir = spool_dir or settings.UPLOAD_SPOOL_DIR
+    max_bytes = max_bytes or settings.MAX_UPLOAD_BYTES
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    filename = getattr(file, "filename", None) or ""
+
+    # Reject early when the multipart parser already knows the size
+    known_size = getattr(file, "size", None)
+    if known_size is not None and known_size > max_bytes:
+        raise UploadTooLargeError(max_bytes)
+
+    os.makedirs(spool_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=spool_dir, prefix=".upload-", suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(chunk)
+                await asyncio.to_thread(out.write, chunk)
+
+        record_bytes("upload", size)
+        sha256 = digest.hexdigest()
+        path = content_path(sha256, filename, spool_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            os.unlink(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+        return SpooledUpload(sha256=sha256, path=path, size=size, filename=filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def lookup_upload(upload: SpooledUpload) -> Optional[Dict[str, Any]]:
+    """Return the sidecar record for spooled content, if any.
+
+    Args:
+        upload (SpooledUpload): Spooled content
+
+    Returns:
+        Optional[Dict[str, Any]]: Recorded task_id, claimed_at (epoch
+            seconds), filename, size and sha256, or None if the content
+            hasn't been claimed
+    """
+    try:
+        with open(upload.sidecar) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def claim_upload(upload: SpooledUpload, task_id: str) -> Dict[str, Any]:
+    """Register the task processing spooled content.
+
+    The sidecar is written to a temporary file and hard-linked into place,
+    which fails if it already exists, so of several concurrent uploads of
+    the same content exactly one claim succeeds and readers never see a
+    partially written record.
+
+    Args:
+        upload (SpooledUpload): Spooled content
+        task_id (str): Task that will process it
+
+    Returns:
+        Dict[str, Any]: The winning record; its task_id equals ``task_id``
+            when this call made the claim
+    """
+    record = {
+        "sha256": upload.sha256,
+        "task_id": task_id,
+        "claimed_at": time.time(),
+        "filename": upload.filename,
+        "size": upload.size
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=upload.path.parent, prefix=".claim-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(record, f)
+        os.link(tmp_path, upload.sidecar)
+    except FileExistsError:
+        record_cache("upload", hit=True)
+        return lookup_upload(upload) or record
+    finally:
+        os.unlink(tmp_path)
+    record_cache("upload", hit=False)
+    return record
+
+def replace_claim(upload: SpooledUpload, stale_task_id: str, task_id: str) -> Dict[str, Any]:
+    """Replace the claim of a task that failed, was revoked or never started.
+
+    The stale sidecar is moved aside atomically, so of several concurrent
+    replacements only one removes it; a claim made in between by another
+    upload is put back instead of being dropped.
+
+    Args:
+        upload (SpooledUpload): Spooled content
+        stale_task_id (str): Task of the claim to replace
+        task_id (str): Task that will process the content instead
+
+    Returns:
+        Dict[str, Any]: The winning record, as returned by ``claim_upload``
+    """
+    moved = upload.sidecar.with_name(f".stale-{task_id}")
+    try:
+        os.rename(upload.sidecar, moved)
+    except FileNotFoundError:
+        return claim_upload(upload, task_id)
+    try:
+        try:
+            with open(moved) as f:
+                current = json.load(f).get("task_id")
+        except (ValueError, AttributeError):
+            current = None
+        if current not in (None, stale_task_id):
+            try:
+                os.link(moved, upload.sidecar)
+            except FileExistsError:
+                pass
+    finally:
+        os.unlink(moved)
+    return claim_upload(upload, task_id)
+
+def release_upload(upload: SpooledUpload) -> None:
+    """Remove the claim on spooled content so a later upload can retry.
+
+    Args:
+        upload (SpooledUpload): Spooled content
+    """
+    try:
+        os.unlink(upload.sidecar)
+    except FileNotFoundError:
+        pass
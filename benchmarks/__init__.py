@@ -0,0 +1,5 @@
+"""Performance benchmarks for Ananke2.
+
+Each module is runnable with ``python -m benchmarks.<name>`` and prints a
+table of results; pass ``--json PATH`` to also write machine-readable output.
+"""
@@ -0,0 +1,236 @@
+"""End-to-end ingest benchmark against local stand-ins.
+
+Streams each document through ``document.stream_document`` (partition,
+chunk, embed ‖ extract, write) with every external service replaced by a
+local stand-in, so runs are repeatable on a laptop and comparable across
+commits:
+
+- DashScope: FakeDashScope on a loopback port, with configurable response
+  latency and share of HTTP 429 answers
+- Chroma: an ephemeral in-process collection
+- MySQL and Neo4j: SQLite and in-memory stand-ins (see benchmarks.standins)
+
+Reports documents per minute, p50/p99 latency of every pipeline stage
+operation (one page batch, element, embedding batch, extraction, flush)
+and of whole documents, and the peak RSS of the process. The first
+``--warmup`` documents are run before timing so imports and partitioner
+models aren't counted.
+
+Usage:
+    python -m benchmarks.bench_ingest
+    python -m benchmarks.bench_ingest --repeat 5 --latency 0.2 --rate-limit 0.05
+    python -m benchmarks.bench_ingest --strategy hi_res --warmup 0
+    python -m benchmarks.bench_ingest --partitioner benchmarks.bench_ingest:text_layer_partition
+    python -m benchmarks.bench_ingest paper.pdf --json results/bench_ingest.json
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from unittest import mock
+
+import numpy as np
+
+from app.processors import partition, pipeline
+from app.tasks import document
+from app.utils.fake_dashscope import FakeDashScope
+from benchmarks.standins import MemoryGraphDatabase, SQLiteRelationalDatabase, vector_db
+
+SAMPLE_DOCS = [os.path.join(os.path.dirname(__file__), os.pardir, "tests", "data", "sample_paper.pdf")]
+
+def text_layer_partition(filename: str, starting_page_number: int = 1, **kwargs: Any) -> List[str]:
+    """Lines of a PDF's text layer, a cheap partitioner to leave parsing out of a run."""
+    from pypdf import PdfReader
+    return [line for page in PdfReader(filename).pages
+            for line in (page.extract_text() or "").splitlines() if line.strip()]
+
+class StageTimer:
+    """Collects the duration of every pipeline stage operation."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self._traced_stage = pipeline.traced_stage
+
+    @contextlib.contextmanager
+    def traced_stage(self, stage: str) -> Iterator[Any]:
+        start = time.perf_counter()
+        try:
+            with self._traced_stage(stage) as current:
+                yield current
+        finally:
+            self.samples[stage].append(time.perf_counter() - start)
+
+    def chunk_builder(self) -> type:
+        """ChunkBuilder timing each element it is fed."""
+        samples = self.samples["pipeline_chunk"]
+
+        class TimedChunkBuilder(pipeline.ChunkBuilder):
+            def add(self, text):
+                start = time.perf_counter()
+                chunks = super().add(text)
+                samples.append(time.perf_counter() - start)
+                return chunks
+
+        return TimedChunkBuilder
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, p50, p99, mean and total seconds per stage."""
+        return {
+            stage: {
+                "count": len(values),
+                "p50": float(np.percentile(values, 50)),
+                "p99": float(np.percentile(values, 99)),
+                "mean": float(np.mean(values)),
+                "total": float(np.sum(values))
+            }
+            for stage, values in sorted(self.samples.items()) if values
+        }
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree, if it is a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def ingest(path: str, stores: Dict[str, Any], partitioner: str = partition.PARTITIONER, strategy: str = "fast",
+           timer: Optional[StageTimer] = None, verbose: bool = False) -> dict:
+    """Stream one document into the stand-ins.
+
+    Args:
+        path (str): PDF file
+        stores (Dict[str, Any]): "relational", "graph" and "vector" stand-ins
+        partitioner (str): "module:function" of the partition function
+        strategy (str): unstructured partition strategy
+        timer (Optional[StageTimer]): Records stage durations, if given
+        verbose (bool): Show the task's output
+
+    Returns:
+        dict: Result of stream_document
+    """
+    patches = [
+        mock.patch.object(document, "get_sync_relational_db", return_value=stores["relational"]),
+        mock.patch.object(document, "get_sync_graph_db", return_value=stores["graph"]),
+        mock.patch.object(document, "get_sync_vector_db", return_value=stores["vector"]),
+        mock.patch.object(document, "bump_generation"),
+        mock.patch.object(document, "iter_partition_pdf",
+                          functools.partial(document.iter_partition_pdf, partitioner=partitioner, strategy=strategy)),
+        # Repeated runs of a document must not be skipped as duplicates
+        mock.patch.object(document.settings, "DEDUP_ENABLED", False)
+    ]
+    if timer is not None:
+        patches += [mock.patch.object(pipeline, "traced_stage", timer.traced_stage),
+                    mock.patch.object(pipeline, "ChunkBuilder", timer.chunk_builder())]
+    with contextlib.ExitStack() as stack:
+        for patch in patches:
+            stack.enter_context(patch)
+        if not verbose:
+            stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+        return document.stream_document(path)
+
+def run_benchmark(paths: List[str], repeat: int = 1, warmup: int = 1, partitioner: str = partition.PARTITIONER,
+                  strategy: str = "fast", latency: float = 0.0, rate_limit: float = 0.0, seed: int = 0,
+                  verbose: bool = False) -> Dict[str, Any]:
+    """Ingest every document ``repeat`` times and summarize.
+
+    Args:
+        paths (List[str]): PDF files to ingest
+        repeat (int): Times each document is ingested
+        warmup (int): Untimed documents ingested first
+        partitioner (str): "module:function" of the partition function
+        strategy (str): unstructured partition strategy
+        latency (float): Seconds the fake DashScope delays every response
+        rate_limit (float): Share of DashScope requests answered with HTTP 429
+        seed (int): Seed of the rate limiting
+        verbose (bool): Show the task's output
+
+    Returns:
+        Dict[str, Any]: Configuration, throughput, stage latencies, peak RSS,
+        DashScope request counts and stored rows
+    """
+    stores = {"relational": SQLiteRelationalDatabase(), "graph": MemoryGraphDatabase(), "vector": vector_db()}
+    timer, documents, failures = StageTimer(), [], []
+    with FakeDashScope(latency=latency, rate_limit=rate_limit, seed=seed) as server:
+        server.install()
+        for path in paths[:1] * warmup:
+            ingest(path, stores, partitioner, strategy, verbose=verbose)
+        server.stats = dict.fromkeys(server.stats, 0)
+        start = time.perf_counter()
+        for path in paths * repeat:
+            doc_start = time.perf_counter()
+            try:
+                result = ingest(path, stores, partitioner, strategy, timer, verbose)
+            except Exception as e:
+                failures.append({"document": os.path.basename(path), "error": str(e)})
+                continue
+            timer.samples["document"].append(time.perf_counter() - doc_start)
+            documents.append({"document": os.path.basename(path), "chunks": result["chunks"],
+                              "entities": result["entities"], "relationships": result["relationships"]})
+        seconds = time.perf_counter() - start
+        requests = dict(server.stats)
+    return {
+        "commit": git_commit(),
+        "config": {"repeat": repeat, "warmup": warmup, "partitioner": partitioner, "strategy": strategy,
+                   "latency": latency, "rate_limit": rate_limit,
+                   "queue_size": document.settings.PIPELINE_QUEUE_SIZE,
+                   "write_batch": document.settings.PIPELINE_WRITE_BATCH,
+                   "embedding_batch_size": document.settings.EMBEDDING_BATCH_SIZE},
+        "documents": len(documents),
+        "failed": failures,
+        "seconds": seconds,
+        "docs_per_min": len(documents) / seconds * 60 if seconds else 0.0,
+        "chunks": sum(doc["chunks"] for doc in documents),
+        "stages": timer.summary(),
+        "peak_rss_mb": peak_rss_mb(),
+        "dashscope_requests": requests,
+        "stored": {**stores["relational"].counts(), **stores["graph"].counts()}
+    }
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="PDF files (default: sample documents)")
+    parser.add_argument("--repeat", type=int, default=3, help="times each document is ingested")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed documents ingested first")
+    parser.add_argument("--partitioner", default=partition.PARTITIONER, help="module:function partitioning PDFs")
+    parser.add_argument("--strategy", default="fast", help="unstructured partition strategy")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake DashScope latency in seconds")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="share of DashScope requests answered 429")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the rate limiting")
+    parser.add_argument("--verbose", action="store_true", help="show the task output")
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or [path for path in SAMPLE_DOCS if os.path.exists(path)]
+    results = run_benchmark(paths, args.repeat, args.warmup, args.partitioner, args.strategy, args.latency,
+                            args.rate_limit, args.seed, args.verbose)
+    print(f"{results['documents']} documents ({results['chunks']} chunks) in {results['seconds']:.2f}s: "
+          f"{results['docs_per_min']:.1f} docs/min, peak RSS {results['peak_rss_mb']:.0f} MiB")
+    for stage, stats in results["stages"].items():
+        print(f"{stage:<20} {stats['count']:>6} x  p50 {stats['p50'] * 1000:>9.2f} ms  "
+              f"p99 {stats['p99'] * 1000:>9.2f} ms  total {stats['total']:>8.2f}s")
+    for failure in results["failed"]:
+        print(f"FAILED {failure['document']}: {failure['error']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0 if not results["failed"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""Micro-benchmarks for model construction and serialization.
+
+Times every model in ``app.models`` through the operations bulk graph export
+uses: construction, ``model_dump`` (python and JSON mode), byte output and
+each database adapter, both returning rows and writing into a ColumnBuffer.
+
+Usage:
+    python -m benchmarks.bench_models
+    python -m benchmarks.bench_models --number 2000 --dim 1024 --model EntitySymbol
+    python -m benchmarks.bench_models --json results/bench_models.json
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from uuid import uuid4
+
+import numpy as np
+
+from app.models import (
+    BaseObject,
+    ColumnBuffer,
+    Document,
+    EntitySemantic,
+    EntitySymbol,
+    LogicExpression,
+    MathExpression,
+    RelationSemantic,
+    RelationSymbol,
+    SemanticBase,
+    StructuredChunk,
+    StructuredData,
+    StructuredDataBase,
+    StructuredSentence,
+    SymbolBase,
+    TripleSemantic,
+    TripleSymbol,
+)
+from app.models.entities import Entity, Relationship
+
+ADAPTERS = ("to_neo4j", "to_mysql", "to_chroma")
+
+def _structured_data() -> Dict[str, Any]:
+    return {"data_id": uuid4(), "data_type": "metadata", "data_value": {"title": "Attention", "year": 2017}}
+
+def sample_kwargs(dim: int) -> Dict[type, Callable[[], Dict[str, Any]]]:
+    """Build constructor arguments for every benchmarked model.
+
+    Args:
+        dim (int): Embedding dimension for vector fields
+
+    Returns:
+        Dict[type, Callable[[], Dict[str, Any]]]: Model class to a factory of
+            keyword arguments
+    """
+    vector = np.random.default_rng(0).random(dim, dtype=np.float32)
+    semantic = lambda: {"semantic_id": uuid4(), "semantic_type": "DEFINITION", "semantic_value": "A model"}
+    symbol = lambda: {"symbol_id": uuid4(), "name": "Transformer", "descriptions": ["A neural architecture"],
+                      "document_id": uuid4()}
+    relation_semantic = lambda: {"relation_id": uuid4(), "name": "USES", "semantic": vector, "hit_count": 3}
+    triple_ids = lambda: {"subject_id": uuid4(), "predicate_id": uuid4(), "object_id": uuid4()}
+    entity_symbol = lambda: {**symbol(), "entity_type": "CONCEPT",
+                             "properties": [StructuredDataBase(**_structured_data())],
+                             "labels": [StructuredDataBase(**_structured_data())]}
+    chunk = lambda: {"chunk_id": uuid4(), "chunk_raw_content": "Attention is all you need. " * 20,
+                     "chunk_summary_content": "Attention", "modality_identifier": "text/plain",
+                     "document_id": uuid4(),
+                     "extraction_entity_results": [EntitySymbol(**entity_symbol())],
+                     "extraction_triple_results": [TripleSymbol(**symbol(), **triple_ids())]}
+    return {
+        BaseObject: dict,
+        Entity: lambda: {"name": "Transformer", "type": "CONCEPT", "description": "A neural architecture"},
+        Relationship: lambda: {"source": "Transformer", "target": "Attention", "relationship": "USES",
+                               "relationship_strength": 8},
+        StructuredDataBase: _structured_data,
+        StructuredData: _structured_data,
+        SemanticBase: semantic,
+        SymbolBase: symbol,
+        EntitySemantic: lambda: {**semantic(), "name": "Transformer", "vector_representation": vector},
+        EntitySymbol: entity_symbol,
+        RelationSemantic: relation_semantic,
+        RelationSymbol: lambda: {"relation_id": uuid4(), "name": "USES", "description": "uses",
+                                 "semantics": RelationSemantic(**relation_semantic()), "hit_count": 3,
+                                 "relationship_strength": 8},
+        TripleSymbol: lambda: {**symbol(), **triple_ids()},
+        TripleSemantic: lambda: {**semantic(), **triple_ids()},
+        LogicExpression: lambda: {"expression_id": uuid4(), "expression_lean4": "∀ x y, x ∧ y → y ∧ x",
+                                  "expression_sympy": "And(x, y) == And(y, x)"},
+        MathExpression: lambda: {"expression_id": uuid4(), "expression_latex": "e^{i\\pi} + 1 = 0",
+                                 "expression_sympy": "Eq(exp(I*pi) + 1, 0)",
+                                 "expression_wolfram": "E^(I Pi) + 1 == 0"},
+        StructuredSentence: lambda: {"sentence_vectorization": vector, "parent_chunk_id": uuid4(),
+                                     "document_id": uuid4(),
+                                     "entity_relations": [TripleSymbol(**symbol(), **triple_ids())]},
+        StructuredChunk: chunk,
+        Document: lambda: {"id": uuid4(), "meta": StructuredData(**_structured_data()),
+                           "meta_embedding": vector, "raw_content": "Attention is all you need. " * 200,
+                           "structured_chunks": [StructuredChunk(**chunk())]},
+    }
+
+def operations(cls: type, kwargs: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    """Build the timed operations for one model.
+
+    Args:
+        cls (type): Model class
+        kwargs (Dict[str, Any]): Constructor arguments
+
+    Returns:
+        Dict[str, Callable[[], Any]]: Operation name to zero-argument callable
+    """
+    instance = cls(**kwargs)
+    ops = {
+        "construct": lambda: cls(**kwargs),
+        "model_dump": instance.model_dump,
+        "model_dump_json_mode": lambda: instance.model_dump(mode="json"),
+        "model_dump_json": instance.model_dump_json,
+    }
+    if isinstance(instance, BaseObject):
+        ops["model_dump_bytes"] = instance.model_dump_bytes
+        for adapter in ADAPTERS:
+            method = getattr(instance, adapter)
+            ops[adapter] = method
+            ops[f"{adapter}_buffered"] = lambda method=method, buffer=ColumnBuffer(): method(buffer=buffer)
+    elif hasattr(instance, "dict"):
+        ops["dict"] = instance.dict
+    return ops
+
+def run_benchmarks(number: int = 1000, dim: int = 1024,
+                   models: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """Time every operation for every (selected) model.
+
+    Args:
+        number (int, optional): Calls per measurement. Defaults to 1000.
+        dim (int, optional): Vector dimension. Defaults to 1024.
+        models (Optional[Sequence[str]]): Class names to include, all if None
+
+    Returns:
+        List[Dict[str, Any]]: One record per model and operation with the
+            mean time per call in microseconds
+    """
+    results = []
+    for cls, factory in sample_kwargs(dim).items():
+        if models and cls.__name__ not in models:
+            continue
+        for name, op in operations(cls, factory()).items():
+            op()  # warm up lazily built serializers and field plans
+            best = min(timeit.repeat(op, number=number, repeat=3))
+            results.append({
+                "model": cls.__name__,
+                "operation": name,
+                "us_per_call": best / number * 1e6
+            })
+    return results
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=1000, help="calls per measurement")
+    parser.add_argument("--dim", type=int, default=1024, help="vector dimension")
+    parser.add_argument("--model", action="append", help="only benchmark this model (repeatable)")
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.number, args.dim, args.model)
+    for result in results:
+        print(f"{result['model']:<20} {result['operation']:<22} {result['us_per_call']:>10.2f} us")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"number": args.number, "dim": args.dim, "results": results}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
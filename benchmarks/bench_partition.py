@@ -0,0 +1,97 @@
+"""Benchmark serial against page-parallel PDF partitioning.
+
+Partitions each sample document once in a single process and once with
+``app.processors.partition.partition_pdf`` for every requested worker count,
+checking that both produce the same elements in the same order. The pool is
+warmed up before timing so worker start-up isn't counted.
+
+Usage:
+    python -m benchmarks.bench_partition
+    python -m benchmarks.bench_partition --workers 2 --workers 4 --pages-per-batch 4
+    python -m benchmarks.bench_partition --strategy hi_res --json results/bench_partition.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.processors import partition
+
+SAMPLE_DOCS = [
+    os.path.join(os.path.dirname(__file__), os.pardir, "tests", "data", "sample_paper.pdf"),
+    *sorted(glob.glob(os.path.join(os.path.dirname(__file__), os.pardir, "test_docs", "*.pdf")))
+]
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def run_benchmarks(paths: List[str], workers: List[int], pages_per_batch: int,
+                   partitioner: str, **kwargs) -> List[Dict[str, Any]]:
+    """Time serial and parallel partitioning of each document.
+
+    Args:
+        paths (List[str]): PDF files to partition
+        workers (List[int]): Worker counts to compare against serial
+        pages_per_batch (int): Pages per worker task
+        partitioner (str): "module:function" of the partition function
+        **kwargs: Passed to the partition function
+
+    Returns:
+        List[Dict[str, Any]]: One result per document and worker count
+    """
+    results = []
+    for path in paths:
+        pages = partition.page_count(path)
+        serial, serial_seconds = _timed(partition.partition_pdf, path, workers=1,
+                                        partitioner=partitioner, **kwargs)
+        for count in workers:
+            # Warm up the pool so imports in the workers aren't timed
+            partition.partition_pdf(path, workers=count, pages_per_batch=pages_per_batch, min_pages=2,
+                                    partitioner=partitioner, **kwargs)
+            parallel, seconds = _timed(partition.partition_pdf, path, workers=count,
+                                       pages_per_batch=pages_per_batch, min_pages=2,
+                                       partitioner=partitioner, **kwargs)
+            results.append({
+                "document": os.path.basename(path),
+                "pages": pages,
+                "workers": count,
+                "elements": len(parallel),
+                "same_elements": [str(e) for e in parallel] == [str(e) for e in serial],
+                "serial_seconds": serial_seconds,
+                "parallel_seconds": seconds,
+                "speedup": serial_seconds / seconds if seconds else 0.0
+            })
+    partition.shutdown_pool()
+    return results
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="PDF files (default: sample documents)")
+    parser.add_argument("--workers", type=int, action="append", help="worker count (repeatable)")
+    parser.add_argument("--pages-per-batch", type=int, default=4, help="pages per worker task")
+    parser.add_argument("--strategy", default="fast", help="unstructured partition strategy")
+    parser.add_argument("--partitioner", default=partition.PARTITIONER, help="module:function to benchmark")
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or [path for path in SAMPLE_DOCS if os.path.exists(path)]
+    workers = args.workers or [os.cpu_count() or 1]
+    results = run_benchmarks(paths, workers, args.pages_per_batch, args.partitioner, strategy=args.strategy)
+    for result in results:
+        print(f"{result['document']:<30} {result['pages']:>4} pages {result['workers']:>3} workers "
+              f"{result['serial_seconds']:>8.2f}s -> {result['parallel_seconds']:>8.2f}s "
+              f"({result['speedup']:.2f}x){'' if result['same_elements'] else '  MISMATCH'}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"strategy": args.strategy, "results": results}, f, indent=2)
+    return 0 if all(result["same_elements"] for result in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
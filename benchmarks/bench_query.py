@@ -0,0 +1,349 @@
+"""Load generator for the CrossDatabaseQuery search paths.
+
+Seeds N synthetic documents into local stand-ins and drives
+``search_by_embedding``, ``search_by_graph``, ``search_structured`` and
+``combined_search`` at each requested concurrency:
+
+- vectors: chunk embeddings clustered around one direction per topic, in an
+  ephemeral in-process Chroma collection
+- documents: SQLite document store with title, topic and year metadata
+- graph: entities of several types per document, in memory
+- query embeddings: FakeDashScope on a loopback port with configurable
+  latency (the query text's embedding is derived from its hash)
+
+With ``--http`` combined search is also driven through the API's
+``/api/v1/search/stream`` endpoint served by uvicorn on a loopback port.
+
+Reports throughput, latency percentiles and errors per workload, plus the
+time spent in each backend call (``vector.search``, ``mysql.get``,
+``dashscope.generate_embeddings``, ...) per request.
+
+Usage:
+    python -m benchmarks.bench_query
+    python -m benchmarks.bench_query --documents 5000 --concurrency 1 --concurrency 32 --http
+    python -m benchmarks.bench_query --workload combined --no-cache --json results/bench_query.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence
+from uuid import UUID, uuid4
+
+import numpy as np
+
+from app.database.cache import GenerationCounter, QueryCache
+from app.database.query import CrossDatabaseQuery
+from app.models.entities import EntitySymbol
+from app.models.structured import Document, StructuredData
+from app.utils.qwen import QwenClient
+from app.utils.fake_dashscope import FakeDashScope, hash_embedding
+from benchmarks.standins import MemoryGraphIndex, SQLiteDocumentStore, chroma_interface
+
+TOPICS = ["attention", "retrieval", "graphs", "diffusion", "reinforcement", "compilers", "proteins", "robotics"]
+ENTITY_TYPES = ["CONCEPT", "METHOD", "DATASET", "PERSON", "ORGANIZATION"]
+WORKLOADS = ["embedding", "graph", "structured", "combined"]
+# Dimension QwenClient.generate_embeddings asks for
+EMBEDDING_DIM = 1024
+
+class Timed:
+    """Proxy recording the duration of every coroutine method call.
+
+    Args:
+        target (Any): Wrapped backend
+        backend (str): Name the calls are recorded under
+        samples (Dict[str, List[float]]): Durations by "backend.method"
+    """
+
+    def __init__(self, target: Any, backend: str, samples: Dict[str, List[float]]):
+        self._target = target
+        self._backend = backend
+        self._samples = samples
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+        samples = self._samples[f"{self._backend}.{name}"]
+
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await attr(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - start)
+
+        return timed
+
+def percentiles(values: Sequence[float]) -> Dict[str, float]:
+    """p50, p95, p99 and mean of durations, in seconds."""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99), "mean": float(np.mean(values))}
+
+async def seed(documents: int, chunks: int, entities: int, dim: int = EMBEDDING_DIM, seed: int = 0) -> Dict[str, Any]:
+    """Create stand-ins holding synthetic documents, embeddings and entities.
+
+    Args:
+        documents (int): Documents to create
+        chunks (int): Chunk embeddings per document
+        entities (int): Graph entities per document
+        dim (int): Embedding dimension
+        seed (int): Seed of the embedding noise
+
+    Returns:
+        Dict[str, Any]: "vector", "mysql" and "graph" stand-ins
+    """
+    rng = np.random.default_rng(seed)
+    centroids = {topic: np.asarray(hash_embedding(topic, dim)) for topic in TOPICS}
+    stores = {"vector": await chroma_interface(), "mysql": SQLiteDocumentStore(), "graph": MemoryGraphIndex()}
+    docs, symbols, ids, vectors, metadatas = [], [], [], [], []
+    for i in range(documents):
+        topic, doc_id = TOPICS[i % len(TOPICS)], UUID(int=i + 1)
+        docs.append(Document(
+            id=doc_id,
+            meta=StructuredData(data_id=doc_id, data_type="document", data_value={
+                "title": f"{topic.title()} paper {i}", "topic": topic, "year": 2015 + i % 10}),
+            raw_content=f"Synthetic {topic} document {i}"
+        ))
+        for k in range(entities):
+            symbols.append(EntitySymbol(symbol_id=uuid4(), name=f"{topic.upper()}_{i}_{k}",
+                                        entity_type=ENTITY_TYPES[(i + k) % len(ENTITY_TYPES)],
+                                        descriptions=[f"Entity {k} of document {i}"], document_id=doc_id))
+        noise = rng.standard_normal((chunks, dim)) * 0.05
+        for j, vector in enumerate(centroids[topic] + noise):
+            ids.append(f"chunk_{doc_id}_{j}")
+            vectors.append(vector / np.linalg.norm(vector))
+            metadatas.append({"type": "chunk", "document_id": str(doc_id), "chunk_index": j})
+    stores["mysql"].add(docs)
+    stores["graph"].add(symbols)
+    for start in range(0, len(ids), 1000):
+        await stores["vector"].add_embeddings(ids[start:start + 1000], vectors[start:start + 1000],
+                                              metadatas[start:start + 1000])
+    return stores
+
+def build_query(stores: Dict[str, Any], samples: Dict[str, List[float]], cache: bool = True) -> CrossDatabaseQuery:
+    """CrossDatabaseQuery over the stand-ins with every backend timed."""
+    qwen_client = QwenClient(api_key="fake-dashscope-key")
+    qwen_client.retry_delay = 0.1
+    query = CrossDatabaseQuery(
+        vector_db=Timed(stores["vector"], "vector", samples),
+        graph_db=Timed(stores["graph"], "graph", samples),
+        mysql_db=Timed(stores["mysql"], "mysql", samples),
+        qwen_client=Timed(qwen_client, "dashscope", samples),
+        cache=QueryCache(generation=GenerationCounter()) if cache else None
+    )
+    if not cache:
+        query.cache = None
+    return query
+
+def query_params(i: int, queries: int, limit: int) -> Dict[str, Any]:
+    """Parameters of the i-th request; ``queries`` distinct texts cycle."""
+    topic = TOPICS[i % len(TOPICS)]
+    return {
+        "query_text": f"{topic} {i % queries}",
+        "entity_type": ENTITY_TYPES[i % len(ENTITY_TYPES)],
+        "filters": {"topic": topic},
+        "limit": limit
+    }
+
+def in_process_call(query: CrossDatabaseQuery, workload: str, queries: int,
+                    limit: int) -> Callable[[int], Awaitable[Any]]:
+    """Request function for a workload against the query object."""
+    def call(i: int) -> Awaitable[Any]:
+        params = query_params(i, queries, limit)
+        if workload == "embedding":
+            return query.search_by_embedding(params["query_text"], limit=limit)
+        if workload == "graph":
+            return query.search_by_graph(entity_type=params["entity_type"], limit=limit)
+        if workload == "structured":
+            return query.search_structured(dict(params["filters"]), limit=limit)
+        return query.combined_search(**params)
+    return call
+
+def http_call(client: Any, queries: int, limit: int) -> Callable[[int], Awaitable[Any]]:
+    """Request function streaming combined search results over HTTP."""
+    async def call(i: int) -> int:
+        params = query_params(i, queries, limit)
+        response = await client.get("/api/v1/search/stream", params={
+            "q": params["query_text"], "entity_type": params["entity_type"],
+            "filters": json.dumps(params["filters"]), "limit": limit
+        })
+        response.raise_for_status()
+        return len(response.content)
+    return call
+
+async def drive(call: Callable[[int], Awaitable[Any]], requests: int, concurrency: int) -> Dict[str, Any]:
+    """Issue ``requests`` calls from ``concurrency`` concurrent workers.
+
+    Returns:
+        Dict[str, Any]: requests, errors, seconds, throughput and latency
+        percentiles in seconds
+    """
+    latencies: List[float] = []
+    errors: List[str] = []
+    pending = iter(range(requests))
+
+    async def worker() -> None:
+        for i in pending:
+            start = time.perf_counter()
+            try:
+                await call(i)
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "seconds": seconds,
+        "throughput": len(latencies) / seconds if seconds else 0.0,
+        **percentiles(latencies)
+    }
+
+def backend_summary(samples: Dict[str, List[float]], requests: int) -> Dict[str, Dict[str, float]]:
+    """Calls, total seconds and seconds per request of every backend call."""
+    return {
+        name: {"calls": len(values), "total": float(sum(values)),
+               "per_request": float(sum(values)) / requests if requests else 0.0,
+               **percentiles(values)}
+        for name, values in sorted(samples.items()) if values
+    }
+
+@contextlib.contextmanager
+def api_server(query: CrossDatabaseQuery) -> Iterator[str]:
+    """Serve the API with ``query`` as its search backend; yields the base URL."""
+    import uvicorn
+    from app.main import app
+    from app.routers import search
+
+    async def get_query() -> CrossDatabaseQuery:
+        return query
+
+    app.dependency_overrides[search.get_query] = get_query
+    # The lifespan would start the worker monitor and tracing
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, lifespan="off",
+                                           log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, name="bench-query-api", daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            if not thread.is_alive():
+                raise RuntimeError("API server failed to start")
+            time.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+        app.dependency_overrides.pop(search.get_query, None)
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    samples: Dict[str, List[float]] = defaultdict(list)
+    seed_start = time.perf_counter()
+    stores = await seed(args.documents, args.chunks, args.entities, seed=args.seed)
+    seed_seconds = time.perf_counter() - seed_start
+    results = []
+
+    def record(mode: str, workload: str, concurrency: int, stats: Dict[str, Any]) -> None:
+        results.append({"mode": mode, "workload": workload, "concurrency": concurrency, **stats,
+                        "backends": backend_summary(samples, args.requests)})
+        samples.clear()
+
+    for workload in args.workload:
+        for concurrency in args.concurrency:
+            query = build_query(stores, samples, cache=not args.no_cache)
+            call = in_process_call(query, workload, args.queries, args.limit)
+            # One untimed round so first-call setup isn't measured
+            await drive(call, min(args.requests, concurrency), concurrency)
+            samples.clear()
+            record("in-process", workload, concurrency, await drive(call, args.requests, concurrency))
+
+    if args.http:
+        import httpx
+        for concurrency in args.concurrency:
+            query = build_query(stores, samples, cache=not args.no_cache)
+            with api_server(query) as url:
+                async with httpx.AsyncClient(base_url=url, timeout=60.0,
+                                             limits=httpx.Limits(max_connections=concurrency)) as client:
+                    call = http_call(client, args.queries, args.limit)
+                    await drive(call, min(args.requests, concurrency), concurrency)
+                    samples.clear()
+                    record("http", "combined", concurrency, await drive(call, args.requests, concurrency))
+
+    return {"seed_seconds": seed_seconds, "results": results}
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Seed the stand-ins and run every workload, mode and concurrency.
+
+    Args:
+        args (argparse.Namespace): Parsed command line options
+
+    Returns:
+        Dict[str, Any]: Configuration, seeding time and one result per
+        mode, workload and concurrency
+    """
+    with FakeDashScope(latency=args.latency, seed=args.seed) as server:
+        server.install()
+        # Keep the query path's own output out of the report
+        with contextlib.redirect_stdout(io.StringIO()) if not args.verbose else contextlib.nullcontext():
+            report = asyncio.run(_run(args))
+        report["dashscope_requests"] = dict(server.stats)
+    config = {key: value for key, value in vars(args).items() if key not in ("json", "verbose")}
+    return {"config": config, **report}
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse command line options, filling in list defaults."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=1000, help="documents to seed")
+    parser.add_argument("--chunks", type=int, default=4, help="chunk embeddings per document")
+    parser.add_argument("--entities", type=int, default=5, help="graph entities per document")
+    parser.add_argument("--requests", type=int, default=200, help="requests per workload and concurrency")
+    parser.add_argument("--concurrency", type=int, action="append", help="concurrent clients (repeatable)")
+    parser.add_argument("--workload", choices=WORKLOADS, action="append", help="workload (repeatable)")
+    parser.add_argument("--queries", type=int, default=50, help="distinct query texts")
+    parser.add_argument("--limit", type=int, default=10, help="results per query")
+    parser.add_argument("--latency", type=float, default=0.02, help="fake DashScope latency in seconds")
+    parser.add_argument("--no-cache", action="store_true", help="disable the query cache")
+    parser.add_argument("--http", action="store_true", help="also drive combined search over HTTP")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic data")
+    parser.add_argument("--verbose", action="store_true", help="show the query path's output")
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+    args.concurrency = args.concurrency or [1, 8]
+    args.workload = args.workload or list(WORKLOADS)
+    return args
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmark from the command line."""
+    args = parse_args(argv)
+    os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+    report = run_benchmark(args)
+    print(f"Seeded {args.documents} documents in {report['seed_seconds']:.2f}s")
+    for result in report["results"]:
+        print(f"{result['mode']:<10} {result['workload']:<10} c={result['concurrency']:<3} "
+              f"{result['throughput']:>8.1f} req/s  p50 {result['p50'] * 1000:>8.2f} ms  "
+              f"p95 {result['p95'] * 1000:>8.2f} ms  p99 {result['p99'] * 1000:>8.2f} ms"
+              f"{'  errors ' + str(result['errors']) if result['errors'] else ''}")
+        for name, stats in result["backends"].items():
+            print(f"{'':<14}{name:<32} {stats['calls']:>6} calls  {stats['per_request'] * 1000:>8.2f} ms/req")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if not any(result["errors"] for result in report["results"]) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Startup import profile for the API and Celery worker entry points.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter,
+reports the modules with the largest cumulative import time and, with
+``--check``, fails if any heavy dependency that should be imported lazily
+(see ``app.utils.lazy``) is loaded at startup.
+
+Usage:
+    python -m benchmarks.import_profile
+    python -m benchmarks.import_profile --module app.tasks --top 30
+    python -m benchmarks.import_profile --check --max-seconds 3
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+ENTRY_POINTS = ("app.main", "app.tasks")
+
+# Top-level packages that must only be imported on first use
+LAZY_MODULES = ("unstructured", "dashscope", "arxiv", "sympy", "chromadb", "neo4j", "torch", "spacy")
+
+def profile_imports(module: str) -> List[Dict[str, Any]]:
+    """Import a module in a fresh interpreter and collect importtime records.
+
+    Args:
+        module (str): Module to import, e.g. "app.main"
+
+    Returns:
+        List[Dict[str, Any]]: One record per imported module with "module",
+            "self_us" and "cumulative_us", in import order
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.getcwd()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    records = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        records.append({
+            "module": fields[2].strip(),
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1])
+        })
+    return records
+
+def eager_heavy_imports(records: List[Dict[str, Any]],
+                        lazy_modules: Sequence[str] = LAZY_MODULES) -> List[str]:
+    """Return the lazy-only top-level packages that were imported anyway.
+
+    Args:
+        records (List[Dict[str, Any]]): Output of ``profile_imports``
+        lazy_modules (Sequence[str]): Packages expected to stay unimported
+
+    Returns:
+        List[str]: Offending package names, sorted
+    """
+    loaded = {record["module"].split(".")[0] for record in records}
+    return sorted(loaded.intersection(lazy_modules))
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Print the import profile and optionally check it."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", action="append", help="entry point to profile (repeatable)")
+    parser.add_argument("--top", type=int, default=15, help="number of modules to list")
+    parser.add_argument("--check", action="store_true",
+                        help="exit non-zero if a lazy dependency is imported at startup")
+    parser.add_argument("--max-seconds", type=float,
+                        help="with --check, also fail if an entry point takes longer")
+    parser.add_argument("--json", help="write the profile to this JSON file")
+    args = parser.parse_args(argv)
+
+    failures = []
+    report = {}
+    for module in args.module or ENTRY_POINTS:
+        records = profile_imports(module)
+        total = next((r["cumulative_us"] for r in records if r["module"] == module), 0) / 1e6
+        eager = eager_heavy_imports(records)
+        report[module] = {"seconds": total, "eager_heavy_imports": eager, "records": records}
+
+        print(f"{module}: {total:.2f}s")
+        for record in sorted(records, key=lambda r: r["cumulative_us"], reverse=True)[:args.top]:
+            print(f"  {record['cumulative_us'] / 1e3:>9.1f} ms  {record['module']}")
+        if eager:
+            failures.append(f"{module} imports {', '.join(eager)} at startup")
+        if args.max_seconds is not None and total > args.max_seconds:
+            failures.append(f"{module} took {total:.2f}s (limit {args.max_seconds:.2f}s)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.check and failures:
+        for failure in failures:
+            print(f"FAIL: {failure}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""In-process database stand-ins for the benchmarks.
+
+The benchmarks run without MySQL or Neo4j containers. These classes
+implement the parts of the synchronous database wrappers
+(``app.database.sync_wrappers``) the ingest path uses:
+
+- SQLiteRelationalDatabase: documents, fingerprints and chunk manifests in an
+  in-memory SQLite database, with the upsert semantics of
+  AsyncRelationalDatabase
+- MemoryGraphDatabase: entities and relationships in dictionaries
+
+and the async interfaces CrossDatabaseQuery reads from:
+
+- SQLiteDocumentStore: documents by ID and by metadata filters
+- MemoryGraphIndex: entities by type and name
+
+Chroma needs no stand-in: ``VectorDatabase`` and ``ChromaInterface``
+without a server configured use an ephemeral in-process client (see
+``vector_db`` and ``chroma_interface``).
+
+Example:
+    ```python
+    rel_db, graph_db = SQLiteRelationalDatabase(), MemoryGraphDatabase()
+    rel_db.store_document({"data_id": doc_id, "data_type": "document", "data_value": {}})
+    graph_db.store_entities(EntityBatch.from_records(entities))
+    ```
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID, uuid4
+
+from app.models.batches import EntityBatch, RelationBatch
+from app.models.entities import EntitySymbol, Relationship
+from app.models.structured import Document
+from app.utils.fingerprint import DocumentFingerprint
+
+_SCHEMA = """
+CREATE TABLE documents (id TEXT PRIMARY KEY, data_type TEXT, data_value TEXT);
+CREATE TABLE fingerprints (sha256 TEXT PRIMARY KEY, document_id TEXT, simhash INTEGER, size INTEGER);
+CREATE TABLE chunks (document_id TEXT, content_hash TEXT, chunk_index INTEGER,
+                     entity_ids TEXT, embedding_id TEXT, PRIMARY KEY (document_id, content_hash));
+"""
+
+class SQLiteRelationalDatabase:
+    """Relational stand-in on an in-memory SQLite database.
+
+    Safe to call from the pipeline's writer threads; statements are
+    serialized by a lock.
+    """
+
+    def __init__(self):
+        self._db = sqlite3.connect(":memory:", check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _execute(self, sql: str, params: Any = (), many: bool = False) -> List[tuple]:
+        with self._lock, self._db:
+            cursor = self._db.executemany(sql, params) if many else self._db.execute(sql, params)
+            return cursor.fetchall()
+
+    def store_document(self, data: Dict[str, Any]) -> str:
+        doc_id = str(data["data_id"])
+        self._execute("INSERT OR REPLACE INTO documents VALUES (?, ?, ?)",
+                      (doc_id, data["data_type"], json.dumps(data["data_value"], default=str)))
+        return doc_id
+
+    def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._execute("SELECT data_value FROM documents WHERE id = ?", (str(doc_id),))
+        return json.loads(rows[0][0]) if rows else None
+
+    def update_document(self, doc_id: str, data: Dict[str, Any]) -> None:
+        value = self.get_document(doc_id)
+        if value is not None:
+            value.update(data)
+            self._execute("UPDATE documents SET data_value = ? WHERE id = ?",
+                          (json.dumps(value, default=str), str(doc_id)))
+
+    def get_fingerprint(self, sha256: str) -> Optional[Dict[str, Any]]:
+        rows = self._execute("SELECT sha256, document_id, simhash, size FROM fingerprints WHERE sha256 = ?",
+                             (sha256,))
+        return dict(zip(("sha256", "document_id", "simhash", "size"), rows[0])) if rows else None
+
+    def store_fingerprint(self, fingerprint: DocumentFingerprint, document_id: str) -> None:
+        # SQLite integers are signed 64-bit
+        simhash = fingerprint.simhash - (1 << 64) if fingerprint.simhash >= 1 << 63 else fingerprint.simhash
+        self._execute("INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?)",
+                      (fingerprint.sha256, str(document_id), simhash, fingerprint.size))
+
+    def get_chunk_manifest(self, doc_id: str) -> Dict[str, Dict[str, Any]]:
+        rows = self._execute("SELECT content_hash, chunk_index, entity_ids, embedding_id FROM chunks "
+                             "WHERE document_id = ?", (str(doc_id),))
+        return {
+            content_hash: {"content_hash": content_hash, "index": index,
+                           "entity_ids": json.loads(entity_ids) if entity_ids else None,
+                           "embedding_id": embedding_id}
+            for content_hash, index, entity_ids, embedding_id in rows
+        }
+
+    def store_chunks(self, doc_id: str, chunks: List[Dict[str, Any]]) -> None:
+        # Stored results are kept unless the chunk carries a new value
+        self._execute(
+            "INSERT INTO chunks VALUES (?, ?, ?, ?, ?) ON CONFLICT (document_id, content_hash) DO UPDATE SET "
+            "chunk_index = excluded.chunk_index, "
+            "entity_ids = COALESCE(excluded.entity_ids, entity_ids), "
+            "embedding_id = COALESCE(excluded.embedding_id, embedding_id)",
+            [(str(doc_id), chunk["content_hash"], chunk["index"],
+              json.dumps(chunk["entity_ids"]) if chunk.get("entity_ids") is not None else None,
+              chunk.get("embedding_id")) for chunk in chunks],
+            many=True
+        )
+
+    def delete_chunks(self, doc_id: str, content_hashes: List[str]) -> int:
+        self._execute("DELETE FROM chunks WHERE document_id = ? AND content_hash = ?",
+                      [(str(doc_id), content_hash) for content_hash in content_hashes], many=True)
+        return len(content_hashes)
+
+    def counts(self) -> Dict[str, int]:
+        """Rows per table."""
+        return {table: self._execute(f"SELECT COUNT(*) FROM {table}")[0][0]
+                for table in ("documents", "fingerprints", "chunks")}
+
+class MemoryGraphDatabase:
+    """Graph stand-in keeping entities and relationships in memory."""
+
+    def __init__(self):
+        self.entities: Dict[str, Dict[str, Any]] = {}
+        self.relationships: List[Relationship] = []
+        self._lock = threading.Lock()
+
+    def store_entities(self, batch: EntityBatch) -> int:
+        with self._lock:
+            for id, record in zip(batch.id_strings(), batch.to_mysql_rows()):
+                self.entities[id] = record
+        return len(batch)
+
+    def delete_entities(self, ids: List[str]) -> int:
+        with self._lock:
+            return sum(self.entities.pop(id, None) is not None for id in ids)
+
+    def store_relationship(self, rel: Relationship) -> None:
+        with self._lock:
+            self.relationships.append(rel)
+
+    def store_relationships(self, batch: RelationBatch) -> int:
+        with self._lock:
+            self.relationships.extend(
+                Relationship(source=source, target=target, relationship=relationship, relationship_strength=strength)
+                for source, target, relationship, strength in zip(
+                    batch.sources, batch.targets, batch.relationships, batch.strengths.tolist()))
+        return len(batch)
+
+    def counts(self) -> Dict[str, int]:
+        """Stored entities and relationships."""
+        return {"entities": len(self.entities), "relationships": len(self.relationships)}
+
+class SQLiteDocumentStore:
+    """Document store for CrossDatabaseQuery on an in-memory SQLite database.
+
+    Documents are kept as JSON; ``search`` matches metadata values with
+    ``json_extract``. Queries run in a thread like a blocking driver would.
+    """
+
+    def __init__(self):
+        self._db = sqlite3.connect(":memory:", check_same_thread=False)
+        self._db.execute("CREATE TABLE documents (id TEXT PRIMARY KEY, data_type TEXT, meta TEXT, document TEXT)")
+        self._lock = threading.Lock()
+
+    def _query(self, sql: str, params: Any = ()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def add(self, documents: Iterable[Document]) -> int:
+        """Store documents, replacing ones with the same ID."""
+        rows = [(str(doc.id), doc.meta.data_type, json.dumps(doc.meta.data_value), doc.model_dump_json())
+                for doc in documents]
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    async def get(self, doc_id: UUID) -> Optional[Document]:
+        rows = await asyncio.to_thread(self._query, "SELECT document FROM documents WHERE id = ?", (str(doc_id),))
+        return Document.model_validate_json(rows[0][0]) if rows else None
+
+    async def search(self, query: Dict[str, Any]) -> List[Document]:
+        filters = dict(query)
+        limit = filters.pop("limit", 10)
+        skip = filters.pop("skip", 0)
+        conditions, params = [], []
+        for key, value in filters.items():
+            if key == "data_type":
+                conditions.append("data_type = ?")
+            else:
+                conditions.append("json_extract(meta, ?) = ?")
+                params.append(f"$.{key}")
+            params.append(value)
+        sql = "SELECT document FROM documents"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        rows = await asyncio.to_thread(self._query, f"{sql} ORDER BY id LIMIT ? OFFSET ?", (*params, limit, skip))
+        return [Document.model_validate_json(row[0]) for row in rows]
+
+class MemoryGraphIndex:
+    """Entity search for CrossDatabaseQuery over in-memory entities."""
+
+    def __init__(self):
+        self._by_type: Dict[str, List[EntitySymbol]] = defaultdict(list)
+
+    def add(self, entities: Iterable[EntitySymbol]) -> int:
+        """Index entities by type."""
+        count = 0
+        for entity in entities:
+            self._by_type[entity.entity_type].append(entity)
+            count += 1
+        return count
+
+    async def search(self, query: Dict[str, Any]) -> List[EntitySymbol]:
+        if "entity_type" in query:
+            candidates = self._by_type.get(query["entity_type"], [])
+        else:
+            candidates = [entity for entities in self._by_type.values() for entity in entities]
+        if "name" in query:
+            candidates = [entity for entity in candidates if entity.name == query["name"]]
+        skip = query.get("skip", 0)
+        return candidates[skip:skip + query.get("limit", 10)]
+
+    async def search_documents(self, entity_type: str, skip: int = 0, limit: int = 10) -> List[Dict[str, Any]]:
+        mentions = Counter(entity.document_id for entity in self._by_type.get(entity_type, []))
+        ranked = sorted(mentions.items(), key=lambda item: (-item[1], str(item[0])))
+        return [{"document_id": doc_id, "score": float(count)} for doc_id, count in ranked[skip:skip + limit]]
+
+def _ephemeral_chroma() -> None:
+    # Chroma reads its own settings from the environment
+    os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+def vector_db(collection_name: Optional[str] = None) -> Any:
+    """VectorDatabase on an ephemeral in-process Chroma collection.
+
+    Args:
+        collection_name (Optional[str]): Collection to use, a new one by default
+
+    Returns:
+        VectorDatabase: Synchronous vector database
+    """
+    _ephemeral_chroma()
+    from app.database.sync_wrappers import VectorDatabase
+    return VectorDatabase(host="", port=0, collection_name=collection_name or f"bench_{uuid4().hex[:12]}")
+
+async def chroma_interface(collection_name: Optional[str] = None) -> Any:
+    """Connected ChromaInterface on an ephemeral in-process collection.
+
+    Args:
+        collection_name (Optional[str]): Collection to use, a new one by default
+
+    Returns:
+        ChromaInterface: Async vector database
+    """
+    _ephemeral_chroma()
+    from app.database.vector import ChromaInterface
+    interface = ChromaInterface(host="", port=0, collection_name=collection_name or f"bench_{uuid4().hex[:12]}")
+    await interface.connect()
+    return interface
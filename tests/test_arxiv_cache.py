@@ -0,0 +1,155 @@
+"""Tests for concurrent arXiv downloads against a local stand-in server."""
+
+import hashlib
+import threading
+import time
+import pytest
+import httpx
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+from app.tasks import document
+from app.utils.arxiv_cache import ArxivDownloader, parse_feed, split_version
+
+PAPERS = {f"2101.0012{i}": (2, b"%PDF-1.4\n" + bytes([i]) * 50_000) for i in range(5)}
+
+def feed(ids):
+    entries = "".join(f"""
+  <entry>
+    <id>http://arxiv.org/abs/{id}v{PAPERS[id][0]}</id>
+    <published>2021-01-01T00:00:00Z</published>
+    <updated>2021-02-01T00:00:00Z</updated>
+    <title>Paper
+      {id}</title>
+    <summary>Abstract of {id}.</summary>
+    <author><name>Ada Lovelace</name></author>
+    <author><name>Alan Turing</name></author>
+    <category term="cs.CL"/>
+  </entry>""" for id in ids if id in PAPERS)
+    return f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'
+
+class StandIn(BaseHTTPRequestHandler):
+    """Minimal arXiv API and PDF endpoints."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        with server.lock:
+            server.requests.append((url.path, self.headers.get("Range")))
+        if url.path == "/api/query":
+            ids = [split_version(id)[0] for id in parse_qs(url.query)["id_list"][0].split(",")]
+            body = feed(ids).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        base_id, _ = split_version(url.path.rsplit("/", 1)[-1])
+        content = PAPERS[base_id][1]
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(0.05)
+            start = int(self.headers["Range"][6:-1]) if self.headers.get("Range") else 0
+            self.send_response(206 if start else 200)
+            self.send_header("Content-Length", str(len(content) - start))
+            self.end_headers()
+            if server.drop_after:
+                # Simulate a connection lost mid-transfer
+                self.wfile.write(content[start:start + server.drop_after])
+                server.drop_after = 0
+                self.close_connection = True
+                return
+            self.wfile.write(content[start:])
+        finally:
+            with server.lock:
+                server.active -= 1
+
+@pytest.fixture
+def arxiv_server():
+    """Run the stand-in on a free local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    server.lock = threading.Lock()
+    server.requests, server.active, server.max_active, server.drop_after = [], 0, 0, 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+
+def downloader(server, cache_dir, **kwargs):
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return ArxivDownloader(cache_dir=str(cache_dir), api_url=f"{base}/api/query", pdf_url=f"{base}/pdf", **kwargs)
+
+def test_split_version_and_parse_feed():
+    """Ids are split into base and version; feeds into metadata."""
+    assert split_version("2101.00123v2") == ("2101.00123", 2)
+    assert split_version("hep-th/9901001") == ("hep-th/9901001", None)
+    with pytest.raises(ValueError):
+        split_version("../../etc/passwd")
+    paper = parse_feed(feed(["2101.00120"]))[0]
+    assert paper["arxiv_id"] == "2101.00120v2"
+    assert paper["title"] == "Paper 2101.00120"
+    assert paper["authors"] == ["Ada Lovelace", "Alan Turing"]
+
+@pytest.mark.asyncio
+async def test_download_many_is_bounded_and_cached(arxiv_server, tmp_path):
+    """Papers download concurrently within the limit and come from the cache afterwards."""
+    ids = list(PAPERS) + ["2101.99999", "not-an-id"]
+    async with downloader(arxiv_server, tmp_path, max_concurrency=2) as d:
+        papers = await d.download_many(ids)
+
+    assert isinstance(papers["2101.99999"], LookupError)
+    assert isinstance(papers["not-an-id"], ValueError)
+    for arxiv_id, (version, content) in PAPERS.items():
+        paper = papers[arxiv_id]
+        assert paper.arxiv_id == f"{arxiv_id}v{version}" and not paper.cached
+        assert paper.sha256 == hashlib.sha256(content).hexdigest()
+        with open(paper.pdf_path, "rb") as f:
+            assert f.read() == content
+    assert arxiv_server.max_active <= 2
+    # One batched metadata query for all ids
+    assert [path for path, _ in arxiv_server.requests].count("/api/query") == 1
+
+    arxiv_server.requests.clear()
+    async with downloader(arxiv_server, tmp_path) as d:
+        papers = await d.download_many(list(PAPERS) + ["2101.00120v2"])
+    assert all(paper.cached for paper in papers.values())
+    assert arxiv_server.requests == []
+
+@pytest.mark.asyncio
+async def test_interrupted_download_resumes(arxiv_server, tmp_path):
+    """A partial download continues with a Range request."""
+    arxiv_server.drop_after = 20_000
+    async with downloader(arxiv_server, tmp_path) as d:
+        with pytest.raises(httpx.HTTPError):
+            await d.download("2101.00121")
+        paper = await d.download("2101.00121")
+
+    pdf_requests = [range_ for path, range_ in arxiv_server.requests if path.startswith("/pdf/")]
+    assert pdf_requests == [None, "bytes=20000-"]
+    assert paper.sha256 == hashlib.sha256(PAPERS["2101.00121"][1]).hexdigest()
+    assert not list((tmp_path / "partial").iterdir())
+
+def test_download_arxiv_task_uses_cache(arxiv_server, tmp_path, monkeypatch):
+    """The task stores metadata of the cached paper."""
+    base = f"http://127.0.0.1:{arxiv_server.server_address[1]}"
+    monkeypatch.setattr(document.settings, "ARXIV_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(document.settings, "ARXIV_API_URL", f"{base}/api/query")
+    monkeypatch.setattr(document.settings, "ARXIV_PDF_URL", f"{base}/pdf")
+    with patch("app.tasks.document.get_sync_relational_db") as rel_db, \
+         patch("app.tasks.document.bump_generation"):
+        rel_db.return_value.store_document.return_value = "doc-1"
+        result = document.download_arxiv("2101.00122")
+        prefetched = document.prefetch_arxiv(["2101.00122", "2101.00123"])
+
+    assert result["doc_id"] == "doc-1"
+    metadata = rel_db.return_value.store_document.call_args.args[0]["data_value"]
+    assert metadata["version"] == 2 and metadata["pdf_path"] == result["pdf_path"]
+    assert [(entry["arxiv_id"], entry["cached"]) for entry in prefetched] == [
+        ("2101.00122", True), ("2101.00123", False)
+    ]
@@ -0,0 +1,146 @@
+"""Tests for columnar entity, relation and triple batches."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+import numpy as np
+from app.models.batches import EntityBatch, RelationBatch, TripleBatch
+from app.database.graph import Neo4jInterface
+from app.database.sync_wrappers import GraphDatabase
+from app.models.entities import Relationship
+
+ENTITIES = [
+    {"name": "CENTRAL INSTITUTION", "type": "ORGANIZATION", "description": "The central bank"},
+    {"name": "MARTIN SMITH", "type": "PERSON", "description": "Chair of the Central Institution"},
+    {"name": "MARKET STRATEGY COMMITTEE", "type": "ORGANIZATION"}
+]
+
+def test_entity_batch_from_records():
+    """Records become columns with generated version 4 UUIDs."""
+    batch = EntityBatch.from_records(ENTITIES)
+    assert len(batch) == 3
+    assert batch.names[1] == "MARTIN SMITH"
+    assert batch.descriptions[2] == ""
+    assert batch.ids.shape == (3, 16)
+
+    ids = [UUID(s) for s in batch.id_strings()]
+    assert len(set(ids)) == 3
+    assert all(id.version == 4 for id in ids)
+    assert ids[0].bytes == batch.to_neo4j_params()["ids"][0]
+
+def test_entity_batch_validation_reports_rows():
+    """Invalid rows are rejected column-wise with their indices."""
+    with pytest.raises(ValueError, match="'names' must not be empty \\(rows 1\\)"):
+        EntityBatch(names=["A", ""], types=["T", "T"])
+    with pytest.raises(ValueError, match="'types' must contain strings"):
+        EntityBatch(names=["A", "B"], types=["T", None])
+    with pytest.raises(ValueError, match="missing required field 'type'"):
+        EntityBatch.from_records([{"name": "A"}])
+    with pytest.raises(ValueError, match="exceeds 255"):
+        EntityBatch(names=["A" * 256], types=["T"])
+
+def test_entity_batch_conversions():
+    """Batches convert to MySQL rows, Chroma add kwargs and chunks."""
+    document_id = uuid4()
+    batch = EntityBatch.from_records(ENTITIES, document_id=document_id)
+
+    rows = batch.to_mysql_rows()
+    assert rows[0]["name"] == "CENTRAL INSTITUTION"
+    assert rows[0]["document_id"] == document_id.bytes
+    assert len(rows[0]["id"]) == 16
+
+    chroma = batch.to_chroma_add(np.ones((3, 4)))
+    assert chroma["ids"] == batch.id_strings()
+    assert chroma["embeddings"][0] == [1.0, 1.0, 1.0, 1.0]
+    assert chroma["metadatas"][1] == {"name": "MARTIN SMITH", "type": "PERSON", "document_id": str(document_id)}
+    with pytest.raises(ValueError):
+        batch.to_chroma_add(np.ones((2, 4)))
+
+    chunks = list(batch.chunks(2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[1].names == ["MARKET STRATEGY COMMITTEE"]
+    assert np.shares_memory(chunks[0].ids, batch.ids)
+
+def test_relation_and_triple_batches():
+    """Relation strengths are validated as integers and triples keep ids."""
+    relations = RelationBatch.from_records([
+        {"source": "MARTIN SMITH", "target": "CENTRAL INSTITUTION",
+         "relationship": "Chair of", "relationship_strength": 9}
+    ])
+    assert relations.to_neo4j_params()["strengths"] == [9]
+    with pytest.raises(ValueError, match="strengths"):
+        RelationBatch(["A"], ["B"], ["rel"], ["strong"])
+
+    subject, predicate, obj = uuid4(), uuid4(), uuid4()
+    triples = TripleBatch.from_records([
+        {"subject_id": subject, "predicate_id": str(predicate), "object_id": obj}
+    ])
+    params = triples.to_neo4j_params()
+    assert params["subject_ids"] == [str(subject)]
+    assert params["predicate_ids"] == [str(predicate)]
+
+def test_entity_batch_to_arrow():
+    """Batches convert to Arrow tables with binary UUID columns."""
+    pa = pytest.importorskip("pyarrow")
+    table = EntityBatch.from_records(ENTITIES).to_arrow()
+    assert table.num_rows == 3
+    assert table.schema.field("ids").type == pa.binary(16)
+
+@pytest.mark.asyncio
+async def test_neo4j_create_entities_single_transaction():
+    """All chunks of a batch are written in one transaction."""
+    tx = AsyncMock()
+    session = MagicMock()
+    session.begin_transaction = AsyncMock(return_value=tx)
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    interface = Neo4jInterface(uri="neo4j://localhost:7687", username="neo4j", password="password")
+    interface._driver = MagicMock()
+    interface._driver.session.return_value = session
+
+    created = await interface.create_entities(EntityBatch.from_records(ENTITIES), chunk_size=2)
+
+    assert created == 3
+    assert tx.run.await_count == 2
+    assert "UNWIND" in tx.run.await_args_list[0].args[0]
+    assert tx.run.await_args_list[1].args[1]["names"] == ["MARKET STRATEGY COMMITTEE"]
+    tx.commit.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_neo4j_store_graph_single_transaction():
+    """Entities and the relationships resolved by name are written in one transaction."""
+    tx = AsyncMock()
+    tx.run.return_value.single.return_value = {"count": 1}
+    session = MagicMock()
+    session.begin_transaction = AsyncMock(return_value=tx)
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    interface = Neo4jInterface(uri="neo4j://localhost:7687", username="neo4j", password="password")
+    interface._driver = MagicMock()
+    interface._driver.session.return_value = session
+    doc_id = uuid4()
+    relations = RelationBatch.from_records([
+        {"source": "MARTIN SMITH", "target": "CENTRAL INSTITUTION", "relationship": "Chairs",
+         "relationship_strength": 9},
+        {"source": "MARTIN SMITH", "target": "UNKNOWN", "relationship": "Mentions", "relationship_strength": 2}
+    ], document_id=doc_id)
+
+    created = await interface.store_graph(EntityBatch.from_records(ENTITIES, document_id=doc_id), relations)
+
+    assert created == (3, 1)
+    assert tx.run.await_count == 2
+    query, params = tx.run.await_args_list[1].args
+    assert "MATCH (s:Entity {name: $sources[i]})" in query and "MERGE (s)-[r:RELATED_TO {id: $ids[i]}]->(t)" in query
+    assert params["targets"] == ["CENTRAL INSTITUTION", "UNKNOWN"]
+    assert params["document_id"] == doc_id.bytes
+    tx.commit.assert_awaited_once()
+
+def test_graph_database_store_relationship_uses_relation_batch():
+    """The sync wrapper stores relationships through the batched path."""
+    with patch.object(Neo4jInterface, "connect", AsyncMock()), \
+         patch.object(Neo4jInterface, "create_relationships", AsyncMock(return_value=1)) as create:
+        db = GraphDatabase(uri="neo4j://neo4j:7687", username="neo4j", password="password")
+        db.store_relationship(Relationship(source="A", target="B", relationship="rel", relationship_strength=5))
+
+    batch = create.await_args.args[0]
+    assert (batch.sources, batch.targets, batch.strengths.tolist()) == (["A"], ["B"], [5])
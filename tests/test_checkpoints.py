@@ -0,0 +1,187 @@
+"""Tests for checkpointed, resumable document workflows."""
+
+import pytest
+from unittest.mock import MagicMock, patch
+from app.tasks import workflow
+from app.utils.chunking import split_text
+
+DOC_ID = "123e4567-e89b-12d3-a456-426614174000"
+TEXT = "\n".join(f"Paragraph {i}: transformers replace recurrence with attention over all tokens." for i in range(60))
+
+class FakeRelationalDatabase:
+    """In-memory stand-in for checkpoints, documents and chunk manifests."""
+
+    def __init__(self):
+        self.stages, self.documents, self.manifest = {}, {}, {}
+
+    def get_stages(self, document_key):
+        return {stage: dict(row) for (key, stage), row in self.stages.items() if key == document_key}
+
+    def record_stage(self, document_key, stage, status, now, result=None, error=None):
+        row = self.stages.setdefault((document_key, stage), {"attempts": 0})
+        row.update(status=status, result=result, error=error, updated_at=now, attempts=row["attempts"] + 1)
+        return row["attempts"]
+
+    def reset_stages(self, document_key):
+        keys = [key for key in self.stages if key[0] == document_key]
+        for key in keys:
+            del self.stages[key]
+        return len(keys)
+
+    def get_document(self, doc_id):
+        return {"id": doc_id, "type": "document", "value": self.documents[doc_id]}
+
+    def update_document(self, doc_id, updates):
+        self.documents[doc_id].update(updates)
+        return True
+
+    def get_chunk_manifest(self, doc_id):
+        return self.manifest
+
+def task(side_effect):
+    """Mock a Celery task whose delay().get() calls side_effect."""
+    mock = MagicMock()
+    mock.delay.side_effect = lambda *args, **kwargs: MagicMock(get=lambda: side_effect(*args, **kwargs))
+    return mock
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    """Run the workflow against mocked stage tasks and the fake database."""
+    monkeypatch.setattr(workflow.settings, "STREAMING_INGEST", False)
+    monkeypatch.setattr(workflow.settings, "CHUNK_MIN_CHARS", 500)
+    monkeypatch.setattr(workflow.settings, "CHUNK_MAX_CHARS", 2000)
+    rel_db = FakeRelationalDatabase()
+    pdf_path = tmp_path / "paper.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+    state = {"fail": set(), "calls": []}
+
+    def stage(name, result):
+        def run(*args, **kwargs):
+            state["calls"].append(name)
+            if name in state["fail"]:
+                raise RuntimeError(f"{name} unavailable")
+            return result(*args, **kwargs) if callable(result) else result
+        return task(run)
+
+    def process(path):
+        rel_db.documents[DOC_ID] = {"content": TEXT, "path": path}
+        chunks = split_text(TEXT, 500, 2000)
+        return {"doc_id": DOC_ID, "text": TEXT, "chunks": [dict(c.to_dict(), entity_ids=None, embedding_id=None)
+                                                          for c in chunks]}
+
+    def extract(payload):
+        state["extracted"] = payload
+        return {"status": "completed", "doc_id": DOC_ID,
+                "entities": [{"name": "Transformer", "type": "CONCEPT"}], "relationships": []}
+
+    def embed(payload):
+        state["embedded"] = payload
+        return {"status": "success", "doc_id": DOC_ID, "embedding_id": f"doc_{DOC_ID}"}
+
+    def stream(path):
+        rel_db.documents[DOC_ID] = {"path": path, "status": "content_extracted"}
+        return {"status": "completed", "doc_id": DOC_ID, "chunks": 3, "entities": 5, "relationships": 2}
+
+    tasks = {
+        "download_arxiv": stage("download", {"doc_id": "arxiv-row", "pdf_path": str(pdf_path)}),
+        "stream_document": stage("stream", stream),
+        "process_document": stage("process", process),
+        "extract_knowledge_graph": stage("extract", extract),
+        "extract_content": stage("embed", embed)
+    }
+    with patch.multiple("app.tasks.workflow.document", **tasks), \
+         patch("app.tasks.workflow.get_sync_relational_db", return_value=rel_db), \
+         patch("app.tasks.workflow.bump_generation") as bump:
+        yield rel_db, state, bump
+
+def test_retry_only_runs_failed_stage(pipeline):
+    """After a failed embedding, a retry skips download, parsing and extraction."""
+    rel_db, state, bump = pipeline
+    state["fail"].add("embed")
+    result = workflow.process_document_workflow("2101.00123")
+    assert result["status"] == "failed" and result["stage"] == "embedded"
+    assert state["calls"] == ["download", "process", "extract", "embed"]
+    assert rel_db.stages[("2101.00123", "embedded")]["error"] == "embed unavailable"
+
+    state["fail"].clear()
+    state["calls"].clear()
+    result = workflow.process_document_workflow("2101.00123")
+    assert state["calls"] == ["embed"]
+    assert result["status"] == "completed" and result["resumed_from"] == "embedded"
+    assert result["entities"] == [{"name": "Transformer", "type": "CONCEPT"}]
+    # The rebuilt input carries the document text and its chunks
+    assert state["embedded"]["text"] == TEXT and state["embedded"]["chunks"]
+    assert rel_db.documents[DOC_ID]["status"] == "indexed"
+    bump.assert_called_once()
+    assert rel_db.stages[("2101.00123", "embedded")]["attempts"] == 2
+
+    state["calls"].clear()
+    result = workflow.process_document_workflow("2101.00123")
+    assert state["calls"] == [] and result["resumed_from"] is None
+
+def test_failed_extraction_is_retried(pipeline):
+    """An extraction reported as failed stops the workflow at that stage."""
+    rel_db, state, _ = pipeline
+    state["fail"].add("extract")
+    assert workflow.process_document_workflow("2101.00123")["stage"] == "extracted"
+
+    state["fail"].clear()
+    state["calls"].clear()
+    rel_db.manifest = {c.content_hash: {"entity_ids": ["e"], "embedding_id": None}
+                       for c in split_text(TEXT, 500, 2000)[:2]}
+    result = workflow.process_document_workflow("2101.00123")
+    assert state["calls"] == ["extract", "embed"]
+    assert result["resumed_from"] == "extracted"
+    # Stored entity IDs are passed along, so extraction skips those chunks
+    assert [c["entity_ids"] for c in state["extracted"]["chunks"][:3]] == [["e"], ["e"], None]
+
+def test_restart_and_missing_pdf(pipeline):
+    """restart runs every stage; a vanished PDF is downloaded again."""
+    rel_db, state, _ = pipeline
+    workflow.process_document_workflow("2101.00123")
+    state["calls"].clear()
+    workflow.process_document_workflow("2101.00123", restart=True)
+    assert state["calls"] == ["download", "process", "extract", "embed"]
+
+    rel_db.stages[("2101.00123", "downloaded")]["result"]["pdf_path"] = "/nonexistent.pdf"
+    rel_db.stages[("2101.00123", "partitioned")]["status"] = "failed"
+    del rel_db.stages[("2101.00123", "chunked")]
+    state["calls"].clear()
+    workflow.process_document_workflow("2101.00123")
+    assert state["calls"][:2] == ["download", "process"]
+
+def test_exact_duplicate_finishes_incomplete_chunks(pipeline):
+    """A known file is only extracted where an earlier run left chunks unfinished."""
+    rel_db, state, _ = pipeline
+    rel_db.documents[DOC_ID] = {"content": TEXT}
+    chunks = split_text(TEXT, 500, 2000)
+    rel_db.manifest = {c.content_hash: {"entity_ids": ["e"], "embedding_id": "v"} for c in chunks}
+    workflow.document.process_document = task(
+        lambda path: {**workflow.stage_input(rel_db, DOC_ID), "duplicate": "exact"})
+
+    result = workflow.process_document_workflow("2101.00123")
+    assert result["duplicate"] == "exact" and result["entities"] == []
+    assert state["calls"] == ["download"]
+
+    rel_db.manifest[chunks[0].content_hash]["embedding_id"] = None
+    state["calls"].clear()
+    result = workflow.process_document_workflow("2101.00123", restart=True)
+    assert state["calls"] == ["download", "extract", "embed"]
+    assert [c["content_hash"] for c in state["embedded"]["chunks"]] == [chunks[0].content_hash]
+
+def test_streaming_ingest_indexes_document(pipeline, monkeypatch):
+    """The streaming task's counts are checkpointed and the document indexed."""
+    rel_db, state, bump = pipeline
+    monkeypatch.setattr(workflow.settings, "STREAMING_INGEST", True)
+    result = workflow.process_document_workflow("2101.00123")
+
+    assert state["calls"] == ["download", "stream"]
+    assert result["status"] == "completed" and result["doc_id"] == DOC_ID
+    assert (result["chunks"], result["entities"], result["relationships"]) == (3, 5, 2)
+    assert rel_db.documents[DOC_ID]["status"] == "indexed"
+    bump.assert_called_once()
+    assert rel_db.stages[("2101.00123", "embedded")]["result"]["doc_id"] == DOC_ID
+
+    state["calls"].clear()
+    assert workflow.process_document_workflow("2101.00123")["entities"] == 5
+    assert state["calls"] == []
@@ -0,0 +1,153 @@
+"""Tests for content-defined chunking and incremental re-processing."""
+
+import pytest
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+from app.models import StructuredChunk
+from app.tasks import document
+from app.utils.chunking import chunk_hash, diff_chunks, split_text
+
+DOC_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+PARAGRAPHS = [
+    f"Paragraph {i} discusses how attention layer {i} routes information "
+    f"between tokens and why residual connections keep gradients stable. " * 4
+    for i in range(80)
+]
+
+def test_split_text_is_local_to_edits():
+    """An edit changes only the chunks around it."""
+    text = "\n".join(PARAGRAPHS)
+    chunks = split_text(text, min_chars=1000, max_chars=4000)
+    assert len(chunks) > 5
+    assert all(len(chunk.text) <= 4000 for chunk in chunks)
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+
+    edited = PARAGRAPHS.copy()
+    edited[40] = edited[40].replace("residual", "skip")
+    new_chunks = split_text("\n".join(edited), min_chars=1000, max_chars=4000)
+    changed = {c.content_hash for c in new_chunks} - {c.content_hash for c in chunks}
+    # Boundaries resynchronize at the next anchor after the edit
+    assert 1 <= len(changed) <= 4
+    assert len(changed) < len(new_chunks) // 3
+
+    # Whitespace-only differences don't change hashes
+    assert chunk_hash("Attention  is\nall you need") == chunk_hash("attention is all you need")
+
+def test_diff_chunks_tracks_pending_and_removed():
+    """Chunks are reused only when both results are stored."""
+    chunks = split_text("\n".join(PARAGRAPHS[:20]), min_chars=500, max_chars=2000)
+    manifest = {
+        chunks[0].content_hash: {"content_hash": chunks[0].content_hash, "entity_ids": ["e1"], "embedding_id": "v1"},
+        chunks[1].content_hash: {"content_hash": chunks[1].content_hash, "entity_ids": ["e2"], "embedding_id": None},
+        "gone": {"content_hash": "gone", "entity_ids": ["e3"], "embedding_id": "v3"}
+    }
+    diff = diff_chunks(manifest, chunks)
+
+    assert diff.unchanged == 1
+    assert len(diff.added) == len(chunks) - 1
+    assert diff.added[0]["entity_ids"] == ["e2"] and diff.added[0]["embedding_id"] is None
+    assert [row["content_hash"] for row in diff.removed] == ["gone"]
+
+def test_structured_chunk_content_hash():
+    """Chunks hash their raw content unless a hash is given."""
+    chunk = StructuredChunk(chunk_id=uuid4(), chunk_raw_content="Attention is all you need",
+                            chunk_summary_content="", modality_identifier="text/plain", document_id=uuid4())
+    assert chunk.content_hash == chunk_hash("Attention is all you need")
+
+def test_sync_chunk_manifest_retracts_removed_chunks():
+    """Removed chunks have their entities, vectors and rows deleted."""
+    text = "\n".join(PARAGRAPHS[:10])
+    rel_db = MagicMock()
+    rel_db.get_chunk_manifest.return_value = {
+        "gone": {"content_hash": "gone", "entity_ids": ["a", "b"], "embedding_id": "chunk_x"}
+    }
+    with patch("app.tasks.document.get_sync_graph_db") as graph_db, \
+         patch("app.tasks.document.get_sync_vector_db") as vector_db:
+        diff = document.sync_chunk_manifest(rel_db, DOC_ID, text)
+
+    graph_db.return_value.delete_entities.assert_called_once_with(["a", "b"])
+    vector_db.return_value.delete_embeddings.assert_called_once_with(["chunk_x"])
+    rel_db.delete_chunks.assert_called_once_with(DOC_ID, ["gone"])
+    stored = rel_db.store_chunks.call_args.args[1]
+    assert [row["content_hash"] for row in stored] == [chunk["content_hash"] for chunk in diff.added]
+
+@pytest.mark.asyncio
+async def test_extract_knowledge_graph_only_pending_chunks():
+    """Chunks with stored entities aren't sent to Qwen again."""
+    chunks = [
+        {"index": 0, "content_hash": "h0", "text": "done", "entity_ids": ["x"], "embedding_id": None},
+        {"index": 1, "content_hash": "h1", "text": "first", "entity_ids": None, "embedding_id": None},
+        {"index": 2, "content_hash": "h2", "text": "second", "entity_ids": None, "embedding_id": None}
+    ]
+    client = AsyncMock()
+    client.extract_entities.side_effect = [
+        [{"name": "A", "type": "CONCEPT", "description": ""}, {"name": "B", "type": "CONCEPT", "description": ""}],
+        [{"name": "C", "type": "CONCEPT", "description": ""}]
+    ]
+    client.extract_relationships.return_value = []
+    with patch("app.tasks.document.QwenClient", return_value=client), \
+         patch("app.database.graph.get_graph_db", return_value=AsyncMock()) as graph_db, \
+         patch("app.tasks.document.get_sync_relational_db") as rel_db:
+        result = await document.extract_knowledge_graph({"doc_id": DOC_ID, "text": "", "chunks": chunks})
+
+    assert result["status"] == "completed"
+    assert [call.args[0] for call in client.extract_entities.await_args_list] == ["first", "second"]
+    batch, relations = graph_db.return_value.store_graph.await_args.args
+    assert relations.document_id == UUID(DOC_ID)
+    assert batch.document_id == UUID(DOC_ID)
+    doc_id, column, results = rel_db.return_value.update_chunk_results.call_args.args
+    assert column == "entity_ids"
+    assert results == {"h1": batch.id_strings()[:2], "h2": batch.id_strings()[2:]}
+
+@pytest.mark.asyncio
+async def test_extract_knowledge_graph_retry_reuses_ids():
+    """A retry after a failed manifest update writes the same entity and relationship ids."""
+    chunks = [{"index": 0, "content_hash": "h0", "text": "first", "entity_ids": None, "embedding_id": None}]
+    client = AsyncMock()
+    client.extract_entities.return_value = [{"name": "A", "type": "CONCEPT", "description": ""},
+                                            {"name": "B", "type": "CONCEPT", "description": ""}]
+    client.extract_relationships.return_value = [
+        {"source": "A", "target": "B", "relationship": "rel", "relationship_strength": 5}]
+    with patch("app.tasks.document.QwenClient", return_value=client), \
+         patch("app.database.graph.get_graph_db", return_value=AsyncMock()) as graph_db, \
+         patch("app.tasks.document.get_sync_relational_db") as rel_db:
+        rel_db.return_value.update_chunk_results.side_effect = [RuntimeError("mysql down"), None]
+        failed = await document.extract_knowledge_graph({"doc_id": DOC_ID, "text": "", "chunks": chunks})
+        retried = await document.extract_knowledge_graph({"doc_id": DOC_ID, "text": "", "chunks": chunks})
+
+    assert (failed["status"], retried["status"]) == ("failed", "completed")
+    (first, first_rels), (second, second_rels) = [call.args for call in graph_db.return_value.store_graph.await_args_list]
+    assert first.id_strings() == second.id_strings()
+    assert first_rels.id_strings() == second_rels.id_strings()
+    assert rel_db.return_value.update_chunk_results.call_args.args[2] == {"h0": second.id_strings()}
+
+def test_extract_content_embeds_pending_chunks_in_batches(monkeypatch):
+    """Pending chunks are embedded in batches and recorded in the manifest."""
+    monkeypatch.setattr(document.settings, "EMBEDDING_BATCH_SIZE", 2)
+    chunks = [
+        {"index": i, "content_hash": str(i) * 64, "text": f"chunk {i}", "entity_ids": None, "embedding_id": None}
+        for i in range(3)
+    ]
+
+    def embed(model, input, dimension, output_type):
+        response = MagicMock(status_code=HTTPStatus.OK)
+        texts = input if isinstance(input, list) else [input]
+        response.output = {"embeddings": [{"text_index": i, "embedding": [float(i)] * 4} for i in range(len(texts))]}
+        return response
+
+    with patch("dashscope.TextEmbedding.call", side_effect=embed) as call, \
+         patch("app.tasks.document.get_sync_relational_db") as rel_db, \
+         patch("app.tasks.document.get_sync_vector_db") as vector_db:
+        rel_db.return_value.get_document.return_value = {"content": "text", "path": "/tmp/paper.pdf"}
+        result = document.extract_content({"doc_id": DOC_ID, "text": "text", "chunks": chunks})
+
+    assert result["status"] == "success"
+    assert call.call_count == 3  # document embedding plus two chunk batches
+    ids, embeddings, metadatas = vector_db.return_value.add_embeddings.call_args.args
+    assert ids == [f"chunk_{DOC_ID}_{str(i) * 16}" for i in range(3)]
+    assert embeddings == [[0.0] * 4, [1.0] * 4, [0.0] * 4]
+    assert metadatas[2]["chunk_index"] == 2
+    _, column, results = rel_db.return_value.update_chunk_results.call_args.args
+    assert column == "embedding_id" and list(results.values()) == ids
@@ -0,0 +1,50 @@
+"""Tests for the local fake DashScope server and the base URL switch."""
+
+import asyncio
+import pytest
+from http import HTTPStatus
+from app.config import settings
+from app.processors.document import DocumentProcessor
+from app.utils.fake_dashscope import FakeDashScope, hash_embedding
+from app.utils.qwen import QwenClient, dashscope
+
+def test_base_url_setting_points_clients_at_server(monkeypatch):
+    """DASHSCOPE_BASE_URL routes QwenClient requests to the configured server."""
+    with FakeDashScope() as server:
+        previous = dashscope.base_http_api_url
+        monkeypatch.setattr(settings, "DASHSCOPE_BASE_URL", server.url)
+        try:
+            client = QwenClient(api_key="test-key")
+            embedding = asyncio.run(client.generate_embeddings("Attention"))
+        finally:
+            dashscope.base_http_api_url = previous
+
+    assert embedding == hash_embedding("Attention", 1024)
+    assert server.stats["embedding"] == 1
+
+def test_error_rate_and_request_rate_limit():
+    """Failures follow the error rate; requests beyond the rate get 429s."""
+    with FakeDashScope(error_rate=1.0) as server:
+        server.install()
+        client = QwenClient(api_key="test-key")
+        client.retry_delay = 0
+        with pytest.raises(Exception):
+            asyncio.run(client.extract_entities("Attention Transformer"))
+    assert server.stats["errors"] == client.max_retries
+
+    with FakeDashScope(requests_per_second=2) as server:
+        server.install()
+        statuses = [dashscope.TextEmbedding.call(model="text-embedding-v3", input="x", api_key="test-key").status_code
+                    for _ in range(4)]
+    assert statuses == [HTTPStatus.OK, HTTPStatus.OK, HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.TOO_MANY_REQUESTS]
+    assert server.stats["rate_limited"] == 2
+
+def test_document_processor_extracts_from_text_format():
+    """DocumentProcessor's combined prompt gets entities and relationships back."""
+    with FakeDashScope() as server:
+        server.install()
+        graph = DocumentProcessor().extract_knowledge_graph(["Layout Parser analyses Documents"])
+
+    assert [entity["name"] for entity in graph["entities"]] == ["LAYOUT", "PARSER", "DOCUMENTS"]
+    assert [(rel["source"], rel["target"]) for rel in graph["relationships"]] == [
+        ("LAYOUT", "PARSER"), ("PARSER", "DOCUMENTS")]
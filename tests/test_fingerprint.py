@@ -0,0 +1,141 @@
+"""Tests for document fingerprints and duplicate short-circuiting."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+from app.database.relational import AsyncRelationalDatabase, DocumentFingerprintTable
+from app.config import settings
+from app.tasks.document import extract_knowledge_graph, process_document
+from app.utils.chunking import split_text
+from app.utils.fingerprint import (
+    DocumentFingerprint,
+    file_sha256,
+    hamming_distance,
+    normalize_text,
+    simhash,
+    simhash_bands
+)
+
+TEXT = " ".join(
+    f"Section {i}. The transformer architecture relies on attention mechanisms "
+    f"to model dependencies between tokens without recurrence, variant {i * 7}."
+    for i in range(40)
+)
+
+def test_simhash_tolerates_small_edits():
+    """Layout changes keep the hash, small edits move it a few bits."""
+    assert normalize_text("Attention,  is\nALL you need!") == "attention is all you need"
+    assert simhash(TEXT) == simhash(TEXT.upper().replace(" ", "  \n"))
+    edited = TEXT.replace("variant 7.", "variant 8.")
+    assert hamming_distance(simhash(TEXT), simhash(edited)) <= 3
+    other = "Graph databases store nodes and edges with properties. " * 40
+    assert hamming_distance(simhash(TEXT), simhash(other)) > 10
+    assert simhash("") == 0
+
+def test_simhash_bands_cover_small_distances():
+    """Hashes within bands - 1 bits share at least one band."""
+    value = simhash(TEXT)
+    near = value ^ (1 << 3) ^ (1 << 20) ^ (1 << 40)
+    assert len(simhash_bands(value)) == 4
+    assert any(a == b for a, b in zip(simhash_bands(value), simhash_bands(near)))
+
+def test_file_sha256(tmp_path):
+    """Files are hashed in chunks."""
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(b"%PDF-1.4\n" * 1000)
+    assert file_sha256(str(path), chunk_size=7) == file_sha256(str(path))
+
+@pytest.mark.asyncio
+async def test_find_similar_fingerprints_filters_candidates():
+    """Band candidates are filtered by exact Hamming distance."""
+    value = simhash(TEXT)
+    rows = [
+        DocumentFingerprintTable(sha256="a" * 64, document_id=uuid4().bytes, simhash=value ^ 0b11, size=1),
+        DocumentFingerprintTable(sha256="b" * 64, document_id=uuid4().bytes, simhash=value ^ 0xFFFF, size=1),
+        DocumentFingerprintTable(sha256="c" * 64, document_id=uuid4().bytes, simhash=value, size=1)
+    ]
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    session.begin.return_value = session
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    session.execute = AsyncMock(return_value=result)
+
+    db = AsyncRelationalDatabase()
+    db._session_factory = MagicMock(return_value=session)
+    matches = await db.find_similar_fingerprints(value, max_distance=3)
+
+    assert [match["sha256"] for match in matches] == ["c" * 64, "a" * 64]
+    assert [match["distance"] for match in matches] == [0, 2]
+    with pytest.raises(ValueError):
+        await db.find_similar_fingerprints(value, max_distance=4)
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    """Write a placeholder PDF file."""
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(b"%PDF-1.4\nTest PDF content")
+    return str(path)
+
+@pytest.mark.asyncio
+async def test_process_document_skips_exact_duplicates(pdf_path):
+    """Known file hashes resolve to the existing document without partitioning."""
+    chunks = split_text(TEXT, settings.CHUNK_MIN_CHARS, settings.CHUNK_MAX_CHARS)
+    done = {chunk.content_hash: {"entity_ids": ["e"], "embedding_id": "v"} for chunk in chunks}
+    rel_db = MagicMock()
+    rel_db.get_fingerprint.return_value = {"document_id": "existing-doc"}
+    rel_db.get_document.return_value = {"value": {"content": TEXT}}
+    rel_db.get_chunk_manifest.return_value = done
+    with patch("app.tasks.document.get_sync_relational_db", return_value=rel_db), \
+         patch("app.tasks.document.partition_pdf") as partition:
+        result = await process_document(pdf_path)
+
+    assert result == {"doc_id": "existing-doc", "text": TEXT, "chunks": [], "duplicate": "exact"}
+    rel_db.get_fingerprint.assert_called_once_with(file_sha256(pdf_path))
+    partition.assert_not_called()
+    rel_db.store_document.assert_not_called()
+
+    skipped = await extract_knowledge_graph(result)
+    assert skipped["status"] == "skipped"
+
+@pytest.mark.asyncio
+async def test_exact_duplicate_resumes_unfinished_chunks(pdf_path):
+    """Chunks a failed run left without entities are passed on again."""
+    chunks = split_text(TEXT, settings.CHUNK_MIN_CHARS, settings.CHUNK_MAX_CHARS)
+    manifest = {chunk.content_hash: {"entity_ids": ["e"], "embedding_id": "v"} for chunk in chunks}
+    manifest[chunks[-1].content_hash] = {"entity_ids": None, "embedding_id": None}
+    rel_db = MagicMock()
+    rel_db.get_fingerprint.return_value = {"document_id": "existing-doc"}
+    rel_db.get_document.return_value = {"value": {"content": TEXT}}
+    rel_db.get_chunk_manifest.return_value = manifest
+    with patch("app.tasks.document.get_sync_relational_db", return_value=rel_db):
+        result = await process_document(pdf_path)
+
+    assert result["duplicate"] == "exact"
+    assert [chunk["content_hash"] for chunk in result["chunks"]] == [chunks[-1].content_hash]
+
+@pytest.mark.asyncio
+async def test_process_document_near_duplicate_and_new(pdf_path):
+    """Near duplicates reuse the document; new documents are registered."""
+    rel_db = MagicMock()
+    rel_db.get_fingerprint.return_value = None
+    rel_db.find_similar_fingerprints.return_value = [{"document_id": "existing-doc", "distance": 1}]
+    rel_db.get_chunk_manifest.return_value = {}
+    with patch("app.tasks.document.get_sync_relational_db", return_value=rel_db), \
+         patch("app.tasks.document.partition_pdf", return_value=[TEXT]):
+        result = await process_document(pdf_path)
+
+        assert result["doc_id"] == "existing-doc"
+        assert result["duplicate"] == "near"
+        fingerprint, doc_id = rel_db.store_fingerprint.call_args.args
+        assert isinstance(fingerprint, DocumentFingerprint)
+        assert doc_id == "existing-doc"
+        rel_db.store_document.assert_not_called()
+
+        rel_db.find_similar_fingerprints.return_value = []
+        result = await process_document(pdf_path)
+
+    assert "duplicate" not in result
+    rel_db.store_document.assert_called_once()
+    assert rel_db.store_fingerprint.call_args.args[1] == result["doc_id"]
@@ -0,0 +1,206 @@
+"""Tests for the backpressure-aware bulk ingest scheduler."""
+
+import pytest
+from unittest.mock import MagicMock, patch
+from celery import states
+from app.tasks import ingest
+
+class FakeRelationalDatabase:
+    """In-memory stand-in for the ingest job tables."""
+
+    def __init__(self):
+        self.jobs, self.items = {}, {}
+
+    def create_ingest_job(self, job_id, arxiv_ids, window, rate, now):
+        self.jobs[job_id] = {"job_id": job_id, "status": "running", "generation": 0, "window": window,
+                             "rate": rate, "effective_window": float(window), "tokens": 0.0,
+                             "throughput": 0.0, "total": len(arxiv_ids), "updated_at": now}
+        self.items[job_id] = [{"position": i, "arxiv_id": arxiv_id, "state": "pending",
+                               "task_id": None, "error": None} for i, arxiv_id in enumerate(arxiv_ids)]
+
+    def get_ingest_job(self, job_id):
+        if job_id not in self.jobs:
+            return None
+        counts = {}
+        for item in self.items[job_id]:
+            counts[item["state"]] = counts.get(item["state"], 0) + 1
+        return dict(self.jobs[job_id], counts=counts)
+
+    def update_ingest_job(self, job_id, values):
+        if job_id not in self.jobs:
+            return False
+        self.jobs[job_id].update(values)
+        return True
+
+    def list_ingest_items(self, job_id, state, limit):
+        return [dict(item) for item in self.items[job_id] if item["state"] == state][:limit]
+
+    def update_ingest_items(self, job_id, updates):
+        for position, values in updates.items():
+            self.items[job_id][position].update(values)
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    """Run ticks against the fake database with a controllable clock and broker."""
+    rel_db = FakeRelationalDatabase()
+    state = {"now": 1000.0, "depths": {}, "results": {}, "scheduled": []}
+    monkeypatch.setattr(ingest.settings, "INGEST_TICK_SECONDS", 5.0)
+    monkeypatch.setattr(ingest.settings, "INGEST_MAX_QUEUE_DEPTH", 100)
+
+    def submit(args, priority):
+        task_id = f"task-{args[0]}"
+        state["results"][task_id] = None
+        return MagicMock(id=task_id)
+
+    def async_result(task_id):
+        value = state["results"][task_id]
+        return MagicMock(ready=MagicMock(return_value=value is not None), state=states.PENDING,
+                         successful=MagicMock(return_value=True), result=value)
+
+    with patch("app.tasks.ingest.get_sync_relational_db", return_value=rel_db), \
+         patch("app.tasks.ingest.time.time", side_effect=lambda: state["now"]), \
+         patch("app.tasks.ingest.queue_depths", side_effect=lambda: state["depths"]), \
+         patch("app.tasks.ingest._schedule", side_effect=lambda *args, **kwargs: state["scheduled"].append(args)), \
+         patch.object(ingest.workflow.process_document_workflow, "apply_async", side_effect=submit) as apply, \
+         patch.object(ingest.celery_app, "AsyncResult", side_effect=async_result):
+        yield rel_db, state, apply
+
+def finish(state, status="completed"):
+    for task_id, value in state["results"].items():
+        if value is None:
+            state["results"][task_id] = {"status": status}
+
+def test_adapt_window_is_aimd():
+    """The window halves under congestion and grows slowly when queues drain."""
+    assert ingest.adapt_window(16.0, 32, {"llm-io": 100}, 100) == 8.0
+    assert ingest.adapt_window(16.0, 32, {"llm-io": 70}, 100) == 16.0
+    assert ingest.adapt_window(16.0, 32, {"llm-io": 10}, 100) == 17.0
+    assert ingest.adapt_window(32.0, 32, {}, 100) == 32.0
+    assert ingest.adapt_window(1.0, 32, {"cpu-parse": 500}, 100) == 1.0
+
+def test_admission_budget():
+    """Admissions are limited by the window, queue headroom and tokens."""
+    assert ingest.admission_budget(10.0, 4, {}, 100, None) == 6
+    assert ingest.admission_budget(10.0, 4, {"llm-io": 97}, 100, None) == 3
+    assert ingest.admission_budget(10.0, 4, {}, 100, 2.7) == 2
+    assert ingest.admission_budget(10.0, 12, {}, 100, None) == 0
+
+def test_ticks_respect_window_and_complete(scheduler):
+    """No more than the window is in flight, and the job completes."""
+    rel_db, state, apply = scheduler
+    job_id = ingest.start_ingest([f"2101.{i:05d}" for i in range(10)] + ["2101.00000"], window=4, rate=0)
+
+    assert rel_db.jobs[job_id]["total"] == 10
+    assert ingest.ingest_tick(job_id, 0) == {"status": "running", "admitted": 4, "in_flight": 4}
+    assert ingest.ingest_tick(job_id, 0)["admitted"] == 0
+
+    for _ in range(10):
+        finish(state)
+        state["now"] += 5
+        if ingest.ingest_tick(job_id, 0)["status"] == "completed":
+            break
+
+    status = ingest.ingest_status(job_id)
+    assert status["status"] == "completed" and status["counts"] == {"completed": 10}
+    assert apply.call_count == 10
+    assert all(call.kwargs["priority"] == ingest.PRIORITY_BACKFILL for call in apply.call_args_list)
+    assert status["throughput"] > 0
+
+def test_congestion_shrinks_window(scheduler):
+    """Full stage queues stop admissions and halve the window."""
+    rel_db, state, _ = scheduler
+    job_id = ingest.start_ingest([f"2101.{i:05d}" for i in range(50)], window=16, rate=0)
+    state["depths"] = {"llm-io": 100}
+
+    assert ingest.ingest_tick(job_id, 0)["admitted"] == 0
+    assert rel_db.jobs[job_id]["effective_window"] == 8.0
+
+    state["depths"] = {"llm-io": 95}
+    assert ingest.ingest_tick(job_id, 0)["admitted"] == 5
+
+def test_rate_limit(scheduler):
+    """A rate limit admits papers at the configured pace."""
+    _, state, _ = scheduler
+    job_id = ingest.start_ingest([f"2101.{i:05d}" for i in range(50)], window=50, rate=24)
+
+    state["now"] += 5
+    assert ingest.ingest_tick(job_id, 0)["admitted"] == 2
+    state["now"] += 2.5
+    assert ingest.ingest_tick(job_id, 0)["admitted"] == 1
+    # Idle time doesn't accumulate more than one tick's burst
+    state["now"] += 600
+    assert ingest.ingest_tick(job_id, 0)["admitted"] == 2
+
+def test_pause_resume_and_throttle(scheduler):
+    """Paused jobs admit nothing; ticks from before a resume are stale."""
+    rel_db, state, _ = scheduler
+    job_id = ingest.start_ingest([f"2101.{i:05d}" for i in range(20)], window=2, rate=0)
+    ingest.ingest_tick(job_id, 0)
+
+    assert ingest.pause_ingest(job_id)
+    assert not ingest.pause_ingest(job_id)
+    assert ingest.ingest_tick(job_id, 0) == {"status": "paused", "admitted": 0, "in_flight": 2}
+
+    assert ingest.throttle_ingest(job_id, window=5)
+    with pytest.raises(ValueError):
+        ingest.throttle_ingest(job_id, rate=-1)
+    assert ingest.resume_ingest(job_id)
+    assert state["scheduled"][-1] == (job_id, 1)
+    assert ingest.ingest_tick(job_id, 0)["status"] == "stale"
+    # A raised window is grown into one paper per tick
+    assert ingest.ingest_tick(job_id, 1)["admitted"] == 1
+    assert rel_db.jobs[job_id]["effective_window"] == 3.0
+
+    assert ingest.cancel_ingest(job_id)
+    assert ingest.ingest_tick(job_id, 1)["admitted"] == 0
+    assert not ingest.resume_ingest(job_id)
+
+def test_failed_papers_are_recorded(scheduler):
+    """A failed workflow marks its paper failed without stopping the job."""
+    rel_db, state, _ = scheduler
+    job_id = ingest.start_ingest(["2101.00001", "2101.00002"], window=2, rate=0)
+    ingest.ingest_tick(job_id, 0)
+    state["results"]["task-2101.00001"] = {"status": "failed", "error": "no PDF"}
+    finish(state)
+
+    assert ingest.ingest_tick(job_id, 0)["status"] == "completed"
+    assert ingest.ingest_status(job_id)["counts"] == {"failed": 1, "completed": 1}
+    assert rel_db.items[job_id][0]["error"] == "no PDF"
+
+def test_failed_tick_schedules_next(scheduler):
+    """An error in a tick doesn't end the job's scheduling loop."""
+    rel_db, state, _ = scheduler
+    job_id = ingest.start_ingest(["2101.00001"], window=1, rate=0)
+    state["scheduled"].clear()
+    with patch("app.tasks.ingest.queue_depths", side_effect=RuntimeError("broker down")):
+        with pytest.raises(RuntimeError):
+            ingest.ingest_tick(job_id, 0)
+
+    assert state["scheduled"] == [(job_id, 0)]
+    assert ingest.ingest_tick(job_id, 0)["admitted"] == 1
+
+def test_lost_papers_time_out(scheduler, monkeypatch):
+    """A workflow still unknown after INGEST_ITEM_TIMEOUT fails its paper."""
+    rel_db, state, _ = scheduler
+    monkeypatch.setattr(ingest.settings, "INGEST_ITEM_TIMEOUT", 60.0)
+    job_id = ingest.start_ingest(["2101.00001"], window=1, rate=0)
+    ingest.ingest_tick(job_id, 0)
+
+    state["now"] += 30
+    assert ingest.ingest_tick(job_id, 0) == {"status": "running", "admitted": 0, "in_flight": 1}
+    state["now"] += 60
+    assert ingest.ingest_tick(job_id, 0)["status"] == "completed"
+    assert rel_db.items[job_id][0]["state"] == "failed"
+    assert "lost" in rel_db.items[job_id][0]["error"]
+
+def test_stalled_job_can_be_resumed(scheduler, monkeypatch):
+    """A running job whose loop stopped is restarted by resume."""
+    rel_db, state, _ = scheduler
+    monkeypatch.setattr(ingest.settings, "INGEST_STALL_SECONDS", 60.0)
+    job_id = ingest.start_ingest(["2101.00001"], window=1, rate=0)
+
+    assert not ingest.resume_ingest(job_id)
+    state["now"] += 120
+    assert ingest.resume_ingest(job_id)
+    assert state["scheduled"][-1] == (job_id, 1)
+    assert rel_db.jobs[job_id]["status"] == "running"
@@ -0,0 +1,56 @@
+"""Tests for the end-to-end ingest benchmark and its local stand-ins."""
+
+import asyncio
+from uuid import uuid4
+from app.tasks.document import embed_texts
+from app.utils.fingerprint import DocumentFingerprint
+from app.utils.qwen import QwenClient
+from benchmarks.bench_ingest import run_benchmark
+from app.utils.fake_dashscope import FakeDashScope, hash_embedding
+from benchmarks.standins import SQLiteRelationalDatabase
+from tests.test_partition import SAMPLE_PDF
+
+def test_fake_dashscope_serves_extraction_and_embeddings():
+    """The SDK talks to the fake server; 429s are retried by QwenClient."""
+    text = "Attention layers let the Transformer route information between Tokens."
+    with FakeDashScope(rate_limit=0.5, seed=3) as server:
+        server.install()
+        client = QwenClient(api_key="test-key")
+        client.retry_delay, client.max_retries = 0, 20
+        entities = asyncio.run(client.extract_entities(text))
+        relationships = asyncio.run(client.extract_relationships(text))
+        server.rate_limit = 0.0
+        embeddings = embed_texts(["first", "second"])
+
+    assert [entity["name"] for entity in entities] == ["ATTENTION", "TRANSFORMER", "TOKENS"]
+    assert [(rel["source"], rel["target"]) for rel in relationships] == [
+        ("ATTENTION", "TRANSFORMER"), ("TRANSFORMER", "TOKENS")]
+    assert embeddings == [hash_embedding("first", 1024), hash_embedding("second", 1024)]
+    assert server.stats["rate_limited"] > 0
+
+def test_sqlite_standin_keeps_chunk_results():
+    """Manifest upserts keep stored results, like AsyncRelationalDatabase."""
+    db, doc_id = SQLiteRelationalDatabase(), str(uuid4())
+    db.store_document({"data_id": doc_id, "data_type": "document", "data_value": {"status": "processing"}})
+    db.update_document(doc_id, {"status": "done"})
+    db.store_chunks(doc_id, [{"content_hash": "a", "index": 0, "embedding_id": "e1"}])
+    db.store_chunks(doc_id, [{"content_hash": "a", "index": 1, "entity_ids": ["x"]}])
+    db.store_fingerprint(DocumentFingerprint("f" * 64, (1 << 64) - 1, 10), doc_id)
+
+    assert db.get_document(doc_id) == {"status": "done"}
+    assert db.get_chunk_manifest(doc_id)["a"] == {
+        "content_hash": "a", "index": 1, "entity_ids": ["x"], "embedding_id": "e1"}
+    assert db.get_fingerprint("f" * 64)["document_id"] == doc_id
+
+def test_run_benchmark_reports_stages():
+    """A run ingests every document and reports throughput, stages and memory."""
+    results = run_benchmark([SAMPLE_PDF], repeat=2, warmup=0, partitioner="tests.test_partition:fake_partition",
+                            latency=0.0)
+
+    assert results["documents"] == 2 and not results["failed"]
+    assert results["docs_per_min"] > 0 and results["peak_rss_mb"] > 0
+    assert {"document", "pipeline_parse", "pipeline_embed", "pipeline_extract", "pipeline_write"} <= set(
+        results["stages"])
+    assert results["stages"]["document"]["p50"] <= results["stages"]["document"]["p99"]
+    assert results["dashscope_requests"]["embedding"] >= 2
+    assert results["stored"]["documents"] == 2 and results["stored"]["chunks"] >= 2
@@ -154,7 +154,7 @@ async def test_empty_input_handling():
 async def test_knowledge_graph_task():
     """Test knowledge graph extraction task."""
     with patch('app.tasks.document.QwenClient') as MockQwenClient, \
-         patch('app.tasks.document.get_sync_graph_db') as mock_graph_db, \
+         patch('app.database.graph.get_graph_db') as mock_graph_db, \
          patch('app.tasks.document.get_sync_vector_db') as mock_vector_db:
 
         # Setup mock QwenClient
@@ -164,7 +164,8 @@ async def test_knowledge_graph_task():
         MockQwenClient.return_value = mock_client
 
         # Setup mock databases
-        mock_graph_db.return_value = MagicMock()
+        mock_graph_db.return_value = AsyncMock()
+        mock_graph_db.return_value.store_graph.return_value = (3, 2)
         mock_vector_db.return_value = MagicMock()
 
         # Run the task
@@ -180,9 +181,12 @@ async def test_knowledge_graph_task():
         assert result["entities"] == EXPECTED_ENTITIES
         assert result["relationships"] == EXPECTED_RELATIONSHIPS
 
-        # Verify database interactions
-        mock_graph_db.return_value.store_entity.assert_called()
-        mock_graph_db.return_value.store_relationship.assert_called()
+        # Verify database interactions: one transaction for the whole graph
+        mock_graph_db.return_value.store_graph.assert_awaited_once()
+        entities, relations = mock_graph_db.return_value.store_graph.await_args.args
+        assert entities.names == [entity["name"] for entity in EXPECTED_ENTITIES]
+        assert relations.sources == [rel["source"] for rel in EXPECTED_RELATIONSHIPS]
+        mock_graph_db.return_value.disconnect.assert_awaited_once()
 
 @pytest.mark.asyncio
 async def test_embedding_generation():
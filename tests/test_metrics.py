@@ -0,0 +1,103 @@
+"""Tests for Prometheus metrics collection and export."""
+
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+import pytest
+from fastapi.testclient import TestClient
+from app.database.cache import TTLLRUCache
+from app.database.sync_wrappers import run_async
+from app.main import app
+from app.tasks import celery_app
+from app.utils import metrics
+from app.utils.qwen import call_dashscope
+
+def sample(name, **labels):
+    return metrics.REGISTRY.get_sample_value(name, labels) or 0.0
+
+class ChromaInterface:
+    """Stands in for the vector interface in round-trip metrics."""
+
+    async def add_embeddings(self, ids):
+        return len(ids)
+
+@celery_app.task(name="tests.metrics_add")
+def add(x, y):
+    return x + y
+
+def test_metrics_endpoint(monkeypatch):
+    """The API serves the registry in the Prometheus text format."""
+    monkeypatch.setattr(metrics.settings, "METRICS_QUEUE_DEPTHS", False)
+    metrics.update_queue_depths({"llm-io": 7})
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'ananke_queue_depth{queue="llm-io"} 7.0' in response.text
+    assert "ananke_task_duration_seconds" in response.text
+
+def test_dashscope_latency_and_tokens():
+    """DashScope calls record latency by status and token usage."""
+    before = sample("ananke_qwen_tokens_total", operation="entities", kind="input")
+    ok = SimpleNamespace(status_code=HTTPStatus.OK, usage={"input_tokens": 120, "output_tokens": 30})
+    call_dashscope("entities", lambda **kwargs: ok, prompt="text")
+    call_dashscope("embedding", lambda **kwargs: SimpleNamespace(status_code=HTTPStatus.OK,
+                                                                 usage={"total_tokens": 8}))
+    call_dashscope("entities", lambda **kwargs: SimpleNamespace(status_code=429, usage=None))
+    with pytest.raises(ConnectionError):
+        call_dashscope("entities", lambda **kwargs: (_ for _ in ()).throw(ConnectionError()))
+
+    assert sample("ananke_qwen_tokens_total", operation="entities", kind="input") == before + 120
+    assert sample("ananke_qwen_tokens_total", operation="embedding", kind="total") >= 8
+    for status in ("ok", "rate_limited", "error"):
+        assert sample("ananke_qwen_request_duration_seconds_count", operation="entities", status=status) >= 1
+
+def test_db_round_trips_and_cache_lookups():
+    """Interface coroutines run through run_async and named caches are counted."""
+    labels = {"backend": "vector", "operation": "add_embeddings"}
+    before = sample("ananke_db_request_duration_seconds_count", **labels)
+    assert run_async(ChromaInterface().add_embeddings(["a", "b"])) == 2
+    assert sample("ananke_db_request_duration_seconds_count", **labels) == before + 1
+
+    cache = TTLLRUCache(maxsize=4, ttl=0, name="test_cache")
+    cache.get("key")
+    cache.set("key", 1)
+    cache.get("key")
+    assert sample("ananke_cache_lookups_total", cache="test_cache", result="hit") == 1
+    assert sample("ananke_cache_lookups_total", cache="test_cache", result="miss") == 1
+
+def test_task_durations_and_push():
+    """Celery tasks are timed; worker processes push metrics and delete them on shutdown."""
+    assert add.apply((2, 3)).get() == 5
+    assert sample("ananke_task_duration_seconds_count", task="tests.metrics_add", state="success") == 1
+
+    class Gateway(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_PUT(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            self.server.pushes.append((self.path, body))
+            self.send_response(200)
+            self.end_headers()
+
+        def do_DELETE(self):
+            self.server.deletes.append(self.path)
+            self.send_response(202)
+            self.end_headers()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Gateway)
+    server.pushes = []
+    server.deletes = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        assert metrics.push_metrics(f"127.0.0.1:{server.server_address[1]}")
+        assert metrics.delete_metrics(f"127.0.0.1:{server.server_address[1]}")
+    finally:
+        server.shutdown()
+    path, body = server.pushes[0]
+    assert path.startswith("/metrics/job/ananke2-worker/instance/")
+    assert b"ananke_task_duration_seconds" in body
+    assert server.deletes == [path]
+    assert not metrics.push_metrics("")
@@ -1,9 +1,14 @@
 """Test model functionality and serialization."""
+import json
+import numpy as np
 import pytest
-from uuid import UUID
+from uuid import UUID, uuid4
 from app.models.types import StructuredDataBase
 from app.models.entities import EntitySymbol, EntitySemantic
-from app.models.structured import StructuredData
+from app.models.relations import RelationSemantic
+from app.models.structured import StructuredData, Document
+from app.models.vector import Vector
+from app.models.serialization import ColumnBuffer, dumps
 
 @pytest.mark.asyncio
 async def test_entity_symbol():
@@ -49,3 +54,96 @@ async def test_structured_data():
     assert isinstance(serialized['data_id'], str)
     assert serialized['data_type'] == "test"
     assert isinstance(serialized['data_value'], dict)
+
+
+def test_vector_fields_are_float32():
+    """Vector fields accept lists, arrays and bytes and store float32."""
+    values = [0.1, 0.2, 0.3]
+    semantic = EntitySemantic(semantic_id=uuid4(), name="Test", vector_representation=values)
+    assert isinstance(semantic.vector_representation, Vector)
+    assert semantic.vector_representation.array.dtype == np.float32
+    assert semantic.vector_representation == values
+
+    array = np.asarray(values, dtype=np.float32)
+    from_array = EntitySemantic(semantic_id=uuid4(), vector_representation=array)
+    assert np.shares_memory(from_array.vector_representation.array, array)
+    from_bytes = EntitySemantic(semantic_id=uuid4(), vector_representation=array.tobytes())
+    assert from_bytes.vector_representation == semantic.vector_representation
+
+    assert len(EntitySemantic(semantic_id=uuid4()).vector_representation) == 0
+    with pytest.raises(ValueError):
+        EntitySemantic(semantic_id=uuid4(), vector_representation=[[0.1], [0.2]])
+
+def test_vector_serialization():
+    """Vectors dump as float lists in JSON mode and for Chroma."""
+    relation = RelationSemantic(relation_id=uuid4(), name="USES", semantic=[0.5, 0.25], hit_count=1)
+    assert json.loads(relation.model_dump_json())["semantic"] == [0.5, 0.25]
+    assert relation.model_dump(mode="json")["semantic"] == [0.5, 0.25]
+    assert relation.to_chroma()["vector"] == [0.5, 0.25]
+
+    document = Document(
+        id=uuid4(),
+        meta=StructuredData(data_id=uuid4(), data_type="test", data_value={}),
+        meta_embedding=[0.5, 0.25],
+        raw_content="content"
+    )
+    chroma = document.to_chroma()
+    assert chroma["vector"] == [0.5, 0.25]
+    assert all(isinstance(v, float) for v in chroma["vector"])
+    assert Document.model_validate_json(document.model_dump_json()).meta_embedding == document.meta_embedding
+
+def test_model_dump_fast_paths():
+    """UUID fields are stringified and byte output round-trips."""
+    entity = EntitySymbol(
+        symbol_id=uuid4(),
+        name="Test Entity",
+        entity_type="TEST",
+        document_id=uuid4(),
+        properties=[StructuredDataBase(data_id=uuid4(), data_type="prop", data_value={"k": 1})]
+    )
+    dumped = entity.model_dump()
+    assert isinstance(dumped["symbol_id"], str)
+    assert isinstance(dumped["document_id"], str)
+    assert entity.model_dump(include={"name"}) == {"name": "Test Entity"}
+
+    neo4j_data = entity.to_neo4j()
+    assert isinstance(neo4j_data["properties"][0]["data_id"], str)
+
+    assert EntitySymbol.model_validate_json(entity.model_dump_bytes()) == entity
+    with pytest.raises(ValueError):
+        entity.model_dump_bytes(format="xml")
+
+def test_adapters_write_into_column_buffer():
+    """Adapters append rows column-wise to a shared buffer."""
+    buffer = ColumnBuffer()
+    entities = [EntitySymbol(symbol_id=uuid4(), name=f"E{i}", entity_type="TEST") for i in range(3)]
+    for entity in entities:
+        entity.to_neo4j(buffer=buffer)
+
+    assert len(buffer) == 3
+    assert buffer.columns["name"] == ["E0", "E1", "E2"]
+    assert buffer.rows()[1] == entities[1].to_neo4j()
+    with pytest.raises(ValueError):
+        buffer.append({"name": "missing columns"})
+
+def test_dumps_encodes_vectors_and_uuids():
+    """Byte output handles UUIDs and numpy-backed vectors."""
+    id = uuid4()
+    payload = json.loads(dumps({"id": id, "vector": Vector([0.5, 0.25])}))
+    assert payload == {"id": str(id), "vector": [0.5, 0.25]}
+
+def test_bench_models_covers_every_model():
+    """The model micro-benchmark suite includes every model class."""
+    import inspect
+    from pydantic import BaseModel
+    import app.models
+    from app.models import entities
+    from benchmarks.bench_models import run_benchmarks
+
+    models = {
+        obj.__name__ for module in (app.models, entities)
+        for obj in vars(module).values()
+        if inspect.isclass(obj) and issubclass(obj, BaseModel) and obj is not BaseModel
+    }
+    results = run_benchmarks(number=1, dim=8)
+    assert models <= {result["model"] for result in results}
@@ -0,0 +1,80 @@
+"""Tests for the background worker monitor."""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.utils import monitoring
+from app.utils.metrics import REGISTRY
+
+def reply(worker, processed, active=()):
+    return {worker: {"active": list(active), "scheduled": [], "reserved": [], "revoked": [],
+                     "registered": ["document.process_document"], "processed": processed,
+                     "queue_wait": {}, "time": 0.0}}
+
+def test_throughput_from_processed_deltas():
+    """Throughput is the change in processed totals over the window."""
+    celery = MagicMock()
+    monitor = monitoring.WorkerMonitor(celery, interval=1, timeout=0.1, window=60, history=10)
+    clock = {"now": 1000.0}
+    celery.control.broadcast.side_effect = [
+        [reply("w1", {"a": 10})],
+        [reply("w1", {"a": 15, "b": 5})],
+        [reply("w1", {"a": 2})]
+    ]
+
+    with patch("app.utils.monitoring.time.time", side_effect=lambda: clock["now"]):
+        assert monitor.poll()["workers"]["w1"]["throughput"] == 0.0
+        clock["now"] += 5
+        snapshot = monitor.poll()
+        # A restarted worker starts over instead of going negative
+        clock["now"] += 5
+        restarted = monitor.poll()
+
+    assert snapshot["workers"]["w1"]["throughput"] == 2.0
+    assert snapshot["workers"]["w1"]["total_processed"] == 20
+    assert restarted["workers"]["w1"]["throughput"] == 0.0
+    celery.control.broadcast.assert_called_with("ananke_snapshot", reply=True, timeout=0.1)
+
+def test_stats_served_from_snapshot():
+    """Status helpers don't broadcast once the monitor has polled."""
+    celery = MagicMock()
+    celery.control.broadcast.return_value = [reply("w1", {"a": 1}, active=[{"id": "t1"}]), {"w2": {"error": "x"}}]
+    monitor = monitoring.WorkerMonitor(celery, interval=1, timeout=0.1)
+
+    with patch("app.utils.monitoring._monitor", monitor):
+        assert monitoring.get_active_tasks() == {"w1": [{"id": "t1"}]}
+        stats = monitoring.get_worker_stats()
+        response = TestClient(app).get("/api/v1/monitoring/throughput")
+
+    assert celery.control.broadcast.call_count == 1
+    assert stats["registered"] == {"w1": ["document.process_document"]}
+    assert stats["throughput"] == {"w1": 0.0}
+    assert response.status_code == 200
+    assert response.json()["history"]["w1"][0]["processed"] == 1
+
+def test_queue_wait_and_worker_snapshot():
+    """Workers report how long tasks waited per queue in their snapshot reply."""
+    headers = {}
+    monitoring._stamp_sent_at(headers=headers)
+    request = SimpleNamespace(request_dict={"sent_at": headers["sent_at"] - 2},
+                              delivery_info={"routing_key": "test-queue"})
+    monitoring._record_received(request=request)
+    monitoring._record_received(request=SimpleNamespace(request_dict={}))
+
+    stats = monitoring.queue_wait_stats(window=60)["test-queue"]
+    assert stats["count"] == 1 and 2.0 <= stats["max"] < 3.0
+
+    snapshot = monitoring.ananke_snapshot(MagicMock())
+    assert set(monitoring.INSPECTIONS) <= set(snapshot)
+    assert snapshot["queue_wait"]["test-queue"]["count"] == 1
+
+def test_task_start_feeds_only_the_histogram():
+    """Waits measured where the task runs go to the histogram, not the snapshot."""
+    request = SimpleNamespace(sent_at=time.time() - 1, delivery_info={"routing_key": "prerun-queue"})
+    before = REGISTRY.get_sample_value("ananke_queue_wait_seconds_count", {"queue": "prerun-queue"}) or 0
+    monitoring._record_queue_wait(task=SimpleNamespace(request=request))
+
+    assert REGISTRY.get_sample_value("ananke_queue_wait_seconds_count", {"queue": "prerun-queue"}) == before + 1
+    assert "prerun-queue" not in monitoring.queue_wait_stats(window=60)
@@ -0,0 +1,90 @@
+"""Tests for page-parallel PDF partitioning."""
+
+import multiprocessing
+import os
+import pytest
+from unittest.mock import patch
+from app.processors import partition
+from app.processors.partition import page_count, page_ranges, partition_pdf
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), "data", "sample_paper.pdf")
+FAKE_PARTITIONER = "tests.test_partition:fake_partition"
+
+class FakeMetadata:
+    def __init__(self, filename, page_number):
+        self.filename = filename
+        self.file_directory = None
+        self.page_number = page_number
+
+class FakeElement:
+    def __init__(self, text, metadata):
+        self.text = text
+        self.metadata = metadata
+
+    def __str__(self):
+        return self.text
+
+def fake_partition(filename, starting_page_number=1, **kwargs):
+    """Emit one element per page, numbered like unstructured does."""
+    from pypdf import PdfReader
+    return [
+        FakeElement(f"page {starting_page_number + i}", FakeMetadata(os.path.basename(filename), starting_page_number + i))
+        for i in range(len(PdfReader(filename).pages))
+    ]
+
+def _partition_in_child(results):
+    elements = partition_pdf(SAMPLE_PDF, workers=2, pages_per_batch=4, min_pages=2,
+                             partitioner=FAKE_PARTITIONER)
+    results.put([element.metadata.page_number for element in elements])
+
+@pytest.fixture(autouse=True)
+def shutdown():
+    yield
+    partition.shutdown_pool()
+
+def test_page_ranges():
+    """Ranges cover every page once, in order."""
+    assert page_ranges(15, 4) == [(0, 4), (4, 8), (8, 12), (12, 15)]
+    assert page_ranges(3, 8) == [(0, 3)]
+    assert page_ranges(0, 8) == []
+
+def test_partition_pdf_parallel_keeps_page_order():
+    """Batches are reassembled in order with page numbers of the original file."""
+    pages = page_count(SAMPLE_PDF)
+    elements = partition_pdf(SAMPLE_PDF, workers=2, pages_per_batch=4, min_pages=2,
+                             partitioner=FAKE_PARTITIONER)
+
+    assert [element.metadata.page_number for element in elements] == list(range(1, pages + 1))
+    assert [str(element) for element in elements][:2] == ["page 1", "page 2"]
+    assert {element.metadata.filename for element in elements} == {"sample_paper.pdf"}
+
+def test_partition_pdf_small_files_stay_in_process():
+    """Files below the page threshold are partitioned with a single call."""
+    with patch.object(partition, "ProcessPoolExecutor") as pool:
+        elements = partition_pdf(SAMPLE_PDF, workers=4, min_pages=100, partitioner=FAKE_PARTITIONER)
+    pool.assert_not_called()
+    assert len(elements) == page_count(SAMPLE_PDF)
+
+def test_partition_pdf_falls_back_without_pool():
+    """A pool that can't be started falls back to in-process partitioning."""
+    with patch.object(partition, "ProcessPoolExecutor", side_effect=OSError("no fork")):
+        elements = partition_pdf(SAMPLE_PDF, workers=2, pages_per_batch=4, min_pages=2,
+                                 partitioner=FAKE_PARTITIONER)
+    assert [element.metadata.page_number for element in elements] == list(range(1, page_count(SAMPLE_PDF) + 1))
+
+def test_partition_pdf_in_daemonic_process():
+    """Daemonic processes such as Celery prefork workers partition in process."""
+    results = multiprocessing.Queue()
+    child = multiprocessing.Process(target=_partition_in_child, args=(results,), daemon=True)
+    child.start()
+    pages = results.get(timeout=60)
+    child.join(timeout=10)
+    assert pages == list(range(1, page_count(SAMPLE_PDF) + 1))
+
+def test_partition_pdf_falls_back_when_workers_fail_to_start():
+    """Errors starting worker processes on submit fall back to in-process partitioning."""
+    with patch.object(partition.ProcessPoolExecutor, "submit",
+                      side_effect=AssertionError("daemonic processes are not allowed to have children")):
+        elements = partition_pdf(SAMPLE_PDF, workers=2, pages_per_batch=4, min_pages=2,
+                                 partitioner=FAKE_PARTITIONER)
+    assert [element.metadata.page_number for element in elements] == list(range(1, page_count(SAMPLE_PDF) + 1))
@@ -0,0 +1,161 @@
+"""Tests for the streaming ingest pipeline."""
+
+import functools
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.processors.pipeline import StreamingPipeline
+from app.tasks import document
+from app.utils.chunking import ChunkBuilder, split_text
+from app.utils.fake_dashscope import FakeDashScope
+from app.utils.fingerprint import SimHasher, simhash
+from benchmarks.standins import MemoryGraphDatabase, SQLiteRelationalDatabase, vector_db
+from tests.test_partition import FAKE_PARTITIONER, SAMPLE_PDF
+
+DOC_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+PAGES = [
+    [f"Page {page} paragraph {i}: attention layers route information between tokens "
+     f"while residual connections keep gradients stable across depth {page * i}." for i in range(12)]
+    for page in range(20)
+]
+TEXT = "\n".join(line for page in PAGES for line in page)
+
+def embed(texts):
+    return [[float(len(text)), 1.0] for text in texts]
+
+def make_client():
+    client = AsyncMock()
+    client.extract_entities.side_effect = lambda text: [
+        {"name": text.split(":")[0], "type": "CONCEPT", "description": ""}
+    ]
+    client.extract_relationships.return_value = []
+    return client
+
+def test_incremental_chunking_and_simhash_match_whole_text():
+    """Feeding elements one by one gives the same chunks and fingerprint."""
+    builder, hasher, chunks = ChunkBuilder(500, 2000), SimHasher(), []
+    for line in TEXT.splitlines():
+        hasher.update(line)
+        chunks.extend(builder.add(line))
+    chunks.extend(builder.finish())
+
+    assert chunks == split_text(TEXT, 500, 2000)
+    assert hasher.digest() == simhash(TEXT)
+
+@pytest.mark.asyncio
+async def test_pipeline_streams_with_bounded_queues(monkeypatch):
+    """Chunks are written while pages are still parsed, queues stay bounded."""
+    monkeypatch.setattr(document.settings, "CHUNK_MIN_CHARS", 500)
+    monkeypatch.setattr(document.settings, "CHUNK_MAX_CHARS", 2000)
+    parsed = []
+
+    def batches():
+        for page in PAGES:
+            parsed.append(page)
+            yield page
+
+    rel_db = MagicMock()
+    flushed_at = []
+    rel_db.store_chunks.side_effect = lambda doc_id, rows: flushed_at.append(len(parsed))
+    graph_db, vector_db = MagicMock(), MagicMock()
+    graph_db.store_entities.side_effect = len
+
+    pipeline = StreamingPipeline(DOC_ID, rel_db, graph_db, vector_db, make_client(), embed,
+                                 queue_size=2, element_queue_size=4, write_batch=2)
+    result = await pipeline.run(batches())
+
+    expected = split_text(TEXT, 500, 2000)
+    assert result.chunks == len(expected)
+    assert result.entities == len(expected)
+    assert result.simhash == simhash(TEXT)
+    assert result.peak_queue_sizes["elements"] <= 4
+    assert all(result.peak_queue_sizes[name] <= 2 for name in ("embed", "extract", "write"))
+    # The first chunks were stored before the last page was parsed
+    assert flushed_at[0] < len(PAGES)
+    assert result.flushes == len(flushed_at) > 1
+
+    stored = {}
+    for call in rel_db.store_chunks.call_args_list:
+        for row in call.args[1]:
+            stored.setdefault(row["content_hash"], {}).update(
+                {key: value for key, value in row.items() if value is not None})
+    assert set(stored) == {chunk.content_hash for chunk in expected}
+    assert all(row.get("entity_ids") and row.get("embedding_id") for row in stored.values())
+    ids = [id for call in vector_db.add_embeddings.call_args_list for id in call.args[0]]
+    assert ids == [f"chunk_{DOC_ID}_{chunk.content_hash[:16]}" for chunk in expected]
+    assert result.document_embedding is not None
+
+@pytest.mark.asyncio
+async def test_pipeline_stores_relationships_once_after_entities():
+    """Relationships of every chunk are stored in one batch after the last entities."""
+    client = make_client()
+    client.extract_relationships.side_effect = lambda text: [
+        {"source": text.split(":")[0], "target": "ATTENTION", "relationship": "uses", "relationship_strength": 5}
+    ]
+    calls = []
+    graph_db = MagicMock()
+    graph_db.store_entities.side_effect = lambda batch: calls.append("entities") or len(batch)
+    graph_db.store_relationships.side_effect = lambda batch: calls.append("relationships") or len(batch)
+
+    pipeline = StreamingPipeline(DOC_ID, MagicMock(), graph_db, MagicMock(), client, embed,
+                                 queue_size=2, element_queue_size=4, write_batch=2)
+    result = await pipeline.run(iter(PAGES))
+
+    assert calls.count("relationships") == 1 and calls[-1] == "relationships"
+    assert calls.count("entities") > 1
+    batch = graph_db.store_relationships.call_args.args[0]
+    assert len(batch) == result.relationships == result.entities
+
+@pytest.mark.asyncio
+async def test_pipeline_failure_cancels_stages():
+    """An error in one stage stops the others and propagates."""
+    client = make_client()
+    client.extract_entities.side_effect = RuntimeError("rate limited")
+    pipeline = StreamingPipeline(DOC_ID, MagicMock(), MagicMock(), MagicMock(), client, embed,
+                                 queue_size=1, element_queue_size=1)
+    with pytest.raises(RuntimeError, match="rate limited"):
+        await pipeline.run(iter(PAGES))
+
+def test_stream_document_registers_document(tmp_path):
+    """The task stores the document, its fingerprint and its mean embedding."""
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(b"%PDF-1.4\nTest PDF content")
+    rel_db = MagicMock()
+    rel_db.get_fingerprint.return_value = None
+    with patch("app.tasks.document.get_sync_relational_db", return_value=rel_db), \
+         patch("app.tasks.document.get_sync_graph_db"), \
+         patch("app.tasks.document.get_sync_vector_db") as vector_db, \
+         patch("app.tasks.document.QwenClient", return_value=make_client()), \
+         patch("app.tasks.document.embed_texts", side_effect=embed), \
+         patch("app.tasks.document.iter_partition_pdf", return_value=iter(PAGES)):
+        result = document.stream_document.apply(args=[str(path)]).get()
+
+    assert result["status"] == "completed"
+    assert result["chunks"] == len(split_text(TEXT, document.settings.CHUNK_MIN_CHARS,
+                                              document.settings.CHUNK_MAX_CHARS))
+    fingerprint, doc_id = rel_db.store_fingerprint.call_args.args
+    assert doc_id == result["doc_id"] and fingerprint.simhash == simhash(TEXT)
+    assert vector_db.return_value.store_embedding.call_args.args[0] == f"doc_{result['doc_id']}"
+    rel_db.update_document.assert_called_once_with(
+        result["doc_id"], {"status": "content_extracted", "chunks": result["chunks"]})
+
+def test_stream_document_task_stores_document(monkeypatch):
+    """Run as a Celery task, the pipeline stores chunks, entities and vectors."""
+    stores = {"relational": SQLiteRelationalDatabase(), "graph": MemoryGraphDatabase(), "vector": vector_db()}
+    monkeypatch.setattr(document, "get_sync_relational_db", lambda: stores["relational"])
+    monkeypatch.setattr(document, "get_sync_graph_db", lambda: stores["graph"])
+    monkeypatch.setattr(document, "get_sync_vector_db", lambda: stores["vector"])
+    monkeypatch.setattr(document, "bump_generation", lambda: None)
+    monkeypatch.setattr(document, "iter_partition_pdf",
+                        functools.partial(document.iter_partition_pdf, partitioner=FAKE_PARTITIONER))
+    monkeypatch.setattr(document.settings, "DEDUP_ENABLED", False)
+    with FakeDashScope() as server:
+        server.install()
+        result = document.stream_document.apply(args=[SAMPLE_PDF]).get()
+
+    assert result["status"] == "completed" and result["chunks"] > 0
+    assert stores["relational"].get_document(result["doc_id"])["status"] == "content_extracted"
+    assert stores["relational"].counts()["chunks"] == result["chunks"]
+    assert stores["graph"].counts()["entities"] == result["entities"]
+    collection = stores["vector"]._async_db._collection
+    assert collection.get(ids=[f"doc_{result['doc_id']}"])["ids"]
@@ -0,0 +1,84 @@
+"""Tests for the opt-in task profiler."""
+
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+import pytest
+from app.utils import profiling
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return total
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    """Profile every run of one task into a temporary directory."""
+    monkeypatch.setattr(profiling.settings, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling.settings, "PROFILE_INTERVAL", 0.001)
+    monkeypatch.setattr(profiling, "get_toggles", lambda: {"tasks": ["document.extract_content"], "rate": 0.0})
+    return tmp_path
+
+def test_should_profile():
+    """Enabled tasks are always profiled, others at the sample rate."""
+    assert profiling.should_profile("document.extract_content", {"tasks": ["document.extract_content"], "rate": 0})
+    assert profiling.should_profile("document.process_document", {"tasks": ["*"], "rate": 0})
+    assert not profiling.should_profile("document.process_document", {"tasks": [], "rate": 0})
+    with patch("app.utils.profiling.random.random", side_effect=[0.04, 0.06]):
+        toggles = {"tasks": [], "rate": 0.05}
+        assert profiling.should_profile("document.process_document", toggles)
+        assert not profiling.should_profile("document.process_document", toggles)
+
+def test_profiled_task_writes_flamegraph_and_allocations(profile_dir):
+    """A profiled run writes collapsed stacks and its top allocation sites."""
+    @profiling.profiled
+    def extract_content(seconds):
+        blocks = [bytearray(1024) for _ in range(200)]
+        return busy(seconds), len(blocks)
+
+    task = SimpleNamespace(name="document.extract_content", request=SimpleNamespace(id="3f2a9c1e-task", is_eager=False))
+    with patch("celery.current_task", task):
+        assert extract_content(0.2)[1] == 200
+    # Runs outside a worker are not profiled
+    assert extract_content(0.01)[1] == 200
+
+    files = sorted(os.listdir(profile_dir))
+    assert len(files) == 2 and all(name.startswith("document.extract_content-") for name in files)
+    alloc, folded = [(profile_dir / name).read_text() for name in files]
+    assert "test_profiling.py" in alloc and "KiB" in alloc
+    stacks = [line.rsplit(" ", 1) for line in folded.splitlines()]
+    assert all(count.isdigit() for _, count in stacks)
+    assert any("extract_content (test_profiling.py" in stack and stack.endswith(")") for stack, _ in stacks)
+    assert any(";busy (test_profiling.py" in stack for stack, _ in stacks)
+
+def test_async_tasks_are_profiled(profile_dir, monkeypatch):
+    """Coroutine tasks stay coroutines and are sampled on the loop's thread."""
+    monkeypatch.setattr(profiling.settings, "PROFILE_MEMORY", False)
+
+    @profiling.profiled
+    async def extract_content():
+        await asyncio.sleep(0)
+        return busy(0.1)
+
+    assert asyncio.iscoroutinefunction(extract_content)
+    task = SimpleNamespace(name="document.extract_content", request=SimpleNamespace(id="a1", is_eager=False))
+    with patch("celery.current_task", task):
+        asyncio.run(extract_content())
+    assert [name.endswith(".folded") for name in os.listdir(profile_dir)] == [True]
+
+def test_retention(tmp_path):
+    """Only the newest files within the age limit are kept."""
+    now = time.time()
+    for index, age in enumerate([10, 20, 30, 4000]):
+        path = tmp_path / f"profile-{index}.folded"
+        path.write_text("main 1\n")
+        os.utime(path, (now - age, now - age))
+
+    assert profiling.prune_profiles(str(tmp_path), max_files=3, max_age=3600) == 1
+    assert profiling.prune_profiles(str(tmp_path), max_files=2, max_age=3600) == 1
+    assert sorted(os.listdir(tmp_path)) == ["profile-0.folded", "profile-1.folded"]
+    assert profiling.prune_profiles(str(tmp_path / "missing")) == 0
@@ -0,0 +1,120 @@
+"""Tests for structured task progress and its event stream."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.utils import progress
+from app.utils.qwen import call_dashscope
+
+def reporter(clock, **kwargs):
+    events = []
+    stored = []
+    instance = progress.ProgressReporter(
+        "task-1", ("parsed", "embedded"), interval=1.0, clock=lambda: clock["now"],
+        publish=lambda task_id, event: events.append(event),
+        store=lambda task_id, event: stored.append(event), **kwargs
+    )
+    return instance, events, stored
+
+def test_reports_are_rate_limited():
+    """Stage changes are reported at once, units at most once per interval."""
+    clock = {"now": 0.0}
+    instance, events, stored = reporter(clock)
+
+    with instance:
+        instance.stage("embedded", total=10)
+        clock["now"] = 2.0
+        instance.advance(4)
+        for _ in range(5):
+            clock["now"] += 0.1
+            instance.advance()
+    assert len(events) == 3 and events == stored
+
+    event = events[1]
+    assert event["stage"] == "embedded" and event["done"] == 4
+    assert event["progress"] == 70.0
+    assert event["eta"] == 3.0
+    # The last units are flushed when the reporter closes
+    assert events[-1]["done"] == 9 and events[-1]["current_operation"] == "embedded 9/10"
+
+def test_tokens_and_inactive_reporters():
+    """DashScope token usage is added to the current report; direct calls report nothing."""
+    clock = {"now": 0.0}
+    instance, events, _ = reporter(clock)
+    response = SimpleNamespace(status_code=HTTPStatus.OK, usage={"input_tokens": 100, "output_tokens": 20})
+    with instance:
+        instance.stage("parsed")
+        call_dashscope("entities", lambda **kwargs: response)
+        clock["now"] = 5.0
+        call_dashscope("entities", lambda **kwargs: response)
+    call_dashscope("entities", lambda **kwargs: response)
+    assert events[-1]["tokens"] == {"input": 200, "output": 40}
+
+    task = SimpleNamespace(request=SimpleNamespace(id=None, is_eager=False))
+    assert progress.ProgressReporter.for_task(task).task_id is None
+    child = SimpleNamespace(request=SimpleNamespace(id="child", parent_id="workflow", is_eager=False))
+    assert progress.ProgressReporter.for_task(child, parent=True).task_id == "workflow"
+
+def test_hub_dispatch():
+    """Events reach every follower of their task only."""
+    async def follow():
+        hub = progress.ProgressHub(maxsize=2)
+        with patch.object(hub, "_listen", new=MagicMock(side_effect=lambda: asyncio.sleep(0))):
+            async with hub.follow("a") as first, hub.follow("a") as second, hub.follow("b") as other:
+                for done in range(3):
+                    hub.dispatch("a", {"done": done})
+                return [first.get_nowait(), first.get_nowait()], second.qsize(), other.qsize()
+
+    received, second, other = asyncio.run(follow())
+    # Slow followers drop the oldest events
+    assert received == [{"done": 1}, {"done": 2}]
+    assert (second, other) == (2, 0)
+
+def test_follow_waits_for_subscription():
+    """Followers start receiving only once the hub's subscription is active."""
+    async def follow():
+        hub = progress.ProgressHub(subscribe_timeout=5)
+        order = []
+
+        async def listen():
+            await asyncio.sleep(0.05)
+            order.append("subscribed")
+            hub._subscribed.set()
+            await asyncio.Event().wait()
+
+        with patch.object(hub, "_listen", new=listen):
+            async with hub.follow("a"):
+                order.append("following")
+        return order
+
+    assert asyncio.run(follow()) == ["subscribed", "following"]
+
+def test_event_stream():
+    """The SSE endpoint streams progress until the task finishes."""
+    class Hub:
+        @asynccontextmanager
+        async def follow(self, task_id):
+            queue = asyncio.Queue()
+            queue.put_nowait({"state": "PROGRESS", "stage": "extracted", "done": 1, "total": 4})
+            queue.put_nowait({"state": "SUCCESS"})
+            yield queue
+
+    results = iter([
+        MagicMock(status="PROGRESS", info={"stage": "downloaded"}, ready=MagicMock(return_value=False)),
+        MagicMock(status="SUCCESS", result={"status": "completed"}, ready=MagicMock(return_value=True),
+                  successful=MagicMock(return_value=True))
+    ])
+    with patch("app.routers.tasks.get_hub", return_value=Hub()), \
+         patch("app.routers.tasks.celery_app.AsyncResult", side_effect=lambda task_id: next(results)):
+        response = TestClient(app).get("/api/v1/task-1/events")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    assert [lines[0] for lines in events] == ["event: state", "event: progress", "event: state"]
+    assert '"stage": "downloaded"' in events[0][1]
+    assert '"done": 1' in events[1][1]
+    assert '"result": {"status": "completed"}' in events[2][1]
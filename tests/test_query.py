@@ -1,9 +1,10 @@
 """Tests for cross-database query interface."""
 
 import pytest
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, MagicMock
 from uuid import UUID, uuid4
 from app.database.query import CrossDatabaseQuery
+from app.database.ranking import ResultFusion, SourceHit
 from app.models.structured import Document, StructuredData
 from app.models.entities import EntitySymbol, EntitySemantic
 from app.database.vector import ChromaInterface
@@ -75,6 +76,7 @@ def query(mock_databases, mock_entity, mock_doc):
         'metadata': {'document_id': str(mock_doc.id)}
     }])
     graph_db.search = AsyncMock(return_value=[mock_entity])
+    graph_db.search_documents = AsyncMock(return_value=[{"document_id": mock_doc.id, "score": 3.0}])
     mysql_db.search = AsyncMock(return_value=[mock_doc])
     mysql_db.get = AsyncMock(return_value=mock_doc)
 
@@ -105,6 +107,46 @@ async def test_search_by_graph(query, mock_entity):
     assert len(results) > 0
     assert isinstance(results[0], EntitySymbol)
 
+def neo4j_session(records):
+    """Neo4jInterface whose session returns ``records`` for every query."""
+    session = MagicMock()
+    session.run = AsyncMock(return_value=MagicMock(all=AsyncMock(return_value=records)))
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    interface = Neo4jInterface(uri="bolt://localhost", username="neo4j", password="test")
+    interface._driver = MagicMock()
+    interface._driver.session.return_value = session
+    return interface, session
+
+@pytest.mark.asyncio
+async def test_neo4j_search_matches_entity_type():
+    """Type and name are property matches; limit pages instead of filtering."""
+    entity_id = uuid4()
+    interface, session = neo4j_session([{"e": {"id": str(entity_id), "name": "BERT", "descriptions": [],
+                                               "entity_type": "MODEL"}}])
+    query = CrossDatabaseQuery(vector_db=AsyncMock(), graph_db=interface, mysql_db=AsyncMock(),
+                               qwen_client=AsyncMock())
+    entities = await query.search_by_graph(entity_type="MODEL", relationship_type="USES", limit=5)
+
+    cypher, params = session.run.await_args.args
+    assert "e.entity_type = $entity_type" in cypher and "e.limit" not in cypher
+    assert "r.description = $relationship" in cypher and "LIMIT $limit" in cypher
+    assert params == {"entity_type": "MODEL", "relationship": "USES", "skip": 0, "limit": 5}
+    assert entities[0].symbol_id == entity_id and entities[0].entity_type == "MODEL"
+
+@pytest.mark.asyncio
+async def test_graph_source_ranks_documents_by_mentions():
+    """The graph source scores documents by their entities of the type."""
+    doc_a, doc_b = uuid4(), uuid4()
+    interface, session = neo4j_session([{"document_id": bytearray(doc_a.bytes), "mentions": 4},
+                                        {"document_id": bytearray(doc_b.bytes), "mentions": 1}])
+    query = CrossDatabaseQuery(vector_db=AsyncMock(), graph_db=interface, mysql_db=AsyncMock(),
+                               qwen_client=AsyncMock())
+    hits = await query._graph_hits("MODEL", limit=20)
+
+    assert [(hit.document_id, hit.score) for hit in hits] == [(doc_a, 4.0), (doc_b, 1.0)]
+    assert session.run.await_args.kwargs == {"entity_type": "MODEL", "skip": 0, "limit": 20}
+
 @pytest.mark.asyncio
 async def test_search_structured(query, mock_doc):
     """Test searching structured data."""
@@ -139,3 +181,127 @@ async def test_error_handling(query):
     query.vector_db.search = AsyncMock(side_effect=Exception("Test error"))
     with pytest.raises(Exception):
         await query.search_by_embedding("test query")
+
+def test_rrf_fusion_orders_by_agreement():
+    """Documents found by several sources outrank single-source hits."""
+    shared, vector_only, graph_only = uuid4(), uuid4(), uuid4()
+    fusion = ResultFusion()
+    ranked = fusion.fuse({
+        "vector": [SourceHit(vector_only, 0.9), SourceHit(shared, 0.8)],
+        "graph": [SourceHit(graph_only, 9.0), SourceHit(shared, 5.0)],
+    })
+    assert ranked[0].document_id == shared
+    assert set(ranked[0].sources) == {"vector", "graph"}
+    assert ranked[0].sources["vector"].rank == 2
+    assert ranked[0].explain()["document_id"] == str(shared)
+
+def test_weighted_fusion_uses_normalized_scores():
+    """Weighted fusion respects per-source weights and score magnitude."""
+    a, b = uuid4(), uuid4()
+    fusion = ResultFusion(method="weighted", weights={"vector": 2.0})
+    ranked = fusion.fuse({
+        "vector": [SourceHit(a, 0.9), SourceHit(b, 0.1)],
+        "graph": [SourceHit(b, 10.0), SourceHit(a, 1.0)],
+    }, limit=1)
+    assert len(ranked) == 1
+    assert ranked[0].document_id == a
+    with pytest.raises(ValueError):
+        ResultFusion(method="unknown")
+
+@pytest.mark.asyncio
+async def test_ranked_search_hydrates_only_top_k(query):
+    """Only fused winners are loaded from MySQL and scores are exposed."""
+    doc_ids = [uuid4() for _ in range(5)]
+    query.vector_db.search = AsyncMock(return_value=[
+        {"id": str(i), "distance": d, "metadata": {"document_id": str(i)}}
+        for d, i in enumerate(doc_ids)
+    ])
+    query.mysql_db.get = AsyncMock(side_effect=lambda doc_id: Document(
+        id=doc_id,
+        meta=StructuredData(data_id=doc_id, data_type="test", data_value={}),
+        raw_content=""
+    ))
+
+    results = await query.ranked_search("test", limit=2)
+
+    assert [r.document_id for r in results] == doc_ids[:2]
+    assert query.mysql_db.get.await_count == 2
+    assert results[0].sources["vector"].score > results[1].sources["vector"].score
+    assert query.vector_db.search.await_args.args[0]["limit"] == 2
+    query.graph_db.search.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_iter_combined_streams_projection(query, mock_doc):
+    """Streaming search yields projected fields in rank order."""
+    items = [item async for item in query.iter_combined(
+        "test", filters={"test": "value"}, fields=["id", "raw_content", "score"]
+    )]
+    assert items[0]["id"] == str(mock_doc.id)
+    assert items[0]["raw_content"] == "Test content"
+    assert items[0]["score"] > 0
+
+@pytest.mark.asyncio
+async def test_iter_by_embedding_id_projection_skips_hydration(query, mock_doc):
+    """Id-only projections never load documents from MySQL."""
+    items = [item async for item in query.iter_by_embedding("test", fields=["id"])]
+    assert items == [{"id": str(mock_doc.id)}]
+    query.mysql_db.get.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_iter_by_embedding_rejects_unknown_fields(query):
+    """Unknown projection fields raise before any backend is queried."""
+    with pytest.raises(ValueError):
+        async for _ in query.iter_by_embedding("test", fields=["nope"]):
+            pass
+    query.vector_db.search.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_iter_structured_and_graph_read_pages(query, mock_entity):
+    """Streaming searches query the backends one page at a time."""
+    docs = [Document(id=uuid4(), meta=StructuredData(data_id=uuid4(), data_type="test", data_value={}),
+                     raw_content="") for _ in range(5)]
+    query.mysql_db.search = AsyncMock(side_effect=lambda q: docs[q.get("skip", 0):q.get("skip", 0) + q["limit"]])
+    query.graph_db.search = AsyncMock(side_effect=[[mock_entity] * 2, [mock_entity]])
+
+    items = [doc async for doc in query.iter_structured({"year": 2023}, limit=4, page_size=2)]
+    entities = [entity async for entity in query.iter_by_graph(entity_type="TECHNOLOGY", limit=10, page_size=2)]
+
+    assert items == docs[:4]
+    assert [(c.args[0].get("skip", 0), c.args[0]["limit"]) for c in query.mysql_db.search.await_args_list] == [
+        (0, 2), (2, 2)]
+    assert len(entities) == 3
+    assert [c.args[0]["skip"] for c in query.graph_db.search.await_args_list] == [0, 2]
+
+@pytest.mark.asyncio
+async def test_iter_combined_yields_before_deeper_pages(query):
+    """The first page is yielded before the backends are searched deeper."""
+    doc_ids = [uuid4() for _ in range(6)]
+    query.vector_db.search = AsyncMock(side_effect=lambda q: [
+        {"id": str(i), "distance": d, "metadata": {"document_id": str(i)}}
+        for d, i in enumerate(doc_ids[:q["limit"]])
+    ])
+
+    stream = query.iter_combined("test", limit=6, fields=["id"], page_size=2)
+    first = await stream.__anext__()
+    assert query.vector_db.search.await_count == 1
+    rest = [item async for item in stream]
+
+    assert [item["id"] for item in [first, *rest]] == [str(i) for i in doc_ids]
+    assert [c.args[0]["limit"] for c in query.vector_db.search.await_args_list] == [2, 4, 6]
+
+@pytest.mark.asyncio
+async def test_semantic_hits_score_chroma_distances():
+    """Chroma hits carry their distance, which orders the vector source."""
+    from benchmarks.standins import chroma_interface
+    near, far = uuid4(), uuid4()
+    vector_db = await chroma_interface()
+    await vector_db.add_embeddings(["near", "far"], [[1.0, 0.0], [0.0, 1.0]],
+                                   [{"document_id": str(near)}, {"document_id": str(far)}])
+    qwen_client = AsyncMock()
+    qwen_client.generate_embeddings = AsyncMock(return_value=[0.9, 0.1])
+    query = CrossDatabaseQuery(vector_db=vector_db, graph_db=AsyncMock(), mysql_db=AsyncMock(),
+                               qwen_client=qwen_client)
+    hits = await query._semantic_hits("test", "text", limit=2)
+
+    assert [hit.document_id for hit in hits] == [near, far]
+    assert 1.0 > hits[0].score > hits[1].score > 0
@@ -0,0 +1,30 @@
+"""Tests for the query-path load generator."""
+
+import asyncio
+from benchmarks.bench_query import TOPICS, parse_args, run_benchmark, seed
+from app.utils.fake_dashscope import hash_embedding
+
+def test_seeded_vectors_cluster_by_topic():
+    """Chroma search returns the chunks of documents on the queried topic."""
+    async def search():
+        stores = await seed(documents=16, chunks=2, entities=3, dim=32)
+        return stores, await stores["vector"].search({"vector": hash_embedding(TOPICS[1], 32), "limit": 4})
+
+    stores, hits = asyncio.run(search())
+    assert len(hits) == 4
+    assert all(hit["distance"] is not None for hit in hits)
+    assert {int(hit["metadata"]["document_id"].replace("-", ""), 16) - 1 for hit in hits} <= {1, 9}
+
+def test_run_benchmark_in_process_and_http():
+    """Every workload runs without errors and reports per-backend time."""
+    args = parse_args(["--documents", "24", "--requests", "6", "--concurrency", "2",
+                       "--latency", "0", "--http"])
+    report = run_benchmark(args)
+
+    modes = {(result["mode"], result["workload"]) for result in report["results"]}
+    assert modes == {("in-process", workload) for workload in ("embedding", "graph", "structured", "combined")} | {
+        ("http", "combined")}
+    assert all(result["errors"] == 0 and result["throughput"] > 0 for result in report["results"])
+    combined = next(result for result in report["results"] if result["mode"] == "http")
+    assert {"vector.search", "graph.search_documents", "mysql.search", "mysql.get"} <= set(combined["backends"])
+    assert combined["p50"] <= combined["p99"]
@@ -0,0 +1,108 @@
+"""Tests for the cross-database query cache."""
+
+import threading
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from app.database.cache import (QueryCache, TTLLRUCache, GenerationCounter, RedisGenerationCounter,
+                                normalize_query, _MISSING)
+from app.database.query import CrossDatabaseQuery
+from app.database.vector import ChromaInterface
+from app.database.graph import Neo4jInterface
+from app.database.relational import MySQLInterface
+from app.models.structured import Document, StructuredData
+
+@pytest.fixture
+def generation():
+    """Create an isolated generation counter."""
+    return GenerationCounter()
+
+@pytest.fixture
+def query(generation):
+    """Create a CrossDatabaseQuery with mocked backends and a fresh cache."""
+    doc_id = uuid4()
+    vector_db = AsyncMock(spec=ChromaInterface)
+    vector_db.search = AsyncMock(return_value=[
+        {"id": str(doc_id), "distance": 0.1, "metadata": {"document_id": str(doc_id)}}
+    ])
+    mysql_db = AsyncMock(spec=MySQLInterface)
+    mysql_db.get = AsyncMock(return_value=Document(
+        id=doc_id,
+        meta=StructuredData(data_id=doc_id, data_type="test", data_value={}),
+        raw_content="Test content"
+    ))
+    qwen_client = AsyncMock()
+    qwen_client.generate_embeddings = AsyncMock(return_value=[0.1, 0.2, 0.3])
+    return CrossDatabaseQuery(
+        vector_db=vector_db,
+        graph_db=AsyncMock(spec=Neo4jInterface),
+        mysql_db=mysql_db,
+        qwen_client=qwen_client,
+        cache=QueryCache(generation=generation)
+    )
+
+def test_ttl_lru_eviction_and_expiry():
+    """Least recently used entries are evicted and expired entries miss."""
+    cache = TTLLRUCache(maxsize=2, ttl=0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is _MISSING
+    assert cache.stats.evictions == 1
+
+    expiring = TTLLRUCache(maxsize=2, ttl=-1)
+    expiring.set("a", 1)
+    assert expiring.get("a") is _MISSING
+
+def test_normalize_query_is_canonical():
+    """Whitespace and dict ordering don't create new cache keys."""
+    assert normalize_query(text=" quantum  computing", filters={"a": 1, "b": 2}) == \
+        normalize_query(text="quantum computing", filters={"b": 2, "a": 1})
+
+@pytest.mark.asyncio
+async def test_repeated_queries_are_served_from_cache(query):
+    """Repeated searches reuse the embedding and ranked ids."""
+    await query.combined_search("quantum computing")
+    await query.combined_search("quantum   computing")
+    await query.search_by_embedding("quantum computing")
+
+    assert query.qwen_client.generate_embeddings.await_count == 1
+    assert query.vector_db.search.await_count == 2
+    stats = query.cache_stats()
+    assert stats["results"]["hits"] == 1
+    assert stats["embeddings"]["hits"] == 1
+    assert stats["results"]["hit_ratio"] == pytest.approx(1 / 3)
+
+@pytest.mark.asyncio
+async def test_generation_bump_invalidates_results(query, generation):
+    """Ingest writes invalidate cached results but not embeddings."""
+    await query.combined_search("quantum computing")
+    generation.bump()
+    await query.combined_search("quantum computing")
+
+    assert query.vector_db.search.await_count == 2
+    assert query.qwen_client.generate_embeddings.await_count == 1
+
+@pytest.mark.asyncio
+async def test_redis_generation_is_read_off_the_event_loop():
+    """Redis is read from a worker thread and at most once per refresh."""
+    loop_thread = threading.get_ident()
+    readers = []
+
+    class Client:
+        def get(self, key):
+            readers.append(threading.get_ident())
+            return b"7"
+
+        def incr(self, key):
+            return 8
+
+    counter = RedisGenerationCounter("redis://unused", refresh=60)
+    counter._client = Client()
+
+    assert await counter.current() == 7
+    assert await counter.current() == 7
+    assert counter.bump() == 8
+    assert await counter.current() == 8
+    assert len(readers) == 1 and readers[0] != loop_thread
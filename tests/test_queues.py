@@ -0,0 +1,66 @@
+"""Tests for Celery queue routing and priorities."""
+
+import os
+import pytest
+import yaml
+from unittest.mock import MagicMock, patch
+from app.tasks import celery_app, workflow
+from app.tasks.queues import (
+    BATCH,
+    CPU_PARSE,
+    INTERACTIVE,
+    LLM_IO,
+    PRIORITY_BACKFILL,
+    main,
+    worker_args,
+    worker_profiles
+)
+
+COMPOSE = os.path.join(os.path.dirname(__file__), os.pardir, "docker-compose.yml")
+
+@pytest.mark.parametrize("task,queue", [
+    ("document.process_document", CPU_PARSE),
+    ("document.stream_document", CPU_PARSE),
+    ("document.download_arxiv", LLM_IO),
+    ("document.extract_knowledge_graph", LLM_IO),
+    ("document.extract_content", LLM_IO),
+    ("workflow.process_document_workflow", INTERACTIVE),
+    ("workflow.process_documents_batch", BATCH),
+    ("ingest.tick", INTERACTIVE),
+    ("unrouted.task", INTERACTIVE)
+])
+def test_tasks_route_to_stage_queues(task, queue):
+    """Each stage is sent to the queue of its workload."""
+    route = celery_app.amqp.router.route({}, task)
+    assert route["queue"].name == queue
+    assert route["queue"].queue_arguments == {"x-max-priority": 9}
+
+def test_priorities_are_inherited():
+    """Subtasks keep the priority of the task that started them."""
+    assert celery_app.conf.task_inherit_parent_priority is True
+    assert celery_app.conf.broker_transport_options["queue_order_strategy"] == "priority"
+
+def test_batch_runs_at_backfill_priority():
+    """Batch backfills are queued behind interactive work."""
+    with patch.object(workflow.document.prefetch_arxiv, "apply_async") as prefetch, \
+         patch.object(workflow.process_document_workflow, "apply_async") as process:
+        process.return_value = MagicMock(get=MagicMock(return_value={"status": "completed"}))
+        workflow.process_documents_batch(["2101.00123"])
+
+    assert prefetch.call_args.kwargs["priority"] == PRIORITY_BACKFILL
+    assert process.call_args.args == (("2101.00123",),)
+    assert process.call_args.kwargs["priority"] == PRIORITY_BACKFILL
+
+def test_worker_profiles_match_compose(capsys):
+    """docker-compose runs one worker per queue with the profile's pool."""
+    assert worker_args(CPU_PARSE)[:5] == ["worker", "--queues", CPU_PARSE, "--pool", "prefork"]
+    assert main([LLM_IO]) == 0
+    assert "--pool threads" in capsys.readouterr().out
+    assert main(["nope"]) == 2
+
+    with open(COMPOSE) as f:
+        services = yaml.safe_load(f)["services"]
+    commands = [service["command"] for name, service in services.items() if name.startswith("celery-worker")]
+    for queue, profile in worker_profiles().items():
+        command = next(command for command in commands if f"--queues {queue} " in command)
+        assert f"--pool {profile['pool']}" in command or "CELERY_IO_POOL" in command
@@ -0,0 +1,50 @@
+"""Tests for the streaming search endpoint."""
+
+import json
+import pytest
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+from app.main import app
+from app.routers.search import get_query
+
+@pytest.fixture
+def client():
+    """Create a test client with a stubbed query interface."""
+    async def iter_combined(query_text, **kwargs):
+        for i in range(3):
+            yield {"id": f"doc-{i}", "title": f"{query_text} {i}"}
+
+    query = MagicMock()
+    query.iter_combined = MagicMock(side_effect=iter_combined)
+    app.dependency_overrides[get_query] = lambda: query
+    yield TestClient(app), query
+    app.dependency_overrides.clear()
+
+def test_stream_search_returns_ndjson(client):
+    """Results are streamed as one JSON object per line."""
+    test_client, query = client
+    response = test_client.get(
+        "/api/v1/search/stream",
+        params={"q": "quantum", "fields": "id,title", "filters": '{"year": 2023}'}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == ["doc-0", "doc-1", "doc-2"]
+    kwargs = query.iter_combined.call_args.kwargs
+    assert kwargs["fields"] == ["id", "title"]
+    assert kwargs["filters"] == {"year": 2023}
+
+def test_stream_search_rejects_unknown_fields(client):
+    """Unknown projection fields are rejected before streaming starts."""
+    test_client, _ = client
+    response = test_client.get("/api/v1/search/stream", params={"q": "x", "fields": "id,bogus"})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("filters", ["[1]", '"x"', "3", "{year: 2023}"])
+def test_stream_search_rejects_non_object_filters(client, filters):
+    """Filters that aren't a JSON object, or no JSON at all, get one status."""
+    test_client, query = client
+    response = test_client.get("/api/v1/search/stream", params={"q": "x", "filters": filters})
+    assert response.status_code == 422
+    query.iter_combined.assert_not_called()
@@ -0,0 +1,34 @@
+"""Tests for lazy imports of heavy dependencies at startup."""
+
+import pytest
+from benchmarks.import_profile import ENTRY_POINTS, eager_heavy_imports, profile_imports
+from app.utils.lazy import LazyModule, lazy_callable
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_entry_points_defer_heavy_imports(module):
+    """Importing the API or worker entry points doesn't load heavy dependencies."""
+    records = profile_imports(module)
+    assert any(record["module"] == module for record in records)
+    assert eager_heavy_imports(records) == []
+
+def test_lazy_module_resolves_on_access():
+    """Lazy proxies import on first use and forward attribute writes."""
+    proxy = LazyModule("colorsys")
+    assert "not loaded" in repr(proxy)
+    assert proxy.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1.0)
+    proxy.EXTRA = 1
+    import colorsys
+    assert colorsys.EXTRA == 1
+    del colorsys.EXTRA
+
+    dedent = lazy_callable("textwrap", "dedent")
+    assert dedent.__name__ == "dedent"
+    assert dedent("  a") == "a"
+
+def test_task_module_names_stay_patchable():
+    """Lazily exported task module names resolve to the real classes."""
+    from app.tasks import document
+    from app.database.graph import Neo4jInterface
+    assert document.Neo4jInterface is Neo4jInterface
+    with pytest.raises(AttributeError):
+        document.NotAnExport
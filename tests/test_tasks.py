@@ -73,7 +73,7 @@ async def test_document_processing(mock_databases, mock_celery_result):
         assert len(result["entities"]) > 0
 
         # Verify database interactions
-        mock_databases['graph'].store_entity.assert_called()
+        mock_databases['graph'].store_entities.assert_called()
         mock_databases['vector'].store_embedding.assert_called()
 
 @pytest.mark.asyncio
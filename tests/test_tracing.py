@@ -0,0 +1,88 @@
+"""Tests for trace propagation, span export and critical-path analysis."""
+
+from http import HTTPStatus
+from types import SimpleNamespace
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from app.database.sync_wrappers import run_async
+from app.utils import tracing
+from app.utils.qwen import call_dashscope
+
+class Neo4jInterface:
+    """Stands in for the graph interface in traced round-trips."""
+
+    async def store_entities(self, batch):
+        return len(batch)
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """Record spans in memory through a private provider."""
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracing, "_tracer", lambda: provider.get_tracer("test"))
+    return exporter
+
+def record(span_id, name, start, end, parent=None, **attributes):
+    return {"trace_id": "t", "span_id": span_id, "parent_id": parent, "name": name, "service": "test",
+            "start": start, "end": end, "attributes": attributes, "status": "UNSET"}
+
+def test_context_follows_task_headers(exporter):
+    """A task's span continues the sender's trace, with DashScope and DB spans inside."""
+    headers = {}
+    with tracing.span("POST /api/v1/process-document"):
+        tracing._inject_context(headers=headers)
+    assert "traceparent" in headers
+
+    task = SimpleNamespace(name="workflow.process_document_workflow",
+                           request=SimpleNamespace(delivery_info={"routing_key": "interactive"}, **headers))
+    tracing._start_task_span(task_id="task-1", task=task)
+    tracing.set_attributes({"ananke.document_id": "2101.00123", "ananke.doc_id": None})
+    call_dashscope("entities", lambda **kwargs: SimpleNamespace(status_code=HTTPStatus.OK,
+                                                                usage={"input_tokens": 5, "output_tokens": 2}))
+    assert run_async(Neo4jInterface().store_entities([1, 2])) == 2
+    tracing._end_task_span(task_id="task-1", state="SUCCESS")
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    request, task_span = spans["POST /api/v1/process-document"], spans["celery.run workflow.process_document_workflow"]
+    assert task_span.parent.span_id == request.context.span_id
+    assert task_span.context.trace_id == request.context.trace_id
+    assert task_span.attributes["ananke.document_id"] == "2101.00123"
+    assert spans["dashscope.entities"].parent.span_id == task_span.context.span_id
+    assert spans["dashscope.entities"].attributes["dashscope.tokens.input"] == 5
+    assert spans["db.graph.store_entities"].attributes["db.operation"] == "store_entities"
+
+def test_critical_path():
+    """Only the children that delay their parent are on the critical path."""
+    spans = [
+        record("root", "celery.run workflow", 0.0, 10.0, **{"ananke.document_id": "2101.00123"}),
+        record("a", "db.graph.store_entities", 3.0, 6.0, "root"),
+        record("b", "stage.extracted", 2.0, 9.0, "root"),
+        record("c", "dashscope.entities", 3.0, 8.0, "b"),
+        record("other", "celery.run other", 0.0, 1.0)
+    ]
+    assert tracing.document_roots(spans, "2101.00123") == [spans[0]]
+
+    segments = tracing.critical_path(spans, spans[0])
+    assert sum(seconds for _, seconds in segments) == pytest.approx(10.0)
+    summary = {entry["name"]: entry for entry in tracing.summarize(segments)}
+    assert "db.graph.store_entities" not in summary
+    assert summary["dashscope.entities"]["seconds"] == pytest.approx(5.0)
+    assert summary["stage.extracted"]["seconds"] == pytest.approx(2.0)
+    assert summary["celery.run workflow"]["share"] == pytest.approx(0.3)
+
+def test_file_export_and_cli(exporter, tmp_path, capsys):
+    """Spans written by the file exporter are analyzed by the CLI."""
+    with tracing.span("celery.run workflow", {"ananke.document_id": "2101.00123"}):
+        with tracing.span("stage.partitioned"):
+            with tracing.span("partition_pdf"):
+                pass
+    path = tmp_path / "traces.jsonl"
+    tracing.JsonLinesExporter(str(path)).export(exporter.get_finished_spans())
+
+    assert tracing.main(["2101.00123", "--file", str(path)]) == 0
+    output = capsys.readouterr().out
+    assert "celery.run workflow" in output and "partition_pdf" in output
+    assert tracing.main(["9999.99999", "--file", str(path)]) == 1
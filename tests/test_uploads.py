@@ -0,0 +1,137 @@
+"""Tests for streaming, content-addressed document uploads."""
+
+import hashlib
+import pytest
+from unittest.mock import MagicMock, patch
+from celery import states
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.utils.uploads import UploadTooLargeError, content_path, spool_upload
+
+PDF = b"%PDF-1.4\n" + b"0123456789" * 1000
+
+class FakeUpload:
+    """Minimal async UploadFile stand-in that records read sizes."""
+
+    def __init__(self, data: bytes, filename: str = "paper.pdf"):
+        self.data = data
+        self.filename = filename
+        self.reads = []
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads.append(size)
+        chunk, self.data = self.data[:size], self.data[size:]
+        return chunk
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    """Point the upload spool at a temporary directory."""
+    monkeypatch.setattr(settings, "UPLOAD_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 1024 * 1024)
+    return tmp_path
+
+@pytest.mark.asyncio
+async def test_spool_upload_streams_and_hashes(spool):
+    """Uploads are read in chunks and stored under their SHA-256."""
+    upload = FakeUpload(PDF, filename="../../etc/paper.PDF")
+    spooled = await spool_upload(upload, chunk_size=4096)
+
+    assert spooled.sha256 == hashlib.sha256(PDF).hexdigest()
+    assert spooled.size == len(PDF)
+    assert spooled.path == content_path(spooled.sha256, "paper.pdf", str(spool))
+    assert spooled.path.read_bytes() == PDF
+    assert set(upload.reads) == {4096}
+    assert not list(spool.glob(".upload-*"))
+
+@pytest.mark.asyncio
+async def test_spool_upload_enforces_size_limit(spool):
+    """Oversized uploads are rejected without leaving files behind."""
+    with pytest.raises(UploadTooLargeError):
+        await spool_upload(FakeUpload(PDF), max_bytes=100, chunk_size=64)
+    assert not list(spool.rglob("*"))
+
+def task_state(state):
+    """Patch the state Celery reports for any task."""
+    return patch("app.routers.tasks.celery_app.AsyncResult", return_value=MagicMock(state=state))
+
+def test_upload_endpoint_deduplicates(spool):
+    """Uploading the same content twice starts the pipeline once."""
+    client = TestClient(app)
+    with patch("app.routers.tasks.celery_app.send_task") as send_task, task_state(states.STARTED):
+        first = client.post("/api/v1/upload-document", files={"file": ("a.pdf", PDF, "application/pdf")})
+        second = client.post("/api/v1/upload-document", files={"file": ("b.pdf", PDF, "application/pdf")})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["duplicate"] is False
+    assert second.json() == {**first.json(), "duplicate": True}
+    send_task.assert_called_once()
+    assert send_task.call_args.kwargs["task_id"] == first.json()["task_id"]
+    assert send_task.call_args.args == ("document.stream_document",)
+    document_path, = send_task.call_args.kwargs["args"]
+    assert document_path.endswith(f"{first.json()['sha256']}.pdf")
+
+def test_upload_endpoint_rejects_large_files(spool, monkeypatch):
+    """Uploads over MAX_UPLOAD_BYTES get a 413."""
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 1000)
+    client = TestClient(app)
+    with patch("app.routers.tasks.celery_app.send_task") as send_task:
+        response = client.post("/api/v1/upload-document", files={"file": ("a.pdf", PDF, "application/pdf")})
+    assert response.status_code == 413
+    send_task.assert_not_called()
+
+def test_upload_endpoint_releases_claim_on_failure(spool):
+    """A failed task submission lets the next upload retry."""
+    client = TestClient(app)
+    with patch("app.routers.tasks.celery_app.send_task",
+               side_effect=[RuntimeError("broker down"), None]) as send_task:
+        failed = client.post("/api/v1/upload-document", files={"file": ("a.pdf", PDF, "application/pdf")})
+        retried = client.post("/api/v1/upload-document", files={"file": ("a.pdf", PDF, "application/pdf")})
+    assert failed.status_code == 500
+    assert retried.status_code == 200
+    assert retried.json()["duplicate"] is False
+    assert send_task.call_count == 2
+
+def test_upload_endpoint_retries_failed_task(spool):
+    """Content whose task failed or was revoked is submitted again."""
+    client = TestClient(app)
+    with patch("app.routers.tasks.celery_app.send_task") as send_task:
+        first = client.post("/api/v1/upload-document", files={"file": ("a.pdf", PDF, "application/pdf")})
+        with task_state(states.FAILURE):
+            retried = client.post("/api/v1/upload-document", files={"file": ("a.pdf", PDF, "application/pdf")})
+        with task_state(states.STARTED):
+            duplicate = client.post("/api/v1/upload-document", files={"file": ("a.pdf", PDF, "application/pdf")})
+
+    assert retried.json()["duplicate"] is False
+    assert retried.json()["task_id"] != first.json()["task_id"]
+    assert duplicate.json() == {**retried.json(), "duplicate": True}
+    assert [call.kwargs["task_id"] for call in send_task.call_args_list] == [
+        first.json()["task_id"], retried.json()["task_id"]]
+
+def test_upload_endpoint_accepts_json_uploads(spool):
+    """A .json upload is not mistaken for its own claim record."""
+    client = TestClient(app)
+    content = b'{"a": 1}'
+    with patch("app.routers.tasks.celery_app.send_task") as send_task, task_state(states.STARTED):
+        first = client.post("/api/v1/upload-document", files={"file": ("data.json", content, "application/json")})
+        second = client.post("/api/v1/upload-document", files={"file": ("data.json", content, "application/json")})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["duplicate"] is False
+    assert second.json() == {**first.json(), "duplicate": True}
+    assert content_path(first.json()["sha256"], "data.json", str(spool)).read_bytes() == content
+    send_task.assert_called_once()
+
+def test_upload_endpoint_retries_lost_task(spool, monkeypatch):
+    """Content whose task stayed pending past the claim timeout is submitted again."""
+    client = TestClient(app)
+    with patch("app.routers.tasks.celery_app.send_task") as send_task, task_state(states.PENDING):
+        first = client.post("/api/v1/upload-document", files={"file": ("a.pdf", PDF, "application/pdf")})
+        queued = client.post("/api/v1/upload-document", files={"file": ("a.pdf", PDF, "application/pdf")})
+        monkeypatch.setattr(settings, "UPLOAD_CLAIM_TIMEOUT", -1.0)
+        retried = client.post("/api/v1/upload-document", files={"file": ("a.pdf", PDF, "application/pdf")})
+
+    assert queued.json() == {**first.json(), "duplicate": True}
+    assert retried.json()["duplicate"] is False
+    assert retried.json()["task_id"] != first.json()["task_id"]
+    assert send_task.call_count == 2